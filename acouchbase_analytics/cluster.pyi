@@ -14,7 +14,7 @@
 #  limitations under the License.
 
 import sys
-from typing import Awaitable, overload
+from typing import Any, Awaitable, Callable, List, overload
 
 if sys.version_info < (3, 11):
     from typing_extensions import Unpack
@@ -24,6 +24,7 @@ else:
 from acouchbase_analytics.database import AsyncDatabase
 from couchbase_analytics.credential import Credential
 from couchbase_analytics.options import ClusterOptions, ClusterOptionsKwargs, QueryOptions, QueryOptionsKwargs
+from couchbase_analytics.query import QueryMetadata
 from couchbase_analytics.result import AsyncQueryResult
 
 class AsyncCluster:
@@ -62,6 +63,36 @@ class AsyncCluster:
     ) -> Awaitable[AsyncQueryResult]: ...
     @overload
     def execute_query(self, statement: str, *args: str, **kwargs: str) -> Awaitable[AsyncQueryResult]: ...
+    @overload
+    def execute_query(
+        self, statement: str, *args: str, row_handler: Callable[[Any], Any], **kwargs: Unpack[QueryOptionsKwargs]
+    ) -> Awaitable[QueryMetadata]: ...
+    @overload
+    def execute_query(
+        self,
+        statement: str,
+        options: QueryOptions,
+        *args: str,
+        row_handler: Callable[[Any], Any],
+        **kwargs: Unpack[QueryOptionsKwargs],
+    ) -> Awaitable[QueryMetadata]: ...
+    @overload
+    def execute_query(
+        self,
+        statement: str,
+        *args: str,
+        batch_handler: Callable[[List[Any]], Any],
+        **kwargs: Unpack[QueryOptionsKwargs],
+    ) -> Awaitable[QueryMetadata]: ...
+    @overload
+    def execute_query(
+        self,
+        statement: str,
+        options: QueryOptions,
+        *args: str,
+        batch_handler: Callable[[List[Any]], Any],
+        **kwargs: Unpack[QueryOptionsKwargs],
+    ) -> Awaitable[QueryMetadata]: ...
     def shutdown(self) -> Awaitable[None]: ...
     @overload
     @classmethod
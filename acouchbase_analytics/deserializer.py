@@ -16,4 +16,7 @@
 
 from couchbase_analytics.common.deserializer import DefaultJsonDeserializer as DefaultJsonDeserializer  # noqa: F401
 from couchbase_analytics.common.deserializer import Deserializer as Deserializer  # noqa: F401
+from couchbase_analytics.common.deserializer import LazyRowDeserializer as LazyRowDeserializer  # noqa: F401
+from couchbase_analytics.common.deserializer import MsgspecDeserializer as MsgspecDeserializer  # noqa: F401
+from couchbase_analytics.common.deserializer import OrjsonDeserializer as OrjsonDeserializer  # noqa: F401
 from couchbase_analytics.common.deserializer import PassthroughDeserializer as PassthroughDeserializer  # noqa: F401
@@ -16,13 +16,24 @@
 
 from __future__ import annotations
 
-from typing import AsyncIterator, Callable, Optional
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Generator, List, Optional, Tuple
 
 import ijson
-from anyio import EndOfStream, Event, create_memory_object_stream
+from anyio import EndOfStream, Event, create_memory_object_stream, move_on_after
 
 from acouchbase_analytics.protocol._core.async_json_token_parser import AsyncJsonTokenParser
+from couchbase_analytics.common._core.buffered_bytes import BufferedBytes
+from couchbase_analytics.common._core.json_parser_backend import (
+    JsonParserBackend,
+    WholeBufferJsonParser,
+    get_ijson_backend,
+    resolve_parser_backend,
+)
 from couchbase_analytics.common._core.json_parsing import JsonStreamConfig, ParsedResult, ParsedResultType
+from couchbase_analytics.common._core.json_row_decoder import JsonRowDecoder
+from couchbase_analytics.common._core.json_row_splitter import JsonRowSplitter
 from couchbase_analytics.common._core.json_token_parser_base import JsonTokenParsingError
 from couchbase_analytics.common.errors import AnalyticsError
 from couchbase_analytics.common.logging import LogLevel
@@ -35,13 +46,13 @@ class AsyncJsonStream:
         *,
         stream_config: Optional[JsonStreamConfig] = None,
         logger_handler: Optional[Callable[[str, LogLevel], None]] = None,
+        row_handler: Optional[Callable[[List[Any]], Awaitable[None]]] = None,
     ) -> None:
         # HTTP stream handling
         if stream_config is None:
             stream_config = JsonStreamConfig()
         self._http_stream_iter = http_stream_iter
-        self._http_stream_buffer_size = stream_config.http_stream_buffer_size
-        self._http_response_buffer = bytearray()
+        self._http_response_chunks: List[bytes] = []
         self._http_stream_exhausted = False
 
         # logging
@@ -51,13 +62,53 @@ class AsyncJsonStream:
         self._send_stream, self._receive_stream = create_memory_object_stream[ParsedResult](
             max_buffer_size=stream_config.buffered_row_max
         )
-        self._json_stream_parser = None
+        # the parser is push-based, each chunk of the HTTP response is sent to the parser (once) as it is received
+        self._json_stream_parser: Optional[Generator[None, bytes, None]] = None
+        self._parser_events: List[Tuple[str, str, Any]] = ijson.sendable_list()
+        self._parser_event_index = 0
         self._buffer_entire_result = stream_config.buffer_entire_result
         handler = None if self._buffer_entire_result is True else self._handle_json_result
         self._json_token_parser = AsyncJsonTokenParser(handler)
+        self._split_raw_rows = stream_config.split_raw_rows
+        self._json_row_splitter: Optional[JsonRowSplitter] = None
+        self._parser_backend = resolve_parser_backend(stream_config.parser_backend)
+        self._whole_buffer_parser: Optional[WholeBufferJsonParser] = None
+        # rows are only decoded when they are emitted by one of the streaming backends
+        self._decode_rows = (
+            stream_config.decode_rows is True
+            and not self._buffer_entire_result
+            and not self._split_raw_rows
+            and self._parser_backend.is_streaming
+        )
+        self._use_float = stream_config.use_float
+        self._json_row_decoder = (
+            JsonRowDecoder(
+                infer_row_shape=stream_config.infer_row_shape,
+                row_shape_sample_size=stream_config.row_shape_sample_size,
+            )
+            if self._decode_rows
+            else None
+        )
         self._token_stream_exhausted = False
+        # rows are handed off to the consumer in batches (see _flush_rows())
+        self._buffered_row_max = stream_config.buffered_row_max
+        self._row_batch_size = max(1, stream_config.row_batch_size)
+        self._row_batch: List[Any] = []
+        self._received_rows: Deque[Any] = deque()
+        self._rows_produced = 0
+        self._rows_consumed = 0
+        # if set, each batch of rows is handed to the row handler from the parsing stage instead of the consumer
+        self._row_handler = row_handler
+        # if set, backpressure is based on the size of the buffered rows (and the number of buffered batches of rows)
+        self._buffered_bytes = (
+            BufferedBytes(stream_config)
+            if stream_config.buffered_bytes_max is not None and row_handler is None and not self._buffer_entire_result
+            else None
+        )
         self._has_results_or_errors_evt = Event()
         self._results_or_errors_type = ParsedResultType.UNKNOWN
+        # set once the remaining results are no longer needed, see stop_parsing()
+        self._stop_requested = False
 
     @property
     def has_results_or_errors(self) -> Event:
@@ -66,6 +117,13 @@ class AsyncJsonStream:
         """
         return self._has_results_or_errors_evt
 
+    @property
+    def http_stream_exhausted(self) -> bool:
+        """
+        **INTERNAL**
+        """
+        return self._http_stream_exhausted
+
     @property
     def results_or_errors_type(self) -> ParsedResultType:
         """
@@ -73,6 +131,22 @@ class AsyncJsonStream:
         """
         return self._results_or_errors_type
 
+    @property
+    def decode_rows(self) -> bool:
+        """
+        **INTERNAL**
+
+        If enabled, ROW results contain the decoded Python object instead of the raw bytes.
+        """
+        return self._decode_rows
+
+    @property
+    def parser_backend(self) -> JsonParserBackend:
+        """
+        **INTERNAL**
+        """
+        return self._parser_backend
+
     @property
     def token_stream_exhausted(self) -> bool:
         """
@@ -84,7 +158,7 @@ class AsyncJsonStream:
         """
         **INTERNAL**
         """
-        if self._token_stream_exhausted:
+        if self._token_stream_exhausted or self._stop_requested:
             return False
         if self._buffer_entire_result:
             return True
@@ -92,27 +166,71 @@ class AsyncJsonStream:
         stats = self._receive_stream.statistics()
         if stats.current_buffer_used >= stats.max_buffer_size:
             return False
+        if self._row_handler is None and self._buffer_full():
+            return False
         return True
 
+    def _buffer_full(self) -> bool:
+        """
+        **INTERNAL**
+
+        True once the producer should pause because the consumer has fallen behind.  The number of buffered batches of
+        rows is bounded by the memory object stream.
+        """
+        if self._buffered_bytes is None:
+            return self._rows_produced - self._rows_consumed >= self._buffered_row_max
+        if self._buffered_bytes.over_threshold():
+            self._buffered_bytes.pause_producing()
+            return True
+        return False
+
     def _log_message(self, message: str, level: LogLevel) -> None:
         if self._log_handler is not None:
             self._log_handler(message, level)
 
+    async def _flush_rows(self) -> None:
+        """
+        **INTERNAL**
+
+        Hands off any rows that have not yet been made available to the consumer as a single ROWS result.  If a row
+        handler is set, the rows are handed directly to the row handler instead.
+        """
+        if not self._row_batch:
+            return
+        rows = self._row_batch
+        self._row_batch = []
+        if self._row_handler is not None:
+            self._rows_consumed += len(rows)
+            await self._row_handler(rows)
+            return
+        if self._buffered_bytes is not None:
+            self._buffered_bytes.add_batch()
+        await self._send_stream.send(ParsedResult(rows, ParsedResultType.ROWS))
+
     async def _send_to_stream(self, result: ParsedResult, close: Optional[bool] = False) -> None:
         """
         **INTERNAL**
         """
+        # pending rows always precede the final result (or an error)
+        await self._flush_rows()
         await self._send_stream.send(result)
         if close is True:
             await self._send_stream.aclose()
 
-    async def _handle_json_result(self, row: bytes) -> None:
+    async def _handle_json_result(self, row: Any) -> None:
         """
         **INTERNAL**
         """
-        if not self._has_results_or_errors_evt.is_set():
+        self._row_batch.append(row)
+        self._rows_produced += 1
+        if self._buffered_bytes is not None:
+            self._buffered_bytes.add_row(row)
+        if self._row_handler is None and not self._has_results_or_errors_evt.is_set():
+            # the consumer is waiting on the first row, don't make it wait for the rest of the batch
+            await self._flush_rows()
             self._handle_notification(ParsedResultType.ROW)
-        await self._send_to_stream(ParsedResult(row, ParsedResultType.ROW))
+        elif len(self._row_batch) >= self._row_batch_size:
+            await self._flush_rows()
 
     def _handle_notification(self, result_type: Optional[ParsedResultType] = None) -> None:
         if self._has_results_or_errors_evt.is_set():
@@ -126,18 +244,121 @@ class AsyncJsonStream:
         self._results_or_errors_type = result_type
         self._has_results_or_errors_evt.set()
 
-    async def _process_token_stream(self) -> None:
+    def _log_parser_backend(self) -> None:
+        if self._split_raw_rows:
+            self._log_message('Splitting raw JSON rows; JSON parser backend not used', LogLevel.DEBUG)
+        else:
+            self._log_message(f'Using JSON parser backend: {self._parser_backend.value}', LogLevel.DEBUG)
+
+    async def _process_raw_stream(self) -> None:
+        """
+        **INTERNAL**
+        """
+        if self._json_row_splitter is None:
+            self._json_row_splitter = JsonRowSplitter(emit_results_enabled=not self._buffer_entire_result)
+
+        try:
+            while self._continue_processing():
+                # don't hold on to rows while waiting on the network
+                await self._flush_rows()
+                try:
+                    chunk = await self._http_stream_iter.__anext__()
+                except StopAsyncIteration:
+                    self._http_stream_exhausted = True
+                    self._token_stream_exhausted = True
+                    break
+                for row in self._json_row_splitter.feed(chunk):
+                    await self._handle_json_result(bytes(row))
+
+            if self._token_stream_exhausted:
+                final_result = self._json_row_splitter.finish()
+        except JsonTokenParsingError as ex:
+            ex_str = str(ex)
+            self._log_message(f'JSON row splitting error encountered: {ex_str}', LogLevel.ERROR)
+            self._token_stream_exhausted = True
+            await self._send_to_stream(ParsedResult(ex_str.encode('utf-8'), ParsedResultType.ERROR), close=True)
+            self._handle_notification(ParsedResultType.ERROR)
+            return
+
+        if self._token_stream_exhausted:
+            result_type = ParsedResultType.ERROR if self._json_row_splitter.has_errors else ParsedResultType.END
+            await self._send_to_stream(ParsedResult(final_result, result_type), close=True)
+            self._handle_notification(result_type)
+
+    async def _process_whole_buffer(self) -> None:
+        """
+        **INTERNAL**
+        """
+        if self._whole_buffer_parser is None:
+            self._whole_buffer_parser = WholeBufferJsonParser(emit_results_enabled=not self._buffer_entire_result)
+
+        while self._continue_processing():
+            try:
+                self._http_response_chunks.append(await self._http_stream_iter.__anext__())
+            except StopAsyncIteration:
+                self._http_stream_exhausted = True
+                break
+
+        if not self._http_stream_exhausted:
+            return
+
+        self._token_stream_exhausted = True
+        try:
+            rows, final_result, has_errors = self._whole_buffer_parser.parse(b''.join(self._http_response_chunks))
+        except JsonTokenParsingError as ex:
+            ex_str = str(ex)
+            self._log_message(f'JSON parsing error encountered: {ex_str}', LogLevel.ERROR)
+            await self._send_to_stream(ParsedResult(ex_str.encode('utf-8'), ParsedResultType.ERROR), close=True)
+            self._handle_notification(ParsedResultType.ERROR)
+            return
+        finally:
+            self._http_response_chunks.clear()
+
+        for row in rows:
+            await self._handle_json_result(bytes(row))
+        result_type = ParsedResultType.ERROR if has_errors else ParsedResultType.END
+        await self._send_to_stream(ParsedResult(final_result, result_type), close=True)
+        self._handle_notification(result_type)
+
+    async def _process_stream(self) -> None:
+        """
+        **INTERNAL**
+        """
+        if self._buffered_bytes is not None:
+            self._buffered_bytes.start_producing()
+        if self._split_raw_rows:
+            await self._process_raw_stream()
+        elif self._parser_backend is JsonParserBackend.SIMDJSON:
+            await self._process_whole_buffer()
+        else:
+            await self._process_token_stream()
+        # the stage is complete, make sure the consumer has all the rows
+        await self._flush_rows()
+
+    async def _process_token_stream(self) -> None:  # noqa: C901
         """
         **INTERNAL**
         """
         if self._json_stream_parser is None:
-            self._json_stream_parser = ijson.parse_async(self, buf_size=self._http_stream_buffer_size)
+            ijson_backend = get_ijson_backend(self._parser_backend)
+            if self._decode_rows:
+                self._json_stream_parser = ijson_backend.parse_coro(self._parser_events, use_float=self._use_float)
+            else:
+                self._json_stream_parser = ijson_backend.parse_coro(self._parser_events)
 
         while self._continue_processing():
             try:
-                _, event, value = await self._json_stream_parser.__anext__()  # type: ignore[attr-defined]
-                # this is a hack b/c the ijson.parse_async iterator does not yield to the event loop
-                # TODO(PYCO-74):  create PYCO to either build custom JSON parsing, or dig into ijson root cause
+                if self._parser_event_index >= len(self._parser_events):
+                    if not await self._feed_parser():
+                        self._token_stream_exhausted = True
+                    continue
+                prefix, event, value = self._parser_events[self._parser_event_index]
+                self._parser_event_index += 1
+                if self._json_row_decoder is not None:
+                    if self._json_row_decoder.parse_event(prefix, event, value):
+                        await self._handle_json_result(self._json_row_decoder.pop_row())
+                    continue
+                # the token parser is async so that emitted rows can be sent to the stream
                 await self._json_token_parser.parse_token(event, value)
             except StopAsyncIteration:
                 self._token_stream_exhausted = True
@@ -171,47 +392,150 @@ class AsyncJsonStream:
                 return
 
         if self._token_stream_exhausted:
-            result_type = ParsedResultType.ERROR if self._json_token_parser.has_errors else ParsedResultType.END
-            await self._send_to_stream(ParsedResult(self._json_token_parser.get_result(), result_type), close=True)
+            final_result: Optional[bytes]
+            if self._json_row_decoder is not None:
+                has_errors = self._json_row_decoder.has_errors
+                final_result = self._json_row_decoder.get_result()
+            else:
+                has_errors = self._json_token_parser.has_errors
+                final_result = self._json_token_parser.get_result()
+            result_type = ParsedResultType.ERROR if has_errors else ParsedResultType.END
+            await self._send_to_stream(ParsedResult(final_result, result_type), close=True)
             self._handle_notification(result_type)
 
-    async def read(self, size: Optional[int] = -1) -> bytes:
+    async def _feed_parser(self) -> bool:
         """
         **INTERNAL**
+
+        Sends the next chunk of the HTTP response to the parser, the parser's events are then available in
+        ``_parser_events``.  Once the HTTP response has been exhausted, the parser is closed which validates the JSON
+        content is complete.
+
+        Returns:
+            False if the parser has already been sent the entire HTTP response, True otherwise.
         """
-        if size is None or size == 0 or self._http_stream_exhausted:
-            return b''
+        del self._parser_events[:]
+        self._parser_event_index = 0
+        if self._http_stream_exhausted or self._json_stream_parser is None:
+            return False
 
-        while not self._http_stream_exhausted:
-            if size >= 0 and len(self._http_response_buffer) > size:
-                break
-            try:
-                chunk = await self._http_stream_iter.__anext__()
-                self._http_response_buffer += chunk
-            except StopAsyncIteration:
-                self._http_stream_exhausted = True
-                break
+        # don't hold on to rows while waiting on the network
+        await self._flush_rows()
+        try:
+            chunk = await self._http_stream_iter.__anext__()
+        except StopAsyncIteration:
+            self._http_stream_exhausted = True
+            self._json_stream_parser.close()
+            return True
 
-        if size == -1:
-            data = bytes(self._http_response_buffer[:])
-            del self._http_response_buffer[:]
-        else:
-            end = min(size, len(self._http_response_buffer))
-            data = bytes(self._http_response_buffer[:end])
-            del self._http_response_buffer[:end]
-        return data
+        if self._buffered_bytes is not None:
+            # used to estimate the size of decoded rows
+            self._buffered_bytes.add_http_bytes(len(chunk))
+        # an empty chunk would signal the end of the JSON content to the parser
+        if chunk:
+            self._json_stream_parser.send(chunk)
+        return True
 
-    async def get_result(self) -> ParsedResult:
+    async def _receive(self) -> ParsedResult:
         try:
-            return await self._receive_stream.receive()
+            if self._buffered_bytes is not None and self._receive_stream.statistics().current_buffer_used == 0:
+                # the consumer has caught up w/ the producer, see BufferedBytes for details on how this is used
+                wait_start = time.monotonic()
+                result = await self._receive_stream.receive()
+                self._buffered_bytes.add_consumer_wait_time(time.monotonic() - wait_start)
+            else:
+                result = await self._receive_stream.receive()
         except EndOfStream as ex:
             raise AnalyticsError(ex, 'AsyncJsonStream has been closed.') from None
+        if self._buffered_bytes is not None and result.result_type == ParsedResultType.ROWS:
+            self._buffered_bytes.receive_batch(len(result.value))
+        return result
+
+    def _consume_rows(self, row_count: int) -> None:
+        """
+        **INTERNAL**
+        """
+        self._rows_consumed += row_count
+        if self._buffered_bytes is not None:
+            self._buffered_bytes.consume_rows(row_count)
+
+    async def drain_http_stream(self, max_bytes: int, timeout: float) -> bool:
+        """
+        **INTERNAL**
+
+        Reads and discards the remainder of the HTTP response w/o parsing it, so the connection can be reused.  Must
+        not be called while the stream is being processed.
+
+        Returns:
+            True if the HTTP response has been exhausted, False if the limits were exceeded.
+        """
+        if self._http_stream_exhausted:
+            return True
+        drained_bytes = 0
+        with move_on_after(timeout):
+            async for chunk in self._http_stream_iter:
+                drained_bytes += len(chunk)
+                if drained_bytes > max_bytes:
+                    return False
+            self._http_stream_exhausted = True
+        return self._http_stream_exhausted
+
+    async def get_result(self) -> ParsedResult:
+        """
+        **INTERNAL**
+
+        Returns the next result, rows are returned individually as ROW results.
+        """
+        if not self._received_rows:
+            result = await self._receive()
+            if result.result_type != ParsedResultType.ROWS:
+                return result
+            self._received_rows.extend(result.value)
+        self._consume_rows(1)
+        return ParsedResult(self._received_rows.popleft(), ParsedResultType.ROW)
+
+    async def get_results(self, max_rows: Optional[int] = None) -> ParsedResult:
+        """
+        **INTERNAL**
+
+        Returns the next result, rows are returned as a ROWS result containing a list of (at most ``max_rows``) rows.
+        """
+        if not self._received_rows:
+            result = await self._receive()
+            if result.result_type != ParsedResultType.ROWS:
+                return result
+            if max_rows is None or len(result.value) <= max_rows:
+                self._consume_rows(len(result.value))
+                return result
+            self._received_rows.extend(result.value)
+
+        if max_rows is None or len(self._received_rows) <= max_rows:
+            rows = list(self._received_rows)
+            self._received_rows.clear()
+        else:
+            rows = [self._received_rows.popleft() for _ in range(max_rows)]
+        self._consume_rows(len(rows))
+        return ParsedResult(rows, ParsedResultType.ROWS)
 
     async def start_parsing(self) -> None:
-        if self._json_stream_parser is not None:
+        if (
+            self._json_stream_parser is not None
+            or self._json_row_splitter is not None
+            or self._whole_buffer_parser is not None
+        ):
             self._log_message('JSON stream parser already exists', LogLevel.WARNING)
             return
-        await self._process_token_stream()
+        self._log_parser_backend()
+        await self._process_stream()
 
     async def continue_parsing(self) -> None:
-        await self._process_token_stream()
+        await self._process_stream()
+
+    def stop_parsing(self) -> None:
+        """
+        **INTERNAL**
+
+        Stops the current (and any subsequent) stage once the chunk of the HTTP response it is processing has been
+        parsed.  Unlike cancelling the request, the HTTP response is not interrupted mid-read, so it can be drained.
+        """
+        self._stop_requested = True
@@ -147,13 +147,18 @@ class _AsyncClientAdapter:
                 self._client = AsyncClient(
                     verify=self._conn_details.ssl_context,
                     auth=BasicAuth(*self._conn_details.credential),
+                    headers=self._conn_details.get_http_headers(),
                     transport=transport,
                 )
             else:
                 transport = None
                 if self._http_transport_cls is not None:
                     transport = self._http_transport_cls()
-                self._client = AsyncClient(auth=BasicAuth(*self._conn_details.credential), transport=transport)
+                self._client = AsyncClient(
+                    auth=BasicAuth(*self._conn_details.credential),
+                    headers=self._conn_details.get_http_headers(),
+                    transport=transport,
+                )
             self.log_message(
                 (f'Cluster HTTP client created: connection_details={self._conn_details.get_init_details()}'),
                 LogLevel.INFO,
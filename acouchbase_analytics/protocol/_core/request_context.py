@@ -19,8 +19,22 @@ from __future__ import annotations
 import json
 import math
 from asyncio import CancelledError, Task
+from dataclasses import replace
 from types import TracebackType
-from typing import TYPE_CHECKING, Any, Awaitable, Callable, Coroutine, Dict, List, Optional, Type, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 from uuid import uuid4
 
 import anyio
@@ -32,10 +46,18 @@ from acouchbase_analytics.protocol._core.async_json_stream import AsyncJsonStrea
 from acouchbase_analytics.protocol._core.net_utils import get_request_ip_async
 from couchbase_analytics.common._core import JsonStreamConfig, ParsedResult, ParsedResultType
 from couchbase_analytics.common._core.error_context import ErrorContext
+from couchbase_analytics.common._core.json_parsing import decode_if_complete
+from couchbase_analytics.common._core.json_row_splitter import split_rows
+from couchbase_analytics.common._core.json_token_parser_base import JsonTokenParsingError
+from couchbase_analytics.common._core.row_formatter import RowFormatter
+from couchbase_analytics.common._core.row_store import RowDecoder
 from couchbase_analytics.common.backoff_calculator import DefaultBackoffCalculator
-from couchbase_analytics.common.errors import AnalyticsError
+from couchbase_analytics.common.deserializer import DefaultJsonDeserializer
+from couchbase_analytics.common.enums import RowFormat
+from couchbase_analytics.common.errors import AnalyticsError, TimeoutError
 from couchbase_analytics.common.logging import LogLevel
 from couchbase_analytics.common.request import RequestState
+from couchbase_analytics.common.row import RowSchema
 from couchbase_analytics.protocol.connection import DEFAULT_TIMEOUTS
 from couchbase_analytics.protocol.errors import ErrorMapper
 
@@ -44,6 +66,12 @@ if TYPE_CHECKING:
     from couchbase_analytics.protocol._core.request import QueryRequest
 
 
+async def _prepend_chunk(chunk: bytes, stream_iter: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    yield chunk
+    async for next_chunk in stream_iter:
+        yield next_chunk
+
+
 class AsyncRequestContext:
     def __init__(
         self,
@@ -51,6 +79,7 @@ class AsyncRequestContext:
         request: QueryRequest,
         stream_config: Optional[JsonStreamConfig] = None,
         backend: Optional[AsyncBackend] = None,
+        row_format: Optional[str] = None,
     ) -> None:
         self._id = str(uuid4())
         self._client_adapter = client_adapter
@@ -60,7 +89,16 @@ class AsyncRequestContext:
         self._error_ctx = ErrorContext(num_attempts=0, method=request.method, statement=request.get_request_statement())
         self._request_state = RequestState.NotStarted
         self._stream_config = stream_config or JsonStreamConfig()
+        if self._stream_config.decode_rows and type(request.deserializer) is not DefaultJsonDeserializer:
+            # decoded rows would bypass the request's deserializer, so only decode rows w/ the default deserializer
+            self._stream_config = replace(self._stream_config, decode_rows=False)
+        self._row_formatter = RowFormatter(RowFormat(row_format)) if row_format is not None else None
         self._json_stream: AsyncJsonStream
+        # set if the first HTTP chunk was read prior to starting the JSON stream
+        self._http_stream_iter: Optional[AsyncIterator[bytes]] = None
+        # the HTTP response (of the latest attempt) and the number of its decoded body bytes read so far
+        self._http_response: Optional[HttpCoreResponse] = None
+        self._http_bytes_decoded = 0
         self._stage_completed: Optional[anyio.Event] = None
         self._request_error: Optional[Union[BaseException, Exception]] = None
         connect_timeout = self._client_adapter.connection_details.get_connect_timeout()
@@ -82,6 +120,38 @@ class AsyncRequestContext:
     def has_stage_completed(self) -> bool:
         return self._stage_completed is not None and self._stage_completed.is_set()
 
+    @property
+    def http_bytes_decoded(self) -> Optional[int]:
+        """
+        **INTERNAL**
+
+        The number of bytes of the HTTP response body read so far, after the content encoding has been decoded.
+        """
+        if self._http_response is None:
+            return None
+        return self._http_bytes_decoded
+
+    @property
+    def http_bytes_received(self) -> Optional[int]:
+        """
+        **INTERNAL**
+
+        The number of bytes of the HTTP response body received so far, prior to decoding the content encoding.
+        """
+        if self._http_response is None:
+            return None
+        return self._http_response.num_bytes_downloaded
+
+    @property
+    def http_stream_exhausted(self) -> bool:
+        """
+        **INTERNAL**
+
+        True once the entire HTTP response has been received, i.e. only results buffered by the JSON stream remain.
+        """
+        json_stream: Optional[AsyncJsonStream] = getattr(self, '_json_stream', None)
+        return json_stream is not None and json_stream.http_stream_exhausted
+
     @property
     def is_shutdown(self) -> bool:
         return self._shutdown
@@ -100,6 +170,14 @@ class AsyncRequestContext:
     def request_error(self) -> Optional[Union[BaseException, Exception]]:
         return self._request_error
 
+    @property
+    def row_batch_size(self) -> int:
+        return max(1, self._stream_config.row_batch_size)
+
+    @property
+    def row_schema(self) -> Optional[RowSchema]:
+        return self._row_formatter.schema if self._row_formatter is not None else None
+
     @property
     def request_state(self) -> RequestState:
         return self._request_state
@@ -134,6 +212,11 @@ class AsyncRequestContext:
             else:
                 self._request_state = RequestState.Timeout
 
+    async def _count_decoded_bytes(self, http_stream_iter: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        async for chunk in http_stream_iter:
+            self._http_bytes_decoded += len(chunk)
+            yield chunk
+
     async def _execute(self, fn: Callable[..., Awaitable[Any]], *args: object) -> None:
         await fn(*args)
         if self._stage_completed is not None:
@@ -250,8 +333,77 @@ class AsyncRequestContext:
         self._response_task = task
         return task
 
-    def deserialize_result(self, result: bytes) -> Any:
-        return self._request.deserializer.deserialize(result)
+    def create_row_decoder(self) -> RowDecoder:
+        """
+        **INTERNAL**
+
+        Returns a decoder that deserializes (and formats) raw rows the same way as the rows of this request.
+        """
+        return RowDecoder(self._request.deserializer, self._row_formatter)
+
+    def deserialize_buffered_rows(self, rows: List[Any]) -> List[Any]:
+        """
+        **INTERNAL**
+
+        Deserializes (and formats) rows returned by :meth:`process_entire_response`.  The rows are raw rows, unless the
+        request uses the default deserializer, in which case the entire response has already been decoded.
+        """
+        if type(self._request.deserializer) is DefaultJsonDeserializer:
+            return self._format_rows(rows)
+        return self._format_rows(self._deserialize_many(rows))
+
+    def deserialize_results(self, results: List[Any]) -> List[Any]:
+        if self._json_stream.decode_rows:
+            # the JSON stream has already decoded the rows, no need for the (default) deserializer
+            return self._format_rows(results)
+        return self._format_rows(self._deserialize_many(results))
+
+    def _format_rows(self, rows: List[Any]) -> List[Any]:
+        if self._row_formatter is None:
+            return rows
+        return self._row_formatter.format_rows(rows)
+
+    def _deserialize_many(self, results: List[bytes]) -> List[Any]:
+        deserializer = self._request.deserializer
+        if len(results) == 1:
+            return [deserializer.deserialize(results[0])]
+        # custom deserializers are not required to subclass Deserializer, so deserialize_many() might not exist
+        deserialize_many = getattr(deserializer, 'deserialize_many', None)
+        if deserialize_many is None:
+            return [deserializer.deserialize(result) for result in results]
+        rows: List[Any] = deserialize_many(results)
+        return rows
+
+    async def drain_http_stream(self) -> bool:
+        """
+        **INTERNAL**
+
+        Reads the remainder of the HTTP response (within the stream config's drain_on_close limits), so that the
+        connection can be reused once the HTTP response is closed.  The HTTP response is only drained if the JSON
+        stream is not being processed (i.e. the current stage has ended).
+
+        Returns:
+            True if the HTTP response has been exhausted, False otherwise.
+        """
+        json_stream: Optional[AsyncJsonStream] = getattr(self, '_json_stream', None)
+        if json_stream is None or not self.has_stage_completed:
+            return False
+        if json_stream.http_stream_exhausted:
+            return True
+        max_bytes = self._stream_config.drain_on_close_max_bytes
+        timeout = self._stream_config.drain_on_close_timeout
+        if max_bytes <= 0 or timeout <= 0:
+            return False
+        try:
+            drained = await json_stream.drain_http_stream(max_bytes, timeout)
+        except Exception as ex:
+            self.log_message(f'Unable to drain HTTP response: {ex!r}', LogLevel.DEBUG)
+            return False
+        if drained:
+            self.log_message('HTTP response drained, connection can be reused', LogLevel.DEBUG)
+        else:
+            self.log_message('HTTP response exceeded drain limits, closing connection', LogLevel.DEBUG)
+        return drained
 
     async def finish_processing_stream(self) -> None:
         if not self.has_stage_completed:
@@ -261,8 +413,8 @@ class AsyncRequestContext:
             self._start_next_stage(self._json_stream.continue_parsing, reset_previous_stage=True)
             await self._wait_for_stage_to_complete()
 
-    async def get_result_from_stream(self) -> ParsedResult:
-        return await self._json_stream.get_result()
+    async def get_results_from_stream(self, max_rows: Optional[int] = None) -> ParsedResult:
+        return await self._json_stream.get_results(max_rows=max_rows)
 
     async def initialize(self) -> None:
         if self._request_state == RequestState.ResetAndNotStarted:
@@ -367,6 +519,94 @@ class AsyncRequestContext:
                 await self._process_error(json_response['errors'], handle_context_shutdown=handle_context_shutdown)
             return json_response
 
+    async def process_entire_response(
+        self,
+        close_handler: Callable[[], Coroutine[Any, Any, None]],
+        body: bytes,
+        json_response: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[Any], Any]:
+        """
+        **INTERNAL**
+
+        Decodes an entire response at once, rather than streaming it via the JSON stream.
+
+        Args:
+            close_handler: Closes the core response.
+            body: The entire response.
+            json_response: The already decoded response, if available.
+
+        Returns:
+            A tuple of the (not yet deserialized) rows and the JSON response (w/o the rows), see
+            :meth:`deserialize_buffered_rows`.
+        """
+        self._http_bytes_decoded += len(body)
+        raw_response = ParsedResult(body, ParsedResultType.END)
+        if type(self._request.deserializer) is DefaultJsonDeserializer:
+            if json_response is None:
+                # the default deserializer is json.loads(), so decode the entire response in a single call
+                json_response = await self.process_response(close_handler, raw_response=raw_response)
+            else:
+                await close_handler()
+                if 'errors' in json_response:
+                    await self._process_error(json_response['errors'])
+            rows = json_response.pop('results', None) if isinstance(json_response, dict) else None
+            return rows or [], json_response
+
+        try:
+            raw_rows, remaining = split_rows(body)
+        except JsonTokenParsingError:
+            # not a valid JSON response, let process_response() determine the appropriate error
+            return [], await self.process_response(close_handler, raw_response=raw_response)
+
+        json_response = await self.process_response(
+            close_handler, raw_response=ParsedResult(remaining, ParsedResultType.END)
+        )
+        return [bytes(row) for row in raw_rows], json_response
+
+    async def read_small_response(
+        self, core_response: HttpCoreResponse
+    ) -> Optional[Tuple[bytes, Optional[Dict[str, Any]]]]:
+        """
+        **INTERNAL**
+
+        Determines if the response is small enough to be decoded at once, either from the Content-Length header (if the
+        response is not compressed) or because the entire response was received within the first HTTP chunk.
+
+        Returns:
+            A tuple of the entire response and (if already decoded) the JSON response, or None if the response should
+            be processed via the JSON stream.  In the latter case, any chunk that has been read is provided to the JSON
+            stream once started.
+        """
+        self._http_stream_iter = None
+        max_bytes = self._stream_config.small_response_max_bytes
+        if max_bytes <= 0:
+            return None
+
+        content_length = core_response.headers.get('content-length')
+        # w/ a Content-Encoding, the Content-Length is the compressed size which does not bound the decoded size
+        content_encoding = core_response.headers.get('content-encoding', 'identity').strip().lower()
+        if content_length is not None and content_length.isdigit() and content_encoding == 'identity':
+            if int(content_length) > max_bytes:
+                return None
+            return await core_response.aread(), None
+
+        stream_iter = core_response.aiter_bytes()
+        try:
+            first_chunk = await stream_iter.__anext__()
+        except StopAsyncIteration:
+            first_chunk = b''
+        json_response = decode_if_complete(first_chunk) if len(first_chunk) <= max_bytes else None
+        if json_response is None:
+            self._http_stream_iter = _prepend_chunk(first_chunk, stream_iter)
+            return None
+
+        # the server has sent the entire response, so this does not wait on the server
+        remaining = b''.join([chunk async for chunk in stream_iter])
+        if remaining.strip(b' \t\n\r'):
+            # let the response processing determine the appropriate error
+            return first_chunk + remaining, None
+        return first_chunk, json_response
+
     async def reraise_after_shutdown(self, err: Exception) -> None:
         try:
             raise err
@@ -393,6 +633,8 @@ class AsyncRequestContext:
         }
         self.log_message('HTTP request', LogLevel.DEBUG, message_data=message_data)
         response = await self._client_adapter.send_request(self._request)
+        self._http_response = response
+        self._http_bytes_decoded = 0
         self._error_ctx.update_response_context(response)
         message_data = {
             'status_code': f'{response.status_code}',
@@ -420,6 +662,13 @@ class AsyncRequestContext:
         if RequestState.is_okay(self._request_state):
             self._request_state = RequestState.Completed
         self._shutdown = True
+        if self._http_response is not None:
+            message_data = {
+                'content_encoding': f'{self._http_response.headers.get("content-encoding", "identity")}',
+                'http_bytes_received': f'{self.http_bytes_received}',
+                'http_bytes_decoded': f'{self.http_bytes_decoded}',
+            }
+            self.log_message('HTTP response bytes', LogLevel.DEBUG, message_data=message_data)
         self.log_message('Request context shutdown complete', LogLevel.INFO)
 
     def start_stream(self, core_response: HttpCoreResponse) -> None:
@@ -427,13 +676,72 @@ class AsyncRequestContext:
             self.log_message('JSON stream already exists', LogLevel.WARNING)
             return
 
+        http_stream_iter = self._count_decoded_bytes(self._http_stream_iter or core_response.aiter_bytes())
+        self._http_stream_iter = None
         self._json_stream = AsyncJsonStream(
-            core_response.aiter_bytes(), stream_config=self._stream_config, logger_handler=self.log_message
+            http_stream_iter, stream_config=self._stream_config, logger_handler=self.log_message
         )
         self._start_next_stage(self._json_stream.start_parsing)
 
-    async def wait_for_results_or_errors(self) -> None:
-        await self._json_stream.has_results_or_errors.wait()
+    async def stop_processing_stream(self) -> None:
+        """
+        **INTERNAL**
+
+        Stops the JSON stream once the remaining results are no longer needed.  If the HTTP response can be drained,
+        waits (at most the stream config's drain_on_close_timeout) for the current stage to end, so that the stage is
+        not cancelled mid-read.
+        """
+        json_stream: Optional[AsyncJsonStream] = getattr(self, '_json_stream', None)
+        if json_stream is None or self._stage_completed is None:
+            return
+        json_stream.stop_parsing()
+        if self._stream_config.drain_on_close_max_bytes <= 0:
+            return
+        with anyio.move_on_after(self._stream_config.drain_on_close_timeout):
+            await self._stage_completed.wait()
+
+    async def stream_to_row_handler(
+        self, core_response: HttpCoreResponse, row_handler: Callable[[List[Any]], Awaitable[None]]
+    ) -> ParsedResult:
+        """
+        **INTERNAL**
+
+        Processes the entire stream in the calling task.  Rather than being handed off to a consumer, each batch of
+        rows is handed directly to the row handler as it is parsed.
+
+        Returns:
+            The final result (i.e. END or ERROR) of the JSON stream.
+        """
+        if hasattr(self, '_json_stream'):
+            raise RuntimeError('JSON stream already exists.')
+
+        http_stream_iter = self._count_decoded_bytes(self._http_stream_iter or core_response.aiter_bytes())
+        self._http_stream_iter = None
+        self._json_stream = AsyncJsonStream(
+            http_stream_iter,
+            stream_config=self._stream_config,
+            logger_handler=self.log_message,
+            row_handler=row_handler,
+        )
+        self._request_state = RequestState.StreamingResults
+        await self._json_stream.start_parsing()
+        while not self._json_stream.token_stream_exhausted:
+            await self._json_stream.continue_parsing()
+        # the rows have all been handed to the row handler, only the final result remains
+        return await self._json_stream.get_results()
+
+    async def wait_for_results_or_errors(self, apply_deadline: Optional[bool] = False) -> None:
+        if apply_deadline is True:
+            # the caller is not within the request's cancel scope (see QueryOptions.return_on_headers), so the request's
+            # deadline is applied here
+            with anyio.move_on_after(max(self._request_deadline - get_time(), 0)):
+                await self._json_stream.has_results_or_errors.wait()
+            if not self._json_stream.has_results_or_errors.is_set():
+                self._check_timed_out()
+                err = TimeoutError(message='Request timed out waiting for results.', context=str(self._error_ctx))
+                await self.reraise_after_shutdown(err)
+        else:
+            await self._json_stream.has_results_or_errors.wait()
         if self._json_stream.results_or_errors_type == ParsedResultType.ROW:
             # we move to iterating rows
             self._request_state = RequestState.StreamingResults
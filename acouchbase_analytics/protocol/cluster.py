@@ -17,7 +17,7 @@
 from __future__ import annotations
 
 import sys
-from typing import TYPE_CHECKING, Awaitable, Optional
+from typing import TYPE_CHECKING, Awaitable, Optional, Union
 from uuid import uuid4
 
 if sys.version_info < (3, 10):
@@ -29,7 +29,9 @@ from acouchbase_analytics.protocol._core.anyio_utils import current_async_librar
 from acouchbase_analytics.protocol._core.client_adapter import _AsyncClientAdapter
 from acouchbase_analytics.protocol._core.request_context import AsyncRequestContext
 from acouchbase_analytics.protocol.streaming import AsyncHttpStreamingResponse
+from couchbase_analytics.common._core.row_handler import BatchHandler, pop_row_handlers
 from couchbase_analytics.common.logging import LogLevel
+from couchbase_analytics.common.query import QueryMetadata
 from couchbase_analytics.common.result import AsyncQueryResult
 from couchbase_analytics.protocol._core.request import _RequestBuilder
 
@@ -105,13 +107,39 @@ class AsyncCluster:
         await http_resp.send_request()
         return AsyncQueryResult(http_resp)
 
-    def execute_query(self, statement: str, *args: object, **kwargs: object) -> Awaitable[AsyncQueryResult]:
+    async def _execute_query_to_row_handler(
+        self, http_resp: AsyncHttpStreamingResponse, row_handler: BatchHandler
+    ) -> QueryMetadata:
+        if not self.has_client:
+            self.client_adapter.log_message(
+                'Cluster does not have a connection.  Creating the client.', LogLevel.WARNING
+            )
+            await self._create_client()
+        return await http_resp.send_request_to_row_handler(row_handler)
+
+    def execute_query(
+        self, statement: str, *args: object, **kwargs: object
+    ) -> Awaitable[Union[AsyncQueryResult, QueryMetadata]]:
+        row_handler = pop_row_handlers(kwargs)
         base_req = self._request_builder.build_base_query_request(statement, *args, is_async=True, **kwargs)
         stream_config = base_req.options.pop('stream_config', None)
+        row_format = base_req.options.pop('row_format', None)
+        buffer_entire_response = base_req.options.pop('buffer_entire_response', None)
+        return_on_headers = base_req.options.pop('return_on_headers', None)
         request_context = AsyncRequestContext(
-            client_adapter=self.client_adapter, request=base_req, stream_config=stream_config, backend=self._backend
+            client_adapter=self.client_adapter,
+            request=base_req,
+            stream_config=stream_config,
+            backend=self._backend,
+            row_format=row_format,
+        )
+        resp = AsyncHttpStreamingResponse(
+            request_context, buffer_entire_response=buffer_entire_response, return_on_headers=return_on_headers
         )
-        resp = AsyncHttpStreamingResponse(request_context)
+        if row_handler is not None:
+            if self._backend.backend_lib == 'asyncio':
+                return request_context.create_response_task(self._execute_query_to_row_handler, resp, row_handler)
+            return self._execute_query_to_row_handler(resp, row_handler)
         if self._backend.backend_lib == 'asyncio':
             return request_context.create_response_task(self._execute_query, resp)
         return self._execute_query(resp)
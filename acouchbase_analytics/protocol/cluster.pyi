@@ -14,7 +14,7 @@
 #  limitations under the License.
 
 import sys
-from typing import Awaitable, overload
+from typing import Any, Awaitable, Callable, List, overload
 
 if sys.version_info < (3, 11):
     from typing_extensions import Unpack
@@ -26,6 +26,7 @@ from acouchbase_analytics.protocol.database import AsyncDatabase
 from couchbase_analytics.common.credential import Credential
 from couchbase_analytics.common.result import AsyncQueryResult
 from couchbase_analytics.options import ClusterOptions, ClusterOptionsKwargs, QueryOptions, QueryOptionsKwargs
+from couchbase_analytics.query import QueryMetadata
 
 class AsyncCluster:
     @overload
@@ -65,6 +66,36 @@ class AsyncCluster:
     @overload
     def execute_query(self, statement: str, *args: str, **kwargs: str) -> Awaitable[AsyncQueryResult]: ...
     @overload
+    def execute_query(
+        self, statement: str, *args: str, row_handler: Callable[[Any], Any], **kwargs: Unpack[QueryOptionsKwargs]
+    ) -> Awaitable[QueryMetadata]: ...
+    @overload
+    def execute_query(
+        self,
+        statement: str,
+        options: QueryOptions,
+        *args: str,
+        row_handler: Callable[[Any], Any],
+        **kwargs: Unpack[QueryOptionsKwargs],
+    ) -> Awaitable[QueryMetadata]: ...
+    @overload
+    def execute_query(
+        self,
+        statement: str,
+        *args: str,
+        batch_handler: Callable[[List[Any]], Any],
+        **kwargs: Unpack[QueryOptionsKwargs],
+    ) -> Awaitable[QueryMetadata]: ...
+    @overload
+    def execute_query(
+        self,
+        statement: str,
+        options: QueryOptions,
+        *args: str,
+        batch_handler: Callable[[List[Any]], Any],
+        **kwargs: Unpack[QueryOptionsKwargs],
+    ) -> Awaitable[QueryMetadata]: ...
+    @overload
     @classmethod
     def create_instance(cls, endpoint: str, credential: Credential) -> AsyncCluster: ...
     @overload
@@ -14,7 +14,7 @@
 #  limitations under the License.
 
 import sys
-from typing import Awaitable, overload
+from typing import Any, Awaitable, Callable, List, overload
 
 if sys.version_info < (3, 11):
     from typing_extensions import Unpack
@@ -24,6 +24,7 @@ else:
 from acouchbase_analytics.protocol._core.client_adapter import _AsyncClientAdapter
 from acouchbase_analytics.protocol.database import AsyncDatabase as AsyncDatabase
 from couchbase_analytics.options import QueryOptions, QueryOptionsKwargs
+from couchbase_analytics.query import QueryMetadata
 from couchbase_analytics.result import AsyncQueryResult
 
 class AsyncScope:
@@ -52,3 +53,33 @@ class AsyncScope:
     ) -> Awaitable[AsyncQueryResult]: ...
     @overload
     def execute_query(self, statement: str, *args: str, **kwargs: str) -> Awaitable[AsyncQueryResult]: ...
+    @overload
+    def execute_query(
+        self, statement: str, *args: str, row_handler: Callable[[Any], Any], **kwargs: Unpack[QueryOptionsKwargs]
+    ) -> Awaitable[QueryMetadata]: ...
+    @overload
+    def execute_query(
+        self,
+        statement: str,
+        options: QueryOptions,
+        *args: str,
+        row_handler: Callable[[Any], Any],
+        **kwargs: Unpack[QueryOptionsKwargs],
+    ) -> Awaitable[QueryMetadata]: ...
+    @overload
+    def execute_query(
+        self,
+        statement: str,
+        *args: str,
+        batch_handler: Callable[[List[Any]], Any],
+        **kwargs: Unpack[QueryOptionsKwargs],
+    ) -> Awaitable[QueryMetadata]: ...
+    @overload
+    def execute_query(
+        self,
+        statement: str,
+        options: QueryOptions,
+        *args: str,
+        batch_handler: Callable[[List[Any]], Any],
+        **kwargs: Unpack[QueryOptionsKwargs],
+    ) -> Awaitable[QueryMetadata]: ...
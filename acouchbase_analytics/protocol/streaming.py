@@ -16,7 +16,9 @@
 
 from __future__ import annotations
 
-from typing import Any, Optional
+import json
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
 
 from httpx import Response as HttpCoreResponse
 
@@ -24,18 +26,73 @@ from acouchbase_analytics.protocol._core.request_context import AsyncRequestCont
 from acouchbase_analytics.protocol._core.retries import AsyncRetryHandler
 from couchbase_analytics.common._core import ParsedResult, ParsedResultType
 from couchbase_analytics.common._core.query import build_query_metadata
+from couchbase_analytics.common._core.row_handler import handle_rows_async
+from couchbase_analytics.common._core.row_store import RowDecoder
 from couchbase_analytics.common.errors import AnalyticsError, InternalSDKError, TimeoutError
 from couchbase_analytics.common.logging import LogLevel
 from couchbase_analytics.common.query import QueryMetadata
+from couchbase_analytics.common.row import RowSchema
+from couchbase_analytics.protocol.errors import WrappedError
+
+
+def _pop_rows(rows: Deque[Any], max_rows: Optional[int] = None) -> List[Any]:
+    if max_rows is None or max_rows >= len(rows):
+        popped = list(rows)
+        rows.clear()
+        return popped
+    return [rows.popleft() for _ in range(max_rows)]
 
 
 class AsyncHttpStreamingResponse:
-    def __init__(self, request_context: AsyncRequestContext) -> None:
+    def __init__(
+        self,
+        request_context: AsyncRequestContext,
+        buffer_entire_response: Optional[bool] = None,
+        return_on_headers: Optional[bool] = None,
+    ) -> None:
+        self._buffer_entire_response = buffer_entire_response is True
+        self._return_on_headers = return_on_headers is True
+        # set when send_request() has returned w/o waiting on the first result, see _wait_for_first_result()
+        self._first_result_pending = False
+        # only set when the entire response has been buffered and decoded at once
+        self._buffered_rows: Optional[Deque[Any]] = None
+        # rows deserialized at once, but not yet returned from get_next_row()
+        self._decoded_rows: Deque[Any] = deque()
         self._metadata: Optional[QueryMetadata] = None
+        self._raw_metadata: Optional[bytes] = None
+        # only set when rows are handed to a row handler rather than returned via get_next_row()/get_next_rows()
+        self._row_handler: Optional[Callable[[List[Any]], Any]] = None
+        self._row_handler_error: Optional[BaseException] = None
+        self._rows_handled = False
         self._core_response: HttpCoreResponse
         # Goal is to treat the AsyncHttpStreamingResponse as a "task group"
         self._request_context = request_context
 
+    @property
+    def buffer_entire_response(self) -> bool:
+        """
+        **INTERNAL**
+        """
+        return self._buffer_entire_response
+
+    @property
+    def rows_buffered(self) -> bool:
+        """
+        **INTERNAL**
+
+        True if the entire response has been read at once, i.e. all rows are in memory.  The rows are deserialized as
+        they are returned, see :meth:`get_next_rows`.
+        """
+        return self._buffered_rows is not None
+
+    def _get_buffered_rows(self, max_rows: Optional[int] = None, raw: Optional[bool] = False) -> List[Any]:
+        if not self._buffered_rows:
+            raise StopAsyncIteration
+        rows = _pop_rows(self._buffered_rows, max_rows=max_rows)
+        if raw is True:
+            return rows
+        return self._request_context.deserialize_buffered_rows(rows)
+
     async def _close_in_background(self) -> None:
         """
         **INTERNAL**
@@ -62,6 +119,34 @@ class AsyncHttpStreamingResponse:
             await self._request_context.shutdown()
             raise StopAsyncIteration
 
+    async def _handle_rows(self, rows: List[Any]) -> None:
+        """
+        **INTERNAL**
+        """
+        if self._row_handler is None:
+            raise RuntimeError('Row handler not set for this response.')
+        if self._request_context.timed_out:
+            err = TimeoutError(
+                message='Request timed out while streaming rows to the handler.',
+                context=str(self._request_context.error_context),
+            )
+            await self._request_context.reraise_after_shutdown(err)
+        self._rows_handled = True
+        try:
+            await handle_rows_async(self._row_handler, self._request_context.deserialize_results(rows))
+        except BaseException as ex:
+            # raised as-is once the request has been cleaned up, see send_request_to_row_handler()
+            self._row_handler_error = ex
+            raise
+
+    async def _process_entire_response(self, body: bytes, json_response: Optional[Dict[str, Any]] = None) -> None:
+        """
+        **INTERNAL**
+        """
+        rows, json_response = await self._request_context.process_entire_response(self.close, body, json_response)
+        self._buffered_rows = deque(rows)
+        await self.set_metadata(json_data=json_response)
+
     async def _process_response(
         self, raw_response: Optional[ParsedResult] = None, handle_context_shutdown: Optional[bool] = False
     ) -> None:
@@ -94,10 +179,43 @@ class AsyncHttpStreamingResponse:
         **INTERNAL**
         """
         self._request_context.log_message('AsyncHttpStreamingResponse cancelling request', LogLevel.DEBUG)
+        # if possible, read the remainder of the response so that the connection can be reused
+        await self._request_context.drain_http_stream()
         await self.close()
         self._request_context.cancel_request()
         await self._request_context.shutdown()
 
+    async def stop_streaming(self) -> None:
+        """
+        **INTERNAL**
+
+        Stops streaming once the caller has all the rows it needs.  If the entire HTTP response has already been
+        received, the remaining (buffered) results are read w/o being deserialized so that the metadata is available
+        and the connection can be reused.  Otherwise the JSON stream is stopped, the remainder of the HTTP response is
+        drained (see :meth:`AsyncRequestContext.drain_http_stream`), the HTTP response is closed and the request
+        context is shutdown.
+        """
+        # rows deserialized via get_next_row() that have not been returned are not needed either
+        self._decoded_rows.clear()
+        if self._buffered_rows is not None or self._request_context.is_shutdown:
+            # the entire response has already been processed
+            return
+        if self._request_context.http_stream_exhausted:
+            try:
+                while True:
+                    await self.get_next_rows(raw=True)
+            except StopAsyncIteration:
+                return
+        self._request_context.log_message(
+            'AsyncHttpStreamingResponse stopping stream, remaining rows not needed', LogLevel.DEBUG
+        )
+        await self._request_context.stop_processing_stream()
+        await self._request_context.drain_http_stream()
+        # stop the JSON stream prior to closing the HTTP response it is reading from
+        self._request_context.cancel_request()
+        await self.close()
+        await self._request_context.shutdown()
+
     def get_metadata(self) -> QueryMetadata:
         """
         **INTERNAL**
@@ -106,12 +224,41 @@ class AsyncHttpStreamingResponse:
             raise RuntimeError('Query metadata is only available after all rows have been iterated.')
         return self._metadata
 
+    def get_raw_metadata(self) -> bytes:
+        """
+        **INTERNAL**
+
+        Returns the query metadata as the JSON object received from the server (i.e. the response w/o the rows).
+        """
+        if self._raw_metadata is None:
+            raise RuntimeError('Query metadata is only available after all rows have been iterated.')
+        return self._raw_metadata
+
+    def create_row_decoder(self) -> RowDecoder:
+        """
+        **INTERNAL**
+        """
+        return self._request_context.create_row_decoder()
+
+    def get_row_schema(self) -> Optional[RowSchema]:
+        """
+        **INTERNAL**
+        """
+        return self._request_context.row_schema
+
     async def set_metadata(self, json_data: Optional[Any] = None, raw_metadata: Optional[bytes] = None) -> None:
         """
         **INTERNAL**
         """
         try:
-            self._metadata = QueryMetadata(build_query_metadata(json_data=json_data, raw_metadata=raw_metadata))
+            metadata = build_query_metadata(json_data=json_data, raw_metadata=raw_metadata)
+            metadata['http_bytes_received'] = self._request_context.http_bytes_received
+            metadata['http_bytes_decoded'] = self._request_context.http_bytes_decoded
+            self._metadata = QueryMetadata(metadata)
+            if raw_metadata is not None:
+                self._raw_metadata = raw_metadata
+            else:
+                self._raw_metadata = json.dumps(json_data, separators=(',', ':')).encode('utf-8')
             await self._request_context.shutdown()
         except (AnalyticsError, ValueError) as err:
             await self._request_context.reraise_after_shutdown(err)
@@ -124,6 +271,43 @@ class AsyncHttpStreamingResponse:
     async def get_next_row(self) -> Any:
         """
         **INTERNAL**
+
+        Returns the next row.  All rows that are ready are deserialized at once and then returned one at a time.
+        """
+        if self._buffered_rows is not None:
+            if not self._decoded_rows:
+                self._decoded_rows.extend(self._get_buffered_rows(max_rows=self._request_context.row_batch_size))
+            return self._decoded_rows.popleft()
+
+        await self._wait_for_first_result()
+        await self._check_okay_to_iterate()
+        if not self._decoded_rows:
+            self._decoded_rows.extend(await self._get_next_rows_from_stream())
+        return self._decoded_rows.popleft()
+
+    async def get_next_rows(self, max_rows: Optional[int] = None, raw: Optional[bool] = False) -> List[Any]:
+        """
+        **INTERNAL**
+
+        Returns the next batch of rows (at most ``max_rows`` rows), as handed off by the JSON stream.  If ``raw`` is
+        enabled, rows are returned as received (i.e. w/o being deserialized or formatted), whether from the JSON stream
+        or from a response that was read at once.
+        """
+        if self._buffered_rows is not None:
+            if self._decoded_rows:
+                return _pop_rows(self._decoded_rows, max_rows=max_rows)
+            return self._get_buffered_rows(max_rows=max_rows, raw=raw)
+
+        await self._wait_for_first_result()
+        await self._check_okay_to_iterate()
+        if self._decoded_rows:
+            # rows deserialized via get_next_row() that have not been returned yet
+            return _pop_rows(self._decoded_rows, max_rows=max_rows)
+        return await self._get_next_rows_from_stream(max_rows=max_rows, raw=raw)
+
+    async def _check_okay_to_iterate(self) -> None:
+        """
+        **INTERNAL**
         """
         if not (
             hasattr(self, '_core_response')
@@ -132,42 +316,135 @@ class AsyncHttpStreamingResponse:
         ):
             await self._handle_iteration_abort()
 
+    async def _get_next_rows_from_stream(
+        self, max_rows: Optional[int] = None, raw: Optional[bool] = False
+    ) -> List[Any]:
+        """
+        **INTERNAL**
+        """
         self._request_context.maybe_continue_to_process_stream()
-        raw_response = await self._request_context.get_result_from_stream()
-        if raw_response.result_type == ParsedResultType.ROW:
-            if raw_response.value is None:
+        raw_response = await self._request_context.get_results_from_stream(max_rows=max_rows)
+        if raw_response.result_type == ParsedResultType.ROWS:
+            if not raw_response.value:
                 await self.close()
                 raise AnalyticsError(
-                    message='Unexpected empty row response while streaming.',
+                    message='Unexpected empty rows response while streaming.',
                     context=str(self._request_context.error_context),
                 )
-            return self._request_context.deserialize_result(raw_response.value)
-        elif raw_response.result_type in [ParsedResultType.ERROR, ParsedResultType.UNKNOWN]:
-            await self._process_response(raw_response=raw_response, handle_context_shutdown=True)
+            if raw is True:
+                rows: List[Any] = raw_response.value
+                return rows
+            return self._request_context.deserialize_results(raw_response.value)
         elif raw_response.result_type == ParsedResultType.END:
             await self.set_metadata(raw_metadata=raw_response.value)
             raise StopAsyncIteration
         else:
             await self._process_response(raw_response=raw_response, handle_context_shutdown=True)
+        # _process_response() raises if the response contains errors
+        raise StopAsyncIteration
+
+    async def _wait_for_first_result(self) -> None:
+        """
+        **INTERNAL**
+
+        If ``return_on_headers`` is enabled, the first result is waited on once iteration begins.  Any error (which
+        might result in the request being retried) is raised from the first iteration.
+        """
+        while self._first_result_pending:
+            await self.send_request()
 
     @AsyncRetryHandler.with_retries
     async def send_request(self) -> None:
         """
         **INTERNAL**
         """
-        if not self._request_context.okay_to_stream:
-            raise RuntimeError('Query has been canceled or previously executed.')
+        apply_deadline = self._first_result_pending
+        if self._first_result_pending:
+            self._first_result_pending = False
+        else:
+            if not self._request_context.okay_to_stream:
+                raise RuntimeError('Query has been canceled or previously executed.')
 
-        # start cancel scope
-        await self._request_context.initialize()
-        self._core_response = await self._request_context.send_request()
-        self._request_context.start_stream(self._core_response)
+            # start cancel scope
+            await self._request_context.initialize()
+            self._core_response = await self._request_context.send_request()
+            if self._buffer_entire_response:
+                await self._process_entire_response(await self._core_response.aread())
+                return
+            if self._return_on_headers and self._core_response.status_code == 200:
+                # the preamble and rows might take a while, parsing continues in the background in the meantime
+                self._request_context.start_stream(self._core_response)
+                self._first_result_pending = True
+                return
+            small_response = await self._request_context.read_small_response(self._core_response)
+            if small_response is not None:
+                await self._process_entire_response(*small_response)
+                return
+            self._request_context.start_stream(self._core_response)
         # block until we either know we have rows or we have an error
-        await self._request_context.wait_for_results_or_errors()
+        await self._request_context.wait_for_results_or_errors(apply_deadline=apply_deadline)
         if not self._request_context.okay_to_iterate:
             await self._request_context.finish_processing_stream()
             await self._process_response()
 
+    @AsyncRetryHandler.with_retries
+    async def _send_request_to_row_handler(self) -> None:
+        """
+        **INTERNAL**
+        """
+        if not self._request_context.okay_to_stream:
+            raise RuntimeError('Query has been canceled or previously executed.')
+
+        await self._request_context.initialize()
+        self._core_response = await self._request_context.send_request()
+        if self._buffer_entire_response:
+            await self._process_entire_response(await self._core_response.aread())
+            return
+        small_response = await self._request_context.read_small_response(self._core_response)
+        if small_response is not None:
+            await self._process_entire_response(*small_response)
+            return
+        final_result = await self._request_context.stream_to_row_handler(self._core_response, self._handle_rows)
+        if final_result.result_type == ParsedResultType.END:
+            await self.set_metadata(raw_metadata=final_result.value)
+            return
+        try:
+            await self._process_response(raw_response=final_result)
+        except WrappedError as ex:
+            if self._rows_handled:
+                # retrying the request would hand the same rows to the row handler again
+                ex.retriable = False
+            raise
+
+    async def send_request_to_row_handler(self, row_handler: Callable[[List[Any]], Any]) -> QueryMetadata:
+        """
+        **INTERNAL**
+
+        Executes the query, handing each batch of rows to the row handler as the response is parsed rather than
+        making the rows available via :meth:`get_next_row`.  The row handler can be a coroutine function.
+
+        Returns:
+            The query metadata, available once all rows have been handed to the row handler.
+        """
+        self._row_handler = row_handler
+        try:
+            await self._send_request_to_row_handler()
+        except Exception:
+            if self._row_handler_error is not None:
+                raise self._row_handler_error from None
+            raise
+
+        if self._buffered_rows:
+            # the entire response was read at once, so the rows are deserialized here rather than by the JSON stream
+            rows = list(self._buffered_rows)
+            self._buffered_rows.clear()
+            batch_size = self._request_context.row_batch_size
+            for idx in range(0, len(rows), batch_size):
+                await handle_rows_async(
+                    row_handler, self._request_context.deserialize_buffered_rows(rows[idx : idx + batch_size])
+                )
+        return self.get_metadata()
+
     async def shutdown(self) -> None:
         """
         **INTERNAL**
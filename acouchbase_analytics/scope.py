@@ -18,13 +18,14 @@ from __future__ import annotations
 
 import sys
 from asyncio import Future
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Union
 
 if sys.version_info < (3, 10):
     from typing_extensions import TypeAlias
 else:
     from typing import TypeAlias
 
+from couchbase_analytics.query import QueryMetadata
 from couchbase_analytics.result import AsyncQueryResult
 
 if TYPE_CHECKING:
@@ -44,7 +45,9 @@ class AsyncScope:
         """
         return self._impl.name
 
-    def execute_query(self, statement: str, *args: object, **kwargs: object) -> Future[AsyncQueryResult]:
+    def execute_query(
+        self, statement: str, *args: object, **kwargs: object
+    ) -> Future[Union[AsyncQueryResult, QueryMetadata]]:
         """Executes a query against an Analytics scope.
 
         .. note::
@@ -56,12 +59,19 @@ class AsyncScope:
         Args:
             statement (str): The N1QL statement to execute.
             options (:class:`~acouchbase_analytics.options.QueryOptions`): Optional parameters for the query operation.
+            row_handler (Callable[[Any], Any]): **VOLATILE** If provided, each row is handed to the handler as the response is parsed rather than being made available via a query result.  The handler can be a coroutine function.  Cannot be used along with ``batch_handler``.
+            batch_handler (Callable[[List[Any]], Any]): **VOLATILE** If provided, each batch of rows (at most :attr:`~couchbase_analytics.common.json_parsing.JsonStreamConfig.row_batch_size` rows) is handed to the handler as the response is parsed rather than being made available via a query result.  The handler can be a coroutine function.  Cannot be used along with ``row_handler``.
             **kwargs (Dict[str, Any]): keyword arguments that can be used in place or to override provided :class:`~acouchbase_analytics.options.QueryOptions`
 
         Returns:
             Future[:class:`~couchbase_analytics.result.AsyncQueryResult`]: A :class:`~asyncio.Future` is returned.
             Once the :class:`~asyncio.Future` completes, an instance of a :class:`~acouchbase_analytics.result.AsyncQueryResult`
-            is available to provide access to iterate over the query results and access metadata and metrics about the query.
+            is available to provide access to iterate over the query results and access metadata and metrics about the query.  If a ``row_handler``
+            or ``batch_handler`` is provided, the :class:`~acouchbase_analytics.query.QueryMetadata` of the query is available once all rows have been
+            handed to the handler.
+
+        Raises:
+            ValueError: If both a ``row_handler`` and a ``batch_handler`` are provided.
 
         Examples:
             Simple query::
@@ -107,6 +117,12 @@ class AsyncScope:
                 print(f'Query metadata: {q_res.metadata()}')
                 print(f'Query metrics: {q_res.metadata().metrics()}')
 
+            Hand each batch of rows to a handler as the response is parsed::
+
+                q_str = 'SELECT * FROM `travel-sample` WHERE country LIKE $country;'
+                metadata = await scope.execute_query(q_str, country='United%', batch_handler=sink.write_rows)
+                print(f'Query metrics: {metadata.metrics()}')
+
         """  # noqa: E501
         return self._impl.execute_query(statement, *args, **kwargs)
 
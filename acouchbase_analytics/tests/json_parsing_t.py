@@ -17,13 +17,16 @@
 from __future__ import annotations
 
 import json
+from decimal import Decimal
 from time import time
-from typing import TYPE_CHECKING, Dict
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
 
+import anyio
 import pytest
 
 from acouchbase_analytics.protocol._core.async_json_stream import AsyncJsonStream
-from couchbase_analytics.common._core import JsonStreamConfig, ParsedResult, ParsedResultType
+from couchbase_analytics.common._core import JsonParserBackend, JsonStreamConfig, ParsedResult, ParsedResultType
+from couchbase_analytics.common._core.json_parser_backend import is_parser_backend_available
 from couchbase_analytics.common.errors import AnalyticsError
 from tests.environments.simple_environment import JsonDataType
 from tests.utils import AsyncBytesIterator
@@ -46,6 +49,13 @@ class JsonParsingTestSuite:
         'test_array_empty',
         'test_array_mixed_types',
         'test_array_of_objects',
+        'test_buffered_bytes',
+        'test_decode_rows',
+        'test_decode_rows_disabled',
+        'test_decode_rows_values',
+        'test_drain_http_stream',
+        'test_empty_http_chunks',
+        'test_get_results_batched',
         'test_invalid_empty',
         'test_invalid_garbage_between_objects',
         'test_invalid_leading_garbage',
@@ -57,6 +67,11 @@ class JsonParsingTestSuite:
         'test_object_simple_nested',
         'test_object_with_empty_key_and_value',
         'test_object_with_unicode',
+        'test_parser_backend',
+        'test_parser_backend_invalid',
+        'test_split_raw_rows',
+        'test_split_raw_rows_invalid',
+        'test_split_raw_rows_preserves_bytes',
         'test_value_bool',
         'test_value_null',
     ]
@@ -303,6 +318,188 @@ class JsonParsingTestSuite:
         with pytest.raises(AnalyticsError):
             await parser.get_result()
 
+    @pytest.mark.parametrize(
+        'stream_config',
+        [
+            JsonStreamConfig(buffered_bytes_max=64, row_batch_size=2),
+            JsonStreamConfig(buffered_bytes_max=64, row_batch_size=2, decode_rows=True),
+            JsonStreamConfig(buffered_bytes_min=16, buffered_bytes_max=64, row_batch_size=2, split_raw_rows=True),
+        ],
+    )
+    async def test_buffered_bytes(
+        self, async_test_env: AsyncSimpleEnvironment, stream_config: JsonStreamConfig
+    ) -> None:
+        json_object, bytes_data = async_test_env.get_json_data(JsonDataType.MULTIPLE_RESULTS)
+        parser = AsyncJsonStream(AsyncBytesIterator(bytes_data, chunk_size=7), stream_config=stream_config)
+        assert parser._buffered_bytes is not None
+        await parser.start_parsing()
+        # the producer pauses once the size of the buffered rows reaches the threshold
+        assert parser.token_stream_exhausted is False
+        rows: List[Any] = []
+        while True:
+            result = await parser.get_results()
+            assert isinstance(result, ParsedResult)
+            if result.result_type != ParsedResultType.ROWS:
+                break
+            rows.extend(row if parser.decode_rows else json.loads(row) for row in result.value)
+            if not parser.token_stream_exhausted:
+                await parser.continue_parsing()
+
+        assert result.result_type == ParsedResultType.END
+        assert rows == json_object.pop('results')
+        assert json.loads(result.value) == json_object
+        assert parser._buffered_bytes.buffered == pytest.approx(0)
+
+    @pytest.mark.parametrize('use_float', [True, False])
+    @pytest.mark.parametrize(
+        'json_type',
+        [
+            JsonDataType.SIMPLE_REQUEST,
+            JsonDataType.MULTIPLE_RESULTS,
+            JsonDataType.MULTIPLE_RESULTS_RAW,
+            JsonDataType.FAILED_REQUEST,
+            JsonDataType.FAILED_REQUEST_MID_STREAM,
+            JsonDataType.FAILED_REQUEST_MULTI_ERRORS,
+        ],
+    )
+    async def test_decode_rows(
+        self, async_test_env: AsyncSimpleEnvironment, json_type: JsonDataType, use_float: bool
+    ) -> None:
+        json_object, bytes_data = async_test_env.get_json_data(json_type)
+        stream_config = JsonStreamConfig(decode_rows=True, use_float=use_float)
+        parser = AsyncJsonStream(AsyncBytesIterator(bytes_data), stream_config=stream_config)
+        assert parser.decode_rows is True
+        await parser.start_parsing()
+        rows = []
+        while True:
+            result = await parser.get_result()
+            if result is None and not parser.token_stream_exhausted:
+                await parser.continue_parsing()
+                continue
+            assert isinstance(result, ParsedResult)
+            if result.result_type != ParsedResultType.ROW:
+                break
+            rows.append(result.value)
+            if not parser.token_stream_exhausted:
+                await parser.continue_parsing()
+
+        expected_type = ParsedResultType.ERROR if 'errors' in json_object else ParsedResultType.END
+        assert result.result_type == expected_type
+        expected_rows = json_object.pop('results', [])
+        if use_float:
+            assert rows == expected_rows
+        else:
+            assert rows == json.loads(json.dumps(expected_rows), parse_float=Decimal)
+        assert isinstance(result.value, bytes)
+        assert json.loads(result.value) == json_object
+        with pytest.raises(AnalyticsError):
+            await parser.get_result()
+
+    @pytest.mark.anyio
+    async def test_decode_rows_disabled(self) -> None:
+        data = b'{"results":[{"a":1}],"status":"success"}'
+        parser = AsyncJsonStream(
+            AsyncBytesIterator(data), stream_config=JsonStreamConfig(decode_rows=True, buffer_entire_result=True)
+        )
+        assert parser.decode_rows is False
+        parser = AsyncJsonStream(
+            AsyncBytesIterator(data), stream_config=JsonStreamConfig(decode_rows=True, split_raw_rows=True)
+        )
+        assert parser.decode_rows is False
+        await parser.start_parsing()
+        result = await parser.get_result()
+        assert isinstance(result, ParsedResult)
+        assert result.result_type == ParsedResultType.ROW
+        assert result.value == b'{"a":1}'
+
+    @pytest.mark.anyio
+    async def test_decode_rows_values(self) -> None:
+        rows = [1, -2.5, 1e100, 'str', True, False, None, [], {}, {'a': [1, {'b': None}], 'c': 'd'}, [[1], [2.25]]]
+        data = json.dumps({'requestID': '1', 'results': rows, 'metrics': {'resultCount': len(rows)}})
+        parser = AsyncJsonStream(
+            AsyncBytesIterator(data, chunk_size=3), stream_config=JsonStreamConfig(decode_rows=True)
+        )
+        await parser.start_parsing()
+        decoded = []
+        while True:
+            result = await parser.get_result()
+            assert isinstance(result, ParsedResult)
+            if result.result_type != ParsedResultType.ROW:
+                break
+            decoded.append(result.value)
+            if not parser.token_stream_exhausted:
+                await parser.continue_parsing()
+
+        assert decoded == rows
+        assert result.result_type == ParsedResultType.END
+        assert json.loads(result.value) == {'requestID': '1', 'metrics': {'resultCount': len(rows)}}
+
+    async def test_drain_http_stream(self, async_test_env: AsyncSimpleEnvironment) -> None:
+        _, bytes_data = async_test_env.get_json_data(JsonDataType.MULTIPLE_RESULTS)
+        parser = AsyncJsonStream(
+            AsyncBytesIterator(bytes_data, chunk_size=7),
+            stream_config=JsonStreamConfig(buffered_row_max=2, row_batch_size=1),
+        )
+        await parser.start_parsing()
+        result = await parser.get_result()
+        assert isinstance(result, ParsedResult)
+        assert result.result_type == ParsedResultType.ROW
+        assert parser.http_stream_exhausted is False
+        assert await parser.drain_http_stream(len(bytes_data), 5) is True
+        assert parser.http_stream_exhausted is True
+
+        parser = AsyncJsonStream(AsyncBytesIterator(bytes_data, chunk_size=7))
+        assert await parser.drain_http_stream(1, 5) is False
+        assert parser.http_stream_exhausted is False
+
+    @pytest.mark.parametrize('decode_rows', [True, False])
+    async def test_empty_http_chunks(self, async_test_env: AsyncSimpleEnvironment, decode_rows: bool) -> None:
+        json_object, bytes_data = async_test_env.get_json_data(JsonDataType.MULTIPLE_RESULTS)
+
+        async def chunks() -> AsyncIterator[bytes]:
+            # an empty chunk must not be mistaken for the end of the HTTP response
+            async for chunk in AsyncBytesIterator(bytes_data, chunk_size=7):
+                yield b''
+                yield chunk
+
+        parser = AsyncJsonStream(chunks(), stream_config=JsonStreamConfig(decode_rows=decode_rows))
+        await parser.start_parsing()
+        rows: List[Any] = []
+        while True:
+            result = await parser.get_result()
+            assert isinstance(result, ParsedResult)
+            if result.result_type != ParsedResultType.ROW:
+                break
+            rows.append(result.value if decode_rows else json.loads(result.value))
+            if not parser.token_stream_exhausted:
+                await parser.continue_parsing()
+
+        assert result.result_type == ParsedResultType.END
+        assert rows == json_object.pop('results')
+        assert json.loads(result.value) == json_object
+
+    @pytest.mark.parametrize('max_rows', [None, 1, 4, 10, 100])
+    async def test_get_results_batched(self, async_test_env: AsyncSimpleEnvironment, max_rows: Optional[int]) -> None:
+        json_object, bytes_data = async_test_env.get_json_data(JsonDataType.MULTIPLE_RESULTS)
+        parser = AsyncJsonStream(AsyncBytesIterator(bytes_data), stream_config=JsonStreamConfig(row_batch_size=10))
+        await parser.start_parsing()
+        rows: List[Any] = []
+        while True:
+            result = await parser.get_results(max_rows=max_rows)
+            assert isinstance(result, ParsedResult)
+            if result.result_type != ParsedResultType.ROWS:
+                break
+            assert 0 < len(result.value) <= (max_rows or 10)
+            rows.extend(json.loads(row) for row in result.value)
+            if not parser.token_stream_exhausted:
+                await parser.continue_parsing()
+
+        assert result.result_type == ParsedResultType.END
+        assert rows == json_object.pop('results')
+        assert json.loads(result.value) == json_object
+        with pytest.raises(AnalyticsError):
+            await parser.get_results()
+
     @pytest.mark.anyio
     async def test_invalid_empty(self) -> None:
         data = ''
@@ -368,6 +565,174 @@ class JsonParsingTestSuite:
         decoded_value = res.value.decode('utf-8')
         assert ('parse error' in decoded_value or 'Incomplete JSON content' in decoded_value) is True
 
+    @pytest.mark.parametrize('buffered_result', [True, False])
+    @pytest.mark.parametrize(
+        'backend', [JsonParserBackend.YAJL2_C, JsonParserBackend.PYTHON, JsonParserBackend.SIMDJSON]
+    )
+    @pytest.mark.parametrize(
+        'json_type',
+        [
+            JsonDataType.SIMPLE_REQUEST,
+            JsonDataType.MULTIPLE_RESULTS,
+            JsonDataType.FAILED_REQUEST,
+            JsonDataType.FAILED_REQUEST_MID_STREAM,
+        ],
+    )
+    async def test_parser_backend(
+        self,
+        async_test_env: AsyncSimpleEnvironment,
+        json_type: JsonDataType,
+        backend: JsonParserBackend,
+        buffered_result: bool,
+    ) -> None:
+        if not is_parser_backend_available(backend):
+            pytest.skip(f'JSON parser backend {backend.value} is not available.')
+        json_object, bytes_data = async_test_env.get_json_data(json_type)
+        stream_config = JsonStreamConfig(parser_backend=backend, buffer_entire_result=buffered_result)
+        parser = AsyncJsonStream(AsyncBytesIterator(bytes_data), stream_config=stream_config)
+        assert parser.parser_backend == backend
+        rows = []
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(parser.start_parsing)
+            while True:
+                result = await parser.get_result()
+                if result is None and not parser.token_stream_exhausted:
+                    await parser.continue_parsing()
+                    continue
+                assert isinstance(result, ParsedResult)
+                assert isinstance(result.value, bytes)
+                if result.result_type != ParsedResultType.ROW:
+                    break
+                rows.append(json.loads(result.value))
+
+        expected_type = ParsedResultType.ERROR if 'errors' in json_object else ParsedResultType.END
+        assert result.result_type == expected_type
+        if buffered_result:
+            assert rows == []
+        else:
+            assert rows == json_object.pop('results', [])
+        assert json.loads(result.value) == json_object
+        with pytest.raises(AnalyticsError):
+            await parser.get_result()
+
+    @pytest.mark.parametrize(
+        'backend', [JsonParserBackend.YAJL2_C, JsonParserBackend.PYTHON, JsonParserBackend.SIMDJSON]
+    )
+    @pytest.mark.parametrize('data', ['', '{"results":[1,2', '{"results":[1]}garbage'])
+    @pytest.mark.anyio
+    async def test_parser_backend_invalid(self, backend: JsonParserBackend, data: str) -> None:
+        if not is_parser_backend_available(backend):
+            pytest.skip(f'JSON parser backend {backend.value} is not available.')
+        stream_config = JsonStreamConfig(parser_backend=backend, buffer_entire_result=True)
+        parser = AsyncJsonStream(AsyncBytesIterator(bytes(data, 'utf-8')), stream_config=stream_config)
+        await parser.start_parsing()
+        result = await parser.get_result()
+        assert isinstance(result, ParsedResult)
+        assert result.result_type == ParsedResultType.ERROR
+        with pytest.raises(AnalyticsError):
+            await parser.get_result()
+
+    @pytest.mark.parametrize('buffered_result', [True, False])
+    @pytest.mark.parametrize('chunk_size', [1, 7, 100])
+    @pytest.mark.parametrize(
+        'json_type',
+        [
+            JsonDataType.SIMPLE_REQUEST,
+            JsonDataType.MULTIPLE_RESULTS,
+            JsonDataType.MULTIPLE_RESULTS_RAW,
+            JsonDataType.FAILED_REQUEST,
+            JsonDataType.FAILED_REQUEST_MID_STREAM,
+            JsonDataType.FAILED_REQUEST_MULTI_ERRORS,
+        ],
+    )
+    async def test_split_raw_rows(
+        self, async_test_env: AsyncSimpleEnvironment, json_type: JsonDataType, chunk_size: int, buffered_result: bool
+    ) -> None:
+        json_object, bytes_data = async_test_env.get_json_data(json_type)
+        stream_config = JsonStreamConfig(split_raw_rows=True, buffer_entire_result=buffered_result)
+        parser = AsyncJsonStream(AsyncBytesIterator(bytes_data, chunk_size=chunk_size), stream_config=stream_config)
+        rows = []
+        async with anyio.create_task_group() as tg:
+            # the splitter can emit more rows per chunk than the stream buffers, so consume concurrently
+            tg.start_soon(parser.start_parsing)
+            while True:
+                result = await parser.get_result()
+                if result is None and not parser.token_stream_exhausted:
+                    await parser.continue_parsing()
+                    continue
+                assert isinstance(result, ParsedResult)
+                assert isinstance(result.value, bytes)
+                if result.result_type != ParsedResultType.ROW:
+                    break
+                rows.append(json.loads(result.value))
+
+        expected_type = ParsedResultType.ERROR if 'errors' in json_object else ParsedResultType.END
+        assert result.result_type == expected_type
+        if buffered_result:
+            assert rows == []
+        else:
+            assert rows == json_object.pop('results', [])
+        assert json.loads(result.value) == json_object
+        with pytest.raises(AnalyticsError):
+            await parser.get_result()
+
+    @pytest.mark.parametrize(
+        'data',
+        [
+            '',
+            '   \n\t  ',
+            'garbage{"results":[1]}',
+            '{"results":[1]}garbage',
+            '{"results":[1,2',
+            '{"results":[1,,2]}',
+            '{"results":[1,]}',
+            '{"results":[{"a":1]]}',
+        ],
+    )
+    @pytest.mark.anyio
+    async def test_split_raw_rows_invalid(self, data: str) -> None:
+        parser = AsyncJsonStream(
+            AsyncBytesIterator(bytes(data, 'utf-8')), stream_config=JsonStreamConfig(split_raw_rows=True)
+        )
+        await parser.start_parsing()
+        result = None
+        while result is None or result.result_type == ParsedResultType.ROW:
+            result = await parser.get_result()
+            if result is None and not parser.token_stream_exhausted:
+                await parser.continue_parsing()
+        assert result.result_type == ParsedResultType.ERROR
+        assert result.value is not None
+        assert 'JsonTokenParsingError' in result.value.decode('utf-8')
+        with pytest.raises(AnalyticsError):
+            await parser.get_result()
+
+    @pytest.mark.anyio
+    async def test_split_raw_rows_preserves_bytes(self) -> None:
+        rows = [
+            '{ "id" : 1.10, "name" : "Alice" }',
+            '"a \\"quoted\\" value, with [brackets]"',
+            '1E+2',
+            '{"nested":{"results":[1,2]},"unicode":"\\u00e9 你好"}',
+            '[ ]',
+        ]
+        data = f'{{"requestID": "1", "results": [ {" , ".join(rows)} ], "status": "success"}}'
+        parser = AsyncJsonStream(
+            AsyncBytesIterator(bytes(data, 'utf-8'), chunk_size=5), stream_config=JsonStreamConfig(split_raw_rows=True)
+        )
+        await parser.start_parsing()
+        for row in rows:
+            result = await parser.get_result()
+            assert isinstance(result, ParsedResult)
+            assert result.result_type == ParsedResultType.ROW
+            # rows are the exact bytes sent by the server
+            assert result.value == bytes(row, 'utf-8')
+
+        final_result = await parser.get_result()
+        assert isinstance(final_result, ParsedResult)
+        assert final_result.result_type == ParsedResultType.END
+        assert isinstance(final_result.value, bytes)
+        assert json.loads(final_result.value) == {'requestID': '1', 'status': 'success'}
+
     @pytest.mark.anyio
     async def test_value_bool(self) -> None:
         data = 'true'
@@ -16,14 +16,39 @@
 
 from __future__ import annotations
 
+import io
+import json
+import os
+import pathlib
+import time
+from dataclasses import dataclass
 from datetime import timedelta
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Type, Union
 
 import pytest
 
+from acouchbase_analytics.deserializer import (
+    DefaultJsonDeserializer,
+    Deserializer,
+    LazyRowDeserializer,
+    MsgspecDeserializer,
+    OrjsonDeserializer,
+    PassthroughDeserializer,
+)
 from acouchbase_analytics.errors import AnalyticsError, InvalidCredentialError, QueryError, TimeoutError
-from acouchbase_analytics.options import QueryOptions
+from acouchbase_analytics.options import HttpCompression, QueryOptions
+from acouchbase_analytics.query import (
+    ColumnarResult,
+    LazyRow,
+    QueryMetadata,
+    Record,
+    RowFormat,
+    RowSchema,
+    RowStore,
+)
 from acouchbase_analytics.result import AsyncQueryResult
+from couchbase_analytics.common._core import JsonStreamConfig
+from couchbase_analytics.common._core.json_parsing import DEFAULT_SMALL_RESPONSE_MAX_BYTES
 from tests import AsyncYieldFixture
 from tests.test_server import ErrorType, NonRetriableSpecificationType, ResultType, RetriableGroupType
 
@@ -31,6 +56,59 @@ if TYPE_CHECKING:
     from tests.environments.base_environment import AsyncTestEnvironment
 
 
+class CountingDeserializer(DefaultJsonDeserializer):
+    def __init__(self) -> None:
+        self.many_count = 0
+        self.row_count = 0
+
+    def deserialize(self, value: bytes) -> Any:
+        self.row_count += 1
+        return super().deserialize(value)
+
+    def deserialize_many(self, values: Sequence[bytes]) -> List[Any]:
+        self.many_count += 1
+        self.row_count += len(values)
+        return super().deserialize_many(values)
+
+
+class TaggingDeserializer(DefaultJsonDeserializer):
+    # only overrides deserialize(), DefaultJsonDeserializer.deserialize_many() must not bypass it
+    def deserialize(self, value: bytes) -> Any:
+        row = super().deserialize(value)
+        row['tagged'] = True
+        return row
+
+
+@dataclass
+class ResultRow:
+    id: int
+    name: str
+    city: str
+
+
+class RowOnlyDeserializer:
+    # custom deserializers are not required to subclass Deserializer (or implement deserialize_many())
+    def deserialize(self, value: bytes) -> Any:
+        return json.loads(value)
+
+
+class AsyncSink:
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self.write_count = 0
+        self.drain_count = 0
+
+    async def write(self, data: bytes) -> None:
+        self._buffer += data
+        self.write_count += 1
+
+    async def drain(self) -> None:
+        self.drain_count += 1
+
+    def getvalue(self) -> bytes:
+        return bytes(self._buffer)
+
+
 class TestServerTestSuite:
     TEST_MANIFEST = [
         'test_auth_error_unauthorized',
@@ -40,8 +118,36 @@ class TestServerTestSuite:
         'test_error_retriable_response_retries_exceeded',
         'test_error_retriable_http503',
         'test_error_timeout',
+        'test_results_batch_handler',
+        'test_results_batched',
+        'test_results_buffer_entire_response',
+        'test_results_decoded_rows',
+        'test_results_deserialize_many',
+        'test_results_first_one_take',
+        'test_results_http_compression',
+        'test_results_iter_arrow_batches',
+        'test_results_iter_batches',
+        'test_results_lazy_rows',
         'test_results_object_values',
+        'test_results_optional_deserializers',
         'test_results_raw_values',
+        'test_results_return_on_headers',
+        'test_results_return_on_headers_errors',
+        'test_results_row_format',
+        'test_results_row_handler',
+        'test_results_row_handler_errors',
+        'test_results_small_response',
+        'test_results_small_response_compressed',
+        'test_results_take_drains_response',
+        'test_results_take_stalled_response',
+        'test_results_to_columns',
+        'test_results_to_columns_non_object_rows',
+        'test_results_to_row_store',
+        'test_results_to_row_store_spill_error',
+        'test_results_write_arrow_file',
+        'test_results_write_arrow_file_schema_mismatch',
+        'test_results_write_ndjson',
+        'test_results_write_ndjson_sink_error',
     ]
 
     async def test_auth_error_unauthorized(self, test_env: AsyncTestEnvironment) -> None:
@@ -161,6 +267,226 @@ class TestServerTestSuite:
         else:
             test_env.assert_error_context_missing_last_dispatch(ex.value._context)
 
+    @pytest.mark.parametrize('batch_size', [1, 7, 50, 100])
+    async def test_results_batched(self, test_env: AsyncTestEnvironment, batch_size: int) -> None:
+        expected_rows = 50
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': expected_rows, 'stream': True}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        result = await test_env.cluster_or_scope.execute_query(statement)
+        assert isinstance(result, AsyncQueryResult)
+        batches = [batch async for batch in result.rows_batched(batch_size)]
+        assert all(len(batch) == batch_size for batch in batches[:-1])
+        assert 0 < len(batches[-1]) <= batch_size
+        assert sum(len(batch) for batch in batches) == expected_rows
+        assert all(isinstance(row, dict) for batch in batches for row in batch)
+        assert result.metadata() is not None
+
+        with pytest.raises(ValueError):
+            result.rows_batched(0)
+
+    @pytest.mark.parametrize('passthrough', [False, True])
+    @pytest.mark.parametrize('stream', [False, True])
+    async def test_results_buffer_entire_response(
+        self, test_env: AsyncTestEnvironment, stream: bool, passthrough: bool
+    ) -> None:
+        expected_rows = 50
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': expected_rows, 'stream': stream}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        deserializer = PassthroughDeserializer() if passthrough else None
+        q_opts = QueryOptions(buffer_entire_response=True, deserializer=deserializer)
+        result = await test_env.cluster_or_scope.execute_query(statement, q_opts)
+        assert isinstance(result, AsyncQueryResult)
+        rows = await result.get_all_rows()
+        assert len(rows) == expected_rows
+        for row in rows:
+            assert isinstance(row, bytes if passthrough else dict)
+        assert result.metadata() is not None
+
+    @pytest.mark.parametrize('passthrough', [False, True])
+    @pytest.mark.parametrize('stream', [False, True])
+    async def test_results_decoded_rows(self, test_env: AsyncTestEnvironment, stream: bool, passthrough: bool) -> None:
+        expected_rows = 50
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': expected_rows, 'stream': stream}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        stream_config = JsonStreamConfig(decode_rows=True)
+        if passthrough:
+            q_opts = QueryOptions(stream_config=stream_config, deserializer=PassthroughDeserializer())
+        else:
+            q_opts = QueryOptions(stream_config=stream_config)
+        result = await test_env.cluster_or_scope.execute_query(statement, q_opts)
+        assert isinstance(result, AsyncQueryResult)
+        rows = await result.get_all_rows()
+        assert len(rows) >= expected_rows
+        # rows are only decoded by the stream when the default deserializer is used
+        for row in rows:
+            assert isinstance(row, bytes if passthrough else dict)
+
+    @pytest.mark.parametrize(
+        'deserializer_type', [DefaultJsonDeserializer, CountingDeserializer, RowOnlyDeserializer, TaggingDeserializer]
+    )
+    async def test_results_deserialize_many(
+        self, test_env: AsyncTestEnvironment, deserializer_type: Type[Deserializer]
+    ) -> None:
+        expected_rows = 50
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': expected_rows, 'stream': True}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        deserializer = deserializer_type()
+        q_opts = QueryOptions(deserializer=deserializer, stream_config=JsonStreamConfig(row_batch_size=10))
+        result = await test_env.cluster_or_scope.execute_query(statement, q_opts)
+        assert isinstance(result, AsyncQueryResult)
+        rows = result.rows()
+        first_row = await rows.__anext__()
+        # the remaining rows deserialized w/ the first row are returned prior to any newly streamed rows
+        all_rows = [first_row] + await result.get_all_rows()
+        assert len(all_rows) == expected_rows
+        assert all(isinstance(row, dict) for row in all_rows)
+        assert result.metadata() is not None
+        # isinstance() is not used as Deserializer.__subclasshook__() matches any deserializer
+        if type(deserializer) is CountingDeserializer:
+            assert deserializer.many_count > 0
+            assert deserializer.row_count == expected_rows
+        if type(deserializer) is TaggingDeserializer:
+            assert all(row.get('tagged') is True for row in all_rows)
+
+    @pytest.mark.parametrize('stream', [False, True])
+    async def test_results_first_one_take(self, test_env: AsyncTestEnvironment, stream: bool) -> None:
+        test_env.set_url_path('/test_results')
+        statement = 'SELECT "Hello, data!" AS greeting'
+
+        # enough rows that the response cannot have been received in full once the first rows are available
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': 5000, 'stream': stream, 'chunk_size': 256}
+        )
+        result = await test_env.cluster_or_scope.execute_query(statement)
+        assert isinstance(result, AsyncQueryResult)
+        assert [row['id'] for row in await result.take(5)] == list(range(1, 6))
+        assert result._http_response._request_context.is_shutdown is True
+        assert await result.take(5) == []
+        assert await result.first() is None
+
+        result = await test_env.cluster_or_scope.execute_query(statement)
+        assert isinstance(result, AsyncQueryResult)
+        assert (await result.first())['id'] == 1
+        with pytest.raises(ValueError):
+            await (await test_env.cluster_or_scope.execute_query(statement)).one()
+
+        test_env.update_request_json({'result_type': ResultType.Object.value, 'row_count': 3, 'stream': stream})
+        result = await test_env.cluster_or_scope.execute_query(statement)
+        assert isinstance(result, AsyncQueryResult)
+        assert [row['id'] for row in await result.take(2)] == [1, 2]
+        if not stream:
+            # the entire response has been received, so the metadata is available
+            assert result.metadata() is not None
+        rows = await (await test_env.cluster_or_scope.execute_query(statement)).take(10)
+        assert [row['id'] for row in rows] == [1, 2, 3]
+        with pytest.raises(ValueError):
+            await (await test_env.cluster_or_scope.execute_query(statement)).take(0)
+
+        test_env.update_request_json({'result_type': ResultType.Object.value, 'row_count': 1, 'stream': stream})
+        result = await test_env.cluster_or_scope.execute_query(statement)
+        assert isinstance(result, AsyncQueryResult)
+        assert (await result.one())['id'] == 1
+        assert result.metadata() is not None
+
+        test_env.update_request_json({'result_type': ResultType.Object.value, 'row_count': 0, 'stream': stream})
+        assert await (await test_env.cluster_or_scope.execute_query(statement)).first() is None
+        with pytest.raises(ValueError):
+            await (await test_env.cluster_or_scope.execute_query(statement)).one()
+
+    async def test_results_take_drains_response(self, test_env: AsyncTestEnvironment) -> None:
+        test_env.set_url_path('/test_results')
+        statement = 'SELECT "Hello, data!" AS greeting'
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': 5000, 'stream': True, 'chunk_size': 256}
+        )
+        # the remainder of the response is read so that the connection can be reused
+        stream_config = JsonStreamConfig(drain_on_close_max_bytes=2**24, drain_on_close_timeout=5)
+        result = await test_env.cluster_or_scope.execute_query(statement, QueryOptions(stream_config=stream_config))
+        assert isinstance(result, AsyncQueryResult)
+        assert [row['id'] for row in await result.take(5)] == list(range(1, 6))
+        assert result._http_response._request_context.http_stream_exhausted is True
+
+        # the response is too large to drain, the connection is closed instead
+        stream_config = JsonStreamConfig(drain_on_close_max_bytes=0)
+        result = await test_env.cluster_or_scope.execute_query(statement, QueryOptions(stream_config=stream_config))
+        assert isinstance(result, AsyncQueryResult)
+        assert [row['id'] for row in await result.take(5)] == list(range(1, 6))
+        assert result._http_response._request_context.http_stream_exhausted is False
+
+    async def test_results_take_stalled_response(self, test_env: AsyncTestEnvironment) -> None:
+        test_env.set_url_path('/test_results')
+        statement = 'SELECT "Hello, data!" AS greeting'
+        # the server stalls once the first rows have been sent
+        test_env.update_request_json(
+            {
+                'result_type': ResultType.Object.value,
+                'row_count': 10,
+                'stream': True,
+                'chunk_size': 512,
+                'first_row_delay': 3,
+            }
+        )
+        result = await test_env.cluster_or_scope.execute_query(statement)
+        assert isinstance(result, AsyncQueryResult)
+        start = time.monotonic()
+        assert (await result.first())['id'] == 1
+        # the stream is stopped w/o waiting on the server
+        assert time.monotonic() - start < 1
+        assert result._http_response._request_context.is_shutdown is True
+
+    @pytest.mark.parametrize('stream', [False, True])
+    async def test_results_iter_batches(self, test_env: AsyncTestEnvironment, stream: bool) -> None:
+        expected_rows = 50
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Raw.value, 'row_count': expected_rows, 'stream': stream}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        result = await test_env.cluster_or_scope.execute_query(statement)
+        assert isinstance(result, AsyncQueryResult)
+        batches = [batch async for batch in result.iter_batches()]
+        assert all(len(batch) > 0 for batch in batches)
+        assert sum(len(batch) for batch in batches) == expected_rows
+        assert result.metadata() is not None
+
+    @pytest.mark.parametrize(
+        'opts',
+        [
+            {},
+            {'buffer_entire_response': True},
+            {'stream_config': JsonStreamConfig(split_raw_rows=True)},
+            {'row_format': RowFormat.TUPLE},
+        ],
+    )
+    async def test_results_lazy_rows(self, test_env: AsyncTestEnvironment, opts: Dict[str, Any]) -> None:
+        expected_rows = 50
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': expected_rows, 'stream': True, 'chunk_size': 256}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        q_opts = QueryOptions(deserializer=LazyRowDeserializer(), **opts)
+        result = await test_env.cluster_or_scope.execute_query(statement, q_opts)
+        assert isinstance(result, AsyncQueryResult)
+        rows = await result.get_all_rows()
+        assert len(rows) == expected_rows
+        # lazy rows are not altered by the row format
+        assert all(type(row) is LazyRow and type(row.raw) is bytes for row in rows)
+        assert [row['id'] for row in rows] == list(range(1, expected_rows + 1))
+        assert all(tuple(row.to_dict()) == ('id', 'name', 'city') for row in rows)
+
     @pytest.mark.parametrize('stream', [False, True])
     async def test_results_object_values(self, test_env: AsyncTestEnvironment, stream: bool) -> None:
         expected_rows = 50
@@ -173,6 +499,37 @@ class TestServerTestSuite:
         assert isinstance(result, AsyncQueryResult)
         await test_env.assert_rows(result, expected_rows)
 
+    @pytest.mark.parametrize('row_type', [None, ResultRow])
+    @pytest.mark.parametrize('module_name', ['orjson', 'msgspec'])
+    @pytest.mark.parametrize('stream', [False, True])
+    async def test_results_optional_deserializers(
+        self, test_env: AsyncTestEnvironment, stream: bool, module_name: str, row_type: Optional[Type[ResultRow]]
+    ) -> None:
+        pytest.importorskip(module_name)
+        if module_name == 'orjson' and row_type is not None:
+            pytest.skip('OrjsonDeserializer does not support typed rows.')
+        expected_rows = 50
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': expected_rows, 'stream': stream}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        deserializer: Deserializer
+        if module_name == 'orjson':
+            deserializer = OrjsonDeserializer()
+        else:
+            deserializer = MsgspecDeserializer(row_type=row_type)
+        result = await test_env.cluster_or_scope.execute_query(statement, QueryOptions(deserializer=deserializer))
+        assert isinstance(result, AsyncQueryResult)
+        rows = await result.get_all_rows()
+        assert len(rows) == expected_rows
+        for row in rows:
+            if row_type is None:
+                assert isinstance(row, dict)
+            else:
+                assert isinstance(row, ResultRow)
+                assert isinstance(row.id, int)
+
     @pytest.mark.parametrize('stream', [False, True])
     async def test_results_raw_values(self, test_env: AsyncTestEnvironment, stream: bool) -> None:
         expected_rows = 50
@@ -185,6 +542,498 @@ class TestServerTestSuite:
         assert isinstance(result, AsyncQueryResult)
         await test_env.assert_rows(result, expected_rows)
 
+    async def test_results_return_on_headers(self, test_env: AsyncTestEnvironment) -> None:
+        test_env.set_url_path('/test_results')
+        statement = 'SELECT "Hello, data!" AS greeting'
+        # the preamble is sent, but the first row is delayed
+        test_env.update_request_json(
+            {
+                'result_type': ResultType.Object.value,
+                'row_count': 10,
+                'stream': True,
+                'chunk_size': 16,
+                'first_row_delay': 2,
+            }
+        )
+        start = time.monotonic()
+        result = await test_env.cluster_or_scope.execute_query(statement, QueryOptions(return_on_headers=True))
+        assert isinstance(result, AsyncQueryResult)
+        assert time.monotonic() - start < 1.5
+        assert [row['id'] async for row in result.rows()] == list(range(1, 11))
+        assert time.monotonic() - start >= 2
+        assert result.metadata() is not None
+
+        # w/o return_on_headers, the result is returned once the first row is available
+        start = time.monotonic()
+        result = await test_env.cluster_or_scope.execute_query(statement)
+        assert isinstance(result, AsyncQueryResult)
+        assert time.monotonic() - start >= 2
+        assert [row['id'] async for row in result.rows()] == list(range(1, 11))
+
+        test_env.update_request_json({'result_type': ResultType.Object.value, 'row_count': 0, 'stream': True})
+        result = await test_env.cluster_or_scope.execute_query(statement, QueryOptions(return_on_headers=True))
+        assert isinstance(result, AsyncQueryResult)
+        assert [row async for row in result.rows()] == []
+        assert result.metadata() is not None
+
+    async def test_results_return_on_headers_errors(self, test_env: AsyncTestEnvironment) -> None:
+        test_env.set_url_path('/test_error')
+        test_env.update_request_json(
+            {'error_type': ErrorType.Retriable.value, 'retry_group_type': RetriableGroupType.All.value}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        allowed_retries = 3
+        q_opts = QueryOptions(return_on_headers=True, max_retries=allowed_retries, timeout=timedelta(seconds=10))
+        # the errors (and retries) are handled once iteration begins
+        result = await test_env.cluster_or_scope.execute_query(statement, q_opts)
+        assert isinstance(result, AsyncQueryResult)
+        with pytest.raises(QueryError) as ex:
+            [row async for row in result.rows()]
+        test_env.assert_error_context_num_attempts(allowed_retries + 1, ex.value._context)
+
+        # an error status is handled prior to returning the result
+        test_env.update_request_json({'error_type': ErrorType.Http503.value, 'analytics_error': True})
+        with pytest.raises(QueryError):
+            await test_env.cluster_or_scope.execute_query(
+                statement, QueryOptions(return_on_headers=True, max_retries=1, timeout=timedelta(seconds=10))
+            )
+
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {
+                'result_type': ResultType.Object.value,
+                'row_count': 10,
+                'stream': True,
+                'chunk_size': 16,
+                'first_row_delay': 3,
+            }
+        )
+        result = await test_env.cluster_or_scope.execute_query(
+            statement, QueryOptions(return_on_headers=True, timeout=timedelta(seconds=1))
+        )
+        assert isinstance(result, AsyncQueryResult)
+        with pytest.raises(TimeoutError):
+            [row async for row in result.rows()]
+
+    @pytest.mark.parametrize('stream_config', [None, JsonStreamConfig(decode_rows=True)])
+    @pytest.mark.parametrize('buffer_entire_response', [False, True])
+    @pytest.mark.parametrize('row_format', [RowFormat.DICT, RowFormat.TUPLE, RowFormat.RECORD])
+    async def test_results_row_format(
+        self,
+        test_env: AsyncTestEnvironment,
+        row_format: RowFormat,
+        buffer_entire_response: bool,
+        stream_config: Optional[JsonStreamConfig],
+    ) -> None:
+        expected_rows = 50
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': expected_rows, 'stream': True, 'chunk_size': 256}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        q_opts = QueryOptions(
+            row_format=row_format, buffer_entire_response=buffer_entire_response, stream_config=stream_config
+        )
+        result = await test_env.cluster_or_scope.execute_query(statement, q_opts)
+        assert isinstance(result, AsyncQueryResult)
+        rows = await result.get_all_rows()
+        assert len(rows) == expected_rows
+        fields = ('id', 'name', 'city')
+        if row_format == RowFormat.TUPLE:
+            assert result.row_schema() == RowSchema(fields)
+            assert all(type(row) is tuple and len(row) == len(fields) for row in rows)
+            assert [row[0] for row in rows] == list(range(1, expected_rows + 1))
+            return
+
+        assert result.row_schema() is None
+        row_type = Record if row_format == RowFormat.RECORD else dict
+        assert all(type(row) is row_type and tuple(row) == fields for row in rows)
+        assert [row['id'] for row in rows] == list(range(1, expected_rows + 1))
+        # the field names (and schema) are shared by all rows
+        first_keys = list(rows[0])
+        for row in rows[1:]:
+            assert all(key is first_key for key, first_key in zip(row, first_keys))
+            if isinstance(row, Record):
+                assert row.schema is rows[0].schema
+
+    @pytest.mark.parametrize('small_response_max_bytes', [0, DEFAULT_SMALL_RESPONSE_MAX_BYTES])
+    @pytest.mark.parametrize('stream', [False, True])
+    async def test_results_small_response(
+        self, test_env: AsyncTestEnvironment, stream: bool, small_response_max_bytes: int
+    ) -> None:
+        expected_rows = 5
+        test_env.set_url_path('/test_results')
+        # stream the response in a single chunk
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': expected_rows, 'stream': stream, 'chunk_size': 2**16}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        q_opts = QueryOptions(stream_config=JsonStreamConfig(small_response_max_bytes=small_response_max_bytes))
+        result = await test_env.cluster_or_scope.execute_query(statement, q_opts)
+        assert isinstance(result, AsyncQueryResult)
+        if not stream:
+            # the Content-Length header determines the response is small
+            uses_json_stream = hasattr(result._http_response._request_context, '_json_stream')
+            assert uses_json_stream is (small_response_max_bytes == 0)
+        rows = await result.get_all_rows()
+        assert len(rows) == expected_rows
+        assert all(isinstance(row, dict) for row in rows)
+        assert result.metadata() is not None
+        test_env.assert_streaming_response_state(result)
+
+    async def test_results_small_response_compressed(self, test_env: AsyncTestEnvironment) -> None:
+        expected_rows = 500
+        small_response_max_bytes = 2**13
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': expected_rows, 'stream': False, 'compress': True}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        q_opts = QueryOptions(stream_config=JsonStreamConfig(small_response_max_bytes=small_response_max_bytes))
+        try:
+            test_env.update_http_compression(HttpCompression.GZIP)
+            result = await test_env.cluster_or_scope.execute_query(statement, q_opts)
+            assert isinstance(result, AsyncQueryResult)
+            # the Content-Length header is the compressed size, so it does not determine the response is small
+            assert hasattr(result._http_response._request_context, '_json_stream')
+            rows = await result.get_all_rows()
+            assert [row['id'] for row in rows] == list(range(1, expected_rows + 1))
+            received = result.metadata().http_bytes_received()
+            decoded = result.metadata().http_bytes_decoded()
+            assert received is not None and decoded is not None
+            assert received <= small_response_max_bytes < decoded
+        finally:
+            test_env.update_http_compression(None)
+
+    @pytest.mark.parametrize('stream', [False, True])
+    async def test_results_to_columns(self, test_env: AsyncTestEnvironment, stream: bool) -> None:
+        expected_rows = 50
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': expected_rows, 'stream': stream, 'chunk_size': 256}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        result = await test_env.cluster_or_scope.execute_query(statement)
+        assert isinstance(result, AsyncQueryResult)
+        columns = await result.to_columns()
+        assert isinstance(columns, ColumnarResult)
+        assert columns.row_count == expected_rows
+        assert list(columns) == ['id', 'name', 'city']
+        assert columns['id'].dtype == 'int64'
+        assert list(columns['id'].values) == list(range(1, expected_rows + 1))
+        assert columns['name'].dtype == 'object'
+        assert all(column.null_count == 0 for column in columns.values())
+        assert result.metadata() is not None
+
+    async def test_results_to_columns_non_object_rows(self, test_env: AsyncTestEnvironment) -> None:
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Raw.value, 'row_count': 500, 'stream': True, 'chunk_size': 256}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        result = await test_env.cluster_or_scope.execute_query(statement)
+        assert isinstance(result, AsyncQueryResult)
+        with pytest.raises(ValueError):
+            await result.to_columns()
+        # the remaining rows are not streamed once a batch cannot be added
+        test_env.assert_streaming_response_state(result)
+
+    @pytest.mark.parametrize('stream', [False, True])
+    @pytest.mark.parametrize('buffer_entire_response', [False, True])
+    @pytest.mark.parametrize(
+        'stream_config',
+        [None, JsonStreamConfig(decode_rows=True), JsonStreamConfig(split_raw_rows=True)],
+    )
+    @pytest.mark.parametrize('row_format', [None, RowFormat.TUPLE])
+    async def test_results_to_row_store(
+        self,
+        test_env: AsyncTestEnvironment,
+        tmp_path: pathlib.Path,
+        stream: bool,
+        buffer_entire_response: bool,
+        stream_config: Optional[JsonStreamConfig],
+        row_format: Optional[RowFormat],
+    ) -> None:
+        expected_rows = 50
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': expected_rows, 'stream': stream, 'chunk_size': 256}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        q_opts = QueryOptions(
+            buffer_entire_response=buffer_entire_response, stream_config=stream_config, row_format=row_format
+        )
+        result = await test_env.cluster_or_scope.execute_query(statement, q_opts)
+        assert isinstance(result, AsyncQueryResult)
+        with await result.to_row_store(memory_limit=2**12, directory=str(tmp_path)) as store:
+            assert isinstance(store, RowStore)
+            assert len(store) == expected_rows
+            if result._http_response.rows_buffered:
+                # the entire response is already in memory
+                assert store.spilled_row_count == 0
+            else:
+                assert 0 < store.spilled_row_count < expected_rows
+            id_idx: Union[int, str] = 0 if row_format == RowFormat.TUPLE else 'id'
+            assert [row[id_idx] for row in store] == list(range(1, expected_rows + 1))
+            assert store[-1][id_idx] == expected_rows
+            assert [row[id_idx] for row in store[10:40]] == list(range(11, 41))
+        assert os.listdir(tmp_path) == []
+        assert result.metadata() is not None
+
+    async def test_results_http_compression(self, test_env: AsyncTestEnvironment) -> None:
+        test_env.set_url_path('/test_results')
+        statement = 'SELECT "Hello, data!" AS greeting'
+        expected_rows = 500
+        test_env.update_request_json(
+            {
+                'result_type': ResultType.Object.value,
+                'row_count': expected_rows,
+                'stream': True,
+                'chunk_size': 1024,
+                'compress': True,
+            }
+        )
+        try:
+            test_env.update_http_compression(HttpCompression.GZIP)
+            result = await test_env.cluster_or_scope.execute_query(statement)
+            assert isinstance(result, AsyncQueryResult)
+            assert [row['id'] async for row in result.rows()] == list(range(1, expected_rows + 1))
+            received = result.metadata().http_bytes_received()
+            decoded = result.metadata().http_bytes_decoded()
+            assert received is not None and decoded is not None
+            assert 0 < received < decoded
+
+            test_env.update_http_compression(HttpCompression.NONE)
+            result = await test_env.cluster_or_scope.execute_query(statement)
+            assert isinstance(result, AsyncQueryResult)
+            assert [row['id'] async for row in result.rows()] == list(range(1, expected_rows + 1))
+            assert result.metadata().http_bytes_received() == result.metadata().http_bytes_decoded()
+        finally:
+            test_env.update_http_compression(None)
+
+    async def test_results_to_row_store_spill_error(
+        self, test_env: AsyncTestEnvironment, tmp_path: pathlib.Path
+    ) -> None:
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': 500, 'stream': True, 'chunk_size': 256}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        result = await test_env.cluster_or_scope.execute_query(statement)
+        assert isinstance(result, AsyncQueryResult)
+        # the temporary file cannot be created in a directory that does not exist
+        with pytest.raises(OSError):
+            await result.to_row_store(memory_limit=0, directory=str(tmp_path / 'missing'))
+        # the remaining rows are not streamed once a batch cannot be added
+        test_env.assert_streaming_response_state(result)
+
+    @pytest.mark.parametrize('stream', [False, True])
+    async def test_results_iter_arrow_batches(self, test_env: AsyncTestEnvironment, stream: bool) -> None:
+        pa = pytest.importorskip('pyarrow')
+        expected_rows = 50
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': expected_rows, 'stream': stream, 'chunk_size': 256}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        result = await test_env.cluster_or_scope.execute_query(statement)
+        assert isinstance(result, AsyncQueryResult)
+        batches = [batch async for batch in result.iter_arrow_batches(batch_size=20)]
+        assert [batch.num_rows for batch in batches] == [20, 20, 10]
+        assert all(isinstance(batch, pa.RecordBatch) for batch in batches)
+        table = pa.Table.from_batches(batches)
+        assert table.schema.names == ['id', 'name', 'city']
+        assert table.column('id').to_pylist() == list(range(1, expected_rows + 1))
+        assert result.metadata() is not None
+
+    @pytest.mark.parametrize('file_format', ['parquet', 'arrow_ipc'])
+    async def test_results_write_arrow_file(
+        self, test_env: AsyncTestEnvironment, tmp_path: pathlib.Path, file_format: str
+    ) -> None:
+        pa = pytest.importorskip('pyarrow')
+        pq = pytest.importorskip('pyarrow.parquet')
+        expected_rows = 50
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': expected_rows, 'stream': True, 'chunk_size': 256}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        result = await test_env.cluster_or_scope.execute_query(statement)
+        assert isinstance(result, AsyncQueryResult)
+        path = str(tmp_path / f'results.{file_format}')
+        if file_format == 'parquet':
+            assert await result.write_parquet(path, batch_size=20) == expected_rows
+            table = pq.read_table(path)
+        else:
+            assert await result.write_arrow_ipc(path, batch_size=20) == expected_rows
+            table = pa.ipc.open_file(path).read_all()
+        assert table.num_rows == expected_rows
+        assert table.column('id').to_pylist() == list(range(1, expected_rows + 1))
+        assert result.metadata() is not None
+
+    @pytest.mark.parametrize('file_format', [None, 'parquet', 'arrow_ipc'])
+    async def test_results_write_arrow_file_schema_mismatch(
+        self, test_env: AsyncTestEnvironment, tmp_path: pathlib.Path, file_format: Optional[str]
+    ) -> None:
+        pa = pytest.importorskip('pyarrow')
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': 500, 'stream': True, 'chunk_size': 256}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        result = await test_env.cluster_or_scope.execute_query(statement)
+        assert isinstance(result, AsyncQueryResult)
+        schema = pa.schema([('id', pa.string())])
+        path = str(tmp_path / f'results.{file_format}')
+        with pytest.raises(ValueError):
+            if file_format == 'parquet':
+                await result.write_parquet(path, batch_size=20, schema=schema)
+            elif file_format == 'arrow_ipc':
+                await result.write_arrow_ipc(path, batch_size=20, schema=schema)
+            else:
+                [batch async for batch in result.iter_arrow_batches(batch_size=20, schema=schema)]
+        # the remaining rows are not streamed once a batch cannot be converted
+        test_env.assert_streaming_response_state(result)
+
+    async def test_results_write_ndjson_sink_error(self, test_env: AsyncTestEnvironment) -> None:
+        class FailingSink(io.BytesIO):
+            def write(self, data: Any) -> int:
+                raise OSError('No space left on device')
+
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': 500, 'stream': True, 'chunk_size': 256}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        result = await test_env.cluster_or_scope.execute_query(statement)
+        assert isinstance(result, AsyncQueryResult)
+        with pytest.raises(OSError):
+            await result.write_ndjson(FailingSink())
+        # the remaining rows are not streamed once a batch cannot be written
+        test_env.assert_streaming_response_state(result)
+
+    @pytest.mark.parametrize('stream', [False, True])
+    @pytest.mark.parametrize('async_sink', [False, True])
+    @pytest.mark.parametrize('row_format', [None, RowFormat.TUPLE])
+    async def test_results_write_ndjson(
+        self, test_env: AsyncTestEnvironment, stream: bool, async_sink: bool, row_format: Optional[RowFormat]
+    ) -> None:
+        expected_rows = 50
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': expected_rows, 'stream': stream, 'chunk_size': 256}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        deserializer = CountingDeserializer()
+        result = await test_env.cluster_or_scope.execute_query(
+            statement, QueryOptions(deserializer=deserializer, row_format=row_format)
+        )
+        assert isinstance(result, AsyncQueryResult)
+        sink: Union[AsyncSink, io.BytesIO] = AsyncSink() if async_sink else io.BytesIO()
+        metadata_sink = io.BytesIO()
+        assert await result.write_ndjson(sink, metadata_trailer=True, metadata_sink=metadata_sink) == expected_rows
+        lines = sink.getvalue().split(b'\n')
+        # each row and the metadata trailer end w/ a newline
+        assert len(lines) == expected_rows + 2 and lines[-1] == b''
+        rows = [json.loads(line) for line in lines[:expected_rows]]
+        assert [row['id'] for row in rows] == list(range(1, expected_rows + 1))
+        assert all(list(row) == ['id', 'name', 'city'] for row in rows)
+        metadata = json.loads(lines[-2])
+        assert 'results' not in metadata
+        assert metadata == json.loads(metadata_sink.getvalue())
+        assert result.metadata() is not None
+        if isinstance(sink, AsyncSink):
+            assert sink.drain_count == sink.write_count > 0
+        # rows are written as received (w/o being deserialized or formatted), even if the response was read at once
+        assert deserializer.row_count == 0
+
+    @pytest.mark.parametrize('stream', [False, True])
+    @pytest.mark.parametrize(
+        'stream_config',
+        [
+            None,
+            JsonStreamConfig(row_batch_size=7),
+            JsonStreamConfig(decode_rows=True, row_batch_size=7),
+            JsonStreamConfig(split_raw_rows=True, row_batch_size=7),
+        ],
+    )
+    @pytest.mark.parametrize('buffer_entire_response', [False, True])
+    async def test_results_batch_handler(
+        self,
+        test_env: AsyncTestEnvironment,
+        stream: bool,
+        stream_config: Optional[JsonStreamConfig],
+        buffer_entire_response: bool,
+    ) -> None:
+        expected_rows = 50
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': expected_rows, 'stream': stream, 'chunk_size': 256}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        batches: List[List[Any]] = []
+        q_opts = QueryOptions(stream_config=stream_config, buffer_entire_response=buffer_entire_response)
+        metadata = await test_env.cluster_or_scope.execute_query(statement, q_opts, batch_handler=batches.append)
+        assert isinstance(metadata, QueryMetadata)
+        assert metadata.metrics().result_count() == expected_rows
+        row_batch_size = (stream_config or JsonStreamConfig()).row_batch_size
+        assert all(0 < len(batch) <= row_batch_size for batch in batches)
+        rows = [row for batch in batches for row in batch]
+        assert [row['id'] for row in rows] == list(range(1, expected_rows + 1))
+
+    @pytest.mark.parametrize('stream', [False, True])
+    @pytest.mark.parametrize('row_format', [None, RowFormat.TUPLE])
+    @pytest.mark.parametrize('use_coroutine', [False, True])
+    async def test_results_row_handler(
+        self, test_env: AsyncTestEnvironment, stream: bool, row_format: Optional[RowFormat], use_coroutine: bool
+    ) -> None:
+        expected_rows = 50
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': expected_rows, 'stream': stream, 'chunk_size': 256}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+        rows: List[Any] = []
+
+        async def append_row(row: Any) -> None:
+            rows.append(row)
+
+        row_handler = append_row if use_coroutine else rows.append
+        metadata = await test_env.cluster_or_scope.execute_query(
+            statement, QueryOptions(row_format=row_format), row_handler=row_handler
+        )
+        assert isinstance(metadata, QueryMetadata)
+        assert len(rows) == expected_rows
+        if row_format is None:
+            assert [row['id'] for row in rows] == list(range(1, expected_rows + 1))
+        else:
+            assert [row[0] for row in rows] == list(range(1, expected_rows + 1))
+
+    async def test_results_row_handler_errors(self, test_env: AsyncTestEnvironment) -> None:
+        test_env.set_url_path('/test_results')
+        test_env.update_request_json(
+            {'result_type': ResultType.Object.value, 'row_count': 50, 'stream': True, 'chunk_size': 256}
+        )
+        statement = 'SELECT "Hello, data!" AS greeting'
+
+        async def failing_handler(row: Any) -> None:
+            if row['id'] == 10:
+                raise KeyError('handler failure')
+
+        # the handler's exception is raised as-is
+        with pytest.raises(KeyError, match='handler failure'):
+            await test_env.cluster_or_scope.execute_query(statement, row_handler=failing_handler)
+
+        with pytest.raises(ValueError):
+            await test_env.cluster_or_scope.execute_query(statement, row_handler=print, batch_handler=print)  # type: ignore[call-overload]
+        with pytest.raises(ValueError):
+            await test_env.cluster_or_scope.execute_query(statement, row_handler='not callable')
+
+        test_env.set_url_path('/test_error')
+        test_env.update_request_json({'error_type': ErrorType.InsufficientPermissions.value})
+        with pytest.raises(QueryError):
+            await test_env.cluster_or_scope.execute_query(statement, row_handler=print)
+
 
 class ClusterTestServerTests(TestServerTestSuite):
     @pytest.fixture(scope='class', autouse=True)
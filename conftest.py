@@ -32,12 +32,18 @@ _UNIT_TESTS = [
     'acouchbase_analytics/tests/query_options_t.py::ScopeQueryOptionsTests',
     'acouchbase_analytics/tests/test_server_t.py::ClusterTestServerTests',
     'acouchbase_analytics/tests/test_server_t.py::ScopeTestServerTests',
+    'couchbase_analytics/tests/arrow_t.py::ArrowTests',
+    'couchbase_analytics/tests/columns_t.py::ColumnsTests',
     'couchbase_analytics/tests/connection_t.py::ConnectionTests',
     'couchbase_analytics/tests/duration_parsing_t.py::DurationParsingTests',
     'couchbase_analytics/tests/json_parsing_t.py::JsonParsingTests',
+    'couchbase_analytics/tests/ndjson_t.py::NdjsonTests',
     'couchbase_analytics/tests/options_t.py::ClusterOptionsTests',
     'couchbase_analytics/tests/query_options_t.py::ClusterQueryOptionsTests',
     'couchbase_analytics/tests/query_options_t.py::ScopeQueryOptionsTests',
+    'couchbase_analytics/tests/ring_buffer_t.py::RingBufferTests',
+    'couchbase_analytics/tests/row_format_t.py::RowFormatTests',
+    'couchbase_analytics/tests/row_store_t.py::RowStoreTests',
     'couchbase_analytics/tests/test_server_t.py::ClusterTestServerTests',
     'couchbase_analytics/tests/test_server_t.py::ScopeTestServerTests',
 ]
@@ -0,0 +1,5 @@
+# This file automatically generated by
+#    /root/package/couchbase_analytics_version.py
+# at
+#    2026-10-17 03:20:54.779403
+__version__ = '0.0.1'
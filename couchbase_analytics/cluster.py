@@ -20,6 +20,7 @@ from concurrent.futures import Future
 from typing import TYPE_CHECKING, Optional, Union
 
 from couchbase_analytics.database import Database
+from couchbase_analytics.query import QueryMetadata
 from couchbase_analytics.result import BlockingQueryResult
 
 if TYPE_CHECKING:
@@ -74,7 +75,7 @@ class Cluster:
 
     def execute_query(
         self, statement: str, *args: object, **kwargs: object
-    ) -> Union[Future[BlockingQueryResult], BlockingQueryResult]:
+    ) -> Union[Future[BlockingQueryResult], BlockingQueryResult, QueryMetadata]:
         """Executes a query against an Analytics cluster.
 
         .. note::
@@ -86,11 +87,18 @@ class Cluster:
         Args:
             statement: The SQL++ statement to execute.
             options (:class:`~couchbase_analytics.options.QueryOptions`): Optional parameters for the query operation.
+            row_handler (Callable[[Any], Any]): **VOLATILE** If provided, each row is handed to the handler as the response is parsed rather than being made available via a query result.  Cannot be used along with ``batch_handler``.
+            batch_handler (Callable[[List[Any]], Any]): **VOLATILE** If provided, each batch of rows (at most :attr:`~couchbase_analytics.common.json_parsing.JsonStreamConfig.row_batch_size` rows) is handed to the handler as the response is parsed rather than being made available via a query result.  Cannot be used along with ``row_handler``.
             **kwargs (Dict[str, Any]): keyword arguments that can be used in place or to override provided :class:`~couchbase_analytics.options.QueryOptions`
 
         Returns:
             :class:`~couchbase_analytics.result.BlockingQueryResult`: An instance of a :class:`~couchbase_analytics.result.BlockingQueryResult` which
-            provides access to iterate over the query results and access metadata and metrics about the query.
+            provides access to iterate over the query results and access metadata and metrics about the query.  If a ``row_handler`` or ``batch_handler``
+            is provided, the :class:`~couchbase_analytics.query.QueryMetadata` of the query is returned once all rows have been handed to the handler.
+
+        Raises:
+            ValueError: If both a ``row_handler`` and a ``batch_handler`` are provided.
+            RuntimeError: If a ``row_handler`` or ``batch_handler`` is provided for a query that is executed lazily or can be cancelled.
 
         Examples:
             Simple query::
@@ -136,6 +144,12 @@ class Cluster:
                 print(f'Query metadata: {q_res.metadata()}')
                 print(f'Query metrics: {q_res.metadata().metrics()}')
 
+            Hand each batch of rows to a handler as the response is parsed::
+
+                q_str = 'SELECT * FROM `travel-sample` WHERE country LIKE $country;'
+                metadata = cluster.execute_query(q_str, country='United%', batch_handler=sink.write_rows)
+                print(f'Query metrics: {metadata.metrics()}')
+
         """  # noqa: E501
         return self._impl.execute_query(statement, *args, **kwargs)
 
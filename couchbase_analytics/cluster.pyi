@@ -15,7 +15,7 @@
 
 import sys
 from concurrent.futures import Future
-from typing import overload
+from typing import Any, Callable, List, overload
 
 if sys.version_info < (3, 11):
     from typing_extensions import Unpack
@@ -26,6 +26,7 @@ from couchbase_analytics import JSONType
 from couchbase_analytics.credential import Credential
 from couchbase_analytics.database import Database
 from couchbase_analytics.options import ClusterOptions, ClusterOptionsKwargs, QueryOptions, QueryOptionsKwargs
+from couchbase_analytics.query import QueryMetadata
 from couchbase_analytics.result import BlockingQueryResult
 
 class Cluster:
@@ -114,6 +115,36 @@ class Cluster:
     def execute_query(
         self, statement: str, *args: JSONType, enable_cancel: bool, **kwargs: str
     ) -> Future[BlockingQueryResult]: ...
+    @overload
+    def execute_query(
+        self, statement: str, *args: JSONType, row_handler: Callable[[Any], Any], **kwargs: Unpack[QueryOptionsKwargs]
+    ) -> QueryMetadata: ...
+    @overload
+    def execute_query(
+        self,
+        statement: str,
+        options: QueryOptions,
+        *args: JSONType,
+        row_handler: Callable[[Any], Any],
+        **kwargs: Unpack[QueryOptionsKwargs],
+    ) -> QueryMetadata: ...
+    @overload
+    def execute_query(
+        self,
+        statement: str,
+        *args: JSONType,
+        batch_handler: Callable[[List[Any]], Any],
+        **kwargs: Unpack[QueryOptionsKwargs],
+    ) -> QueryMetadata: ...
+    @overload
+    def execute_query(
+        self,
+        statement: str,
+        options: QueryOptions,
+        *args: JSONType,
+        batch_handler: Callable[[List[Any]], Any],
+        **kwargs: Unpack[QueryOptionsKwargs],
+    ) -> QueryMetadata: ...
     def shutdown(self) -> None: ...
     @overload
     @classmethod
@@ -14,6 +14,7 @@
 #  limitations under the License.
 
 
+from .json_parser_backend import JsonParserBackend as JsonParserBackend  # noqa: F401
 from .json_parsing import JsonStreamConfig as JsonStreamConfig  # noqa: F401
 from .json_parsing import ParsedResult as ParsedResult  # noqa: F401
 from .json_parsing import ParsedResultType as ParsedResultType  # noqa: F401
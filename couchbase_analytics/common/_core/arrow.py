@@ -0,0 +1,236 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from enum import Enum
+from itertools import chain
+from typing import Any, List, Optional
+
+DEFAULT_ARROW_BATCH_SIZE = 10000
+# the number of rows an ArrowFileWriter holds while waiting for the type of every (so far all null) field to be known
+DEFAULT_ARROW_MAX_PENDING_ROWS = 10 * DEFAULT_ARROW_BATCH_SIZE
+
+
+def import_pyarrow() -> Any:
+    """
+    **INTERNAL**
+
+    Raises:
+        ImportError: If the pyarrow package is not installed.
+    """
+    try:
+        import pyarrow  # type: ignore[import-untyped, import-not-found, unused-ignore]
+    except ImportError:
+        raise ImportError('Arrow record batches require the pyarrow package.') from None
+    return pyarrow
+
+
+class ArrowFileFormat(Enum):
+    """
+    **INTERNAL**
+    """
+
+    PARQUET = 'parquet'
+    ARROW_IPC = 'arrow_ipc'
+
+
+class ArrowBatchBuilder:
+    """
+    **INTERNAL**
+
+    Builds a pyarrow ``RecordBatch`` from each batch of object rows.
+
+    If a schema is not provided, the schema is inferred from the first (non-empty) batch and then used for every
+    following batch, so that all batches share a single schema (as required by the Parquet and Arrow IPC writers).  A
+    field that is null in every row of the first batch(es) has the ``null`` type, which is resolved (i.e. inferred from
+    a later batch) once a non-null value is received; batches built prior to that keep the ``null`` type for the field.
+    """
+
+    def __init__(self, schema: Optional[Any] = None) -> None:
+        self._pa = import_pyarrow()
+        if schema is not None and not isinstance(schema, self._pa.Schema):
+            raise ValueError(f'Expected schema to be of type pyarrow.Schema instead of {type(schema)}.')
+        self._schema = schema
+        self._schema_inferred = False
+        self._has_null_fields = False
+
+    @property
+    def schema(self) -> Optional[Any]:
+        return self._schema
+
+    def _resolve_null_fields(self, schema: Any, rows: List[Any]) -> None:
+        for idx, field in enumerate(schema):
+            if not self._pa.types.is_null(field.type):
+                continue
+            try:
+                field_type = self._pa.array([row.get(field.name) for row in rows]).type
+            except (self._pa.ArrowInvalid, self._pa.ArrowTypeError) as ex:
+                raise ValueError(f'Unable to convert rows to an Arrow record batch: {ex}') from None
+            if not self._pa.types.is_null(field_type):
+                schema = schema.set(idx, field.with_type(field_type))
+        self._schema = schema
+        self._has_null_fields = any(self._pa.types.is_null(field.type) for field in schema)
+
+    def _validate_fields(self, schema: Any, rows: List[Any]) -> None:
+        # an inferred schema would otherwise silently drop fields which first appear in a later batch
+        names = set(schema.names)
+        new_fields = [field for field in dict.fromkeys(chain.from_iterable(rows)) if field not in names]
+        if new_fields:
+            raise ValueError(
+                f'Row fields {new_fields} are not in the schema inferred from the first batch of rows.  '
+                'Provide a schema in order to handle rows with differing fields.'
+            )
+
+    def to_record_batch(self, rows: List[Any]) -> Any:
+        """
+        **INTERNAL**
+
+        Raises:
+            ValueError: If a row is not an object (i.e. a mapping) or a row does not fit the schema.
+        """
+        if not all(type(row) is dict for row in rows):
+            rows = [self._to_dict(row) for row in rows]
+        if self._schema_inferred:
+            self._validate_fields(self._schema, rows)
+            if self._has_null_fields:
+                self._resolve_null_fields(self._schema, rows)
+        try:
+            batch = self._pa.RecordBatch.from_pylist(rows, schema=self._schema)
+        except (self._pa.ArrowInvalid, self._pa.ArrowTypeError) as ex:
+            raise ValueError(f'Unable to convert rows to an Arrow record batch: {ex}') from None
+        if self._schema is None and rows:
+            self._schema = batch.schema
+            self._schema_inferred = True
+            self._has_null_fields = any(self._pa.types.is_null(field.type) for field in batch.schema)
+        return batch
+
+    @staticmethod
+    def _to_dict(row: Any) -> Any:
+        if type(row) is dict:
+            return row
+        if isinstance(row, Mapping):
+            return dict(row)
+        raise ValueError(f'Expected rows to be JSON objects in order to build Arrow record batches, got {type(row)}.')
+
+
+class ArrowFileWriter:
+    """
+    **INTERNAL**
+
+    Writes RecordBatches, one at a time, to a Parquet or Arrow IPC file.  The underlying writer is opened with the
+    schema of the first batch.  As every batch written to the file must share that schema, batches w/ ``null`` typed
+    fields (see :class:`ArrowBatchBuilder`) are held (up to ``max_pending_rows`` rows) until a batch resolves the type
+    of each of those fields; the held batches are then cast to the resolved schema.
+    """
+
+    def __init__(
+        self, path: Any, file_format: ArrowFileFormat, max_pending_rows: int = DEFAULT_ARROW_MAX_PENDING_ROWS
+    ) -> None:
+        self._pa = import_pyarrow()
+        self._path = path
+        self._file_format = file_format
+        self._max_pending_rows = max_pending_rows
+        self._writer: Optional[Any] = None
+        self._schema: Optional[Any] = None
+        self._pending: List[Any] = []
+        self._pending_rows = 0
+        self._row_count = 0
+
+    @property
+    def row_count(self) -> int:
+        return self._row_count
+
+    def _open(self, schema: Any) -> Any:
+        if self._file_format is ArrowFileFormat.PARQUET:
+            import pyarrow.parquet  # type: ignore[import-untyped, import-not-found, unused-ignore]
+
+            return pyarrow.parquet.ParquetWriter(self._path, schema)
+        return self._pa.ipc.new_file(self._path, schema)
+
+    def _has_null_fields(self, schema: Any) -> bool:
+        return any(self._pa.types.is_null(field.type) for field in schema)
+
+    def _open_with_pending(self, schema: Any) -> None:
+        pending = self._pending
+        self._pending = []
+        self._pending_rows = 0
+        self._schema = schema
+        self._writer = self._open(schema)
+        for batch in pending:
+            self._write(batch)
+
+    def _write(self, batch: Any) -> None:
+        schema: Any = self._schema
+        if batch.schema != schema:
+            try:
+                if batch.schema.names != schema.names:
+                    raise ValueError('the fields differ')
+                columns = [column.cast(field.type) for column, field in zip(batch.columns, schema)]
+                batch = self._pa.RecordBatch.from_arrays(columns, schema=schema)
+            except (self._pa.ArrowInvalid, self._pa.ArrowNotImplementedError, ValueError) as ex:
+                raise ValueError(
+                    f'Unable to write a batch w/ schema {batch.schema} to a file w/ schema {schema}: {ex}.  '
+                    'Provide a schema in order to handle fields whose type is not known from the first rows.'
+                ) from None
+        if batch.num_rows > 0:
+            self._writer.write_batch(batch)  # type: ignore[union-attr]
+            self._row_count += batch.num_rows
+
+    def write_batch(self, batch: Any) -> None:
+        """
+        **INTERNAL**
+
+        Raises:
+            ValueError: If the batch does not fit the schema the file was opened with.
+        """
+        if self._writer is None:
+            if self._has_null_fields(batch.schema) and self._pending_rows + batch.num_rows <= self._max_pending_rows:
+                self._pending.append(batch)
+                self._pending_rows += batch.num_rows
+                return
+            self._open_with_pending(batch.schema)
+        self._write(batch)
+
+    def close(self) -> None:
+        """
+        **INTERNAL**
+        """
+        self._pending = []
+        self._pending_rows = 0
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def finish(self, schema: Optional[Any] = None) -> int:
+        """
+        **INTERNAL**
+
+        Args:
+            schema: The schema used to open the file if it has not been opened (i.e. no batch was written, or every
+                batch was held) which should be the builder's (resolved) schema.  Defaults to the schema of the last
+                held batch, or no columns.
+
+        Returns:
+            The number of rows written.
+        """
+        if self._writer is None:
+            if schema is None:
+                schema = self._pending[-1].schema if self._pending else self._pa.schema([])
+            self._open_with_pending(schema)
+        self.close()
+        return self._row_count
@@ -0,0 +1,232 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Any, Callable, Deque, List, Optional
+
+from couchbase_analytics.common._core.json_parsing import JsonStreamConfig
+
+# the adaptive buffer size is reduced once the consumer has not had to wait on the producer for this many pauses
+ADAPTIVE_SHRINK_AFTER_PAUSES = 4
+ADAPTIVE_SHRINK_FACTOR = 0.75
+
+
+class BufferedBytes:
+    """
+    **INTERNAL**
+
+    Tracks the size of the rows a JSON stream has produced (parsed) but the consumer has not yet consumed, so that
+    backpressure can be based on the size of the buffered rows rather than the number of buffered rows.
+
+    The size of a raw row is the size of its JSON.  Rows decoded by the JSON stream are assumed to be the average size
+    of the rows received so far (i.e. the size of the HTTP response received so far divided by the number of rows).
+    Only the producer updates the produced counters and only the consumer updates the consumed counters.
+
+    If ``buffered_bytes_min`` is set, the buffer's size adapts between ``buffered_bytes_min`` and
+    ``buffered_bytes_max`` to the measured producer and consumer rates.  Each time the producer pauses because the
+    buffer is full, the buffer grows by the amount the consumer could have consumed while it waited on the (faster)
+    producer to resume, and shrinks once the consumer has not had to wait for a number of pauses.
+    """
+
+    def __init__(self, stream_config: JsonStreamConfig, clock: Optional[Callable[[], float]] = None) -> None:
+        max_bytes = stream_config.buffered_bytes_max
+        if max_bytes is None:
+            raise ValueError('Bytes-based backpressure requires buffered_bytes_max to be set.')
+        min_bytes = stream_config.buffered_bytes_min
+        self._clock = clock if clock is not None else time.monotonic
+        self._threshold_percent = stream_config.buffered_row_threshold_percent
+        self._max_bytes = max_bytes
+        self._min_bytes = min_bytes if min_bytes is not None else max_bytes
+        self._buffer_size = float(self._min_bytes)
+        self._threshold = self._get_threshold()
+
+        # producer
+        self._produced = 0.0
+        self._rows_produced = 0
+        self._http_bytes = 0
+        self._pending_batch_size = 0.0
+        self._last_batch_size = 0.0
+        self._batch_sizes: Deque[float] = deque()
+        self._production_started: Optional[float] = None
+        self._production_time = 0.0
+
+        # consumer
+        self._consumed = 0.0
+        # (rows not yet consumed, row size) for each batch received by the consumer
+        self._received_batches: Deque[List[float]] = deque()
+        self._consumer_wait_time = 0.0
+
+        # adaptive sizing, updated by the producer each time it pauses
+        self._last_pause: Optional[float] = None
+        self._consumed_at_last_pause = 0.0
+        self._consumer_wait_time_at_last_pause = 0.0
+        self._pauses_without_wait = 0
+
+    @property
+    def adaptive(self) -> bool:
+        return self._min_bytes < self._max_bytes
+
+    @property
+    def buffer_size(self) -> int:
+        """
+        **INTERNAL**
+
+        The current size (in bytes) of the buffer, backpressure is applied once the size of the buffered rows reaches
+        the buffer's threshold (i.e. ``buffered_row_threshold_percent`` of the buffer's size).
+        """
+        return int(self._buffer_size)
+
+    @property
+    def buffered(self) -> float:
+        """
+        **INTERNAL**
+
+        The size of the rows that have been produced, but not yet consumed.
+        """
+        return self._produced - self._consumed
+
+    def _get_threshold(self) -> float:
+        return max(self._buffer_size * self._threshold_percent, 1.0)
+
+    def over_threshold(self) -> bool:
+        return self._produced - self._consumed >= self._threshold
+
+    def above_resume_threshold(self) -> bool:
+        """
+        **INTERNAL**
+
+        True until the consumer has made room for (at least) another batch of rows the size of the last batch, or has
+        consumed all of the buffered rows (a single batch can be larger than the threshold).
+        """
+        buffered = self._produced - self._consumed
+        # allow for floating point error, every row is at least a byte
+        return buffered >= 1 and buffered + self._last_batch_size > self._threshold
+
+    def add_http_bytes(self, size: int) -> None:
+        self._http_bytes += size
+
+    def add_row(self, row: Any) -> None:
+        """
+        **INTERNAL**
+
+        Called by the producer for each row that has been produced.
+        """
+        self._rows_produced += 1
+        if type(row) is bytes or type(row) is memoryview:
+            size = float(len(row))
+        else:
+            size = self._http_bytes / self._rows_produced
+        self._produced += size
+        self._pending_batch_size += size
+
+    def add_batch(self) -> None:
+        """
+        **INTERNAL**
+
+        Called by the producer before a batch of rows is handed off to the consumer.
+        """
+        self._batch_sizes.append(self._pending_batch_size)
+        self._last_batch_size = self._pending_batch_size
+        self._pending_batch_size = 0.0
+
+    def receive_batch(self, row_count: int) -> None:
+        """
+        **INTERNAL**
+
+        Called by the consumer for each batch of rows it receives.
+        """
+        batch_size = self._batch_sizes.popleft() if self._batch_sizes else 0.0
+        if row_count > 0:
+            self._received_batches.append([float(row_count), batch_size / row_count])
+
+    def consume_rows(self, row_count: int) -> None:
+        """
+        **INTERNAL**
+
+        Called by the consumer for rows consumed from the batches it has received (rows are consumed in order).
+        """
+        received_batches = self._received_batches
+        while row_count > 0 and received_batches:
+            batch = received_batches[0]
+            consumed_rows = min(row_count, batch[0])
+            self._consumed += consumed_rows * batch[1]
+            row_count -= int(consumed_rows)
+            batch[0] -= consumed_rows
+            if batch[0] <= 0:
+                received_batches.popleft()
+
+    def add_consumer_wait_time(self, wait_time: float) -> None:
+        """
+        **INTERNAL**
+
+        Called by the consumer after it has waited on the producer because the buffer was empty.
+        """
+        self._consumer_wait_time += wait_time
+
+    def start_producing(self) -> None:
+        """
+        **INTERNAL**
+
+        Called by the producer each time it starts (or resumes) processing the stream.
+        """
+        self._production_started = self._clock()
+
+    def pause_producing(self) -> None:
+        """
+        **INTERNAL**
+
+        Called by the producer when it pauses because the buffer is full.  Adapts the buffer's size to the measured
+        producer and consumer rates.
+        """
+        now = self._clock()
+        if self._production_started is not None:
+            self._production_time += now - self._production_started
+            self._production_started = None
+        if not self.adaptive:
+            return
+        if self._last_pause is None:
+            self._last_pause = now
+            self._consumed_at_last_pause = self._consumed
+            self._consumer_wait_time_at_last_pause = self._consumer_wait_time
+            return
+
+        elapsed = now - self._last_pause
+        consumer_wait_time = self._consumer_wait_time - self._consumer_wait_time_at_last_pause
+        consumed = self._consumed - self._consumed_at_last_pause
+        self._last_pause = now
+        self._consumed_at_last_pause = self._consumed
+        self._consumer_wait_time_at_last_pause = self._consumer_wait_time
+
+        consuming_time = elapsed - consumer_wait_time
+        consumer_rate = consumed / consuming_time if consuming_time > 0 else 0.0
+        producer_rate = self._produced / self._production_time if self._production_time > 0 else 0.0
+        if consumer_wait_time > 0 and producer_rate > consumer_rate:
+            # the producer is able to keep up, the consumer only had to wait while the producer was paused (i.e. the
+            # buffer drained before the producer resumed), buffer what the consumer could have consumed in that time
+            self._pauses_without_wait = 0
+            self._resize(self._buffer_size + max(consumer_rate * consumer_wait_time, self._min_bytes))
+        elif consumer_wait_time <= 0:
+            self._pauses_without_wait += 1
+            if self._pauses_without_wait >= ADAPTIVE_SHRINK_AFTER_PAUSES:
+                self._pauses_without_wait = 0
+                self._resize(self._buffer_size * ADAPTIVE_SHRINK_FACTOR)
+
+    def _resize(self, buffer_size: float) -> None:
+        self._buffer_size = float(min(max(buffer_size, self._min_bytes), self._max_bytes))
+        self._threshold = self._get_threshold()
@@ -0,0 +1,229 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping
+from itertools import chain
+from typing import Any, Dict, List, Optional
+
+from couchbase_analytics.common.columns import Column, ColumnarResult
+
+_INT64 = 'int64'
+_FLOAT64 = 'float64'
+_BOOL = 'bool'
+_OBJECT = 'object'
+
+_TYPECODES = {_INT64: 'q', _FLOAT64: 'd', _BOOL: 'B'}
+# the value types each (non-object) dtype can hold w/o being widened
+_ACCEPTED_TYPES = {_INT64: (int,), _FLOAT64: (float, int), _BOOL: (bool,)}
+_NONE_TYPE = type(None)
+_ACCEPTED_TYPES_WITH_NULL = {dtype: frozenset((*types, _NONE_TYPE)) for dtype, types in _ACCEPTED_TYPES.items()}
+_NUMPY_DTYPES = {_INT64: 'int64', _FLOAT64: 'float64', _BOOL: 'bool'}
+# ints beyond this magnitude are not exactly representable as a float64
+_MAX_FLOAT64_INT = 2**53
+
+
+def _fits_float64(values: Any) -> bool:
+    return all(-_MAX_FLOAT64_INT <= value <= _MAX_FLOAT64_INT for value in values if type(value) is int)
+
+
+class _ColumnBuffer:
+    """
+    **INTERNAL**
+
+    The values of a single column.  The column's dtype is determined by the first non-null value and is widened (i.e.
+    int64 -> float64 -> object, bool -> object) if a later value does not fit.  Ints are only held as float64 if they
+    are exactly representable (i.e. |v| <= 2**53), otherwise the column is widened to object.  The positions of the
+    ints held as float64 are tracked, so that the ints are restored if the column is later widened to object.
+    """
+
+    __slots__ = ('dtype', 'values', 'null_mask', 'int_mask')
+
+    def __init__(self, null_count: int) -> None:
+        # the dtype is unknown until the first non-null value
+        self.dtype: Optional[str] = None
+        self.values: Any = [None] * null_count
+        self.null_mask = bytearray(b'\x01' * null_count)
+        # only set for a float64 column, marks the values that were ints
+        self.int_mask: Optional[bytearray] = None
+
+    def _set_dtype(self, value: Any) -> None:
+        value_type = type(value)
+        if value_type is bool:
+            dtype = _BOOL
+        elif value_type is int:
+            dtype = _INT64 if -(2**63) <= value < 2**63 else _OBJECT
+        elif value_type is float:
+            dtype = _FLOAT64
+        else:
+            dtype = _OBJECT
+        self.dtype = dtype
+        if dtype != _OBJECT:
+            self.values = array(_TYPECODES[dtype], bytes(len(self.values) * array(_TYPECODES[dtype]).itemsize))
+        if dtype == _FLOAT64:
+            self.int_mask = bytearray(len(self.values))
+
+    def _to_object(self) -> None:
+        values = self.values.tolist()
+        if self.dtype == _BOOL:
+            values = [bool(value) for value in values]
+        elif self.int_mask is not None:
+            for idx, is_int in enumerate(self.int_mask):
+                if is_int:
+                    values[idx] = int(values[idx])
+            self.int_mask = None
+        for idx, is_null in enumerate(self.null_mask):
+            if is_null:
+                values[idx] = None
+        self.values = values
+        self.dtype = _OBJECT
+
+    def _widen(self, value: Any) -> None:
+        if self.dtype == _INT64 and type(value) is float and _fits_float64(self.values):
+            self.values = array(_TYPECODES[_FLOAT64], self.values)
+            self.int_mask = bytearray(1 - is_null for is_null in self.null_mask)
+            self.dtype = _FLOAT64
+        else:
+            self._to_object()
+
+    def append(self, value: Any) -> None:
+        if value is None:
+            self.append_null()
+            return
+        if self.dtype is None:
+            self._set_dtype(value)
+        dtype = self.dtype
+        if dtype != _OBJECT and type(value) not in _ACCEPTED_TYPES[dtype]:  # type: ignore[index]
+            self._widen(value)
+        elif dtype == _FLOAT64 and not _fits_float64((value,)):
+            self._to_object()
+        try:
+            self.values.append(value)
+        except OverflowError:
+            # an int which does not fit in an int64
+            self._to_object()
+            self.values.append(value)
+        self.null_mask.append(0)
+        if self.int_mask is not None:
+            self.int_mask.append(type(value) is int)
+
+    def extend(self, values: List[Any]) -> None:
+        value_types = set(map(type, values))
+        has_nulls = _NONE_TYPE in value_types
+        if self.dtype is None and len(value_types) > has_nulls:
+            self._set_dtype(next(value for value in values if value is not None))
+        dtype = self.dtype
+        if (
+            dtype is None
+            or (dtype != _OBJECT and not value_types.issubset(_ACCEPTED_TYPES_WITH_NULL[dtype]))
+            or (dtype == _FLOAT64 and int in value_types and not _fits_float64(values))
+        ):
+            # not all of the values fit the current dtype (or they are all null), handle each value individually
+            for value in values:
+                self.append(value)
+            return
+
+        start = len(self.null_mask)
+        try:
+            if has_nulls and dtype != _OBJECT:
+                self.values.extend([0 if value is None else value for value in values])
+            else:
+                self.values.extend(values)
+        except OverflowError:
+            # an int which does not fit in an int64, a partial extend needs to be undone
+            del self.values[start:]
+            for value in values:
+                self.append(value)
+            return
+        self.null_mask.extend(bytes([value is None for value in values]) if has_nulls else bytes(len(values)))
+        if self.int_mask is not None:
+            self.int_mask.extend(
+                bytes([type(value) is int for value in values]) if int in value_types else bytes(len(values))
+            )
+
+    def append_null(self) -> None:
+        self.values.append(None if self.dtype is None or self.dtype == _OBJECT else 0)
+        self.null_mask.append(1)
+        if self.int_mask is not None:
+            self.int_mask.append(0)
+
+    def to_column(self, name: str, use_numpy: bool) -> Column:
+        dtype = self.dtype or _OBJECT
+        if not use_numpy:
+            return Column(name, dtype, self.values, self.null_mask)
+        import numpy  # type: ignore[import-not-found, unused-ignore]
+
+        values = self.values
+        if dtype != _OBJECT:
+            values = numpy.frombuffer(values, dtype=_NUMPY_DTYPES[dtype])
+        return Column(name, dtype, values, numpy.frombuffer(self.null_mask, dtype='bool'))
+
+
+class ColumnBuilder:
+    """
+    **INTERNAL**
+
+    Transposes (batches of) object rows into per-field column buffers, so that rows can be released as soon as they
+    have been added.  A field missing from a row is null for that row.
+    """
+
+    def __init__(self, use_numpy: Optional[bool] = False) -> None:
+        self._use_numpy = use_numpy is True
+        if self._use_numpy:
+            try:
+                import numpy  # type: ignore[import-not-found, unused-ignore]  # noqa: F401
+            except ImportError:
+                raise ImportError('Columns as NumPy arrays requires the numpy package.') from None
+        self._columns: Dict[str, _ColumnBuffer] = {}
+        self._row_count = 0
+
+    @property
+    def row_count(self) -> int:
+        return self._row_count
+
+    def add_rows(self, rows: List[Any]) -> None:
+        """
+        **INTERNAL**
+
+        Raises:
+            ValueError: If a row is not an object (i.e. a mapping).
+        """
+        if not rows:
+            return
+        for row in rows:
+            if type(row) is not dict and not isinstance(row, Mapping):
+                raise ValueError(f'Expected rows to be JSON objects in order to build columns, got {type(row)}.')
+        columns = self._columns
+        # every field of the batch, in the order each field is first encountered
+        for field in dict.fromkeys(chain.from_iterable(rows)):
+            column = columns.get(field)
+            if column is None:
+                column = columns[field] = _ColumnBuffer(self._row_count)
+            column.extend([row.get(field) for row in rows])
+        self._row_count += len(rows)
+        for column in columns.values():
+            if len(column.null_mask) < self._row_count:
+                # none of the rows of the batch contain the field
+                column.extend([None] * (self._row_count - len(column.null_mask)))
+
+    def build(self) -> ColumnarResult:
+        """
+        **INTERNAL**
+        """
+        columns = {name: column.to_column(name, self._use_numpy) for name, column in self._columns.items()}
+        return ColumnarResult(columns, self._row_count)
@@ -0,0 +1,66 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+from importlib.util import find_spec
+from typing import Dict, Optional, Tuple, Union
+
+from couchbase_analytics.common.enums import HttpCompression
+
+# the packages httpx uses to decode the content encoding, gzip is always available
+_DECODER_PACKAGES: Dict[HttpCompression, Tuple[str, ...]] = {
+    HttpCompression.ZSTD: ('zstandard',),
+    HttpCompression.BROTLI: ('brotli', 'brotlicffi'),
+}
+
+
+def is_compression_available(compression: HttpCompression) -> bool:
+    """
+    **INTERNAL**
+
+    True if responses w/ the content encoding can be decoded.
+    """
+    packages = _DECODER_PACKAGES.get(compression)
+    if packages is None:
+        return True
+    return any(find_spec(package) is not None for package in packages)
+
+
+def get_accept_encoding(compression: Optional[Union[HttpCompression, str]] = None) -> Optional[str]:
+    """
+    **INTERNAL**
+
+    Returns:
+        The value of the Accept-Encoding header for the compression setting, or None if the HTTP client's default
+        should be used.
+
+    Raises:
+        ValueError: If the content encoding is not available.
+    """
+    if compression is None:
+        return None
+    compression = HttpCompression(compression)
+    if compression is HttpCompression.NONE:
+        return 'identity'
+    if compression is HttpCompression.AUTO:
+        # in order of preference, Analytics JSON compresses best w/ zstd and br
+        preferred = (HttpCompression.ZSTD, HttpCompression.BROTLI, HttpCompression.GZIP)
+        return ', '.join(c.value for c in preferred if is_compression_available(c))
+    if not is_compression_available(compression):
+        packages = ' or '.join(_DECODER_PACKAGES[compression])
+        raise ValueError(f'HTTP compression {compression.value} is not available, it requires the {packages} package.')
+    return str(compression.value)
@@ -0,0 +1,157 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+from enum import Enum
+from importlib.util import find_spec
+from typing import Any, Dict, List, Optional, Tuple
+
+import ijson
+
+from couchbase_analytics.common._core.json_row_splitter import RawRow, split_rows
+from couchbase_analytics.common._core.json_token_parser_base import JsonTokenParsingError
+
+
+class JsonParserBackend(Enum):
+    """
+    **INTERNAL**
+
+    The JSON parser backend used to process an Analytics response.
+
+    AUTO: Use the fastest streaming backend available, YAJL2_C (falling back to PYTHON if ijson's C extension is not
+        available).
+    YAJL2_C: Streaming ijson backend using ijson's yajl2 C extension.
+    PYTHON: Streaming ijson backend implemented in pure Python.
+    SIMDJSON: Whole-buffer backend using the optional pysimdjson package.  The entire HTTP response is read prior to
+        parsing, so rows are not available until the response has been received.  Best suited for use along with
+        ``buffer_entire_result``.  Must be explicitly selected.
+    """
+
+    AUTO = 'auto'
+    YAJL2_C = 'yajl2_c'
+    PYTHON = 'python'
+    SIMDJSON = 'simdjson'
+
+    @property
+    def is_streaming(self) -> bool:
+        return self in (JsonParserBackend.YAJL2_C, JsonParserBackend.PYTHON)
+
+
+_IJSON_BACKENDS: Dict[JsonParserBackend, Any] = {}
+
+
+def _load_ijson_backend(backend: JsonParserBackend) -> Optional[Any]:
+    if backend in _IJSON_BACKENDS:
+        return _IJSON_BACKENDS[backend]
+    try:
+        module = ijson.get_backend(backend.value)
+    except ImportError:
+        module = None
+    _IJSON_BACKENDS[backend] = module
+    return module
+
+
+def is_parser_backend_available(backend: JsonParserBackend) -> bool:
+    """
+    **INTERNAL**
+    """
+    if backend is JsonParserBackend.AUTO:
+        return True
+    if backend is JsonParserBackend.SIMDJSON:
+        return find_spec('simdjson') is not None
+    return _load_ijson_backend(backend) is not None
+
+
+def resolve_parser_backend(backend: Optional[JsonParserBackend] = None) -> JsonParserBackend:
+    """
+    **INTERNAL**
+
+    Resolves the requested backend to a concrete backend.
+
+    Raises:
+        ValueError: If the requested backend is not available.
+    """
+    if backend is None or backend is JsonParserBackend.AUTO:
+        if is_parser_backend_available(JsonParserBackend.YAJL2_C):
+            return JsonParserBackend.YAJL2_C
+        return JsonParserBackend.PYTHON
+
+    if not isinstance(backend, JsonParserBackend):
+        raise ValueError(f'Expected value to be of type JsonParserBackend instead of {type(backend)}.')
+    if not is_parser_backend_available(backend):
+        raise ValueError(f'JSON parser backend {backend.value} is not available.')
+    return backend
+
+
+def get_ijson_backend(backend: JsonParserBackend) -> Any:
+    """
+    **INTERNAL**
+
+    Returns the ijson backend module (providing ``parse`` and ``parse_async``) for a streaming backend.
+    """
+    if not backend.is_streaming:
+        raise ValueError(f'JSON parser backend {backend.value} is not a streaming backend.')
+    module = _load_ijson_backend(backend)
+    if module is None:
+        raise ValueError(f'JSON parser backend {backend.value} is not available.')
+    return module
+
+
+class WholeBufferJsonParser:
+    """
+    **INTERNAL**
+
+    Parses a fully buffered Analytics response using simdjson.
+
+    simdjson validates the entire document; the rows are then sliced from the original bytes (see
+    :class:`~couchbase_analytics.common._core.json_row_splitter.JsonRowSplitter`) so that each row is exactly what the
+    server sent.  When ``emit_results_enabled`` is ``False`` the validated response is returned as-is.
+    """
+
+    def __init__(self, emit_results_enabled: Optional[bool] = True) -> None:
+        import simdjson  # type: ignore[import-not-found, unused-ignore]
+
+        self._simdjson = simdjson
+        self._parser = simdjson.Parser()
+        self._emit_results_enabled = emit_results_enabled is True
+
+    def parse(self, data: bytes) -> Tuple[List[RawRow], bytes, bool]:
+        """
+        **INTERNAL**
+
+        Returns:
+            A tuple of the rows, the remaining JSON content and whether the response contains errors.
+
+        Raises:
+            JsonTokenParsingError: If the JSON content is invalid.
+        """
+        try:
+            doc = self._parser.parse(data, recursive=False)
+        except ValueError as ex:
+            raise JsonTokenParsingError(str(ex)) from None
+
+        try:
+            has_errors = isinstance(doc, self._simdjson.Object) and 'errors' in doc
+        finally:
+            # simdjson proxies must be released before the parser can be reused
+            del doc
+
+        if not self._emit_results_enabled:
+            return [], data.strip(b' \t\n\r'), has_errors
+
+        rows, remaining = split_rows(data)
+        return rows, remaining, has_errors
@@ -16,22 +16,98 @@
 
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
 from enum import IntEnum
-from typing import NamedTuple, Optional
+from typing import Any, Dict, NamedTuple, Optional
 
-# buffer size in httpcore is 2 ** 16 (65kiB) which matches the default buffer size in ijson
-# passing in a chunk_size is only applying an abstraction over the httpcore stream
+from couchbase_analytics.common._core.json_parser_backend import JsonParserBackend
+from couchbase_analytics.common._core.json_row_decoder import DEFAULT_ROW_SHAPE_SAMPLE_SIZE
+
+# DEPRECATED: the JSON streams send each HTTP chunk to the parser as it is received, so the buffer size is not used
 DEFAULT_HTTP_STREAM_BUFFER_SIZE = 2**16
+# responses up to this (decoded) size, per the Content-Length header of an uncompressed response or if the entire
+# response is within the first HTTP chunk, are decoded at once instead of being processed via the JSON stream
+DEFAULT_SMALL_RESPONSE_MAX_BYTES = 2**14
+# when the remaining rows are no longer needed (e.g. the request is cancelled), up to this many bytes of the remaining
+# HTTP response are read (within DEFAULT_DRAIN_ON_CLOSE_TIMEOUT seconds) so that the connection can be reused
+DEFAULT_DRAIN_ON_CLOSE_MAX_BYTES = 2**18
+DEFAULT_DRAIN_ON_CLOSE_TIMEOUT = 0.1
 
 
 @dataclass
 class JsonStreamConfig:
+    # DEPRECATED: has no effect (each HTTP chunk is sent to the parser as it is received), only kept so that existing
+    # configurations remain valid; will be removed in a future release
     http_stream_buffer_size: int = DEFAULT_HTTP_STREAM_BUFFER_SIZE
     buffer_entire_result: bool = False
     buffered_row_max: int = 100
     buffered_row_threshold_percent: float = 0.75
+    # if set, backpressure is based on the size (in bytes) of the buffered rows rather than the number of buffered rows;
+    # buffered_row_threshold_percent applies to the size and buffered_row_max then bounds the number of buffered batches
+    # of rows (see row_batch_size)
+    buffered_bytes_max: Optional[int] = None
+    # if set (along w/ buffered_bytes_max), the size of the buffer adapts, between buffered_bytes_min and
+    # buffered_bytes_max, to the measured rates of the producer (parsing) and the consumer (iterating)
+    buffered_bytes_min: Optional[int] = None
     queue_timeout: float = 0.25
+    # max number of rows handed off from the parser to the consumer at once
+    row_batch_size: int = 50
+    # split rows directly from the raw HTTP response bytes instead of rebuilding them from JSON tokens
+    split_raw_rows: bool = False
+    # JSON parser backend used to tokenize the HTTP response, see JsonParserBackend for details
+    parser_backend: JsonParserBackend = JsonParserBackend.AUTO
+    # build Python objects for each row directly from the parser events; only applies to the streaming parser backends
+    # and is only used when the request's deserializer is the DefaultJsonDeserializer
+    decode_rows: bool = False
+    # when decoding rows, decode non-integral numbers as float (matching json.loads) instead of Decimal
+    use_float: bool = True
+    # parse the entire response in a dedicated thread (per request) that parks while the consumer catches up, instead
+    # of submitting a new parsing stage to the ThreadPoolExecutor each time the consumer drains the buffered rows
+    dedicated_parser_thread: bool = False
+    # max size of a response that is decoded at once (bypassing the JSON stream); set to 0 to disable
+    small_response_max_bytes: int = DEFAULT_SMALL_RESPONSE_MAX_BYTES
+    # when the remaining rows are no longer needed (e.g. the request is cancelled or via first()/one()/take()), the
+    # remainder of the HTTP response is read and discarded (w/o being parsed) so that the connection can be returned to
+    # the connection pool; if the remainder exceeds drain_on_close_max_bytes or is not received within
+    # drain_on_close_timeout seconds, the connection is closed instead.  Set either to 0 to always close the connection
+    drain_on_close_max_bytes: int = DEFAULT_DRAIN_ON_CLOSE_MAX_BYTES
+    drain_on_close_timeout: float = DEFAULT_DRAIN_ON_CLOSE_TIMEOUT
+    # when decoding rows, learn the shape (keys) of flat rows from the first row_shape_sample_size rows and then build
+    # rows of that shape directly, sharing the learned key objects across rows
+    infer_row_shape: bool = False
+    row_shape_sample_size: int = DEFAULT_ROW_SHAPE_SAMPLE_SIZE
+
+    def __post_init__(self) -> None:
+        if self.buffered_bytes_max is not None and self.buffered_bytes_max < 1:
+            raise ValueError(f'Expected buffered_bytes_max to be a positive integer, got {self.buffered_bytes_max!r}.')
+        if self.buffered_bytes_min is not None:
+            if self.buffered_bytes_max is None:
+                raise ValueError('buffered_bytes_min requires buffered_bytes_max to be set.')
+            if not 0 < self.buffered_bytes_min <= self.buffered_bytes_max:
+                raise ValueError(
+                    'Expected buffered_bytes_min to be a positive integer no greater than buffered_bytes_max, '
+                    f'got {self.buffered_bytes_min!r}.'
+                )
+
+
+def decode_if_complete(data: bytes) -> Optional[Dict[str, Any]]:
+    """
+    **INTERNAL**
+
+    Decodes the provided data if it is an entire JSON object, e.g. an Analytics response that was received within a
+    single HTTP chunk.
+
+    Returns:
+        The decoded JSON object, or None if the data is not an entire JSON object.
+    """
+    if not data.rstrip(b' \t\n\r').endswith(b'}'):
+        return None
+    try:
+        json_response = json.loads(data)
+    except ValueError:
+        return None
+    return json_response if isinstance(json_response, dict) else None
 
 
 class ParsedResultType(IntEnum):
@@ -43,6 +119,7 @@ class ParsedResultType(IntEnum):
     ERROR = 1
     END = 2
     UNKNOWN = 3
+    ROWS = 4
 
 
 class ParsedResult(NamedTuple):
@@ -50,5 +127,7 @@ class ParsedResult(NamedTuple):
     **INTERNAL**
     """
 
-    value: Optional[bytes]
+    # the raw bytes, or the decoded row for ROW results when JsonStreamConfig.decode_rows is in effect
+    # ROWS results contain a list of rows
+    value: Any
     result_type: ParsedResultType
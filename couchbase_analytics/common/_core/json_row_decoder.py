@@ -0,0 +1,213 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+import json
+import sys
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from ijson import ObjectBuilder
+
+_START_EVENTS = frozenset(['start_map', 'start_array'])
+_END_EVENTS = frozenset(['end_map', 'end_array'])
+
+_RESULTS_PREFIX = 'results'
+_RESULT_PREFIX = 'results.item'
+
+DEFAULT_ROW_SHAPE_SAMPLE_SIZE = 8
+
+
+def _json_default(value: Any) -> Any:
+    # numbers are only Decimal when use_float is disabled
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+class JsonRowDecoder:
+    """
+    **INTERNAL**
+
+    Builds Python objects for each element of the top-level ``results`` array directly from ijson events.
+
+    Avoids rebuilding each row's JSON string only for it to be deserialized again.  Events for everything but the
+    rows are used to build the remainder of the response, which is returned (as JSON) from :meth:`get_result`.
+
+    If ``infer_row_shape`` is enabled, the shape of the rows (i.e. the keys, in order, of a flat object) is learned from
+    the first ``row_shape_sample_size`` rows.  Once learned, rows are built directly (instead of via a generic
+    ``ObjectBuilder``) and share the learned, interned key objects rather than each row holding its own copy of every
+    key.  Rows that do not match the learned shape are still decoded correctly; a row with a nested object or array
+    falls back to the generic builder.
+    """
+
+    def __init__(
+        self, infer_row_shape: Optional[bool] = False, row_shape_sample_size: int = DEFAULT_ROW_SHAPE_SAMPLE_SIZE
+    ) -> None:
+        self._meta_builder = ObjectBuilder()
+        self._row_builder: Optional[ObjectBuilder] = None
+        self._row_depth = 0
+        self._row: Any = None
+        self._in_results = False
+        self._has_errors = False
+        # row shape inference
+        self._infer_row_shape = infer_row_shape is True and row_shape_sample_size > 0
+        self._row_shape_sample_size = row_shape_sample_size
+        self._row_shape_candidate: Optional[Tuple[str, ...]] = None
+        self._row_shape_matches = 0
+        self._row_shape: Optional[List[str]] = None
+        # the row currently being built via the learned shape
+        self._shaped_row: Optional[Dict[str, Any]] = None
+        self._shaped_row_key: str = ''
+        self._shaped_row_key_idx = 0
+
+    @property
+    def has_errors(self) -> bool:
+        return self._has_errors
+
+    @property
+    def row_shape(self) -> Optional[List[str]]:
+        """
+        **INTERNAL**
+
+        The learned row shape (i.e. the keys of each row), or None if a row shape has not been learned.
+        """
+        return self._row_shape
+
+    def _learn_row_shape(self, row: Any) -> None:
+        keys: Optional[Tuple[str, ...]] = None
+        if isinstance(row, dict) and not any(isinstance(value, (dict, list)) for value in row.values()):
+            keys = tuple(row)
+        if keys is None or (self._row_shape_candidate is not None and keys != self._row_shape_candidate):
+            # the rows do not share a single (flat) shape, don't bother w/ the remaining rows
+            self._infer_row_shape = False
+            self._row_shape_candidate = None
+            return
+        self._row_shape_candidate = keys
+        self._row_shape_matches += 1
+        if self._row_shape_matches >= self._row_shape_sample_size:
+            self._row_shape = [sys.intern(key) for key in keys]
+            self._infer_row_shape = False
+
+    def _complete_row(self, row: Any) -> bool:
+        self._row = row
+        if self._infer_row_shape:
+            self._learn_row_shape(row)
+        return True
+
+    def _parse_shaped_row_event(self, event: str, value: Any) -> bool:
+        shaped_row = self._shaped_row
+        if shaped_row is None:
+            return False
+        if event == 'map_key':
+            row_shape = self._row_shape or []
+            idx = self._shaped_row_key_idx
+            # use the learned key object, so that each row does not hold its own copy of every key
+            self._shaped_row_key = row_shape[idx] if idx < len(row_shape) and value == row_shape[idx] else value
+            self._shaped_row_key_idx = idx + 1
+            return False
+        if event == 'end_map':
+            self._shaped_row = None
+            self._row = shaped_row
+            return True
+        if event in _START_EVENTS:
+            # nested value, fall back to the generic builder for the remainder of the row
+            self._shaped_row = None
+            self._row_builder = ObjectBuilder()
+            self._row_builder.event('start_map', None)
+            for key, row_value in shaped_row.items():
+                self._row_builder.event('map_key', key)
+                self._row_builder.event('string', row_value)
+            self._row_builder.event('map_key', self._shaped_row_key)
+            self._row_builder.event(event, value)
+            self._row_depth = 2
+            return False
+        shaped_row[self._shaped_row_key] = value
+        return False
+
+    def parse_event(self, prefix: str, event: str, value: Any) -> bool:  # noqa: C901
+        """
+        **INTERNAL**
+
+        Args:
+            prefix: The ijson prefix of the event.
+            event: The ijson event.
+            value: The ijson value.
+
+        Returns:
+            True if a row has been completed, the row is then available via :meth:`pop_row`.
+        """
+        if self._shaped_row is not None:
+            return self._parse_shaped_row_event(event, value)
+
+        if self._row_builder is not None:
+            self._row_builder.event(event, value)
+            if event in _START_EVENTS:
+                self._row_depth += 1
+            elif event in _END_EVENTS:
+                self._row_depth -= 1
+                if self._row_depth == 0:
+                    row = self._row_builder.value
+                    self._row_builder = None
+                    return self._complete_row(row)
+            return False
+
+        if self._in_results and prefix == _RESULT_PREFIX:
+            if event == 'start_map' and self._row_shape is not None:
+                self._shaped_row = {}
+                self._shaped_row_key_idx = 0
+                return False
+            if event in _START_EVENTS:
+                self._row_builder = ObjectBuilder()
+                self._row_builder.event(event, value)
+                self._row_depth = 1
+                return False
+            return self._complete_row(value)
+
+        if prefix == _RESULTS_PREFIX:
+            if event == 'start_array':
+                # the results are not retained, so the results array is never added to the remaining content
+                self._in_results = True
+                return False
+            elif event == 'end_array' and self._in_results:
+                self._in_results = False
+                return False
+        elif prefix == '' and event == 'map_key':
+            if value == 'errors':
+                self._has_errors = True
+
+        self._meta_builder.event(event, value)
+        return False
+
+    def pop_row(self) -> Any:
+        """
+        **INTERNAL**
+        """
+        row = self._row
+        self._row = None
+        return row
+
+    def get_result(self) -> Optional[bytes]:
+        """
+        **INTERNAL**
+
+        Returns:
+            The remaining JSON content (i.e. everything but the rows), or None if the JSON content is incomplete.
+        """
+        if self._row_builder is not None or self._in_results or not hasattr(self._meta_builder, 'value'):
+            return None
+        return json.dumps(self._meta_builder.value, separators=(',', ':'), default=_json_default).encode('utf-8')
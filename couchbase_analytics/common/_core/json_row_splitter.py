@@ -0,0 +1,298 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+import re
+from typing import List, Optional, Tuple, Union
+
+from couchbase_analytics.common._core.json_token_parser_base import JsonTokenParsingError
+
+# structural characters we need to stop on when outside of a JSON string
+_STRUCTURAL_PATTERN = re.compile(rb'[{}\[\]",]')
+# characters we need to stop on when inside of a JSON string
+_STRING_SPECIAL_PATTERN = re.compile(rb'["\\]')
+_NON_WHITESPACE_PATTERN = re.compile(rb'[^ \t\n\r]')
+_WHITESPACE = b' \t\n\r'
+
+_OPEN_BRACE = 0x7B  # {
+_CLOSE_BRACE = 0x7D  # }
+_OPEN_BRACKET = 0x5B  # [
+_CLOSE_BRACKET = 0x5D  # ]
+_QUOTE = 0x22  # "
+_COMMA = 0x2C  # ,
+_BACKSLASH = 0x5C  # \
+
+_MATCHING_OPEN = {_CLOSE_BRACE: _OPEN_BRACE, _CLOSE_BRACKET: _OPEN_BRACKET}
+
+RawRow = Union[bytes, memoryview]
+
+
+class JsonRowSplitter:
+    """
+    **INTERNAL**
+
+    Incrementally splits a raw Analytics JSON response into rows without tokenizing the row values.
+
+    Chunks of the HTTP response are fed to the splitter as they arrive.  The splitter only tracks nesting depth and
+    string/escape state in order to find the boundaries of each element of the top-level ``results`` array.  Rows
+    contained within a single chunk are returned as zero-copy ``memoryview`` slices of that chunk; rows spanning
+    multiple chunks are joined into a single ``bytes`` object.  Either way the row bytes are exactly what the server
+    sent.
+
+    The remainder of the response (i.e. everything but the ``results`` member) is retained and returned from
+    :meth:`finish`.  If ``emit_results_enabled`` is ``False`` no rows are emitted and :meth:`finish` returns the
+    entire response.
+
+    .. note::
+        Only the structure of the response is validated.  Scalar values are validated when a row is deserialized.
+    """
+
+    def __init__(self, emit_results_enabled: Optional[bool] = True) -> None:
+        self._emit_results_enabled = emit_results_enabled is True
+        self._stack = bytearray()
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self._done = False
+        self._has_errors = False
+        # top-level object key handling
+        self._expect_key = False
+        self._capture_key = False
+        self._key_parts: List[bytes] = []
+        self._key_start = 0
+        self._pending_key: Optional[bytes] = None
+        self._key_meta_offset = 0
+        # results handling
+        self._in_results = False
+        self._row_start = 0
+        self._row_parts: List[memoryview] = []
+        self._row_count = 0
+        # everything that is not a row
+        self._meta = bytearray()
+        self._drop_next_comma = False
+
+    @property
+    def has_errors(self) -> bool:
+        return self._has_errors
+
+    @property
+    def row_count(self) -> int:
+        return self._row_count
+
+    def _append_row(self, rows: List[RawRow], buf: bytes, end: int, allow_empty: Optional[bool] = False) -> None:
+        if self._row_parts:
+            self._row_parts.append(memoryview(buf)[self._row_start : end])
+            row = b''.join(self._row_parts).strip(_WHITESPACE)
+            self._row_parts = []
+            if row:
+                rows.append(row)
+                self._row_count += 1
+            elif allow_empty is not True:
+                raise JsonTokenParsingError('Unexpected empty row in results.')
+            return
+
+        match = _NON_WHITESPACE_PATTERN.search(buf, self._row_start, end)
+        if match is None:
+            if allow_empty is not True:
+                raise JsonTokenParsingError('Unexpected empty row in results.')
+            return
+        start = match.start()
+        while buf[end - 1] in _WHITESPACE:
+            end -= 1
+        rows.append(memoryview(buf)[start:end])
+        self._row_count += 1
+
+    def _close_results(self, buf: bytes, pos: int, rows: List[RawRow]) -> None:
+        # only an empty results array is allowed to not have a row prior to the closing bracket
+        self._append_row(rows, buf, pos, allow_empty=self._row_count == 0)
+        self._in_results = False
+        self._drop_next_comma = self._meta.rstrip(_WHITESPACE).endswith(b'{')
+
+    def _open_results(self, buf: bytes, seg_start: int, pos: int) -> None:
+        self._meta += buf[seg_start:pos]
+        # remove the "results": key from the retained metadata, along w/ a now dangling comma
+        del self._meta[self._key_meta_offset :]
+        stripped = self._meta.rstrip(_WHITESPACE)
+        if stripped.endswith(b','):
+            del self._meta[len(stripped) - 1 :]
+        self._in_results = True
+        self._row_start = pos + 1
+
+    def _validate_trailing_data(self, buf: bytes, pos: int) -> None:
+        if _NON_WHITESPACE_PATTERN.search(buf, pos) is not None:
+            raise JsonTokenParsingError('Additional data found after the end of the JSON content.')
+
+    def feed(self, chunk: bytes) -> List[RawRow]:  # noqa: C901
+        """
+        **INTERNAL**
+
+        Feed the next chunk of the HTTP response to the splitter.
+
+        Args:
+            chunk: The next chunk of the HTTP response.
+
+        Returns:
+            The rows completed within the provided chunk (possibly empty).
+
+        Raises:
+            JsonTokenParsingError: If the structure of the JSON content is invalid.
+        """
+        rows: List[RawRow] = []
+        if self._done:
+            self._validate_trailing_data(chunk, 0)
+            return rows
+
+        buf = chunk
+        n = len(buf)
+        pos = 0
+        seg_start = 0
+        stack = self._stack
+        while pos < n:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    pos += 1
+                    continue
+                match = _STRING_SPECIAL_PATTERN.search(buf, pos)
+                if match is None:
+                    pos = n
+                    break
+                pos = match.start()
+                if buf[pos] == _BACKSLASH:
+                    self._escape = True
+                    pos += 1
+                    continue
+                self._in_string = False
+                if self._capture_key:
+                    self._capture_key = False
+                    self._key_parts.append(buf[self._key_start : pos])
+                    self._pending_key = b''.join(self._key_parts)
+                    self._key_parts = []
+                    if self._pending_key == b'errors':
+                        self._has_errors = True
+                pos += 1
+                continue
+
+            match = _STRUCTURAL_PATTERN.search(buf, pos)
+            if match is None:
+                pos = n
+                break
+            pos = match.start()
+            char = buf[pos]
+            depth = len(stack)
+            if char == _QUOTE:
+                self._in_string = True
+                if depth == 1 and self._expect_key:
+                    self._expect_key = False
+                    self._capture_key = True
+                    self._key_start = pos + 1
+                    self._key_meta_offset = len(self._meta) + (pos - seg_start)
+                elif depth == 1:
+                    self._pending_key = None
+            elif char == _COMMA:
+                if self._in_results and depth == 2:
+                    self._append_row(rows, buf, pos)
+                    self._row_start = pos + 1
+                elif depth == 1:
+                    self._expect_key = stack[0] == _OPEN_BRACE
+                    self._pending_key = None
+                    if self._drop_next_comma:
+                        self._meta += buf[seg_start:pos]
+                        seg_start = pos + 1
+                elif depth == 0:
+                    raise JsonTokenParsingError('Unexpected "," outside of the JSON content.')
+                self._drop_next_comma = False
+            elif char == _OPEN_BRACE or char == _OPEN_BRACKET:
+                if depth == 0:
+                    if self._started:
+                        raise JsonTokenParsingError('Additional data found after the end of the JSON content.')
+                    if _NON_WHITESPACE_PATTERN.search(buf, seg_start, pos) is not None or self._meta.strip():
+                        raise JsonTokenParsingError('Unexpected data found prior to the JSON content.')
+                    self._started = True
+                    self._expect_key = char == _OPEN_BRACE
+                elif (
+                    depth == 1
+                    and char == _OPEN_BRACKET
+                    and self._pending_key == b'results'
+                    and self._emit_results_enabled
+                ):
+                    self._open_results(buf, seg_start, pos)
+                elif depth == 1:
+                    self._pending_key = None
+                self._drop_next_comma = False
+                stack.append(char)
+            else:
+                if depth == 0 or stack[-1] != _MATCHING_OPEN[char]:
+                    raise JsonTokenParsingError(f'Unexpected "{chr(char)}" encountered.')
+                stack.pop()
+                if self._in_results and depth == 2:
+                    self._close_results(buf, pos, rows)
+                    seg_start = pos + 1
+                elif depth == 1:
+                    self._done = True
+                    pos += 1
+                    self._meta += buf[seg_start:pos]
+                    self._validate_trailing_data(buf, pos)
+                    return rows
+            pos += 1
+
+        if self._in_results:
+            self._row_parts.append(memoryview(buf)[self._row_start :])
+            self._row_start = 0
+        else:
+            self._meta += buf[seg_start:]
+        if self._capture_key:
+            self._key_parts.append(buf[self._key_start :])
+            self._key_start = 0
+        return rows
+
+    def finish(self) -> bytes:
+        """
+        **INTERNAL**
+
+        Signal the end of the HTTP response.
+
+        Returns:
+            The remaining JSON content (i.e. everything but the emitted rows).
+
+        Raises:
+            JsonTokenParsingError: If the JSON content is incomplete.
+        """
+        if not self._done:
+            content = bytes(self._meta).strip(_WHITESPACE)
+            # a top-level scalar is the only valid content w/o a container
+            if self._started or self._in_string or not content:
+                raise JsonTokenParsingError('Incomplete JSON content.')
+            return content
+        return bytes(self._meta).strip(_WHITESPACE)
+
+
+def split_rows(data: bytes) -> Tuple[List[RawRow], bytes]:
+    """
+    **INTERNAL**
+
+    Splits an entire (i.e. already received) Analytics response into its rows.
+
+    Returns:
+        A tuple of the rows and the remaining JSON content (i.e. everything but the rows).
+
+    Raises:
+        JsonTokenParsingError: If the structure of the JSON content is invalid.
+    """
+    splitter = JsonRowSplitter()
+    rows = splitter.feed(data)
+    return rows, splitter.finish()
@@ -0,0 +1,108 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+import inspect
+import json
+import re
+from collections.abc import Mapping
+from decimal import Decimal
+from typing import Any, List, Union
+
+from anyio import to_thread
+
+from couchbase_analytics.common.row import LazyRow
+
+# literal newlines can only be insignificant whitespace in JSON (newlines within strings are escaped)
+_NEWLINE_PATTERN = re.compile(rb'[\r\n]+')
+_NEWLINE = b'\n'
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return dict(value)
+    # numbers are only Decimal when the JSON stream's use_float is disabled
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def encode_ndjson_line(value: Any) -> Union[bytes, memoryview]:
+    """
+    **INTERNAL**
+
+    Returns the JSON bytes of a single row (w/o the trailing newline).  Raw rows (i.e. the bytes the server sent) are
+    returned as-is, unless the row spans multiple lines.  Rows that have already been deserialized are re-encoded.
+    """
+    if isinstance(value, (bytes, memoryview)):
+        raw = value
+    elif isinstance(value, bytearray):
+        raw = bytes(value)
+    elif isinstance(value, LazyRow):
+        raw = value.raw
+    else:
+        return json.dumps(value, separators=(',', ':'), default=_json_default).encode('utf-8')
+    if _NEWLINE_PATTERN.search(raw) is not None:
+        return _NEWLINE_PATTERN.sub(b' ', raw)
+    return raw
+
+
+def encode_ndjson_rows(rows: List[Any]) -> bytes:
+    """
+    **INTERNAL**
+
+    Joins a batch of rows into newline delimited JSON, so that the batch is written w/ a single write.
+    """
+    if not rows:
+        return b''
+    if all(type(row) is bytes or type(row) is memoryview for row in rows):
+        # raw rows, only a row w/ a newline of its own needs to be handled individually
+        data = b'\n'.join(rows) + _NEWLINE
+        if data.count(_NEWLINE) == len(rows) and b'\r' not in data:
+            return data
+    parts: List[Union[bytes, memoryview]] = []
+    for row in rows:
+        parts.append(encode_ndjson_line(row))
+        parts.append(_NEWLINE)
+    return b''.join(parts)
+
+
+def encode_ndjson_metadata(raw_metadata: bytes) -> bytes:
+    """
+    **INTERNAL**
+
+    The query metadata as a single line of newline delimited JSON.
+    """
+    return b''.join((encode_ndjson_line(raw_metadata), _NEWLINE))
+
+
+async def write_async(sink: Any, data: bytes) -> None:
+    """
+    **INTERNAL**
+
+    Writes to either an async sink (e.g. an ``asyncio.StreamWriter``, whose buffer is drained after each write) or a
+    blocking binary file-like object.  A blocking write is run in a worker thread so that the event loop is not blocked.
+    """
+    drain = getattr(sink, 'drain', None)
+    if drain is None and not inspect.iscoroutinefunction(sink.write):
+        written = await to_thread.run_sync(sink.write, data)
+    else:
+        written = sink.write(data)
+    if inspect.isawaitable(written):
+        await written
+    if drain is not None:
+        await drain()
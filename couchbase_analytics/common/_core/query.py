@@ -57,6 +57,8 @@ class QueryMetadataCore(TypedDict, total=False):
     warnings: List[QueryWarningCore]
     metrics: QueryMetricsCore
     status: Optional[str]
+    http_bytes_received: Optional[int]
+    http_bytes_decoded: Optional[int]
 
 
 def build_query_metadata(json_data: Optional[Any] = None, raw_metadata: Optional[bytes] = None) -> QueryMetadataCore:
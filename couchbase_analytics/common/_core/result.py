@@ -27,7 +27,10 @@ else:
     from collections.abc import AsyncIterator as PyAsyncIterator
     from collections.abc import Iterator
 
+from couchbase_analytics.common._core.arrow import DEFAULT_ARROW_BATCH_SIZE
+from couchbase_analytics.common.columns import ColumnarResult
 from couchbase_analytics.common.query import QueryMetadata
+from couchbase_analytics.common.row import RowSchema
 
 
 class QueryResult(ABC):
@@ -47,12 +50,62 @@ class QueryResult(ABC):
         """Convenience method to load all query results into memory."""
         raise NotImplementedError
 
+    @abstractmethod
+    def iter_batches(self) -> Union[PyAsyncIterator[List[Any]], Iterator[List[Any]]]:
+        """Retrieve the rows which have been returned by the query in batches, as the rows are received."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_arrow_batches(
+        self, batch_size: int = DEFAULT_ARROW_BATCH_SIZE, schema: Optional[Any] = None
+    ) -> Union[PyAsyncIterator[Any], Iterator[Any]]:
+        """Retrieve the rows which have been returned by the query as pyarrow RecordBatches."""
+        raise NotImplementedError
+
     @abstractmethod
     def metadata(self) -> Optional[QueryMetadata]:
         """Get the query metadata."""
         raise NotImplementedError
 
+    @abstractmethod
+    def row_schema(self) -> Optional[RowSchema]:
+        """Get the schema of the query's rows when using tuple rows."""
+        raise NotImplementedError
+
     @abstractmethod
     def rows(self) -> Union[PyAsyncIterator[Any], Iterator[Any]]:
         """Retrieve the rows which have been returned by the query."""
         raise NotImplementedError
+
+    @abstractmethod
+    def rows_batched(self, batch_size: int) -> Union[PyAsyncIterator[List[Any]], Iterator[List[Any]]]:
+        """Retrieve the rows which have been returned by the query in batches of ``batch_size`` rows."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def to_columns(
+        self, use_numpy: Optional[bool] = False
+    ) -> Union[Coroutine[Any, Any, ColumnarResult], ColumnarResult]:
+        """Load all query results into memory, stored by column rather than by row."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def write_arrow_ipc(
+        self, path: Any, batch_size: int = DEFAULT_ARROW_BATCH_SIZE, schema: Optional[Any] = None
+    ) -> Union[Coroutine[Any, Any, int], int]:
+        """Write the query results to an Arrow IPC file, batch by batch."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def write_ndjson(
+        self, sink: Any, metadata_trailer: Optional[bool] = False, metadata_sink: Optional[Any] = None
+    ) -> Union[Coroutine[Any, Any, int], int]:
+        """Write the query results to a binary sink as newline delimited JSON (NDJSON)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def write_parquet(
+        self, path: Any, batch_size: int = DEFAULT_ARROW_BATCH_SIZE, schema: Optional[Any] = None
+    ) -> Union[Coroutine[Any, Any, int], int]:
+        """Write the query results to a Parquet file, batch by batch."""
+        raise NotImplementedError
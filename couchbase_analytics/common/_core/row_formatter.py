@@ -0,0 +1,115 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from couchbase_analytics.common.enums import RowFormat
+from couchbase_analytics.common.row import Record, RowSchema
+
+# bounds the shared state, results w/ (unexpectedly) many distinct field names simply stop sharing new field names
+MAX_SHARED_FIELD_NAMES = 4096
+MAX_SHARED_SCHEMAS = 256
+
+
+class RowFormatter:
+    """
+    **INTERNAL**
+
+    Materializes the (deserialized) object rows of a single result in the requested :class:`.RowFormat`.
+
+    Field names and schemas are shared across every batch of rows of the result.  Only the top-level fields of a row
+    are shared, nested objects are not altered.
+    """
+
+    def __init__(self, row_format: RowFormat) -> None:
+        self._row_format = row_format
+        self._field_names: Dict[str, str] = {}
+        self._schemas: Dict[Tuple[str, ...], RowSchema] = {}
+        self._schema: Optional[RowSchema] = None
+
+    @property
+    def row_format(self) -> RowFormat:
+        return self._row_format
+
+    @property
+    def schema(self) -> Optional[RowSchema]:
+        """
+        **INTERNAL**
+
+        The schema of the result's tuple rows, or None if no object rows have been formatted (or the row format is
+        not :attr:`.RowFormat.TUPLE`).
+        """
+        return self._schema
+
+    def _get_schema(self, fields: Tuple[str, ...]) -> RowSchema:
+        schema = self._schemas.get(fields)
+        if schema is None:
+            schema = RowSchema(fields)
+            if len(self._schemas) < MAX_SHARED_SCHEMAS:
+                self._schemas[fields] = schema
+        return schema
+
+    def _to_dict(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        field_names = self._field_names
+        shared_row = {}
+        for field, value in row.items():
+            shared_field = field_names.get(field)
+            if shared_field is None:
+                shared_field = field
+                if len(field_names) < MAX_SHARED_FIELD_NAMES:
+                    field_names[field] = field
+            shared_row[shared_field] = value
+        return shared_row
+
+    def _to_tuple(self, row: Dict[str, Any]) -> Tuple[Any, ...]:
+        schema = self._schema
+        if schema is None:
+            schema = self._schema = RowSchema(row)
+        values = tuple(row.values())
+        if len(row) == len(schema) and all(a is b or a == b for a, b in zip(row, schema.fields)):
+            return values
+        unknown = [field for field in row if field not in schema]
+        if unknown:
+            raise ValueError(
+                f'Row contains fields {unknown} that are not part of the result {schema}. '
+                'Use RowFormat.RECORD for results whose rows do not share the same fields.'
+            )
+        return tuple(row.get(field) for field in schema.fields)
+
+    def format_rows(self, rows: List[Any]) -> List[Any]:
+        """
+        **INTERNAL**
+
+        Args:
+            rows: The deserialized rows.
+
+        Returns:
+            The rows in the requested format.  Rows which are not dicts are returned as-is.
+
+        Raises:
+            ValueError: If the row format is :attr:`.RowFormat.TUPLE` and a row contains a field that is not part of
+                the result's schema.
+        """
+        if self._row_format is RowFormat.RECORD:
+            get_schema = self._get_schema
+            return [
+                Record(get_schema(tuple(row)), tuple(row.values())) if isinstance(row, dict) else row for row in rows
+            ]
+        if self._row_format is RowFormat.TUPLE:
+            return [self._to_tuple(row) if isinstance(row, dict) else row for row in rows]
+        return [self._to_dict(row) if isinstance(row, dict) else row for row in rows]
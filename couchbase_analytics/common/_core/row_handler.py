@@ -0,0 +1,101 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+from inspect import isawaitable
+from typing import Any, Callable, Dict, List, Optional
+
+RowHandler = Callable[[Any], Any]
+BatchHandler = Callable[[List[Any]], Any]
+
+
+def pop_row_handlers(kwargs: Dict[str, object]) -> Optional[BatchHandler]:
+    """
+    **INTERNAL**
+
+    Removes the ``row_handler`` and ``batch_handler`` keyword arguments of ``execute_query()``, so that neither is
+    treated as a named parameter.
+
+    Returns:
+        A handler that accepts each batch of rows, or None if neither handler was provided.
+
+    Raises:
+        ValueError: If both handlers are provided or a handler is not callable.
+    """
+    row_handler = kwargs.pop('row_handler', None)
+    batch_handler = kwargs.pop('batch_handler', None)
+    if row_handler is not None and batch_handler is not None:
+        raise ValueError('Only one of row_handler or batch_handler can be provided.')
+    if row_handler is not None:
+        if not callable(row_handler):
+            raise ValueError(f'Expected row_handler to be callable instead of {type(row_handler)}.')
+        return RowsToRowHandler(row_handler)
+    if batch_handler is not None:
+        if not callable(batch_handler):
+            raise ValueError(f'Expected batch_handler to be callable instead of {type(batch_handler)}.')
+        return batch_handler
+    return None
+
+
+def validate_handler_request(lazy_execute: Optional[bool], enable_cancel: Optional[bool]) -> None:
+    """
+    **INTERNAL**
+
+    Raises:
+        RuntimeError: If the query is executed lazily or is cancellable, neither apply when rows are handed to a
+            handler as the query is executed.
+    """
+    if lazy_execute is True:
+        raise RuntimeError('A query that is executed lazily cannot hand rows to a row_handler or batch_handler.')
+    if enable_cancel is True:
+        raise RuntimeError('A query that hands rows to a row_handler or batch_handler cannot be cancelled.')
+
+
+async def handle_rows_async(handler: BatchHandler, rows: List[Any]) -> None:
+    """
+    **INTERNAL**
+
+    Hands the rows to the handler, awaiting the result of each call if the handler is a coroutine function (or
+    otherwise returns an awaitable).
+    """
+    if isinstance(handler, RowsToRowHandler):
+        row_handler = handler.row_handler
+        for row in rows:
+            result = row_handler(row)
+            if isawaitable(result):
+                await result
+        return
+    result = handler(rows)
+    if isawaitable(result):
+        await result
+
+
+class RowsToRowHandler:
+    """
+    **INTERNAL**
+
+    Hands each row of a batch to a row handler.  The row handler is available via ``row_handler`` so that the async
+    API can await the result of each call.
+    """
+
+    def __init__(self, row_handler: RowHandler) -> None:
+        self.row_handler = row_handler
+
+    def __call__(self, rows: List[Any]) -> None:
+        row_handler = self.row_handler
+        for row in rows:
+            row_handler(row)
@@ -0,0 +1,163 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+import mmap
+import os
+import tempfile
+from threading import Lock
+from typing import IO, Any, List, Optional, Union
+
+from couchbase_analytics.common._core.ndjson import encode_ndjson_line
+from couchbase_analytics.common._core.row_formatter import RowFormatter
+
+_RAW_ROW_TYPES = (bytes, bytearray, memoryview)
+
+
+class RowDecoder:
+    """
+    **INTERNAL**
+
+    Deserializes (and formats) raw rows the same way as the rows of the result they belong to.  Must be picklable, it
+    is shared w/ any process a :class:`~couchbase_analytics.query.RowStore` is sent to.
+    """
+
+    __slots__ = ('_deserializer', '_row_formatter')
+
+    def __init__(self, deserializer: Any, row_formatter: Optional[RowFormatter] = None) -> None:
+        self._deserializer = deserializer
+        self._row_formatter = row_formatter
+
+    def decode(self, rows: List[Any]) -> List[Any]:
+        """
+        **INTERNAL**
+
+        Args:
+            rows: Raw rows (i.e. the JSON the server sent) and/or rows that have already been deserialized.
+
+        Returns:
+            The deserialized rows, in the result's row format.
+        """
+        deserializer = self._deserializer
+        if all(isinstance(row, _RAW_ROW_TYPES) for row in rows):
+            # custom deserializers are not required to subclass Deserializer, so deserialize_many() might not exist
+            deserialize_many = getattr(deserializer, 'deserialize_many', None)
+            if len(rows) > 1 and deserialize_many is not None:
+                rows = deserialize_many(rows)
+            else:
+                rows = [deserializer.deserialize(row) for row in rows]
+        else:
+            rows = [deserializer.deserialize(row) if isinstance(row, _RAW_ROW_TYPES) else row for row in rows]
+        if self._row_formatter is None:
+            return rows
+        return self._row_formatter.format_rows(rows)
+
+    def encode(self, row: Any) -> Union[bytes, memoryview]:
+        """
+        **INTERNAL**
+
+        Returns the JSON of a single row, w/o any newlines.  Raw rows are returned as-is (unless the row spans multiple
+        lines), rows that have already been deserialized are re-encoded.
+        """
+        schema = self._row_formatter.schema if self._row_formatter is not None else None
+        if schema is not None and type(row) is tuple:
+            # a tuple row is re-encoded as the object it was formatted from
+            row = dict(zip(schema.fields, row))
+        return encode_ndjson_line(row)
+
+    @staticmethod
+    def raw_size(row: Any) -> Optional[int]:
+        """
+        **INTERNAL**
+
+        Returns the size of a raw row, or None if the row has already been deserialized.
+        """
+        return len(row) if isinstance(row, _RAW_ROW_TYPES) else None
+
+
+class SpillFile:
+    """
+    **INTERNAL**
+
+    A temporary file of newline delimited rows.  Rows are appended until the file is finished, after which the file is
+    memory-mapped (on first read) for random access.  Only the owner of the file (i.e. the process that created it)
+    removes the file when closed.
+    """
+
+    def __init__(self, path: str, owner: bool, file: Optional[IO[bytes]] = None) -> None:
+        self._path = path
+        self._owner = owner
+        self._file = file
+        self._mmap: Optional[mmap.mmap] = None
+        self._closed = False
+        self._lock = Lock()
+
+    @classmethod
+    def create(cls, directory: Optional[str] = None) -> SpillFile:
+        fd, path = tempfile.mkstemp(prefix='pycbac-rows-', suffix='.ndjson', dir=directory)
+        return cls(path, True, file=os.fdopen(fd, 'wb'))
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def write(self, data: bytes) -> None:
+        if self._file is None:
+            raise RuntimeError('Cannot write to a spill file that has been finished.')
+        self._file.write(data)
+
+    def finish(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def read(self, start: int, end: int) -> bytes:
+        """
+        **INTERNAL**
+
+        Returns the bytes between the start and end offsets of the file.
+        """
+        buffer = self._mmap
+        if buffer is None:
+            buffer = self._open_mmap()
+        return buffer[start:end]
+
+    def _open_mmap(self) -> mmap.mmap:
+        with self._lock:
+            if self._closed:
+                raise ValueError('The row store has been closed.')
+            if self._mmap is None:
+                self.finish()
+                with open(self._path, 'rb') as f:
+                    # the mapping stays valid once the file is closed
+                    self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._mmap
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self.finish()
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+            if self._owner:
+                try:
+                    os.remove(self._path)
+                except FileNotFoundError:
+                    pass
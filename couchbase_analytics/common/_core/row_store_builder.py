@@ -0,0 +1,174 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+import sys
+from array import array
+from typing import Any, Iterable, List, Optional, Union
+
+from couchbase_analytics.common._core.row_store import RowDecoder, SpillFile
+from couchbase_analytics.common.row import LazyRow, Record
+from couchbase_analytics.common.row_store import RowStore
+
+# rows beyond this (estimated) size of the deserialized rows are spilled to disk
+DEFAULT_ROW_STORE_MEMORY_LIMIT = 2**26
+# the number of rows measured once deserialized in order to estimate the size of every following row from its raw size
+_SIZE_SAMPLE_ROW_COUNT = 32
+
+
+def estimate_row_size(value: Any) -> int:
+    """
+    **INTERNAL**
+
+    Estimates the memory used by a deserialized row, i.e. the size of the row's object along w/ its (nested) values.
+    Values shared between rows (e.g. a Record's schema) are not included.
+    """
+    size = sys.getsizeof(value)
+    value_type = type(value)
+    if value_type is dict:
+        return size + sum(estimate_row_size(key) + estimate_row_size(item) for key, item in value.items())
+    if value_type is list or value_type is tuple:
+        return size + sum(estimate_row_size(item) for item in value)
+    if value_type is Record:
+        return size + estimate_row_size(value.as_tuple())
+    if value_type is LazyRow:
+        return size + sys.getsizeof(value.raw)
+    return size
+
+
+class RowStoreBuilder:
+    """
+    **INTERNAL**
+
+    Builds a :class:`~couchbase_analytics.query.RowStore` from batches of rows as they are received.  Rows are
+    deserialized and kept in memory until the (estimated) size of the deserialized rows exceeds the memory limit, every
+    following row is appended (as raw JSON) to a temporary file.  Only the first rows are measured once deserialized,
+    the size of every following row is estimated from the size of its raw JSON (using the ratio of the deserialized
+    size to the raw size of the first rows).
+    """
+
+    def __init__(self, decoder: RowDecoder, memory_limit: int, directory: Optional[str] = None) -> None:
+        if not isinstance(memory_limit, int) or isinstance(memory_limit, bool) or memory_limit < 0:
+            raise ValueError(f'Expected memory_limit to be a non-negative integer, got {memory_limit!r}.')
+        self._decoder = decoder
+        self._memory_limit = memory_limit
+        self._directory = directory
+        self._memory_used = 0.0
+        # the size of a deserialized row relative to the size of its raw JSON, determined from the first rows
+        self._size_ratio: Optional[float] = None
+        self._rows: List[Any] = []
+        self._spill_file: Optional[SpillFile] = None
+        # the end offset (i.e. the start of the next row) of each spilled row
+        self._offsets = array('Q', [0])
+
+    def add_rows(self, rows: List[Any], buffered: Optional[bool] = False) -> None:
+        """
+        **INTERNAL**
+
+        Args:
+            rows: A batch of raw rows, as returned by the result's batch iterator when ``raw`` is enabled.
+            buffered: If enabled, the entire response is already in memory (i.e. there is nothing to be gained by
+                spilling the rows), so the rows are decoded and kept in memory.
+        """
+        if not rows:
+            return
+        if self._spill_file is None:
+            if buffered is True:
+                self._rows.extend(self._decoder.decode(rows))
+                return
+            rows = rows[self._add_memory_rows(rows) :]
+            if not rows:
+                return
+            self._spill_file = SpillFile.create(self._directory)
+        self._spill_rows(rows)
+
+    def _add_memory_rows(self, rows: List[Any]) -> int:
+        """
+        **INTERNAL**
+
+        Deserializes and keeps the leading rows that fit within the memory limit.
+
+        Returns:
+            The number of rows kept in memory.  If fewer than all of the rows, the memory limit has been reached.
+        """
+        if self._memory_limit == 0:
+            return 0
+        offset = 0
+        if self._size_ratio is None:
+            sample = rows[:_SIZE_SAMPLE_ROW_COUNT]
+            decoded = self._decoder.decode(sample)
+            sizes = [estimate_row_size(row) for row in decoded]
+            raw_size = sum(self._get_raw_size(row) for row in sample)
+            self._size_ratio = sum(sizes) / raw_size if raw_size > 0 else 1.0
+            offset = self._get_fitting_row_count(sizes)
+            self._rows.extend(decoded[:offset])
+            if offset < len(sample):
+                return offset
+        ratio = self._size_ratio
+        count = self._get_fitting_row_count(self._get_raw_size(row) * ratio for row in rows[offset:])
+        if count > 0:
+            self._rows.extend(self._decoder.decode(rows[offset : offset + count]))
+        return offset + count
+
+    def _get_raw_size(self, row: Any) -> int:
+        size = RowDecoder.raw_size(row)
+        return len(self._decoder.encode(row)) if size is None else size
+
+    def _get_fitting_row_count(self, sizes: Iterable[float]) -> int:
+        memory_used = self._memory_used
+        count = 0
+        for size in sizes:
+            if memory_used + size > self._memory_limit:
+                break
+            memory_used += size
+            count += 1
+        self._memory_used = memory_used
+        return count
+
+    def _spill_rows(self, rows: List[Any]) -> None:
+        if self._spill_file is None:
+            raise RuntimeError('Spill file has not been created.')
+        encode = self._decoder.encode
+        lines: List[Union[bytes, memoryview]] = [encode(row) for row in rows]
+        offsets = self._offsets
+        end = offsets[-1]
+        for line in lines:
+            end += len(line) + 1
+            offsets.append(end)
+        lines.append(b'')
+        self._spill_file.write(b'\n'.join(lines))
+
+    def build(self) -> RowStore:
+        """
+        **INTERNAL**
+
+        Returns:
+            The row store.  Once built, the row store owns the temporary file (if any rows were spilled).
+        """
+        if self._spill_file is not None:
+            self._spill_file.finish()
+        return RowStore(self._rows, self._decoder, self._offsets, self._spill_file)
+
+    def close(self) -> None:
+        """
+        **INTERNAL**
+
+        Removes the temporary file, if the row store is not going to be built (e.g. the query failed).
+        """
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
@@ -0,0 +1,148 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List
+
+
+class Column:
+    """A single column of a :class:`.ColumnarResult`.
+
+    **VOLATILE** This API is subject to change at any time.
+
+    Values are stored in a buffer determined by the column's ``dtype``:
+
+    * ``int64``: ``array.array('q')`` (or a NumPy ``int64`` array)
+    * ``float64``: ``array.array('d')`` (or a NumPy ``float64`` array)
+    * ``bool``: ``array.array('B')`` of 0/1 (or a NumPy ``bool`` array)
+    * ``object``: a list (strings, nested objects and arrays, or mixed types)
+
+    A column mixing ints and floats is only ``float64`` if every int is exactly representable (i.e. within +/-2**53),
+    otherwise it is ``object``.
+
+    Null (or missing) values are marked in the ``null_mask``; the corresponding position in a numeric buffer holds 0.
+    """
+
+    __slots__ = ('_name', '_dtype', '_values', '_null_mask')
+
+    def __init__(self, name: str, dtype: str, values: Any, null_mask: Any) -> None:
+        self._name = name
+        self._dtype = dtype
+        self._values = values
+        self._null_mask = null_mask
+
+    @property
+    def name(self) -> str:
+        """
+        str: The field name of the column.
+        """
+        return self._name
+
+    @property
+    def dtype(self) -> str:
+        """
+        str: One of ``int64``, ``float64``, ``bool`` or ``object``.
+        """
+        return self._dtype
+
+    @property
+    def values(self) -> Any:
+        """
+        Union[array.array, List[Any], numpy.ndarray]: The column's value buffer.
+        """
+        return self._values
+
+    @property
+    def null_mask(self) -> Any:
+        """
+        Union[bytearray, numpy.ndarray]: A 1 (or True) for each row where the value is null (or missing).
+        """
+        return self._null_mask
+
+    @property
+    def null_count(self) -> int:
+        """
+        int: The number of null (or missing) values.
+        """
+        return int(sum(self._null_mask))
+
+    def to_list(self) -> List[Any]:
+        """Get the column's values as Python objects.
+
+        Returns:
+            A list of the column's values, with None for each null (or missing) value.
+        """
+        convert = bool if self._dtype == 'bool' else None
+        values: List[Any] = []
+        for value, is_null in zip(self._values, self._null_mask):
+            if is_null:
+                values.append(None)
+            elif convert is not None:
+                values.append(convert(value))
+            else:
+                values.append(value.item() if hasattr(value, 'item') else value)
+        return values
+
+    def __len__(self) -> int:
+        return len(self._null_mask)
+
+    def __repr__(self) -> str:
+        return f'Column(name={self._name!r}, dtype={self._dtype!r}, length={len(self)})'
+
+
+class ColumnarResult(Mapping[str, Column]):
+    """The rows of a query result, stored by column.
+
+    **VOLATILE** This API is subject to change at any time.
+
+    A mapping of each field name (in the order each field was first encountered) to its :class:`.Column`.  Every
+    column contains :attr:`.row_count` values.
+    """
+
+    __slots__ = ('_columns', '_row_count')
+
+    def __init__(self, columns: Dict[str, Column], row_count: int) -> None:
+        self._columns = columns
+        self._row_count = row_count
+
+    @property
+    def row_count(self) -> int:
+        """
+        int: The number of rows.
+        """
+        return self._row_count
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """Get each column's values as Python objects.
+
+        Returns:
+            A dict of each field name to a list of the column's values (see :meth:`.Column.to_list`).
+        """
+        return {name: column.to_list() for name, column in self._columns.items()}
+
+    def __getitem__(self, name: str) -> Column:
+        return self._columns[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __repr__(self) -> str:
+        return f'ColumnarResult(columns={list(self._columns)}, row_count={self._row_count})'
@@ -17,8 +17,19 @@
 from __future__ import annotations
 
 import json
+import re
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, List, Optional, Sequence, Type
+
+from couchbase_analytics.common.row import LazyRow
+
+_OBJECT_START_PATTERN = re.compile(rb'[ \t\n\r]*\{')
+
+
+def _overrides_deserialize_only(deserializer: Deserializer, cls: Type[Deserializer]) -> bool:
+    # a subclass that only overrides deserialize() must not be bypassed by the class' deserialize_many()
+    subclass = type(deserializer)
+    return subclass.deserialize is not cls.deserialize and subclass.deserialize_many is cls.deserialize_many
 
 
 class Deserializer(ABC):
@@ -30,6 +41,18 @@ class Deserializer(ABC):
     def deserialize(self, value: bytes) -> Any:
         raise NotImplementedError
 
+    def deserialize_many(self, values: Sequence[bytes]) -> List[Any]:
+        """Deserializes multiple rows at once.  Override in order to decode multiple rows more efficiently than one at a
+        time.
+
+        Args:
+            values: The bytes of each row to deserialize.
+
+        Returns:
+            The deserialized Python objects, in the same order as the provided rows.
+        """
+        return [self.deserialize(value) for value in values]
+
     @classmethod
     def __subclasshook__(cls, subclass: type) -> bool:
         return hasattr(subclass, 'deserialize') and callable(subclass.deserialize)
@@ -51,6 +74,22 @@ class DefaultJsonDeserializer(Deserializer):
         """
         return json.loads(value.decode('utf-8'))
 
+    def deserialize_many(self, values: Sequence[bytes]) -> List[Any]:
+        """Joins the received rows into a single JSON array and deserializes the array using Python's json library.
+
+        Args:
+            values: The bytes of each row to deserialize.
+
+        Returns:
+            The deserialized Python objects, in the same order as the provided rows.
+        """
+        if _overrides_deserialize_only(self, DefaultJsonDeserializer):
+            return super().deserialize_many(values)
+        if not values:
+            return []
+        rows: List[Any] = json.loads(b''.join((b'[', b','.join(values), b']')))
+        return rows
+
 
 class PassthroughDeserializer(Deserializer):
     """
@@ -67,3 +106,149 @@ class PassthroughDeserializer(Deserializer):
             The received bytes.
         """
         return value
+
+    def deserialize_many(self, values: Sequence[bytes]) -> List[bytes]:
+        """No deserializing is done.
+
+        Args:
+            values: The bytes of each row to passthrough.
+
+        Returns:
+            The received bytes of each row.
+        """
+        if _overrides_deserialize_only(self, PassthroughDeserializer):
+            return super().deserialize_many(values)
+        return list(values)
+
+
+class LazyRowDeserializer(Deserializer):
+    """
+    **VOLATILE** This API is subject to change at any time.
+
+    Deserializer that defers decoding object rows until they are used.  Each object row is returned as a
+    :class:`~couchbase_analytics.query.LazyRow`, which only decodes the fields that are accessed.  Rows which are not
+    JSON objects are deserialized the same as the :class:`.DefaultJsonDeserializer`.
+    """
+
+    def deserialize(self, value: bytes) -> Any:
+        """Wraps the received bytes in a :class:`~couchbase_analytics.query.LazyRow`, if the row is a JSON object.
+
+        Args:
+            value: The bytes to deserialize.
+
+        Returns:
+            A :class:`~couchbase_analytics.query.LazyRow` if the row is a JSON object, otherwise the deserialized Python
+            object.
+        """
+        if isinstance(value, memoryview):
+            # don't keep the entire HTTP chunk alive
+            value = bytes(value)
+        if _OBJECT_START_PATTERN.match(value) is None:
+            return json.loads(value)
+        return LazyRow(value)
+
+
+class OrjsonDeserializer(Deserializer):
+    """
+    Deserializer using the optional `orjson <https://github.com/ijl/orjson>`_ package.
+
+    Raises:
+        ImportError: If the orjson package is not installed.
+    """
+
+    def __init__(self) -> None:
+        try:
+            import orjson  # type: ignore[import-not-found, unused-ignore]
+        except ImportError:
+            raise ImportError('OrjsonDeserializer requires the orjson package.') from None
+        self._loads = orjson.loads
+
+    def deserialize(self, value: bytes) -> Any:
+        """Deserializes the received bytes using orjson.
+
+        Args:
+            value: The bytes to deserialize.
+
+        Returns:
+            The deserialized Python object.
+        """
+        return self._loads(value)
+
+    def deserialize_many(self, values: Sequence[bytes]) -> List[Any]:
+        """Joins the received rows into a single JSON array and deserializes the array using orjson.
+
+        Args:
+            values: The bytes of each row to deserialize.
+
+        Returns:
+            The deserialized Python objects, in the same order as the provided rows.
+        """
+        if _overrides_deserialize_only(self, OrjsonDeserializer):
+            return super().deserialize_many(values)
+        if not values:
+            return []
+        rows: List[Any] = self._loads(b''.join((b'[', b','.join(values), b']')))
+        return rows
+
+
+class MsgspecDeserializer(Deserializer):
+    """
+    Deserializer using the optional `msgspec <https://jcristharif.com/msgspec/>`_ package.
+
+    If a ``row_type`` is provided (e.g. a ``msgspec.Struct`` or a dataclass), each row is decoded directly into, and
+    validated against, that type.
+
+    Args:
+        row_type (Optional[Any]): The type each row is decoded into.  Defaults to `None` (rows are decoded into builtin
+            Python types, the same as the :class:`.DefaultJsonDeserializer`).
+
+    Raises:
+        ImportError: If the msgspec package is not installed.
+    """
+
+    def __init__(self, row_type: Optional[Any] = None) -> None:
+        try:
+            import msgspec  # type: ignore[import-not-found, unused-ignore]
+        except ImportError:
+            raise ImportError('MsgspecDeserializer requires the msgspec package.') from None
+        self._row_type = row_type if row_type is not None else Any
+        self._decoder = msgspec.json.Decoder(self._row_type)
+        # decodes rows that have been joined into a single JSON array
+        self._many_decoder = msgspec.json.Decoder(List[self._row_type])  # type: ignore[name-defined]
+
+    @property
+    def row_type(self) -> Any:
+        return self._row_type
+
+    def deserialize(self, value: bytes) -> Any:
+        """Deserializes the received bytes using msgspec.
+
+        Args:
+            value: The bytes to deserialize.
+
+        Returns:
+            The deserialized Python object (an instance of ``row_type``, if provided).
+
+        Raises:
+            msgspec.ValidationError: If the row does not match the provided ``row_type``.
+        """
+        return self._decoder.decode(value)
+
+    def deserialize_many(self, values: Sequence[bytes]) -> List[Any]:
+        """Joins the received rows into a single JSON array and deserializes the array using msgspec.
+
+        Args:
+            values: The bytes of each row to deserialize.
+
+        Returns:
+            The deserialized Python objects, in the same order as the provided rows.
+
+        Raises:
+            msgspec.ValidationError: If a row does not match the provided ``row_type``.
+        """
+        if _overrides_deserialize_only(self, MsgspecDeserializer):
+            return super().deserialize_many(values)
+        if not values:
+            return []
+        rows: List[Any] = self._many_decoder.decode(b''.join((b'[', b','.join(values), b']')))
+        return rows
@@ -41,3 +41,57 @@ QueryScanConsistency.REQUEST_PLUS.__doc__ = (
     'up to the most recent operations, but provides the highest level '
     'of consistency.'
 )
+
+
+class RowFormat(Enum):
+    """
+    **VOLATILE** This API is subject to change at any time.
+
+    Represents the various formats in which object (i.e. JSON object) rows can be materialized.  Rows which are not
+    objects (e.g. ``SELECT VALUE`` queries) are never altered.
+    """
+
+    DICT = 'dict'
+    TUPLE = 'tuple'
+    RECORD = 'record'
+
+
+RowFormat.DICT.__doc__ = (
+    'Rows are dicts.  Field names are shared across all rows of the result, '
+    'rather than each row holding its own copy of every field name.'
+)
+RowFormat.TUPLE.__doc__ = (
+    'Rows are tuples of the row values.  The field names are only held once, by the '
+    ':class:`~couchbase_analytics.query.RowSchema` of the result.  All rows must only contain fields of the schema '
+    'learned from the first row; fields missing from a row are None.'
+)
+RowFormat.RECORD.__doc__ = (
+    'Rows are read-only :class:`~couchbase_analytics.query.Record` mappings backed by a tuple of the row values and a '
+    ':class:`~couchbase_analytics.query.RowSchema` shared by all rows with the same fields.'
+)
+
+
+class HttpCompression(Enum):
+    """
+    **VOLATILE** This API is subject to change at any time.
+
+    Represents the content encodings the client accepts for query responses.  Responses are decompressed as they are
+    streamed.  BROTLI requires the optional brotli (or brotlicffi) package and ZSTD requires the optional zstandard
+    package.
+    """
+
+    AUTO = 'auto'
+    ZSTD = 'zstd'
+    BROTLI = 'br'
+    GZIP = 'gzip'
+    NONE = 'none'
+
+
+HttpCompression.AUTO.__doc__ = (
+    'Accepts any available content encoding, in order of preference: zstd, br (if the optional packages are '
+    'installed) and gzip.'
+)
+HttpCompression.ZSTD.__doc__ = 'Only accepts zstd encoded responses.'
+HttpCompression.BROTLI.__doc__ = 'Only accepts br (brotli) encoded responses.'
+HttpCompression.GZIP.__doc__ = 'Only accepts gzip encoded responses.'
+HttpCompression.NONE.__doc__ = 'Responses are not compressed.'
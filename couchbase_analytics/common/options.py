@@ -50,6 +50,7 @@ class ClusterOptions(ClusterOptionsBase):
         Options and methods marked **VOLATILE** are subject to change at any time.
 
     Args:
+        compression (Optional[:class:`~couchbase_analytics.options.HttpCompression`]): **VOLATILE** Set to configure the content encodings accepted for query responses.  Responses are decompressed incrementally as they are streamed.  The number of bytes received and decoded is available via :meth:`~couchbase_analytics.query.QueryMetadata.http_bytes_received` and :meth:`~couchbase_analytics.query.QueryMetadata.http_bytes_decoded`.  Defaults to `None` (the HTTP client's default, gzip and deflate).
         deserializer (Optional[Deserializer]): Set to configure global serializer to translate JSON to Python objects. Defaults to `None` (:class:`~couchbase_analytics.deserializer.DefaultJsonDeserializer`).
         max_retries (Optional[int]): **VOLATILE** Set to configure the maximum number of retries for a request. Defaults to 7.
         security_options (Optional[:class:`.SecurityOptions`]): Security options for SDK connection.
@@ -147,6 +148,7 @@ class QueryOptions(QueryOptionsBase):
         Options marked **VOLATILE** are subject to change at any time.
 
     Args:
+        buffer_entire_response (Optional[bool]): **VOLATILE** If enabled, the entire response is read and decoded at once instead of streaming rows.  Rows are not available until the entire response has been received.  Defaults to `None` (disabled).
         client_context_id (Optional[str]): Set to configure a unique identifier for this query request.  Defaults to `None` (autogenerated by client).
         deserializer (Optional[Deserializer]): Specifies a :class:`~couchbase_analytics.deserializer.Deserializer` to apply to results.  Defaults to `None` (:class:`~couchbase_analytics.deserializer.DefaultJsonDeserializer`).
         lazy_execute (Optional[bool]): **VOLATILE** If enabled, the query will not execute until the application begins to iterate over results.  Defaulst to `None` (disabled).
@@ -156,9 +158,11 @@ class QueryOptions(QueryOptionsBase):
         query_context (Optional[str]): Specifies the context within which this query should be executed.
         raw (Optional[Dict[str, Any]]): Specifies any additional parameters which should be passed to the Analytics engine when executing the query.
         readonly (Optional[bool]): Specifies that this query should be executed in read-only mode, disabling the ability for the query to make any changes to the data.
+        return_on_headers (Optional[bool]): **VOLATILE** If enabled, the query result is returned once the HTTP status and headers of a successful response have been received, rather than once the first row (or an error) is available.  Rows continue to be parsed in the background and any error in the response (including a timeout) is raised once the application begins to iterate over results.  Defaults to `None` (disabled).
+        row_format (Optional[RowFormat]): **VOLATILE** Specifies the :class:`~couchbase_analytics.query.RowFormat` in which object rows are materialized.  Useful to reduce the memory used by large results.  Defaults to `None` (rows are returned as provided by the deserializer).
         scan_consistency (Optional[QueryScanConsistency]): Specifies the consistency requirements when executing the query.
         timeout (Optional[timedelta]): Set to configure allowed time for operation to complete. Defaults to `None` (75s).
-        stream_config (Optional[JsonStreamConfig]): **VOLATILE** Configuration for JSON stream processing. Defaults to `None` (default configuration).  See :class:`~couchbase_analytics.common.json_parsing.JsonStreamConfig` for details.
+        stream_config (Optional[JsonStreamConfig]): **VOLATILE** Configuration for JSON stream processing. Defaults to `None` (default configuration).  See :class:`~couchbase_analytics.common.json_parsing.JsonStreamConfig` for details.  ``JsonStreamConfig.http_stream_buffer_size`` is deprecated and has no effect.
     """  # noqa: E501
 
 
@@ -33,7 +33,7 @@ else:
 from couchbase_analytics.common import JSONType
 from couchbase_analytics.common._core import JsonStreamConfig
 from couchbase_analytics.common.deserializer import Deserializer
-from couchbase_analytics.common.enums import QueryScanConsistency
+from couchbase_analytics.common.enums import HttpCompression, QueryScanConsistency, RowFormat
 
 """
     Python Analytics SDK Cluster Options Classes
@@ -41,6 +41,7 @@ from couchbase_analytics.common.enums import QueryScanConsistency
 
 
 class ClusterOptionsKwargs(TypedDict, total=False):
+    compression: Optional[Union[HttpCompression, str]]
     deserializer: Optional[Deserializer]
     max_retries: Optional[int]
     security_options: Optional[SecurityOptionsBase]
@@ -48,6 +49,7 @@ class ClusterOptionsKwargs(TypedDict, total=False):
 
 
 ClusterOptionsValidKeys: TypeAlias = Literal[
+    'compression',
     'deserializer',
     'max_retries',
     'security_options',
@@ -61,6 +63,7 @@ class ClusterOptionsBase(Dict[str, Any]):
     """
 
     VALID_OPTION_KEYS: List[ClusterOptionsValidKeys] = [
+        'compression',
         'deserializer',
         'max_retries',
         'security_options',
@@ -134,6 +137,7 @@ class TimeoutOptionsBase(Dict[str, object]):
 
 
 class QueryOptionsKwargs(TypedDict, total=False):
+    buffer_entire_response: Optional[bool]
     client_context_id: Optional[str]
     deserializer: Optional[Deserializer]
     lazy_execute: Optional[bool]
@@ -143,12 +147,15 @@ class QueryOptionsKwargs(TypedDict, total=False):
     query_context: Optional[str]
     raw: Optional[Dict[str, Any]]
     readonly: Optional[bool]
+    return_on_headers: Optional[bool]
+    row_format: Optional[Union[RowFormat, str]]
     scan_consistency: Optional[Union[QueryScanConsistency, str]]
     stream_config: Optional[JsonStreamConfig]
     timeout: Optional[timedelta]
 
 
 QueryOptionsValidKeys: TypeAlias = Literal[
+    'buffer_entire_response',
     'client_context_id',
     'deserializer',
     'lazy_execute',
@@ -158,6 +165,8 @@ QueryOptionsValidKeys: TypeAlias = Literal[
     'query_context',
     'raw',
     'readonly',
+    'return_on_headers',
+    'row_format',
     'scan_consistency',
     'stream_config',
     'timeout',
@@ -166,6 +175,7 @@ QueryOptionsValidKeys: TypeAlias = Literal[
 
 class QueryOptionsBase(Dict[str, object]):
     VALID_OPTION_KEYS: List[QueryOptionsValidKeys] = [
+        'buffer_entire_response',
         'client_context_id',
         'deserializer',
         'lazy_execute',
@@ -175,6 +185,8 @@ class QueryOptionsBase(Dict[str, object]):
         'query_context',
         'raw',
         'readonly',
+        'return_on_headers',
+        'row_format',
         'scan_consistency',
         'stream_config',
         'timeout',
@@ -122,5 +122,28 @@ class QueryMetadata:
         """
         return QueryMetrics(self._raw['metrics'])
 
+    def http_bytes_received(self) -> Optional[int]:
+        """Get the number of bytes of the HTTP response body received, i.e. prior to decoding the response's content
+        encoding (see the ``compression`` cluster option).
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Returns:
+            The number of bytes received, or None if not available.
+        """
+        return self._raw.get('http_bytes_received', None)
+
+    def http_bytes_decoded(self) -> Optional[int]:
+        """Get the number of bytes of the HTTP response body after decoding the response's content encoding.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        When the response is not compressed, this matches :meth:`http_bytes_received`.
+
+        Returns:
+            The number of decoded bytes, or None if not available.
+        """
+        return self._raw.get('http_bytes_decoded', None)
+
     def __repr__(self) -> str:
         return 'QueryMetadata:{}'.format(self._raw)
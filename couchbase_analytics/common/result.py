@@ -18,9 +18,25 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any, List, Optional
 
+from anyio import to_thread
+
+from couchbase_analytics.common._core.arrow import DEFAULT_ARROW_BATCH_SIZE, ArrowFileFormat, ArrowFileWriter
+from couchbase_analytics.common._core.column_builder import ColumnBuilder
+from couchbase_analytics.common._core.ndjson import encode_ndjson_metadata, encode_ndjson_rows, write_async
 from couchbase_analytics.common._core.result import QueryResult as QueryResult
+from couchbase_analytics.common._core.row_store_builder import DEFAULT_ROW_STORE_MEMORY_LIMIT, RowStoreBuilder
+from couchbase_analytics.common.columns import ColumnarResult
 from couchbase_analytics.common.query import QueryMetadata
-from couchbase_analytics.common.streaming import AsyncIterator, BlockingIterator
+from couchbase_analytics.common.row import RowSchema
+from couchbase_analytics.common.row_store import RowStore
+from couchbase_analytics.common.streaming import (
+    AsyncArrowBatchIterator,
+    AsyncBatchIterator,
+    AsyncIterator,
+    BlockingArrowBatchIterator,
+    BlockingBatchIterator,
+    BlockingIterator,
+)
 
 if TYPE_CHECKING:
     from acouchbase_analytics.protocol.streaming import AsyncHttpStreamingResponse
@@ -39,6 +55,27 @@ class BlockingQueryResult(QueryResult):
         """
         self._http_response.cancel()
 
+    def first(self) -> Any:
+        """Retrieve the first row returned by the query, then stop streaming the query results.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        See :meth:`.take` for details on how streaming is stopped.
+
+        Returns:
+            The first row (or the next row if rows have already been iterated), None if the query did not return any
+            (more) rows.
+
+        Example:
+            Check if a document exists::
+
+                q_str = 'SELECT a.id FROM `travel-sample`.inventory.airline a WHERE a.iata = $iata;'
+                exists = cluster.execute_query(q_str, named_parameters={'iata': 'KL'}).first() is not None
+
+        """
+        rows = self.take(1)
+        return rows[0] if rows else None
+
     def get_all_rows(self) -> List[Any]:
         """Convenience method to load all query results into memory.
 
@@ -54,6 +91,53 @@ class BlockingQueryResult(QueryResult):
         """
         return BlockingIterator(self._http_response).get_all_rows()
 
+    def iter_arrow_batches(
+        self, batch_size: int = DEFAULT_ARROW_BATCH_SIZE, schema: Optional[Any] = None
+    ) -> BlockingArrowBatchIterator:
+        """Retrieve the rows which have been returned by the query as pyarrow ``RecordBatch`` objects.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Each ``RecordBatch`` is built from ``batch_size`` rows as the rows are received, so only a single batch of rows
+        is in memory at a time.  If a schema is not provided, the schema is inferred from the first batch of rows and
+        used for every following batch.  A field that is null in every row of the first batch(es) is typed ``null``
+        until a batch w/ a non-null value for the field is received (provide a schema for all batches to share a single
+        schema).  Requires the pyarrow package.
+
+        Args:
+            batch_size: The number of rows in each ``RecordBatch``.  The final batch may contain fewer rows.  Defaults
+                to 10000.
+            schema: The ``pyarrow.Schema`` of the rows.  Fields not in the schema are ignored and fields missing from a
+                row are null.
+
+        Returns:
+            A blocking iterator for iterating over pyarrow ``RecordBatch`` objects.
+
+        Raises:
+            ImportError: If the pyarrow package is not installed.
+            ValueError: If the batch_size is not a positive integer, a row is not a JSON object or a row does not fit
+                the (provided or inferred) schema.
+
+        Example:
+            Build a pyarrow Table from a simple query::
+
+                q_str = 'SELECT a.name, a.country FROM `travel-sample`.inventory.airline a;'
+                table = pyarrow.Table.from_batches(cluster.execute_query(q_str).iter_arrow_batches())
+
+        """
+        return BlockingArrowBatchIterator(self._http_response, batch_size, schema=schema)
+
+    def iter_batches(self) -> BlockingBatchIterator:
+        """Retrieve the rows which have been returned by the query in batches, as the rows are received.
+
+        The number of rows in each batch varies depending on how the rows have been received.  Use
+        :meth:`.rows_batched` for batches of a fixed size.
+
+        Returns:
+            A blocking iterator for iterating over lists of query results.
+        """
+        return BlockingBatchIterator(self._http_response)
+
     def metadata(self) -> QueryMetadata:
         """Get the query metadata.
 
@@ -65,6 +149,67 @@ class BlockingQueryResult(QueryResult):
         """  # noqa: E501
         return self._http_response.get_metadata()
 
+    def one(self) -> Any:
+        """Retrieve the only row returned by the query, then stop streaming the query results.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        At most two rows are read in order to confirm the query returned exactly one row.  See :meth:`.take` for
+        details on how streaming is stopped.
+
+        Returns:
+            The only row (or the only remaining row if rows have already been iterated).
+
+        Raises:
+            ValueError: If the query did not return exactly one (more) row.
+
+        Example:
+            Retrieve a single count::
+
+                q_str = 'SELECT VALUE COUNT(*) FROM `travel-sample`.inventory.airline;'
+                airline_count = cluster.execute_query(q_str).one()
+
+        """
+        rows = self.take(2)
+        if len(rows) != 1:
+            returned = 'no rows' if not rows else 'more than one row'
+            raise ValueError(f'Expected the query to return exactly one row, but it returned {returned}.')
+        return rows[0]
+
+    def rows_batched(self, batch_size: int) -> BlockingBatchIterator:
+        """Retrieve the rows which have been returned by the query in batches of ``batch_size`` rows.
+
+        Args:
+            batch_size: The number of rows in each batch.  The final batch may contain fewer rows.
+
+        Returns:
+            A blocking iterator for iterating over lists of query results.
+
+        Raises:
+            ValueError: If the batch_size is not a positive integer.
+
+        Example:
+            Process rows in batches of 1000::
+
+                q_str = 'SELECT * FROM `travel-sample`.inventory.airline;'
+                for batch in cluster.execute_query(q_str).rows_batched(1000):
+                    process(batch)
+
+        """
+        return BlockingBatchIterator(self._http_response, batch_size=batch_size)
+
+    def row_schema(self) -> Optional[RowSchema]:
+        """Get the schema of the query's rows when using :attr:`~couchbase_analytics.query.RowFormat.TUPLE` rows.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Returns:
+            The :class:`~couchbase_analytics.query.RowSchema` (i.e. the field names, in order) of the tuple rows, or
+            `None` if the row format is not :attr:`~couchbase_analytics.query.RowFormat.TUPLE` or an object row has
+            not yet been received.
+        """
+        return self._http_response.get_row_schema()
+
     def rows(self) -> BlockingIterator:
         """Retrieve the rows which have been returned by the query.
 
@@ -73,6 +218,252 @@ class BlockingQueryResult(QueryResult):
         """
         return BlockingIterator(self._http_response)
 
+    def take(self, n: int) -> List[Any]:
+        """Retrieve the first ``n`` rows returned by the query, then stop streaming the query results.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Once ``n`` rows have been received, the remaining rows are not needed.  If the entire response has already
+        been received, the remaining results are read (w/o deserializing rows) so that :meth:`.metadata` is available
+        and the connection can be reused.  Otherwise, parsing the response stops, the HTTP response is closed and the
+        query's metadata is not available.
+
+        Args:
+            n: The number of rows to retrieve.
+
+        Returns:
+            A list of (at most ``n``) rows.  Contains fewer than ``n`` rows if the query did not return ``n`` (more)
+            rows.
+
+        Raises:
+            ValueError: If ``n`` is not a positive integer.
+
+        Example:
+            Preview the results of a query::
+
+                q_str = 'SELECT a.* FROM `travel-sample`.inventory.airline a;'
+                preview = cluster.execute_query(q_str).take(10)
+
+        """
+        if isinstance(n, bool) or not isinstance(n, int) or n < 1:
+            raise ValueError(f'Expected n to be a positive int, got {n!r}.')
+        for rows in BlockingBatchIterator(self._http_response, batch_size=n):
+            self._http_response.stop_streaming()
+            return rows
+        return []
+
+    def to_columns(self, use_numpy: Optional[bool] = False) -> ColumnarResult:
+        """Load all query results into memory, stored by column rather than by row.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Rows are added to the columns as each batch of rows is received, so only a single batch of rows is in memory at
+        a time.  Numeric and boolean columns are stored in :class:`array.array` (or NumPy array) buffers, all other
+        columns are stored in lists.  Null (and missing) values are marked in each column's null mask.
+
+        Args:
+            use_numpy: If enabled, numeric and boolean columns (and the null masks) are NumPy arrays.  Requires the
+                numpy package.  Defaults to `False`.
+
+        Returns:
+            A :class:`~couchbase_analytics.query.ColumnarResult` mapping of each field name to its column, along with
+            the row count.
+
+        Raises:
+            ImportError: If ``use_numpy`` is enabled and the numpy package is not installed.
+            ValueError: If a row is not a JSON object.
+
+        Example:
+            Load the columns of a simple query::
+
+                q_str = 'SELECT a.name, a.country FROM `travel-sample`.inventory.airline a;'
+                columns = cluster.execute_query(q_str).to_columns()
+                names = columns['name'].values
+
+        """
+        builder = ColumnBuilder(use_numpy=use_numpy)
+        for batch in BlockingBatchIterator(self._http_response):
+            try:
+                builder.add_rows(batch)
+            except Exception:
+                # the remaining rows are not needed once a batch cannot be added
+                self._http_response.stop_streaming()
+                raise
+        return builder.build()
+
+    def to_row_store(
+        self, memory_limit: int = DEFAULT_ROW_STORE_MEMORY_LIMIT, directory: Optional[str] = None
+    ) -> RowStore:
+        """Load all query results, keeping rows in memory up to a limit and spilling the remaining rows to disk.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Rows are deserialized and kept in memory until the (estimated) memory used by the deserialized rows reaches
+        ``memory_limit`` bytes (the first rows are measured once deserialized, the size of each later row is estimated
+        from the size of its JSON).  Every following row is appended to a temporary file as it is received, without
+        being deserialized, along with an index of each row's offset.  The returned
+        :class:`~couchbase_analytics.query.RowStore` can be iterated any number of times, indexed and sliced; spilled
+        rows are deserialized each time they are accessed.  Rows are never spilled when the entire response has been
+        read at once (e.g. when ``buffer_entire_response`` is enabled).
+
+        Args:
+            memory_limit: The (estimated) size in bytes of the deserialized rows kept in memory.  Set to 0 to spill
+                every row.  Defaults to 64 MiB.
+            directory: The directory of the temporary file.  Defaults to the platform's temporary directory (see
+                :func:`tempfile.gettempdir`).
+
+        Returns:
+            A :class:`~couchbase_analytics.query.RowStore` of the query's rows.  Close the row store (or use it as a
+            context manager) to remove the temporary file.
+
+        Raises:
+            ValueError: If the memory_limit is not a non-negative integer.
+
+        Example:
+            Randomly access the rows of a large result::
+
+                q_str = 'SELECT a.* FROM `travel-sample`.inventory.airline a;'
+                with cluster.execute_query(q_str).to_row_store(memory_limit=2**24) as rows:
+                    last_row = rows[-1]
+                    for row in rows[:1000]:
+                        process(row)
+
+        """
+        builder = RowStoreBuilder(self._http_response.create_row_decoder(), memory_limit, directory=directory)
+        try:
+            for batch in BlockingBatchIterator(self._http_response, raw=True):
+                try:
+                    builder.add_rows(batch, buffered=self._http_response.rows_buffered)
+                except Exception:
+                    # the remaining rows are not needed once a batch cannot be added (e.g. the disk is full)
+                    self._http_response.stop_streaming()
+                    raise
+        except BaseException:
+            builder.close()
+            raise
+        return builder.build()
+
+    def write_arrow_ipc(
+        self, path: Any, batch_size: int = DEFAULT_ARROW_BATCH_SIZE, schema: Optional[Any] = None
+    ) -> int:
+        """Write the query results to an Arrow IPC (i.e. Feather V2) file.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Rows are written a batch at a time as the rows are received (see :meth:`.iter_arrow_batches`), so only a single
+        batch of rows is in memory at a time.  While a field has only been null, up to 100000 rows are held until the
+        field's type is known.  Requires the pyarrow package.
+
+        Args:
+            path: The path (or pyarrow compatible sink) to write to.
+            batch_size: The number of rows in each record batch.  Defaults to 10000.
+            schema: The ``pyarrow.Schema`` of the rows.  If not provided, the schema is inferred from the first batch of
+                rows.
+
+        Returns:
+            The number of rows written.
+
+        Raises:
+            ImportError: If the pyarrow package is not installed.
+            ValueError: If the batch_size is not a positive integer, a row is not a JSON object or a row does not fit
+                the (provided or inferred) schema.
+        """
+        return self._write_arrow_file(path, ArrowFileFormat.ARROW_IPC, batch_size, schema)
+
+    def write_ndjson(
+        self, sink: Any, metadata_trailer: Optional[bool] = False, metadata_sink: Optional[Any] = None
+    ) -> int:
+        """Write the query results to a binary sink as newline delimited JSON (NDJSON).
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Each row is written as the JSON the server sent, followed by a newline, without deserializing the row (i.e. the
+        query's deserializer and row format are not used).  Rows are written as they are received, with a single write
+        per batch of rows.  Rows that have already been deserialized (e.g. when the entire response was read at once)
+        are encoded as JSON.
+
+        Args:
+            sink: A binary file-like object (i.e. an object with a ``write(bytes)`` method), for example a file opened
+                in ``'wb'`` mode or ``socket.makefile('wb')``.
+            metadata_trailer: If enabled, the query metadata (i.e. the JSON object the server sent, without the rows) is
+                written to the sink as the final line.  Defaults to `False`.
+            metadata_sink: If provided, the query metadata is written to this binary file-like object (e.g. a sidecar
+                file).
+
+        Returns:
+            The number of rows written.
+
+        Example:
+            Export the results of a simple query to a file::
+
+                q_str = 'SELECT a.* FROM `travel-sample`.inventory.airline a;'
+                with open('airlines.ndjson', 'wb') as f:
+                    num_rows = cluster.execute_query(q_str).write_ndjson(f)
+
+        """
+        row_count = 0
+        for batch in BlockingBatchIterator(self._http_response, raw=True):
+            try:
+                sink.write(encode_ndjson_rows(batch))
+            except Exception:
+                # the remaining rows are not needed once a batch cannot be written
+                self._http_response.stop_streaming()
+                raise
+            row_count += len(batch)
+        if metadata_trailer is True:
+            sink.write(encode_ndjson_metadata(self._http_response.get_raw_metadata()))
+        if metadata_sink is not None:
+            metadata_sink.write(self._http_response.get_raw_metadata())
+        return row_count
+
+    def write_parquet(self, path: Any, batch_size: int = DEFAULT_ARROW_BATCH_SIZE, schema: Optional[Any] = None) -> int:
+        """Write the query results to a Parquet file.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Rows are written a batch at a time as the rows are received (see :meth:`.iter_arrow_batches`), so only a single
+        batch of rows is in memory at a time.  While a field has only been null, up to 100000 rows are held until the
+        field's type is known.  Each batch is written as a Parquet row group.  Requires the pyarrow package.
+
+        Args:
+            path: The path (or pyarrow compatible sink) to write to.
+            batch_size: The number of rows in each record batch.  Defaults to 10000.
+            schema: The ``pyarrow.Schema`` of the rows.  If not provided, the schema is inferred from the first batch of
+                rows.
+
+        Returns:
+            The number of rows written.
+
+        Raises:
+            ImportError: If the pyarrow package is not installed.
+            ValueError: If the batch_size is not a positive integer, a row is not a JSON object or a row does not fit
+                the (provided or inferred) schema.
+
+        Example:
+            Write the results of a simple query to a Parquet file::
+
+                q_str = 'SELECT a.name, a.country FROM `travel-sample`.inventory.airline a;'
+                num_rows = cluster.execute_query(q_str).write_parquet('airlines.parquet')
+
+        """
+        return self._write_arrow_file(path, ArrowFileFormat.PARQUET, batch_size, schema)
+
+    def _write_arrow_file(self, path: Any, file_format: ArrowFileFormat, batch_size: int, schema: Optional[Any]) -> int:
+        batches = BlockingArrowBatchIterator(self._http_response, batch_size, schema=schema)
+        writer = ArrowFileWriter(path, file_format)
+        try:
+            for batch in batches:
+                try:
+                    writer.write_batch(batch)
+                except Exception:
+                    # the remaining rows are not needed once a batch cannot be written
+                    self._http_response.stop_streaming()
+                    raise
+        except BaseException:
+            writer.close()
+            raise
+        return writer.finish(batches.schema)
+
     def __iter__(self) -> BlockingIterator:
         return iter(BlockingIterator(self._http_response))
 
@@ -98,6 +489,28 @@ class AsyncQueryResult(QueryResult):
         """
         await self._http_response.cancel_async()
 
+    async def first(self) -> Any:
+        """Retrieve the first row returned by the query, then stop streaming the query results.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        See :meth:`.take` for details on how streaming is stopped.
+
+        Returns:
+            The first row (or the next row if rows have already been iterated), None if the query did not return any
+            (more) rows.
+
+        Example:
+            Check if a document exists::
+
+                q_str = 'SELECT a.id FROM `travel-sample`.inventory.airline a WHERE a.iata = $iata;'
+                result = await cluster.execute_query(q_str, named_parameters={'iata': 'KL'})
+                exists = await result.first() is not None
+
+        """
+        rows = await self.take(1)
+        return rows[0] if rows else None
+
     async def get_all_rows(self) -> List[Any]:
         """Convenience method to load all query results into memory.
 
@@ -114,6 +527,60 @@ class AsyncQueryResult(QueryResult):
         """
         return await AsyncIterator(self._http_response).get_all_rows()
 
+    def iter_arrow_batches(
+        self, batch_size: int = DEFAULT_ARROW_BATCH_SIZE, schema: Optional[Any] = None
+    ) -> AsyncArrowBatchIterator:
+        """Retrieve the rows which have been returned by the query as pyarrow ``RecordBatch`` objects.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Each ``RecordBatch`` is built from ``batch_size`` rows as the rows are received, so only a single batch of rows
+        is in memory at a time.  If a schema is not provided, the schema is inferred from the first batch of rows and
+        used for every following batch.  A field that is null in every row of the first batch(es) is typed ``null``
+        until a batch w/ a non-null value for the field is received (provide a schema for all batches to share a single
+        schema).  Requires the pyarrow package.
+
+        .. note::
+            Be sure to use ``async for`` when looping over batches.
+
+        Args:
+            batch_size: The number of rows in each ``RecordBatch``.  The final batch may contain fewer rows.  Defaults
+                to 10000.
+            schema: The ``pyarrow.Schema`` of the rows.  Fields not in the schema are ignored and fields missing from a
+                row are null.
+
+        Returns:
+            An async iterator for iterating over pyarrow ``RecordBatch`` objects.
+
+        Raises:
+            ImportError: If the pyarrow package is not installed.
+            ValueError: If the batch_size is not a positive integer, a row is not a JSON object or a row does not fit
+                the (provided or inferred) schema.
+
+        Example:
+            Build a pyarrow Table from a simple query::
+
+                q_str = 'SELECT a.name, a.country FROM `travel-sample`.inventory.airline a;'
+                result = await cluster.execute_query(q_str)
+                table = pyarrow.Table.from_batches([batch async for batch in result.iter_arrow_batches()])
+
+        """
+        return AsyncArrowBatchIterator(self._http_response, batch_size, schema=schema)
+
+    def iter_batches(self) -> AsyncBatchIterator:
+        """Retrieve the rows which have been returned by the query in batches, as the rows are received.
+
+        The number of rows in each batch varies depending on how the rows have been received.  Use
+        :meth:`.rows_batched` for batches of a fixed size.
+
+        .. note::
+            Be sure to use ``async for`` when looping over batches.
+
+        Returns:
+            An async iterator for iterating over lists of query results.
+        """
+        return AsyncBatchIterator(self._http_response)
+
     def metadata(self) -> QueryMetadata:
         """The meta-data which has been returned by the query.
 
@@ -125,6 +592,70 @@ class AsyncQueryResult(QueryResult):
         """  # noqa: E501
         return self._http_response.get_metadata()
 
+    async def one(self) -> Any:
+        """Retrieve the only row returned by the query, then stop streaming the query results.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        At most two rows are read in order to confirm the query returned exactly one row.  See :meth:`.take` for
+        details on how streaming is stopped.
+
+        Returns:
+            The only row (or the only remaining row if rows have already been iterated).
+
+        Raises:
+            ValueError: If the query did not return exactly one (more) row.
+
+        Example:
+            Retrieve a single count::
+
+                q_str = 'SELECT VALUE COUNT(*) FROM `travel-sample`.inventory.airline;'
+                airline_count = await (await cluster.execute_query(q_str)).one()
+
+        """
+        rows = await self.take(2)
+        if len(rows) != 1:
+            returned = 'no rows' if not rows else 'more than one row'
+            raise ValueError(f'Expected the query to return exactly one row, but it returned {returned}.')
+        return rows[0]
+
+    def rows_batched(self, batch_size: int) -> AsyncBatchIterator:
+        """Retrieve the rows which have been returned by the query in batches of ``batch_size`` rows.
+
+        .. note::
+            Be sure to use ``async for`` when looping over batches.
+
+        Args:
+            batch_size: The number of rows in each batch.  The final batch may contain fewer rows.
+
+        Returns:
+            An async iterator for iterating over lists of query results.
+
+        Raises:
+            ValueError: If the batch_size is not a positive integer.
+
+        Example:
+            Process rows in batches of 1000::
+
+                q_str = 'SELECT * FROM `travel-sample`.inventory.airline;'
+                async for batch in (await cluster.execute_query(q_str)).rows_batched(1000):
+                    process(batch)
+
+        """
+        return AsyncBatchIterator(self._http_response, batch_size=batch_size)
+
+    def row_schema(self) -> Optional[RowSchema]:
+        """Get the schema of the query's rows when using :attr:`~couchbase_analytics.query.RowFormat.TUPLE` rows.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Returns:
+            The :class:`~couchbase_analytics.query.RowSchema` (i.e. the field names, in order) of the tuple rows, or
+            `None` if the row format is not :attr:`~couchbase_analytics.query.RowFormat.TUPLE` or an object row has
+            not yet been received.
+        """
+        return self._http_response.get_row_schema()
+
     def rows(self) -> AsyncIterator:
         """Retrieve the rows which have been returned by the query.
 
@@ -140,6 +671,263 @@ class AsyncQueryResult(QueryResult):
         """Shutdown the streaming connection."""
         await self._http_response.shutdown()
 
+    async def take(self, n: int) -> List[Any]:
+        """Retrieve the first ``n`` rows returned by the query, then stop streaming the query results.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Once ``n`` rows have been received, the remaining rows are not needed.  If the entire response has already
+        been received, the remaining results are read (w/o deserializing rows) so that :meth:`.metadata` is available
+        and the connection can be reused.  Otherwise, parsing the response stops, the HTTP response is closed and the
+        query's metadata is not available.
+
+        Args:
+            n: The number of rows to retrieve.
+
+        Returns:
+            A list of (at most ``n``) rows.  Contains fewer than ``n`` rows if the query did not return ``n`` (more)
+            rows.
+
+        Raises:
+            ValueError: If ``n`` is not a positive integer.
+
+        Example:
+            Preview the results of a query::
+
+                q_str = 'SELECT a.* FROM `travel-sample`.inventory.airline a;'
+                preview = await (await cluster.execute_query(q_str)).take(10)
+
+        """
+        if isinstance(n, bool) or not isinstance(n, int) or n < 1:
+            raise ValueError(f'Expected n to be a positive int, got {n!r}.')
+        async for rows in AsyncBatchIterator(self._http_response, batch_size=n):
+            await self._http_response.stop_streaming()
+            return rows
+        return []
+
+    async def to_columns(self, use_numpy: Optional[bool] = False) -> ColumnarResult:
+        """Load all query results into memory, stored by column rather than by row.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Rows are added to the columns as each batch of rows is received, so only a single batch of rows is in memory at
+        a time.  Numeric and boolean columns are stored in :class:`array.array` (or NumPy array) buffers, all other
+        columns are stored in lists.  Null (and missing) values are marked in each column's null mask.
+
+        Args:
+            use_numpy: If enabled, numeric and boolean columns (and the null masks) are NumPy arrays.  Requires the
+                numpy package.  Defaults to `False`.
+
+        Returns:
+            A :class:`~couchbase_analytics.query.ColumnarResult` mapping of each field name to its column, along with
+            the row count.
+
+        Raises:
+            ImportError: If ``use_numpy`` is enabled and the numpy package is not installed.
+            ValueError: If a row is not a JSON object.
+
+        Example:
+            Load the columns of a simple query::
+
+                q_str = 'SELECT a.name, a.country FROM `travel-sample`.inventory.airline a;'
+                columns = await (await cluster.execute_query(q_str)).to_columns()
+                names = columns['name'].values
+
+        """
+        builder = ColumnBuilder(use_numpy=use_numpy)
+        async for batch in AsyncBatchIterator(self._http_response):
+            try:
+                builder.add_rows(batch)
+            except Exception:
+                # the remaining rows are not needed once a batch cannot be added
+                await self._http_response.stop_streaming()
+                raise
+        return builder.build()
+
+    async def to_row_store(
+        self, memory_limit: int = DEFAULT_ROW_STORE_MEMORY_LIMIT, directory: Optional[str] = None
+    ) -> RowStore:
+        """Load all query results, keeping rows in memory up to a limit and spilling the remaining rows to disk.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Rows are deserialized and kept in memory until the (estimated) memory used by the deserialized rows reaches
+        ``memory_limit`` bytes (the first rows are measured once deserialized, the size of each later row is estimated
+        from the size of its JSON).  Every following row is appended to a temporary file as it is received, without
+        being deserialized, along with an index of each row's offset.  The returned
+        :class:`~couchbase_analytics.query.RowStore` can be iterated any number of times, indexed and sliced; spilled
+        rows are deserialized each time they are accessed.  Rows are never spilled when the entire response has been
+        read at once (e.g. when ``buffer_entire_response`` is enabled).
+
+        Args:
+            memory_limit: The (estimated) size in bytes of the deserialized rows kept in memory.  Set to 0 to spill
+                every row.  Defaults to 64 MiB.
+            directory: The directory of the temporary file.  Defaults to the platform's temporary directory (see
+                :func:`tempfile.gettempdir`).
+
+        Returns:
+            A :class:`~couchbase_analytics.query.RowStore` of the query's rows.  Close the row store (or use it as a
+            context manager) to remove the temporary file.
+
+        Raises:
+            ValueError: If the memory_limit is not a non-negative integer.
+
+        Example:
+            Randomly access the rows of a large result::
+
+                q_str = 'SELECT a.* FROM `travel-sample`.inventory.airline a;'
+                result = await cluster.execute_query(q_str)
+                with await result.to_row_store(memory_limit=2**24) as rows:
+                    last_row = rows[-1]
+                    for row in rows[:1000]:
+                        process(row)
+
+        """
+        builder = RowStoreBuilder(self._http_response.create_row_decoder(), memory_limit, directory=directory)
+        # the rows are deserialized, or written to the (blocking) temporary file, in a worker thread so that the event
+        # loop is not blocked
+        try:
+            async for batch in AsyncBatchIterator(self._http_response, raw=True):
+                try:
+                    await to_thread.run_sync(builder.add_rows, batch, self._http_response.rows_buffered)
+                except Exception:
+                    # the remaining rows are not needed once a batch cannot be added (e.g. the disk is full)
+                    await self._http_response.stop_streaming()
+                    raise
+        except BaseException:
+            # not awaited, the task may have been cancelled
+            builder.close()
+            raise
+        return await to_thread.run_sync(builder.build)
+
+    async def write_arrow_ipc(
+        self, path: Any, batch_size: int = DEFAULT_ARROW_BATCH_SIZE, schema: Optional[Any] = None
+    ) -> int:
+        """Write the query results to an Arrow IPC (i.e. Feather V2) file.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Rows are written a batch at a time as the rows are received (see :meth:`.iter_arrow_batches`), so only a single
+        batch of rows is in memory at a time.  While a field has only been null, up to 100000 rows are held until the
+        field's type is known.  Requires the pyarrow package.
+
+        Args:
+            path: The path (or pyarrow compatible sink) to write to.
+            batch_size: The number of rows in each record batch.  Defaults to 10000.
+            schema: The ``pyarrow.Schema`` of the rows.  If not provided, the schema is inferred from the first batch of
+                rows.
+
+        Returns:
+            The number of rows written.
+
+        Raises:
+            ImportError: If the pyarrow package is not installed.
+            ValueError: If the batch_size is not a positive integer, a row is not a JSON object or a row does not fit
+                the (provided or inferred) schema.
+        """
+        return await self._write_arrow_file(path, ArrowFileFormat.ARROW_IPC, batch_size, schema)
+
+    async def write_ndjson(
+        self, sink: Any, metadata_trailer: Optional[bool] = False, metadata_sink: Optional[Any] = None
+    ) -> int:
+        """Write the query results to a binary sink as newline delimited JSON (NDJSON).
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Each row is written as the JSON the server sent, followed by a newline, without deserializing the row (i.e. the
+        query's deserializer and row format are not used).  Rows are written as they are received, with a single write
+        per batch of rows.  Rows that have already been deserialized (e.g. when the entire response was read at once)
+        are encoded as JSON.
+
+        Args:
+            sink: The binary sink.  Either an async writer (e.g. an :class:`asyncio.StreamWriter`, which is drained
+                after each write, or an object with an async ``write(bytes)`` method) or a binary file-like object,
+                whose (blocking) writes are run in a worker thread so that the event loop is not blocked.
+            metadata_trailer: If enabled, the query metadata (i.e. the JSON object the server sent, without the rows) is
+                written to the sink as the final line.  Defaults to `False`.
+            metadata_sink: If provided, the query metadata is written to this sink (e.g. a sidecar file).  Supports the
+                same types of sinks as ``sink``.
+
+        Returns:
+            The number of rows written.
+
+        Example:
+            Export the results of a simple query to a socket::
+
+                q_str = 'SELECT a.* FROM `travel-sample`.inventory.airline a;'
+                reader, writer = await asyncio.open_connection(host, port)
+                num_rows = await (await cluster.execute_query(q_str)).write_ndjson(writer)
+
+        """
+        row_count = 0
+        async for batch in AsyncBatchIterator(self._http_response, raw=True):
+            try:
+                await write_async(sink, encode_ndjson_rows(batch))
+            except Exception:
+                # the remaining rows are not needed once a batch cannot be written
+                await self._http_response.stop_streaming()
+                raise
+            row_count += len(batch)
+        if metadata_trailer is True:
+            await write_async(sink, encode_ndjson_metadata(self._http_response.get_raw_metadata()))
+        if metadata_sink is not None:
+            await write_async(metadata_sink, self._http_response.get_raw_metadata())
+        return row_count
+
+    async def write_parquet(
+        self, path: Any, batch_size: int = DEFAULT_ARROW_BATCH_SIZE, schema: Optional[Any] = None
+    ) -> int:
+        """Write the query results to a Parquet file.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Rows are written a batch at a time as the rows are received (see :meth:`.iter_arrow_batches`), so only a single
+        batch of rows is in memory at a time.  While a field has only been null, up to 100000 rows are held until the
+        field's type is known.  Each batch is written as a Parquet row group.  Requires the pyarrow package.
+
+        Args:
+            path: The path (or pyarrow compatible sink) to write to.
+            batch_size: The number of rows in each record batch.  Defaults to 10000.
+            schema: The ``pyarrow.Schema`` of the rows.  If not provided, the schema is inferred from the first batch of
+                rows.
+
+        Returns:
+            The number of rows written.
+
+        Raises:
+            ImportError: If the pyarrow package is not installed.
+            ValueError: If the batch_size is not a positive integer, a row is not a JSON object or a row does not fit
+                the (provided or inferred) schema.
+
+        Example:
+            Write the results of a simple query to a Parquet file::
+
+                q_str = 'SELECT a.name, a.country FROM `travel-sample`.inventory.airline a;'
+                num_rows = await (await cluster.execute_query(q_str)).write_parquet('airlines.parquet')
+
+        """
+        return await self._write_arrow_file(path, ArrowFileFormat.PARQUET, batch_size, schema)
+
+    async def _write_arrow_file(
+        self, path: Any, file_format: ArrowFileFormat, batch_size: int, schema: Optional[Any]
+    ) -> int:
+        batches = AsyncArrowBatchIterator(self._http_response, batch_size, schema=schema)
+        writer = ArrowFileWriter(path, file_format)
+        # the (blocking) file writes are run in a worker thread so that the event loop is not blocked
+        try:
+            async for batch in batches:
+                try:
+                    await to_thread.run_sync(writer.write_batch, batch)
+                except Exception:
+                    # the remaining rows are not needed once a batch cannot be written
+                    await self._http_response.stop_streaming()
+                    raise
+        except BaseException:
+            # not awaited, the task may have been cancelled
+            writer.close()
+            raise
+        return await to_thread.run_sync(writer.finish, batches.schema)
+
     def __aiter__(self) -> AsyncIterator:
         return AsyncIterator(self._http_response).__aiter__()
 
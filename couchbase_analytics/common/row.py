@@ -0,0 +1,309 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+import json
+import re
+import sys
+from collections.abc import Mapping
+from json.scanner import make_scanner
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+_WHITESPACE_PATTERN = re.compile(r'[ \t\n\r]*')
+# matches the remainder of a JSON string, starting after the opening quote and ending after the closing quote
+_STRING_END_PATTERN = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_SCALAR_END_PATTERN = re.compile(r'[ \t\n\r,}\]]')
+# escapes by which a later field name could match a field name w/o being written the same way
+_NAME_ESCAPE_PATTERN = re.compile(r'\\[u/]')
+# uses the json module's (C accelerated, if available) scanner to decode individual values
+_scan_value = make_scanner(json.JSONDecoder())  # type: ignore[arg-type]
+
+# the number of fields a LazyRow indexes prior to decoding the entire row
+MAX_LAZY_INDEXED_FIELDS = 8
+
+
+class RowSchema:
+    """The field names, in order, of a row.
+
+    **VOLATILE** This API is subject to change at any time.
+
+    A single schema is shared by all rows with the same fields.
+    """
+
+    __slots__ = ('_fields', '_index')
+
+    def __init__(self, fields: Iterable[str]) -> None:
+        self._fields: Tuple[str, ...] = tuple(sys.intern(field) for field in fields)
+        self._index: Dict[str, int] = {field: idx for idx, field in enumerate(self._fields)}
+        if len(self._index) != len(self._fields):
+            raise ValueError('RowSchema fields must be unique.')
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """
+        Tuple[str, ...]: The field names, in order.
+        """
+        return self._fields
+
+    def index(self, field: str) -> int:
+        """Get the position of a field.
+
+        Args:
+            field: The field name.
+
+        Returns:
+            The position of the field's value within a row.
+
+        Raises:
+            KeyError: If the field is not part of the schema.
+        """
+        return self._index[field]
+
+    def __contains__(self, field: object) -> bool:
+        return field in self._index
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RowSchema):
+            return NotImplemented
+        return self._fields == other._fields
+
+    def __hash__(self) -> int:
+        return hash(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __repr__(self) -> str:
+        return f'RowSchema({list(self._fields)})'
+
+
+class Record(Mapping[str, Any]):
+    """A read-only row, backed by a tuple of the row's values and a :class:`.RowSchema` shared with other rows.
+
+    **VOLATILE** This API is subject to change at any time.
+
+    A Record behaves like a read-only dict (and compares equal to a dict with the same items), but takes considerably
+    less memory as the field names are not stored per row.
+    """
+
+    __slots__ = ('_schema', '_values')
+
+    def __init__(self, schema: RowSchema, values: Tuple[Any, ...]) -> None:
+        if len(values) != len(schema):
+            raise ValueError('Expected the number of Record values to match the number of RowSchema fields.')
+        self._schema = schema
+        self._values = values
+
+    @property
+    def schema(self) -> RowSchema:
+        """
+        :class:`.RowSchema`: The schema of the row.
+        """
+        return self._schema
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the row as a dict.
+
+        Returns:
+            A new dict of the row's fields and values.
+        """
+        return dict(zip(self._schema.fields, self._values))
+
+    def as_tuple(self) -> Tuple[Any, ...]:
+        """Get the row's values.
+
+        Returns:
+            The row's values, in the order of the row's schema fields.
+        """
+        return self._values
+
+    def __getitem__(self, field: str) -> Any:
+        return self._values[self._schema.index(field)]
+
+    def __contains__(self, field: object) -> bool:
+        return field in self._schema
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._schema.fields)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (Record, (self._schema, self._values))
+
+    def __repr__(self) -> str:
+        return f'Record({self.as_dict()!r})'
+
+
+class LazyRow(Mapping[str, Any]):
+    """A read-only row which holds the raw JSON object of the row and only decodes a field when it is accessed.
+
+    **VOLATILE** This API is subject to change at any time.
+
+    When a field is accessed, the row's top-level fields are indexed, in order, only until the field is found.  Only the
+    accessed field's value is decoded (and then cached).  If the field is not found within the first 8 fields, or
+    the entire row is needed (e.g. when iterating), the entire row is decoded at once.  Best suited for wide rows
+    where only a few of the leading fields are used, or for result sets where many of the rows are never used.  Use
+    :meth:`.to_dict` to decode the entire row.  As with ``json.loads``, the last value of a duplicated field is used.
+
+    .. note::
+        Rows are not validated until they are accessed.  Accessing an invalid row raises a ``ValueError``.
+    """
+
+    __slots__ = ('_raw', '_text', '_offsets', '_values', '_scan_pos', '_row')
+
+    def __init__(self, raw: bytes) -> None:
+        self._raw = raw
+        self._text: Optional[str] = None
+        # field -> start position of the field's value within the decoded text of the row
+        self._offsets: Dict[str, int] = {}
+        self._values: Dict[str, Any] = {}
+        # position from which to continue indexing fields, -1 once all fields have been indexed
+        self._scan_pos = 0
+        # set once the entire row has been decoded
+        self._row: Optional[Dict[str, Any]] = None
+
+    @property
+    def raw(self) -> bytes:
+        """
+        bytes: The raw JSON object of the row.
+        """
+        return self._raw
+
+    def _decode_row(self) -> Dict[str, Any]:
+        if self._row is None:
+            row = json.loads(self._raw)
+            if not isinstance(row, dict):
+                raise ValueError('Expected JSON row to be a JSON object.')
+            self._row = row
+            # the index is no longer needed
+            self._text = None
+            self._offsets = {}
+            self._values = {}
+        return self._row
+
+    def _start_index(self) -> str:
+        text = self._raw.decode('utf-8')
+        pos = _WHITESPACE_PATTERN.match(text).end()  # type: ignore[union-attr]
+        if text[pos : pos + 1] != '{':
+            raise ValueError('Expected JSON row to be a JSON object.')
+        pos = _WHITESPACE_PATTERN.match(text, pos + 1).end()  # type: ignore[union-attr]
+        self._scan_pos = -1 if text[pos : pos + 1] == '}' else pos
+        self._text = text
+        return text
+
+    def _index_field(self, text: str, pos: int) -> int:
+        if text[pos : pos + 1] != '"':
+            raise ValueError(f'Expected field name in JSON row at position {pos}.')
+        key, pos = _scan_value(text, pos)
+        pos = _WHITESPACE_PATTERN.match(text, pos).end()  # type: ignore[union-attr]
+        if text[pos : pos + 1] != ':':
+            raise ValueError(f'Expected ":" in JSON row at position {pos}.')
+        start = _WHITESPACE_PATTERN.match(text, pos + 1).end()  # type: ignore[union-attr]
+        char = text[start : start + 1]
+        if char == '"':
+            match = _STRING_END_PATTERN.match(text, start + 1)
+            if match is None:
+                raise ValueError(f'Unterminated string in JSON row at position {start}.')
+            end = match.end()
+        elif char == '{' or char == '[':
+            end = self._index_nested_value(text, key, start)
+        elif char:
+            match = _SCALAR_END_PATTERN.search(text, start)
+            end = match.start() if match is not None else len(text)
+        else:
+            raise ValueError(f'Expected value in JSON row at position {start}.')
+        self._offsets[key] = start
+
+        pos = _WHITESPACE_PATTERN.match(text, end).end()  # type: ignore[union-attr]
+        char = text[pos : pos + 1]
+        if char == ',':
+            return _WHITESPACE_PATTERN.match(text, pos + 1).end()  # type: ignore[union-attr]
+        if char == '}':
+            return -1
+        raise ValueError(f'Expected "," or "}}" in JSON row at position {pos}.')
+
+    def _index_nested_value(self, text: str, key: str, start: int) -> int:
+        # skipping a nested value in Python is far slower than decoding it via the json module's scanner
+        try:
+            value, end = _scan_value(text, start)
+        except StopIteration:
+            raise ValueError(f'Expected value in JSON row at position {start}.') from None
+        if self._is_last_occurrence(text, key, end):
+            self._values[key] = value
+        return int(end)
+
+    @staticmethod
+    def _is_last_occurrence(text: str, field: str, pos: int) -> bool:
+        # json.loads keeps the last value of a duplicated field, so the field must not appear (as a field name) after
+        # pos; the field name within a nested object or a string value is a false positive, which only costs decoding
+        # the entire row
+        return (
+            text.find(json.dumps(field, ensure_ascii=False), pos) == -1
+            and _NAME_ESCAPE_PATTERN.search(text, pos) is None
+        )
+
+    def _get_indexed_value(self, field: str) -> Any:
+        text = self._text if self._text is not None else self._start_index()
+        while field not in self._offsets:
+            if self._scan_pos == -1:
+                raise KeyError(field)
+            if len(self._offsets) >= MAX_LAZY_INDEXED_FIELDS:
+                return self._decode_row()[field]
+            self._scan_pos = self._index_field(text, self._scan_pos)
+        if field in self._values:
+            # nested values are decoded while indexing
+            return self._values[field]
+        try:
+            value, end = _scan_value(text, self._offsets[field])
+        except StopIteration:
+            raise ValueError(f'Expected value in JSON row at position {self._offsets[field]}.') from None
+        if not self._is_last_occurrence(text, field, end):
+            return self._decode_row()[field]
+        self._values[field] = value
+        return value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Decode the entire row.
+
+        Returns:
+            A new dict of the row's fields and values.
+        """
+        return dict(self._decode_row())
+
+    def __getitem__(self, field: str) -> Any:
+        if self._row is not None:
+            return self._row[field]
+        if field in self._values:
+            return self._values[field]
+        return self._get_indexed_value(field)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._decode_row())
+
+    def __len__(self) -> int:
+        return len(self._decode_row())
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (LazyRow, (self._raw,))
+
+    def __repr__(self) -> str:
+        return f'LazyRow({self._raw!r})'
@@ -0,0 +1,142 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+import weakref
+from array import array
+from collections.abc import Sequence
+from types import TracebackType
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Type, Union, overload
+
+from couchbase_analytics.common._core.row_store import RowDecoder, SpillFile
+
+# the number of spilled rows deserialized at once when iterating
+_ITER_BATCH_SIZE = 1000
+
+
+class RowStore(Sequence[Any]):
+    """The rows of a query result, held in memory up to a limit and spilled to a temporary file beyond that limit.
+
+    **VOLATILE** This API is subject to change at any time.
+
+    A read-only sequence of the result's rows that can be iterated any number of times and indexed (or sliced) without
+    re-executing the query.  Rows kept in memory have already been deserialized.  Spilled rows are stored as the JSON
+    the server sent (one row per line, see :attr:`.path`) and are deserialized (w/ the query's deserializer and row
+    format) each time they are accessed, via a memory-map of the file and an index of each row's offset.
+
+    The temporary file is removed when the row store is closed (or garbage collected).  A row store can be pickled and
+    sent to other processes (e.g. the workers of a :class:`multiprocessing.Pool`) on the same host.  Only the row
+    offsets are copied, the spilled rows are read from the same file.  A row store received from another process does
+    not remove the file, the file must remain available (i.e. the original row store must not be closed) until the
+    other processes are done with it.
+    """
+
+    def __init__(
+        self, rows: List[Any], decoder: RowDecoder, offsets: array[int], spill_file: Optional[SpillFile]
+    ) -> None:
+        self._rows = rows
+        self._decoder = decoder
+        self._offsets = offsets
+        self._spill_file = spill_file
+        self._finalizer = weakref.finalize(self, spill_file.close) if spill_file is not None else None
+
+    @property
+    def path(self) -> Optional[str]:
+        """
+        Optional[str]: The path of the temporary file of spilled rows (as newline delimited JSON), or `None` if no rows
+        have been spilled.
+        """
+        return self._spill_file.path if self._spill_file is not None else None
+
+    @property
+    def spilled_row_count(self) -> int:
+        """
+        int: The number of rows that have been spilled to the temporary file.
+        """
+        return len(self._offsets) - 1
+
+    def close(self) -> None:
+        """Removes the temporary file of spilled rows.  Spilled rows are no longer available once closed."""
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def _read_rows(self, positions: Iterable[int]) -> List[Any]:
+        if self._spill_file is None:
+            raise RuntimeError('Row store does not have spilled rows.')
+        offsets = self._offsets
+        read = self._spill_file.read
+        # exclude the newline that follows each row
+        return self._decoder.decode([read(offsets[pos], offsets[pos + 1] - 1) for pos in positions])
+
+    def _get_rows(self, indexes: range) -> List[Any]:
+        memory_count = len(self._rows)
+        spilled = [idx - memory_count for idx in indexes if idx >= memory_count]
+        spilled_rows = iter(self._read_rows(spilled) if spilled else ())
+        return [self._rows[idx] if idx < memory_count else next(spilled_rows) for idx in indexes]
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Any]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return self._get_rows(range(*index.indices(len(self))))
+        row_count = len(self)
+        if index < 0:
+            index += row_count
+        if not 0 <= index < row_count:
+            raise IndexError('RowStore index out of range')
+        if index < len(self._rows):
+            return self._rows[index]
+        return self._read_rows((index - len(self._rows),))[0]
+
+    def __iter__(self) -> Iterator[Any]:
+        yield from self._rows
+        spilled_row_count = self.spilled_row_count
+        for start in range(0, spilled_row_count, _ITER_BATCH_SIZE):
+            yield from self._read_rows(range(start, min(start + _ITER_BATCH_SIZE, spilled_row_count)))
+
+    def __len__(self) -> int:
+        return len(self._rows) + len(self._offsets) - 1
+
+    def __enter__(self) -> RowStore:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'rows': self._rows, 'decoder': self._decoder, 'offsets': self._offsets, 'path': self.path}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        path = state['path']
+        self._rows = state['rows']
+        self._decoder = state['decoder']
+        self._offsets = state['offsets']
+        # only the row store that spilled the rows removes the file
+        self._spill_file = SpillFile(path, False) if path is not None else None
+        self._finalizer = weakref.finalize(self, self._spill_file.close) if self._spill_file is not None else None
+
+    def __repr__(self) -> str:
+        return f'RowStore(row_count={len(self)}, spilled_row_count={self.spilled_row_count})'
@@ -18,8 +18,9 @@ from __future__ import annotations
 
 from collections.abc import AsyncIterator as PyAsyncIterator
 from collections.abc import Iterator
-from typing import TYPE_CHECKING, Any, List
+from typing import TYPE_CHECKING, Any, List, Optional
 
+from couchbase_analytics.common._core.arrow import ArrowBatchBuilder
 from couchbase_analytics.common.errors import AnalyticsError, InternalSDKError
 
 if TYPE_CHECKING:
@@ -38,8 +39,16 @@ class BlockingIterator(Iterator[Any]):
     def get_all_rows(self) -> List[Any]:
         """
         **INTERNAL
+
+        If the request has not yet been sent (i.e. lazy execution), the entire response is read and decoded at once.
+        Otherwise the remaining rows are collected in batches.
         """
-        return list(self)
+        if self._http_response.lazy_execute is True:
+            self._http_response.enable_buffer_entire_response()
+        rows: List[Any] = []
+        for batch in BlockingBatchIterator(self._http_response):
+            rows.extend(batch)
+        return rows
 
     def __iter__(self) -> BlockingIterator:
         """
@@ -64,6 +73,105 @@ class BlockingIterator(Iterator[Any]):
             raise InternalSDKError(cause=ex, message='Error attempting to obtain next row.') from None
 
 
+def _validate_batch_size(batch_size: Optional[int]) -> Optional[int]:
+    if batch_size is None:
+        return None
+    if isinstance(batch_size, bool) or not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError(f'Expected batch_size to be a positive int, got {batch_size!r}.')
+    return batch_size
+
+
+class BlockingBatchIterator(Iterator[List[Any]]):
+    """
+    **INTERNAL
+
+    Iterates over lists of rows.  If ``batch_size`` is provided, each batch contains ``batch_size`` rows (the final
+    batch may contain fewer rows), otherwise each batch contains the rows as they were handed off by the JSON stream.
+    If ``raw`` is enabled, rows are not deserialized when possible (see ``get_next_rows()``).
+    """
+
+    def __init__(
+        self, http_response: HttpStreamingResponse, batch_size: Optional[int] = None, raw: Optional[bool] = False
+    ) -> None:
+        self._http_response = http_response
+        self._batch_size = _validate_batch_size(batch_size)
+        self._raw = raw is True
+        self._done = False
+
+    def __iter__(self) -> BlockingBatchIterator:
+        """
+        **INTERNAL
+        """
+        if self._http_response.lazy_execute is True:
+            self._http_response.send_request()
+
+        return self
+
+    def __next__(self) -> List[Any]:
+        """
+        **INTERNAL
+        """
+        if self._done:
+            raise StopIteration
+        batch: List[Any] = []
+        try:
+            while True:
+                max_rows = None if self._batch_size is None else self._batch_size - len(batch)
+                batch.extend(self._http_response.get_next_rows(max_rows=max_rows, raw=self._raw))
+                if self._batch_size is None or len(batch) >= self._batch_size:
+                    return batch
+        except StopIteration:
+            self._done = True
+            if batch:
+                return batch
+            raise
+        except AnalyticsError as err:
+            raise err
+        except Exception as ex:
+            raise InternalSDKError(cause=ex, message='Error attempting to obtain next batch of rows.') from None
+
+
+class BlockingArrowBatchIterator(Iterator[Any]):
+    """
+    **INTERNAL
+
+    Iterates over pyarrow RecordBatches, each built from a batch of ``batch_size`` rows.
+    """
+
+    def __init__(self, http_response: HttpStreamingResponse, batch_size: int, schema: Optional[Any] = None) -> None:
+        self._http_response = http_response
+        self._batches = BlockingBatchIterator(http_response, batch_size=batch_size)
+        self._builder = ArrowBatchBuilder(schema=schema)
+
+    @property
+    def schema(self) -> Optional[Any]:
+        """
+        **INTERNAL
+
+        The provided schema, or the schema inferred from the first batch (None until the first batch).
+        """
+        return self._builder.schema
+
+    def __iter__(self) -> BlockingArrowBatchIterator:
+        """
+        **INTERNAL
+        """
+        iter(self._batches)
+        return self
+
+    def __next__(self) -> Any:
+        """
+        **INTERNAL
+        """
+        rows = next(self._batches)
+        try:
+            return self._builder.to_record_batch(rows)
+        except ValueError:
+            # the remaining rows cannot be converted either
+            self._http_response.stop_streaming()
+            raise
+
+
 class AsyncIterator(PyAsyncIterator[Any]):
     """
     **INTERNAL
@@ -75,8 +183,13 @@ class AsyncIterator(PyAsyncIterator[Any]):
     async def get_all_rows(self) -> List[Any]:
         """
         **INTERNAL
+
+        Collects the remaining rows in batches.
         """
-        return [r async for r in self]
+        rows: List[Any] = []
+        async for batch in AsyncBatchIterator(self._http_response):
+            rows.extend(batch)
+        return rows
 
     def __aiter__(self) -> AsyncIterator:
         """
@@ -96,3 +209,92 @@ class AsyncIterator(PyAsyncIterator[Any]):
             raise err
         except Exception as ex:
             raise InternalSDKError(cause=ex, message='Error attempting to obtain next row.') from None
+
+
+class AsyncBatchIterator(PyAsyncIterator[List[Any]]):
+    """
+    **INTERNAL
+
+    Iterates over lists of rows.  If ``batch_size`` is provided, each batch contains ``batch_size`` rows (the final
+    batch may contain fewer rows), otherwise each batch contains the rows as they were handed off by the JSON stream.
+    If ``raw`` is enabled, rows are not deserialized when possible (see ``get_next_rows()``).
+    """
+
+    def __init__(
+        self, http_response: AsyncHttpStreamingResponse, batch_size: Optional[int] = None, raw: Optional[bool] = False
+    ) -> None:
+        self._http_response = http_response
+        self._batch_size = _validate_batch_size(batch_size)
+        self._raw = raw is True
+        self._done = False
+
+    def __aiter__(self) -> AsyncBatchIterator:
+        """
+        **INTERNAL
+        """
+        return self
+
+    async def __anext__(self) -> List[Any]:
+        """
+        **INTERNAL
+        """
+        if self._done:
+            raise StopAsyncIteration
+        batch: List[Any] = []
+        try:
+            while True:
+                max_rows = None if self._batch_size is None else self._batch_size - len(batch)
+                batch.extend(await self._http_response.get_next_rows(max_rows=max_rows, raw=self._raw))
+                if self._batch_size is None or len(batch) >= self._batch_size:
+                    return batch
+        except StopAsyncIteration:
+            self._done = True
+            if batch:
+                return batch
+            raise
+        except AnalyticsError as err:
+            raise err
+        except Exception as ex:
+            raise InternalSDKError(cause=ex, message='Error attempting to obtain next batch of rows.') from None
+
+
+class AsyncArrowBatchIterator(PyAsyncIterator[Any]):
+    """
+    **INTERNAL
+
+    Iterates over pyarrow RecordBatches, each built from a batch of ``batch_size`` rows.
+    """
+
+    def __init__(
+        self, http_response: AsyncHttpStreamingResponse, batch_size: int, schema: Optional[Any] = None
+    ) -> None:
+        self._http_response = http_response
+        self._batches = AsyncBatchIterator(http_response, batch_size=batch_size)
+        self._builder = ArrowBatchBuilder(schema=schema)
+
+    @property
+    def schema(self) -> Optional[Any]:
+        """
+        **INTERNAL
+
+        The provided schema, or the schema inferred from the first batch (None until the first batch).
+        """
+        return self._builder.schema
+
+    def __aiter__(self) -> AsyncArrowBatchIterator:
+        """
+        **INTERNAL
+        """
+        return self
+
+    async def __anext__(self) -> Any:
+        """
+        **INTERNAL
+        """
+        rows = await self._batches.__anext__()
+        try:
+            return self._builder.to_record_batch(rows)
+        except ValueError:
+            # the remaining rows cannot be converted either
+            await self._http_response.stop_streaming()
+            raise
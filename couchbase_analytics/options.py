@@ -14,6 +14,7 @@
 #  limitations under the License.
 
 
+from couchbase_analytics.common.enums import HttpCompression as HttpCompression  # noqa: F401
 from couchbase_analytics.common.options import ClusterOptions as ClusterOptions  # noqa: F401
 from couchbase_analytics.common.options import ClusterOptionsKwargs as ClusterOptionsKwargs  # noqa: F401
 from couchbase_analytics.common.options import QueryOptions as QueryOptions  # noqa: F401
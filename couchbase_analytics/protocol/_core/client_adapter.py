@@ -145,12 +145,17 @@ class _ClientAdapter:
                 transport = None
                 if self._http_transport_cls is not None:
                     transport = self._http_transport_cls(verify=self._conn_details.ssl_context)
-                self._client = Client(verify=self._conn_details.ssl_context, auth=auth, transport=transport)
+                self._client = Client(
+                    verify=self._conn_details.ssl_context,
+                    auth=auth,
+                    headers=self._conn_details.get_http_headers(),
+                    transport=transport,
+                )
             else:
                 transport = None
                 if self._http_transport_cls is not None:
                     transport = self._http_transport_cls()
-                self._client = Client(auth=auth, transport=transport)
+                self._client = Client(auth=auth, headers=self._conn_details.get_http_headers(), transport=transport)
 
             self.log_message(
                 (f'Cluster HTTP client created: connection_details={self._conn_details.get_init_details()}'),
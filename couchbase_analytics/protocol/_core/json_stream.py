@@ -16,39 +16,47 @@
 
 from __future__ import annotations
 
+import time
+from collections import deque
 from concurrent.futures import Future
-from queue import Empty as QueueEmpty
-from queue import Full as QueueFull
-from queue import Queue
-from typing import TYPE_CHECKING, Callable, Iterator, Optional
+from threading import Condition
+from typing import TYPE_CHECKING, Any, Callable, Deque, Generator, Iterator, List, Optional, Tuple
 
 import ijson
 
+from couchbase_analytics.common._core.buffered_bytes import BufferedBytes
+from couchbase_analytics.common._core.json_parser_backend import (
+    JsonParserBackend,
+    WholeBufferJsonParser,
+    get_ijson_backend,
+    resolve_parser_backend,
+)
 from couchbase_analytics.common._core.json_parsing import JsonStreamConfig, ParsedResult, ParsedResultType
+from couchbase_analytics.common._core.json_row_decoder import JsonRowDecoder
+from couchbase_analytics.common._core.json_row_splitter import JsonRowSplitter, RawRow
 from couchbase_analytics.common._core.json_token_parser_base import JsonTokenParsingError
 from couchbase_analytics.common.logging import LogLevel
 from couchbase_analytics.protocol._core.json_token_parser import JsonTokenParser
+from couchbase_analytics.protocol._core.ring_buffer import SpscRingBuffer
 
 if TYPE_CHECKING:
     from couchbase_analytics.protocol._core.request_context import RequestContext
 
 
 class JsonStream:
-    DEFAULT_HTTP_STREAM_BUFFER_SIZE = 2**16
-
     def __init__(
         self,
         http_stream_iter: Iterator[bytes],
         *,
         stream_config: Optional[JsonStreamConfig] = None,
         logger_handler: Optional[Callable[[str, LogLevel], None]] = None,
+        row_handler: Optional[Callable[[List[Any]], None]] = None,
     ) -> None:
         # HTTP stream handling
         if stream_config is None:
             stream_config = JsonStreamConfig()
         self._http_stream_iter = http_stream_iter
-        self._http_stream_buffer_size = stream_config.http_stream_buffer_size
-        self._http_response_buffer = bytearray()
+        self._http_response_chunks: List[bytes] = []
         self._http_stream_exhausted = False
 
         # logging
@@ -57,13 +65,62 @@ class JsonStream:
         # results handling
         self._buffered_row_max = stream_config.buffered_row_max
         self._buffered_row_threshold = int(self._buffered_row_max * stream_config.buffered_row_threshold_percent)
-        self._json_stream_parser = None
+        # the parser is push-based, each chunk of the HTTP response is sent to the parser (once) as it is received
+        self._json_stream_parser: Optional[Generator[None, bytes, None]] = None
+        self._parser_events: List[Tuple[str, str, Any]] = ijson.sendable_list()
+        self._parser_event_index = 0
         self._buffer_entire_result = stream_config.buffer_entire_result
         handler = None if self._buffer_entire_result is True else self._handle_json_result
         self._json_token_parser = JsonTokenParser(handler)
+        self._split_raw_rows = stream_config.split_raw_rows
+        self._json_row_splitter: Optional[JsonRowSplitter] = None
+        self._parser_backend = resolve_parser_backend(stream_config.parser_backend)
+        self._whole_buffer_parser: Optional[WholeBufferJsonParser] = None
+        # rows are only decoded when they are emitted by one of the streaming backends
+        self._decode_rows = (
+            stream_config.decode_rows is True
+            and not self._buffer_entire_result
+            and not self._split_raw_rows
+            and self._parser_backend.is_streaming
+        )
+        self._use_float = stream_config.use_float
+        self._json_row_decoder = (
+            JsonRowDecoder(
+                infer_row_shape=stream_config.infer_row_shape,
+                row_shape_sample_size=stream_config.row_shape_sample_size,
+            )
+            if self._decode_rows
+            else None
+        )
         self._token_stream_exhausted = False
-        self._results_queue: Queue[ParsedResult] = Queue()
+        # rows are handed off to the consumer in batches (see _flush_rows())
+        self._row_batch_size = max(1, stream_config.row_batch_size)
+        self._row_batch: List[Any] = []
+        self._received_rows: Deque[Any] = deque()
+        self._rows_produced = 0
+        self._rows_consumed = 0
+        # if set, each batch of rows is handed to the row handler from the parsing stage instead of the consumer
+        self._row_handler = row_handler
+        # if set, backpressure is based on the size of the buffered rows (and the number of buffered batches of rows)
+        self._buffered_bytes = (
+            BufferedBytes(stream_config)
+            if stream_config.buffered_bytes_max is not None and row_handler is None and not self._buffer_entire_result
+            else None
+        )
+        # rows yet to be handed to the row handler (raw rows are split/parsed a chunk, or response, at a time)
+        self._pending_rows: Deque[RawRow] = deque()
+        self._pending_result: Optional[ParsedResult] = None
+        # exactly one producer (the parsing stage) and one consumer (the iterating thread); row backpressure bounds
+        # the number of outstanding rows (and therefore batches), leaving room for the final result
+        self._results_buffer: SpscRingBuffer[ParsedResult] = SpscRingBuffer(
+            max(self._buffered_row_max, self._buffered_row_threshold) + 2
+        )
         self._queue_timeout = stream_config.queue_timeout
+        # a persistent producer (see run_parsing()) parks until there is room for (at least) a full batch of rows
+        self._producer_resume_threshold = max(self._buffered_row_threshold - self._row_batch_size, 0)
+        self._producer_cond = Condition()
+        self._producer_parked = False
+        self._producer_wake_requested = False
         self._notify_on_results_or_error: Optional[Future[ParsedResultType]] = None
 
     @property
@@ -73,6 +130,22 @@ class JsonStream:
         """
         return self._http_stream_exhausted
 
+    @property
+    def decode_rows(self) -> bool:
+        """
+        **INTERNAL**
+
+        If enabled, ROW results contain the decoded Python object instead of the raw bytes.
+        """
+        return self._decode_rows
+
+    @property
+    def parser_backend(self) -> JsonParserBackend:
+        """
+        **INTERNAL**
+        """
+        return self._parser_backend
+
     @property
     def token_stream_exhausted(self) -> bool:
         """
@@ -90,30 +163,113 @@ class JsonStream:
             return True
         if request_context is not None and (request_context.cancelled or request_context.timed_out):
             return False
-        if self._results_queue.qsize() >= self._buffered_row_threshold:
+        if self._row_handler is None and self._buffer_full():
             return False
         return True
 
+    def _buffer_full(self) -> bool:
+        """
+        **INTERNAL**
+
+        True once the producer should pause because the consumer has fallen behind.
+        """
+        if self._buffered_bytes is None:
+            return self._rows_produced - self._rows_consumed >= self._buffered_row_threshold
+        if self._buffered_bytes.over_threshold() or len(self._results_buffer) >= self._buffered_row_threshold:
+            self._buffered_bytes.pause_producing()
+            return True
+        return False
+
+    def _above_resume_threshold(self) -> bool:
+        """
+        **INTERNAL**
+
+        True until the consumer has made room for (at least) a full batch of rows.
+        """
+        if self._buffered_bytes is None:
+            return self._rows_produced - self._rows_consumed > self._producer_resume_threshold
+        return (
+            self._buffered_bytes.above_resume_threshold() or len(self._results_buffer) >= self._buffered_row_threshold
+        )
+
+    def _flush_rows(self) -> None:
+        """
+        **INTERNAL**
+
+        Hands off any rows that have not yet been made available to the consumer as a single ROWS result.  If a row
+        handler is set, the rows are handed directly to the row handler instead.
+        """
+        if not self._row_batch:
+            return
+        rows = self._row_batch
+        self._row_batch = []
+        if self._row_handler is not None:
+            self._rows_consumed += len(rows)
+            self._row_handler(rows)
+            return
+        if self._buffered_bytes is not None:
+            self._buffered_bytes.add_batch()
+        self._put(ParsedResult(rows, ParsedResultType.ROWS))
+
     def _put(self, result: ParsedResult) -> None:
         """
         **INTERNAL**
         """
-        while True:
-            try:
-                self._results_queue.put(result, timeout=self._queue_timeout)
-                break
-            except QueueFull:
-                self._log_message('Encountered QueueFull error', LogLevel.ERROR)
-                pass
+        if result.result_type != ParsedResultType.ROWS:
+            # pending rows always precede the final result (or an error)
+            self._flush_rows()
+        while not self._results_buffer.put(result, timeout=self._queue_timeout):
+            self._log_message(f'Results buffer full after waiting {self._queue_timeout} seconds', LogLevel.ERROR)
 
-    def _handle_json_result(self, row: bytes) -> None:
+    def _handle_json_result(self, row: Any) -> None:
         """
         **INTERNAL**
         """
+        self._row_batch.append(row)
+        self._rows_produced += 1
+        if self._buffered_bytes is not None:
+            self._buffered_bytes.add_row(row)
         if self._notify_on_results_or_error is not None and not self._notify_on_results_or_error.done():
+            # the consumer is waiting on the first row, don't make it wait for the rest of the batch
+            self._flush_rows()
             self._handle_notification(ParsedResultType.ROW)
+        elif len(self._row_batch) >= self._row_batch_size:
+            self._flush_rows()
+
+    def _wait_for_consumer(self, request_context: Optional[RequestContext] = None) -> bool:
+        """
+        **INTERNAL**
 
-        self._put(ParsedResult(row, ParsedResultType.ROW))
+        Parks the producer until the consumer has caught up.
+
+        Returns:
+            True if the producer should continue processing the stream, False otherwise.
+        """
+        with self._producer_cond:
+            self._producer_parked = True
+            try:
+                while self._above_resume_threshold():
+                    if self._producer_wake_requested:
+                        break
+                    if request_context is not None and (request_context.cancelled or request_context.timed_out):
+                        return False
+                    timeout = request_context.get_stream_timeout() if request_context is not None else None
+                    self._producer_cond.wait(timeout)
+            finally:
+                self._producer_parked = False
+                self._producer_wake_requested = False
+        if request_context is not None and (request_context.cancelled or request_context.timed_out):
+            return False
+        return True
+
+    def _notify_producer(self) -> None:
+        """
+        **INTERNAL**
+        """
+        # only take the lock if the producer is (about to be) parked
+        if self._producer_parked and not self._above_resume_threshold():
+            with self._producer_cond:
+                self._producer_cond.notify()
 
     def _handle_notification(self, result_type: ParsedResultType) -> None:
         if self._notify_on_results_or_error is None or self._notify_on_results_or_error.done():
@@ -125,17 +281,132 @@ class JsonStream:
         if self._log_handler is not None:
             self._log_handler(message, level)
 
-    def _process_token_stream(self, request_context: Optional[RequestContext] = None) -> None:
+    def _log_parser_backend(self) -> None:
+        if self._split_raw_rows:
+            self._log_message('Splitting raw JSON rows; JSON parser backend not used', LogLevel.DEBUG)
+        else:
+            self._log_message(f'Using JSON parser backend: {self._parser_backend.value}', LogLevel.DEBUG)
+
+    def _process_raw_stream(self, request_context: Optional[RequestContext] = None) -> None:
+        """
+        **INTERNAL**
+        """
+        if self._json_row_splitter is None:
+            self._json_row_splitter = JsonRowSplitter(emit_results_enabled=not self._buffer_entire_result)
+
+        try:
+            while self._continue_processing(request_context=request_context):
+                if self._pending_rows:
+                    self._handle_json_result(bytes(self._pending_rows.popleft()))
+                    continue
+                if self._http_stream_exhausted:
+                    final_result = self._json_row_splitter.finish()
+                    self._token_stream_exhausted = True
+                    break
+                # don't hold on to rows while waiting on the network
+                self._flush_rows()
+                try:
+                    chunk = next(self._http_stream_iter)
+                except StopIteration:
+                    self._http_stream_exhausted = True
+                    continue
+                self._pending_rows.extend(self._json_row_splitter.feed(chunk))
+        except JsonTokenParsingError as ex:
+            ex_str = str(ex)
+            self._log_message(f'JSON row splitting error encountered: {ex_str}', LogLevel.ERROR)
+            self._token_stream_exhausted = True
+            self._put(ParsedResult(ex_str.encode('utf-8'), ParsedResultType.ERROR))
+            self._handle_notification(ParsedResultType.ERROR)
+            return
+
+        if self._token_stream_exhausted:
+            result_type = ParsedResultType.ERROR if self._json_row_splitter.has_errors else ParsedResultType.END
+            self._put(ParsedResult(final_result, result_type))
+            self._handle_notification(result_type)
+
+    def _process_whole_buffer(self, request_context: Optional[RequestContext] = None) -> None:
+        """
+        **INTERNAL**
+        """
+        if self._whole_buffer_parser is None:
+            self._whole_buffer_parser = WholeBufferJsonParser(emit_results_enabled=not self._buffer_entire_result)
+
+        if self._pending_result is None:
+            while self._continue_processing(request_context=request_context):
+                try:
+                    self._http_response_chunks.append(next(self._http_stream_iter))
+                except StopIteration:
+                    self._http_stream_exhausted = True
+                    break
+
+            if not self._http_stream_exhausted:
+                return
+
+            try:
+                rows, final_result, has_errors = self._whole_buffer_parser.parse(b''.join(self._http_response_chunks))
+            except JsonTokenParsingError as ex:
+                ex_str = str(ex)
+                self._log_message(f'JSON parsing error encountered: {ex_str}', LogLevel.ERROR)
+                self._token_stream_exhausted = True
+                self._put(ParsedResult(ex_str.encode('utf-8'), ParsedResultType.ERROR))
+                self._handle_notification(ParsedResultType.ERROR)
+                return
+            finally:
+                self._http_response_chunks.clear()
+
+            self._pending_rows.extend(rows)
+            self._pending_result = ParsedResult(
+                final_result, ParsedResultType.ERROR if has_errors else ParsedResultType.END
+            )
+
+        # the rows are handed off subject to the same backpressure as the streaming backends
+        while self._continue_processing(request_context=request_context):
+            if self._pending_rows:
+                self._handle_json_result(bytes(self._pending_rows.popleft()))
+                continue
+            self._token_stream_exhausted = True
+            self._put(self._pending_result)
+            self._handle_notification(self._pending_result.result_type)
+
+    def _process_stream(self, request_context: Optional[RequestContext] = None) -> None:
+        """
+        **INTERNAL**
+        """
+        if self._buffered_bytes is not None:
+            self._buffered_bytes.start_producing()
+        if self._split_raw_rows:
+            self._process_raw_stream(request_context=request_context)
+        elif self._parser_backend is JsonParserBackend.SIMDJSON:
+            self._process_whole_buffer(request_context=request_context)
+        else:
+            self._process_token_stream(request_context=request_context)
+        # the stage is complete, make sure the consumer has all the rows
+        self._flush_rows()
+
+    def _process_token_stream(self, request_context: Optional[RequestContext] = None) -> None:  # noqa: C901
         """
         **INTERNAL**
         """
         if self._json_stream_parser is None:
-            self._json_stream_parser = ijson.parse(self, buf_size=self._http_stream_buffer_size)
+            ijson_backend = get_ijson_backend(self._parser_backend)
+            if self._decode_rows:
+                self._json_stream_parser = ijson_backend.parse_coro(self._parser_events, use_float=self._use_float)
+            else:
+                self._json_stream_parser = ijson_backend.parse_coro(self._parser_events)
 
         while self._continue_processing(request_context=request_context):
             try:
-                _, event, value = next(self._json_stream_parser)  # type: ignore[call-overload]
-                self._json_token_parser.parse_token(event, value)
+                if self._parser_event_index >= len(self._parser_events):
+                    if not self._feed_parser():
+                        self._token_stream_exhausted = True
+                    continue
+                prefix, event, value = self._parser_events[self._parser_event_index]
+                self._parser_event_index += 1
+                if self._json_row_decoder is not None:
+                    if self._json_row_decoder.parse_event(prefix, event, value):
+                        self._handle_json_result(self._json_row_decoder.pop_row())
+                else:
+                    self._json_token_parser.parse_token(event, value)
             except StopIteration:
                 self._token_stream_exhausted = True
             except JsonTokenParsingError as ex:
@@ -168,56 +439,186 @@ class JsonStream:
                 return
 
         if self._token_stream_exhausted:
-            result_type = ParsedResultType.ERROR if self._json_token_parser.has_errors else ParsedResultType.END
-            self._put(ParsedResult(self._json_token_parser.get_result(), result_type))
+            final_result: Optional[bytes]
+            if self._json_row_decoder is not None:
+                has_errors = self._json_row_decoder.has_errors
+                final_result = self._json_row_decoder.get_result()
+            else:
+                has_errors = self._json_token_parser.has_errors
+                final_result = self._json_token_parser.get_result()
+            result_type = ParsedResultType.ERROR if has_errors else ParsedResultType.END
+            self._put(ParsedResult(final_result, result_type))
             self._handle_notification(result_type)
 
-    def read(self, size: Optional[int] = -1) -> bytes:
+    def _feed_parser(self) -> bool:
         """
         **INTERNAL**
+
+        Sends the next chunk of the HTTP response to the parser, the parser's events are then available in
+        ``_parser_events``.  Once the HTTP response has been exhausted, the parser is closed which validates the JSON
+        content is complete.
+
+        Returns:
+            False if the parser has already been sent the entire HTTP response, True otherwise.
         """
-        if size is None or size == 0 or self._http_stream_exhausted:
-            return b''
+        del self._parser_events[:]
+        self._parser_event_index = 0
+        if self._http_stream_exhausted or self._json_stream_parser is None:
+            return False
 
-        while not self._http_stream_exhausted:
-            if size >= 0 and len(self._http_response_buffer) > size:
-                break
-            try:
-                chunk = next(self._http_stream_iter)
-                self._http_response_buffer += chunk
-            except StopIteration:
-                self._http_stream_exhausted = True
-                break
+        # don't hold on to rows while waiting on the network
+        self._flush_rows()
+        try:
+            chunk = next(self._http_stream_iter)
+        except StopIteration:
+            self._http_stream_exhausted = True
+            self._json_stream_parser.close()
+            return True
+
+        if self._buffered_bytes is not None:
+            # used to estimate the size of decoded rows
+            self._buffered_bytes.add_http_bytes(len(chunk))
+        # an empty chunk would signal the end of the JSON content to the parser
+        if chunk:
+            self._json_stream_parser.send(chunk)
+        return True
 
-        if size == -1:
-            data = bytes(self._http_response_buffer[:])
-            del self._http_response_buffer[:]
+    def _get(self, timeout: Optional[float]) -> Optional[ParsedResult]:
+        if self._buffered_bytes is not None and self._results_buffer.empty():
+            # the consumer has caught up w/ the producer, see BufferedBytes for details on how this is used
+            wait_start = time.monotonic()
+            result = self._results_buffer.get(timeout=timeout)
+            self._buffered_bytes.add_consumer_wait_time(time.monotonic() - wait_start)
         else:
-            end = min(size, len(self._http_response_buffer))
-            data = bytes(self._http_response_buffer[:end])
-            del self._http_response_buffer[:end]
-        return data
+            result = self._results_buffer.get(timeout=timeout)
+        if result is None:
+            self._log_message('No result available, consumer timed out or was woken', LogLevel.DEBUG)
+        elif self._buffered_bytes is not None and result.result_type == ParsedResultType.ROWS:
+            self._buffered_bytes.receive_batch(len(result.value))
+        return result
 
-    def get_result(self, timeout: float) -> Optional[ParsedResult]:
-        try:
-            return self._results_queue.get(timeout=timeout)
-        except QueueEmpty:
-            self._log_message(f'Results queue empty after waiting {timeout} seconds', LogLevel.WARNING)
-            return None
+    def _consume_rows(self, row_count: int) -> None:
+        """
+        **INTERNAL**
+        """
+        self._rows_consumed += row_count
+        if self._buffered_bytes is not None:
+            self._buffered_bytes.consume_rows(row_count)
+        self._notify_producer()
+
+    def drain_http_stream(self, max_bytes: int, timeout: float) -> bool:
+        """
+        **INTERNAL**
+
+        Reads and discards the remainder of the HTTP response w/o parsing it, so the connection can be reused.  Must
+        not be called while the stream is being processed.  The timeout is only checked once each chunk is received, a
+        read waiting on the server is not interrupted.
+
+        Returns:
+            True if the HTTP response has been exhausted, False if the limits were exceeded.
+        """
+        if self._http_stream_exhausted:
+            return True
+        deadline = time.monotonic() + timeout
+        drained_bytes = 0
+        for chunk in self._http_stream_iter:
+            drained_bytes += len(chunk)
+            if drained_bytes > max_bytes or time.monotonic() > deadline:
+                return False
+        self._http_stream_exhausted = True
+        return True
+
+    def wake_producer(self) -> None:
+        """
+        **INTERNAL**
+
+        Wakes a parked persistent producer (see :meth:`run_parsing`) so that it can re-check the request's state.
+        """
+        with self._producer_cond:
+            self._producer_wake_requested = True
+            self._producer_cond.notify()
+
+    def wake_consumer(self) -> None:
+        """
+        **INTERNAL**
+
+        Wakes the consumer if it is waiting on a result, see :meth:`get_result`.
+        """
+        self._results_buffer.wake_consumer()
+
+    def get_result(self, timeout: Optional[float]) -> Optional[ParsedResult]:
+        """
+        **INTERNAL**
+
+        Returns the next result, rows are returned individually as ROW results.  Returns None if no result is available
+        within ``timeout`` seconds, or if the consumer is woken via :meth:`wake_consumer`.
+        """
+        if not self._received_rows:
+            result = self._get(timeout)
+            if result is None or result.result_type != ParsedResultType.ROWS:
+                return result
+            self._received_rows.extend(result.value)
+        self._consume_rows(1)
+        return ParsedResult(self._received_rows.popleft(), ParsedResultType.ROW)
+
+    def get_results(self, timeout: Optional[float], max_rows: Optional[int] = None) -> Optional[ParsedResult]:
+        """
+        **INTERNAL**
+
+        Returns the next result, rows are returned as a ROWS result containing a list of (at most ``max_rows``) rows.
+        """
+        if not self._received_rows:
+            result = self._get(timeout)
+            if result is None or result.result_type != ParsedResultType.ROWS:
+                return result
+            if max_rows is None or len(result.value) <= max_rows:
+                self._consume_rows(len(result.value))
+                return result
+            self._received_rows.extend(result.value)
+
+        if max_rows is None or len(self._received_rows) <= max_rows:
+            rows = list(self._received_rows)
+            self._received_rows.clear()
+        else:
+            rows = [self._received_rows.popleft() for _ in range(max_rows)]
+        self._consume_rows(len(rows))
+        return ParsedResult(rows, ParsedResultType.ROWS)
 
     def start_parsing(
         self,
         request_context: Optional[RequestContext] = None,
         notify_on_results_or_error: Optional[Future[ParsedResultType]] = None,
     ) -> None:
-        if self._json_stream_parser is not None:
+        if (
+            self._json_stream_parser is not None
+            or self._json_row_splitter is not None
+            or self._whole_buffer_parser is not None
+        ):
             self._log_message('JSON stream parser already exists', LogLevel.WARNING)
             return
         self._notify_on_results_or_error = notify_on_results_or_error
-        self._process_token_stream(request_context=request_context)
+        self._log_parser_backend()
+        self._process_stream(request_context=request_context)
 
     def continue_parsing(
         self,
         request_context: Optional[RequestContext] = None,
     ) -> None:
-        self._process_token_stream(request_context=request_context)
+        self._process_stream(request_context=request_context)
+
+    def run_parsing(
+        self,
+        request_context: Optional[RequestContext] = None,
+        notify_on_results_or_error: Optional[Future[ParsedResultType]] = None,
+    ) -> None:
+        """
+        **INTERNAL**
+
+        Processes the entire stream as a single, persistent producer.  Rather than ending the stage once the consumer
+        falls behind (and relying on a new stage to be started), the producer parks until the consumer has made room
+        for a full batch of rows.  Returns once the stream has been exhausted, or the request has been cancelled or
+        timed out.
+        """
+        self.start_parsing(request_context=request_context, notify_on_results_or_error=notify_on_results_or_error)
+        while not self._token_stream_exhausted and self._wait_for_consumer(request_context=request_context):
+            self._process_stream(request_context=request_context)
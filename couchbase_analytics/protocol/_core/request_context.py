@@ -18,21 +18,33 @@ from __future__ import annotations
 
 import json
 import math
+import socket
 import time
 from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
-from threading import Event
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Union
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import replace
+from itertools import chain
+from threading import Event, Lock, Thread, Timer
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from uuid import uuid4
 
 from httpx import Response as HttpCoreResponse
 
 from couchbase_analytics.common._core import JsonStreamConfig, ParsedResult, ParsedResultType
 from couchbase_analytics.common._core.error_context import ErrorContext
+from couchbase_analytics.common._core.json_parsing import decode_if_complete
+from couchbase_analytics.common._core.json_row_splitter import split_rows
+from couchbase_analytics.common._core.json_token_parser_base import JsonTokenParsingError
+from couchbase_analytics.common._core.row_formatter import RowFormatter
+from couchbase_analytics.common._core.row_store import RowDecoder
 from couchbase_analytics.common.backoff_calculator import DefaultBackoffCalculator
+from couchbase_analytics.common.deserializer import DefaultJsonDeserializer
+from couchbase_analytics.common.enums import RowFormat
 from couchbase_analytics.common.errors import AnalyticsError, TimeoutError
 from couchbase_analytics.common.logging import LogLevel
 from couchbase_analytics.common.request import RequestState
 from couchbase_analytics.common.result import BlockingQueryResult
+from couchbase_analytics.common.row import RowSchema
 from couchbase_analytics.protocol._core.json_stream import JsonStream
 from couchbase_analytics.protocol._core.net_utils import get_request_ip
 from couchbase_analytics.protocol.connection import DEFAULT_TIMEOUTS
@@ -92,6 +104,7 @@ class RequestContext:
         request: QueryRequest,
         tp_executor: ThreadPoolExecutor,
         stream_config: Optional[JsonStreamConfig] = None,
+        row_format: Optional[str] = None,
     ) -> None:
         self._id = str(uuid4())
         self._client_adapter = client_adapter
@@ -100,7 +113,16 @@ class RequestContext:
         self._error_ctx = ErrorContext(num_attempts=0, method=request.method, statement=request.get_request_statement())
         self._request_state = RequestState.NotStarted
         self._stream_config = stream_config or JsonStreamConfig()
+        if self._stream_config.decode_rows and type(request.deserializer) is not DefaultJsonDeserializer:
+            # decoded rows would bypass the request's deserializer, so only decode rows w/ the default deserializer
+            self._stream_config = replace(self._stream_config, decode_rows=False)
+        self._row_formatter = RowFormatter(RowFormat(row_format)) if row_format is not None else None
         self._json_stream: JsonStream
+        # set if the first HTTP chunk was read prior to starting the JSON stream
+        self._http_stream_iter: Optional[Iterator[bytes]] = None
+        # the HTTP response (of the latest attempt) and the number of its decoded body bytes read so far
+        self._http_response: Optional[HttpCoreResponse] = None
+        self._http_bytes_decoded = 0
         self._cancel_event = Event()
         self._tp_executor = tp_executor
         self._stage_completed_ft: Optional[Future[Any]] = None
@@ -126,6 +148,38 @@ class RequestContext:
     def has_stage_completed(self) -> bool:
         return self._stage_completed_ft is not None and self._stage_completed_ft.done()
 
+    @property
+    def http_bytes_decoded(self) -> Optional[int]:
+        """
+        **INTERNAL**
+
+        The number of bytes of the HTTP response body read so far, after the content encoding has been decoded.
+        """
+        if self._http_response is None:
+            return None
+        return self._http_bytes_decoded
+
+    @property
+    def http_bytes_received(self) -> Optional[int]:
+        """
+        **INTERNAL**
+
+        The number of bytes of the HTTP response body received so far, prior to decoding the content encoding.
+        """
+        if self._http_response is None:
+            return None
+        return self._http_response.num_bytes_downloaded
+
+    @property
+    def http_stream_exhausted(self) -> bool:
+        """
+        **INTERNAL**
+
+        True once the entire HTTP response has been received, i.e. only results buffered by the JSON stream remain.
+        """
+        json_stream: Optional[JsonStream] = getattr(self, '_json_stream', None)
+        return json_stream is not None and json_stream.http_stream_exhausted
+
     @property
     def is_shutdown(self) -> bool:
         return self._shutdown
@@ -142,6 +196,14 @@ class RequestContext:
         self._check_cancelled_or_timed_out()
         return RequestState.okay_to_stream(self._request_state)
 
+    @property
+    def row_batch_size(self) -> int:
+        return max(1, self._stream_config.row_batch_size)
+
+    @property
+    def row_schema(self) -> Optional[RowSchema]:
+        return self._row_formatter.schema if self._row_formatter is not None else None
+
     @property
     def request_state(self) -> RequestState:
         return self._request_state
@@ -179,6 +241,18 @@ class RequestContext:
             else:
                 self._request_state = RequestState.Timeout
 
+    def _count_decoded_bytes(self, http_stream_iter: Iterator[bytes]) -> Iterator[bytes]:
+        for chunk in http_stream_iter:
+            self._http_bytes_decoded += len(chunk)
+            yield chunk
+
+    def _get_http_response_socket(self) -> Optional[socket.socket]:
+        if self._http_response is None:
+            return None
+        network_stream = self._http_response.extensions.get('network_stream', None)
+        sock = network_stream.get_extra_info('socket') if network_stream is not None else None
+        return sock if isinstance(sock, socket.socket) else None
+
     def _create_stage_notification_future(self) -> None:
         # TODO(PYCO-75):  custom ThreadPoolExecutor, to get a "plain" future
         if self._stage_notification_ft is not None:
@@ -229,7 +303,28 @@ class RequestContext:
                 raise RuntimeError('Unable to create stage notification future.')
             kwargs['notify_on_results_or_error'] = self._stage_notification_ft
 
-        self._stage_completed_ft = self._tp_executor.submit(fn, *args, **kwargs)
+        if self._stream_config.dedicated_parser_thread is True:
+            self._stage_completed_ft = self._start_dedicated_thread(fn, *args, **kwargs)
+        else:
+            self._stage_completed_ft = self._tp_executor.submit(fn, *args, **kwargs)
+        json_stream = getattr(self, '_json_stream', None)
+        if json_stream is not None:
+            # a consumer waiting on a result needs to know the stage ended, regardless of why it ended
+            self._stage_completed_ft.add_done_callback(lambda _: json_stream.wake_consumer())
+
+    def _start_dedicated_thread(self, fn: Callable[..., Any], *args: object, **kwargs: object) -> Future[Any]:
+        # TODO(PYCO-75):  custom ThreadPoolExecutor, to get a "plain" future
+        ft = Future[Any]()
+        ft.set_running_or_notify_cancel()
+
+        def _run() -> None:
+            try:
+                ft.set_result(fn(*args, **kwargs))
+            except BaseException as ex:
+                ft.set_exception(ex)
+
+        Thread(target=_run, name=f'pycbac-parser-{self._id[:8]}', daemon=True).start()
+        return ft
 
     def _trace_handler(self, event_name: str, _: str) -> None:
         if event_name == 'connection.connect_tcp.complete':
@@ -240,6 +335,24 @@ class RequestContext:
             raise RuntimeError('Stage completed future not created for this context.')
         self._stage_completed_ft.result()
 
+    def abort_http_response(self) -> None:
+        """
+        **INTERNAL**
+
+        Shuts down the HTTP response's socket, so that a read blocked waiting on the server fails immediately.  The
+        connection cannot be reused afterwards.
+        """
+        if self._http_response is None:
+            return
+        sock = self._get_http_response_socket()
+        if sock is None:
+            self._http_response.close()
+            return
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError as ex:
+            self.log_message(f'Unable to shutdown HTTP response socket: {ex!r}', LogLevel.DEBUG)
+
     def calculate_backoff(self) -> float:
         return self._backoff_calc.calculate_backoff(self._error_ctx.num_attempts) / 1000
 
@@ -247,9 +360,102 @@ class RequestContext:
         if self._request_state == RequestState.Timeout:
             return
         self._request_state = RequestState.Cancelled
+        if hasattr(self, '_json_stream'):
+            self._json_stream.wake_consumer()
+            self._json_stream.wake_producer()
+
+    def create_row_decoder(self) -> RowDecoder:
+        """
+        **INTERNAL**
+
+        Returns a decoder that deserializes (and formats) raw rows the same way as the rows of this request.
+        """
+        return RowDecoder(self._request.deserializer, self._row_formatter)
+
+    def deserialize_buffered_rows(self, rows: List[Any]) -> List[Any]:
+        """
+        **INTERNAL**
+
+        Deserializes (and formats) rows returned by :meth:`process_entire_response`.  The rows are raw rows, unless the
+        request uses the default deserializer, in which case the entire response has already been decoded.
+        """
+        if type(self._request.deserializer) is DefaultJsonDeserializer:
+            return self._format_rows(rows)
+        return self._format_rows(self._deserialize_many(rows))
+
+    def deserialize_results(self, results: List[Any]) -> List[Any]:
+        if self._json_stream.decode_rows:
+            # the JSON stream has already decoded the rows, no need for the (default) deserializer
+            return self._format_rows(results)
+        return self._format_rows(self._deserialize_many(results))
+
+    def _format_rows(self, rows: List[Any]) -> List[Any]:
+        if self._row_formatter is None:
+            return rows
+        return self._row_formatter.format_rows(rows)
+
+    def _deserialize_many(self, results: List[bytes]) -> List[Any]:
+        deserializer = self._request.deserializer
+        if len(results) == 1:
+            return [deserializer.deserialize(results[0])]
+        # custom deserializers are not required to subclass Deserializer, so deserialize_many() might not exist
+        deserialize_many = getattr(deserializer, 'deserialize_many', None)
+        if deserialize_many is None:
+            return [deserializer.deserialize(result) for result in results]
+        rows: List[Any] = deserialize_many(results)
+        return rows
+
+    def drain_http_stream(self) -> bool:
+        """
+        **INTERNAL**
+
+        Reads the remainder of the HTTP response (within the stream config's drain_on_close limits), so that the
+        connection can be reused once the HTTP response is closed.  The HTTP response is only drained if the JSON
+        stream is not being processed (i.e. the current stage has ended).
+
+        Returns:
+            True if the HTTP response has been exhausted, False otherwise.
+        """
+        json_stream: Optional[JsonStream] = getattr(self, '_json_stream', None)
+        if json_stream is None or not self.has_stage_completed:
+            return False
+        if json_stream.http_stream_exhausted:
+            return True
+        max_bytes = self._stream_config.drain_on_close_max_bytes
+        timeout = self._stream_config.drain_on_close_timeout
+        if max_bytes <= 0 or timeout <= 0:
+            return False
+        if self._get_http_response_socket() is None:
+            # a read waiting on the server cannot be interrupted w/o the socket
+            return False
+
+        # the JSON stream only checks the timeout between reads, abort the HTTP response if a read is still waiting on
+        # the server once the timeout has elapsed
+        drain_lock = Lock()
+        drain_done = False
+
+        def _abort_drain() -> None:
+            with drain_lock:
+                if not drain_done:
+                    self.abort_http_response()
 
-    def deserialize_result(self, result: bytes) -> Any:
-        return self._request.deserializer.deserialize(result)
+        abort_timer = Timer(timeout, _abort_drain)
+        abort_timer.daemon = True
+        abort_timer.start()
+        try:
+            drained = json_stream.drain_http_stream(max_bytes, timeout)
+        except Exception as ex:
+            self.log_message(f'Unable to drain HTTP response: {ex!r}', LogLevel.DEBUG)
+            return False
+        finally:
+            with drain_lock:
+                drain_done = True
+            abort_timer.cancel()
+        if drained:
+            self.log_message('HTTP response drained, connection can be reused', LogLevel.DEBUG)
+        else:
+            self.log_message('HTTP response exceeded drain limits, closing connection', LogLevel.DEBUG)
+        return drained
 
     def finish_processing_stream(self) -> None:
         if not self.has_stage_completed:
@@ -261,8 +467,14 @@ class RequestContext:
         while not self._json_stream.token_stream_exhausted:
             self._json_stream.continue_parsing()
 
-    def get_result_from_stream(self) -> Optional[ParsedResult]:
-        return self._json_stream.get_result(self._stream_config.queue_timeout)
+    def get_results_from_stream(self, max_rows: Optional[int] = None) -> Optional[ParsedResult]:
+        # no polling, the consumer is woken when a result is available, the stage ends or the request is cancelled
+        return self._json_stream.get_results(self.get_stream_timeout(), max_rows=max_rows)
+
+    def get_stream_timeout(self) -> Optional[float]:
+        if math.isinf(self._request_deadline):
+            return None
+        return max(round(self._request_deadline - time.monotonic(), 6), 0)  # round to microseconds
 
     def initialize(self) -> None:
         if self._request_state == RequestState.ResetAndNotStarted:
@@ -297,6 +509,15 @@ class RequestContext:
         if not self.has_stage_completed:
             return
 
+        if self._stage_completed_ft is not None and not self._stage_completed_ft.cancelled():
+            if self._stage_completed_ft.exception() is not None:
+                # starting another stage would only fail again, raise the stage's exception
+                self._wait_for_stage_completed()
+
+        if self._stream_config.dedicated_parser_thread is True:
+            # the dedicated thread processes the entire stream, there is never a next stage
+            return
+
         if self._json_stream.token_stream_exhausted:
             return
 
@@ -366,6 +587,84 @@ class RequestContext:
                 self._process_error(json_response['errors'], handle_context_shutdown=handle_context_shutdown)
             return json_response
 
+    def process_entire_response(
+        self, close_handler: Callable[[], None], body: bytes, json_response: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Any], Any]:
+        """
+        **INTERNAL**
+
+        Decodes an entire response at once, rather than streaming it via the JSON stream.
+
+        Args:
+            close_handler: Closes the core response.
+            body: The entire response.
+            json_response: The already decoded response, if available.
+
+        Returns:
+            A tuple of the (not yet deserialized) rows and the JSON response (w/o the rows), see
+            :meth:`deserialize_buffered_rows`.
+        """
+        self._http_bytes_decoded += len(body)
+        raw_response = ParsedResult(body, ParsedResultType.END)
+        if type(self._request.deserializer) is DefaultJsonDeserializer:
+            if json_response is None:
+                # the default deserializer is json.loads(), so decode the entire response in a single call
+                json_response = self.process_response(close_handler, raw_response=raw_response)
+            else:
+                close_handler()
+                if 'errors' in json_response:
+                    self._process_error(json_response['errors'])
+            rows = json_response.pop('results', None) if isinstance(json_response, dict) else None
+            return rows or [], json_response
+
+        try:
+            raw_rows, remaining = split_rows(body)
+        except JsonTokenParsingError:
+            # not a valid JSON response, let process_response() determine the appropriate error
+            return [], self.process_response(close_handler, raw_response=raw_response)
+
+        json_response = self.process_response(close_handler, raw_response=ParsedResult(remaining, ParsedResultType.END))
+        return [bytes(row) for row in raw_rows], json_response
+
+    def read_small_response(self, core_response: HttpCoreResponse) -> Optional[Tuple[bytes, Optional[Dict[str, Any]]]]:
+        """
+        **INTERNAL**
+
+        Determines if the response is small enough to be decoded at once, either from the Content-Length header (if the
+        response is not compressed) or because the entire response was received within the first HTTP chunk.
+
+        Returns:
+            A tuple of the entire response and (if already decoded) the JSON response, or None if the response should
+            be processed via the JSON stream.  In the latter case, any chunk that has been read is provided to the JSON
+            stream once started.
+        """
+        self._http_stream_iter = None
+        max_bytes = self._stream_config.small_response_max_bytes
+        if max_bytes <= 0:
+            return None
+
+        content_length = core_response.headers.get('content-length')
+        # w/ a Content-Encoding, the Content-Length is the compressed size which does not bound the decoded size
+        content_encoding = core_response.headers.get('content-encoding', 'identity').strip().lower()
+        if content_length is not None and content_length.isdigit() and content_encoding == 'identity':
+            if int(content_length) > max_bytes:
+                return None
+            return core_response.read(), None
+
+        stream_iter = core_response.iter_bytes()
+        first_chunk = next(stream_iter, b'')
+        json_response = decode_if_complete(first_chunk) if len(first_chunk) <= max_bytes else None
+        if json_response is None:
+            self._http_stream_iter = chain((first_chunk,), stream_iter)
+            return None
+
+        # the server has sent the entire response, so this does not wait on the server
+        remaining = b''.join(stream_iter)
+        if remaining.strip(b' \t\n\r'):
+            # let the response processing determine the appropriate error
+            return first_chunk + remaining, None
+        return first_chunk, json_response
+
     def send_request(self, enable_trace_handling: Optional[bool] = False) -> HttpCoreResponse:
         self._error_ctx.update_num_attempts()
         ip = get_request_ip(self._request.url.host, self._request.url.port, self.log_message)
@@ -385,6 +684,8 @@ class RequestContext:
         }
         self.log_message('HTTP request', LogLevel.DEBUG, message_data=message_data)
         response = self._client_adapter.send_request(self._request)
+        self._http_response = response
+        self._http_bytes_decoded = 0
         self._error_ctx.update_response_context(response)
         message_data = {
             'status_code': f'{response.status_code}',
@@ -429,6 +730,13 @@ class RequestContext:
         if RequestState.is_okay(self._request_state):
             self._request_state = RequestState.Completed
         self._shutdown = True
+        if self._http_response is not None:
+            message_data = {
+                'content_encoding': f'{self._http_response.headers.get("content-encoding", "identity")}',
+                'http_bytes_received': f'{self.http_bytes_received}',
+                'http_bytes_decoded': f'{self.http_bytes_decoded}',
+            }
+            self.log_message('HTTP response bytes', LogLevel.DEBUG, message_data=message_data)
         self.log_message('Request context shutdown complete', LogLevel.INFO)
 
     def start_stream(self, core_response: HttpCoreResponse) -> None:
@@ -437,10 +745,87 @@ class RequestContext:
             return
 
         # TODO(PYCO-73): Potentially use new iterator if problems w/ httpx
+        http_stream_iter = self._count_decoded_bytes(self._http_stream_iter or core_response.iter_bytes())
+        self._http_stream_iter = None
         self._json_stream = JsonStream(
-            core_response.iter_bytes(), stream_config=self._stream_config, logger_handler=self.log_message
+            http_stream_iter, stream_config=self._stream_config, logger_handler=self.log_message
         )
-        self._start_next_stage(self._json_stream.start_parsing, create_notification=True)
+        if self._stream_config.dedicated_parser_thread is True:
+            self._start_next_stage(self._json_stream.run_parsing, create_notification=True)
+        else:
+            self._start_next_stage(self._json_stream.start_parsing, create_notification=True)
+
+    def stop_processing_stream(self) -> None:
+        """
+        **INTERNAL**
+
+        Stops the JSON stream once the remaining results are no longer needed.  Waits (at most the stream config's
+        drain_on_close_timeout) for the current stage to end, so that the HTTP response is not closed while the stage
+        is reading from it.  If the stage is still waiting on the server, the HTTP response is aborted so that the
+        stage's read fails and the stage ends.
+        """
+        self.cancel_request()
+        if self._stage_completed_ft is None:
+            return
+        stream_timeout = self.get_stream_timeout()
+        wait_timeout = max(self._stream_config.drain_on_close_timeout, 0)
+        if stream_timeout is not None:
+            wait_timeout = min(wait_timeout, stream_timeout)
+        try:
+            self._stage_completed_ft.result(timeout=wait_timeout)
+            return
+        except FutureTimeoutError:
+            self.log_message('Stage still reading the HTTP response, aborting the HTTP response', LogLevel.DEBUG)
+        except Exception as ex:
+            # the stage's results are no longer needed
+            self.log_message(f'Stage did not complete cleanly after stopping the stream: {ex!r}', LogLevel.DEBUG)
+            return
+        self.abort_http_response()
+        try:
+            self._stage_completed_ft.result(timeout=self.get_stream_timeout())
+        except Exception as ex:
+            self.log_message(f'Stage did not complete cleanly after aborting the stream: {ex!r}', LogLevel.DEBUG)
+
+    def stream_to_row_handler(
+        self, core_response: HttpCoreResponse, row_handler: Callable[[List[Any]], None]
+    ) -> Optional[ParsedResult]:
+        """
+        **INTERNAL**
+
+        Processes the entire stream in the calling thread.  Rather than being handed off to a consumer, each batch of
+        rows is handed directly to the row handler as it is parsed.
+
+        Returns:
+            The final result (i.e. END or ERROR) of the JSON stream.
+
+        Raises:
+            TimeoutError: If the request times out prior to the stream being exhausted.
+        """
+        if hasattr(self, '_json_stream'):
+            raise RuntimeError('JSON stream already exists.')
+
+        http_stream_iter = self._count_decoded_bytes(self._http_stream_iter or core_response.iter_bytes())
+        self._http_stream_iter = None
+        self._json_stream = JsonStream(
+            http_stream_iter,
+            stream_config=self._stream_config,
+            logger_handler=self.log_message,
+            row_handler=row_handler,
+        )
+        self._request_state = RequestState.StreamingResults
+        self._json_stream.start_parsing(request_context=self)
+        while not self._json_stream.token_stream_exhausted:
+            if self.timed_out:
+                err = TimeoutError(
+                    message='Request timed out while streaming rows to the handler.', context=str(self._error_ctx)
+                )
+                self.shutdown(err)
+                raise err
+            if self.cancelled:
+                raise CancelledError('Request was cancelled.')
+            self._json_stream.continue_parsing(request_context=self)
+        # the rows have all been handed to the row handler, only the final result remains
+        return self._json_stream.get_results(0)
 
     def wait_for_stage_notification(self) -> None:
         if self._stage_notification_ft is None:
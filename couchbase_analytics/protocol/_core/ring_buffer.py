@@ -0,0 +1,132 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+from threading import Event
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class SpscRingBuffer(Generic[T]):
+    """
+    **INTERNAL**
+
+    Bounded, array-backed ring buffer for handing items from exactly one producer thread to exactly one consumer thread.
+
+    Unlike :class:`queue.Queue`, neither :meth:`put` nor :meth:`get` take a lock when they do not have to wait.  The
+    producer only ever advances the tail and the consumer only ever advances the head, so each index has a single
+    writer.  A side only touches its :class:`threading.Event` when the other side has indicated it is waiting.
+
+    .. note::
+        Using more than one producer or more than one consumer is not supported.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError('SpscRingBuffer capacity must be at least 1.')
+        self._capacity = capacity
+        self._buffer: List[Optional[T]] = [None] * capacity
+        # monotonically increasing; the producer owns the tail and the consumer owns the head
+        self._head = 0
+        self._tail = 0
+        self._not_empty = Event()
+        self._not_full = Event()
+        self._consumer_waiting = False
+        self._producer_waiting = False
+        # a wake request is kept until the consumer sees it, so it is not lost if the consumer is not yet waiting
+        self._wake_requested = False
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def empty(self) -> bool:
+        return self._tail == self._head
+
+    def full(self) -> bool:
+        return self._tail - self._head >= self._capacity
+
+    def wake_consumer(self) -> None:
+        """
+        **INTERNAL**
+
+        Wakes the consumer if it is waiting in :meth:`get`, in which case :meth:`get` returns None.  Safe to call from
+        any thread.
+        """
+        self._wake_requested = True
+        self._not_empty.set()
+
+    def put(self, item: T, timeout: Optional[float] = None) -> bool:
+        """
+        **INTERNAL**
+
+        Producer only.  Adds an item, waiting up to ``timeout`` seconds for space if the buffer is full.
+
+        Returns:
+            True if the item was added, False if the buffer remained full for the entire timeout.
+        """
+        if self.full():
+            self._producer_waiting = True
+            self._not_full.clear()
+            # the consumer might have made space prior to seeing that we are waiting
+            if self.full():
+                self._not_full.wait(timeout)
+            self._producer_waiting = False
+            if self.full():
+                return False
+
+        tail = self._tail
+        self._buffer[tail % self._capacity] = item
+        self._tail = tail + 1
+        if self._consumer_waiting:
+            self._not_empty.set()
+        return True
+
+    def get(self, timeout: Optional[float] = None) -> Optional[T]:
+        """
+        **INTERNAL**
+
+        Consumer only.  Removes the oldest item, waiting up to ``timeout`` seconds for an item if the buffer is empty.
+
+        Returns:
+            The oldest item, or None if the buffer remained empty for the entire timeout (or the consumer was woken via
+            :meth:`wake_consumer`).
+        """
+        if self.empty():
+            self._consumer_waiting = True
+            self._not_empty.clear()
+            # the producer might have added an item prior to seeing that we are waiting
+            if self.empty() and not self._wake_requested:
+                self._not_empty.wait(timeout)
+            self._consumer_waiting = False
+            self._wake_requested = False
+            if self.empty():
+                return None
+
+        head = self._head
+        idx = head % self._capacity
+        item = self._buffer[idx]
+        # don't keep the item alive any longer than necessary
+        self._buffer[idx] = None
+        self._head = head + 1
+        if self._producer_waiting:
+            self._not_full.set()
+        return item
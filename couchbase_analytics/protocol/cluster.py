@@ -21,7 +21,9 @@ from concurrent.futures import Future, ThreadPoolExecutor
 from typing import TYPE_CHECKING, Optional, Union
 from uuid import uuid4
 
+from couchbase_analytics.common._core.row_handler import pop_row_handlers, validate_handler_request
 from couchbase_analytics.common.logging import LogLevel
+from couchbase_analytics.common.query import QueryMetadata
 from couchbase_analytics.common.result import BlockingQueryResult
 from couchbase_analytics.protocol._core.client_adapter import _ClientAdapter
 from couchbase_analytics.protocol._core.request import _RequestBuilder
@@ -119,14 +121,31 @@ class Cluster:
 
     def execute_query(
         self, statement: str, *args: object, **kwargs: object
-    ) -> Union[BlockingQueryResult, Future[BlockingQueryResult]]:
+    ) -> Union[BlockingQueryResult, Future[BlockingQueryResult], QueryMetadata]:
+        row_handler = pop_row_handlers(kwargs)
         base_req = self._request_builder.build_base_query_request(statement, *args, **kwargs)
         lazy_execute = base_req.options.pop('lazy_execute', None)
+        buffer_entire_response = base_req.options.pop('buffer_entire_response', None)
+        return_on_headers = base_req.options.pop('return_on_headers', None)
         stream_config = base_req.options.pop('stream_config', None)
+        row_format = base_req.options.pop('row_format', None)
         request_context = RequestContext(
-            self.client_adapter, base_req, self.threadpool_executor, stream_config=stream_config
+            self.client_adapter,
+            base_req,
+            self.threadpool_executor,
+            stream_config=stream_config,
+            row_format=row_format,
         )
-        resp = HttpStreamingResponse(request_context, lazy_execute=lazy_execute)
+        resp = HttpStreamingResponse(
+            request_context,
+            lazy_execute=lazy_execute,
+            buffer_entire_response=buffer_entire_response,
+            return_on_headers=return_on_headers,
+        )
+
+        if row_handler is not None:
+            validate_handler_request(lazy_execute, request_context.cancel_enabled)
+            return resp.send_request_to_row_handler(row_handler)
 
         def _execute_query(http_response: HttpStreamingResponse) -> BlockingQueryResult:
             http_response.send_request()
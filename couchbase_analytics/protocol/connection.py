@@ -24,6 +24,7 @@ from urllib.parse import parse_qs, urlparse
 
 from couchbase_analytics.common._core.certificates import _Certificates
 from couchbase_analytics.common._core.duration_str_utils import parse_duration_str
+from couchbase_analytics.common._core.http_compression import get_accept_encoding
 from couchbase_analytics.common._core.utils import is_null_or_empty
 from couchbase_analytics.common.credential import Credential
 from couchbase_analytics.common.deserializer import DefaultJsonDeserializer, Deserializer
@@ -173,6 +174,12 @@ class _ConnectionDetails:
                 return connect_timeout
         return DEFAULT_TIMEOUTS['connect_timeout']
 
+    def get_http_headers(self) -> Optional[Dict[str, str]]:
+        accept_encoding = get_accept_encoding(self.cluster_options.get('compression', None))
+        if accept_encoding is None:
+            return None
+        return {'Accept-Encoding': accept_encoding}
+
     def get_max_retries(self) -> int:
         return self.cluster_options.get('max_retries', None) or DEFAULT_MAX_RETRIES
 
@@ -268,4 +275,6 @@ class _ConnectionDetails:
 
         conn_dtls = cls(url, cluster_opts, credential.astuple(), default_deserializer, logger_name=logger_name)
         conn_dtls.validate_security_options()
+        # raises if the requested compression cannot be decoded
+        conn_dtls.get_http_headers()
         return conn_dtls
@@ -32,7 +32,7 @@ from couchbase_analytics.common._core.utils import (
     validate_raw_dict,
 )
 from couchbase_analytics.common.deserializer import Deserializer
-from couchbase_analytics.common.enums import QueryScanConsistency
+from couchbase_analytics.common.enums import HttpCompression, QueryScanConsistency, RowFormat
 from couchbase_analytics.common.options import (
     ClusterOptions,
     OptionsClass,
@@ -47,12 +47,15 @@ from couchbase_analytics.common.options_base import (
     TimeoutOptionsValidKeys,
 )
 
+HTTP_COMPRESSION_TO_STR = EnumToStr[HttpCompression]()
 QUERY_CONSISTENCY_TO_STR = EnumToStr[QueryScanConsistency]()
+ROW_FORMAT_TO_STR = EnumToStr[RowFormat]()
 
 QueryStrVal = Union[List[str], str, bool, int, float]
 
 
 class ClusterOptionsTransforms(TypedDict):
+    compression: Dict[Literal['compression'], Callable[[Any], str]]
     deserializer: Dict[Literal['deserializer'], Callable[[Any], Deserializer]]
     max_retries: Dict[Literal['max_retries'], Callable[[Any], int]]
     security_options: Dict[Literal['security_options'], Callable[[Any], Any]]
@@ -60,6 +63,7 @@ class ClusterOptionsTransforms(TypedDict):
 
 
 CLUSTER_OPTIONS_TRANSFORMS: ClusterOptionsTransforms = {
+    'compression': {'compression': HTTP_COMPRESSION_TO_STR},
     'deserializer': {'deserializer': VALIDATE_DESERIALIZER},
     'max_retries': {'max_retries': VALIDATE_INT},
     'security_options': {'security_options': lambda x: x},
@@ -68,6 +72,7 @@ CLUSTER_OPTIONS_TRANSFORMS: ClusterOptionsTransforms = {
 
 
 class ClusterOptionsTransformedKwargs(TypedDict, total=False):
+    compression: Optional[str]
     deserializer: Optional[Deserializer]
     max_retries: Optional[int]
     security_options: Optional[SecurityOptionsTransformedKwargs]
@@ -118,6 +123,7 @@ class TimeoutOptionsTransformedKwargs(TypedDict, total=False):
 
 
 class QueryOptionsTransforms(TypedDict):
+    buffer_entire_response: Dict[Literal['buffer_entire_response'], Callable[[Any], bool]]
     client_context_id: Dict[Literal['client_context_id'], Callable[[Any], str]]
     deserializer: Dict[Literal['deserializer'], Callable[[Any], Deserializer]]
     lazy_execute: Dict[Literal['lazy_execute'], Callable[[Any], bool]]
@@ -127,12 +133,15 @@ class QueryOptionsTransforms(TypedDict):
     query_context: Dict[Literal['query_context'], Callable[[Any], str]]
     raw: Dict[Literal['raw'], Callable[[Any], Dict[str, Any]]]
     readonly: Dict[Literal['readonly'], Callable[[Any], bool]]
+    return_on_headers: Dict[Literal['return_on_headers'], Callable[[Any], bool]]
+    row_format: Dict[Literal['row_format'], Callable[[Any], str]]
     scan_consistency: Dict[Literal['scan_consistency'], Callable[[Any], str]]
     stream_config: Dict[Literal['stream_config'], Callable[[Any], JsonStreamConfig]]
     timeout: Dict[Literal['timeout'], Callable[[Any], float]]
 
 
 QUERY_OPTIONS_TRANSFORMS: QueryOptionsTransforms = {
+    'buffer_entire_response': {'buffer_entire_response': VALIDATE_BOOL},
     'client_context_id': {'client_context_id': VALIDATE_STR},
     'deserializer': {'deserializer': VALIDATE_DESERIALIZER},
     'lazy_execute': {'lazy_execute': VALIDATE_BOOL},
@@ -142,6 +151,8 @@ QUERY_OPTIONS_TRANSFORMS: QueryOptionsTransforms = {
     'query_context': {'query_context': VALIDATE_STR},
     'raw': {'raw': validate_raw_dict},
     'readonly': {'readonly': VALIDATE_BOOL},
+    'return_on_headers': {'return_on_headers': VALIDATE_BOOL},
+    'row_format': {'row_format': ROW_FORMAT_TO_STR},
     'scan_consistency': {'scan_consistency': QUERY_CONSISTENCY_TO_STR},
     'stream_config': {'stream_config': lambda x: x},
     'timeout': {'timeout': to_seconds},
@@ -149,6 +160,7 @@ QUERY_OPTIONS_TRANSFORMS: QueryOptionsTransforms = {
 
 
 class QueryOptionsTransformedKwargs(TypedDict, total=False):
+    buffer_entire_response: Optional[bool]
     client_context_id: Optional[str]
     deserializer: Optional[Deserializer]
     lazy_execute: Optional[bool]
@@ -159,6 +171,8 @@ class QueryOptionsTransformedKwargs(TypedDict, total=False):
     query_context: Optional[str]
     raw: Optional[Dict[str, Any]]
     readonly: Optional[bool]
+    return_on_headers: Optional[bool]
+    row_format: Optional[str]
     scan_consistency: Optional[str]
     stream_config: Optional[JsonStreamConfig]
     timeout: Optional[float]
@@ -15,7 +15,7 @@
 
 import sys
 from concurrent.futures import Future, ThreadPoolExecutor
-from typing import overload
+from typing import Any, Callable, List, overload
 
 if sys.version_info < (3, 11):
     from typing_extensions import Unpack
@@ -27,6 +27,7 @@ from couchbase_analytics.common.result import BlockingQueryResult
 from couchbase_analytics.options import QueryOptions, QueryOptionsKwargs
 from couchbase_analytics.protocol._core.client_adapter import _ClientAdapter
 from couchbase_analytics.protocol.database import Database as Database
+from couchbase_analytics.query import QueryMetadata
 
 class Scope:
     def __init__(self, database: Database, scope_name: str) -> None: ...
@@ -106,3 +107,33 @@ class Scope:
     def execute_query(
         self, statement: str, *args: JSONType, enable_cancel: bool, **kwargs: str
     ) -> Future[BlockingQueryResult]: ...
+    @overload
+    def execute_query(
+        self, statement: str, *args: JSONType, row_handler: Callable[[Any], Any], **kwargs: Unpack[QueryOptionsKwargs]
+    ) -> QueryMetadata: ...
+    @overload
+    def execute_query(
+        self,
+        statement: str,
+        options: QueryOptions,
+        *args: JSONType,
+        row_handler: Callable[[Any], Any],
+        **kwargs: Unpack[QueryOptionsKwargs],
+    ) -> QueryMetadata: ...
+    @overload
+    def execute_query(
+        self,
+        statement: str,
+        *args: JSONType,
+        batch_handler: Callable[[List[Any]], Any],
+        **kwargs: Unpack[QueryOptionsKwargs],
+    ) -> QueryMetadata: ...
+    @overload
+    def execute_query(
+        self,
+        statement: str,
+        options: QueryOptions,
+        *args: JSONType,
+        batch_handler: Callable[[List[Any]], Any],
+        **kwargs: Unpack[QueryOptionsKwargs],
+    ) -> QueryMetadata: ...
@@ -16,28 +16,61 @@
 
 from __future__ import annotations
 
+import json
+from collections import deque
 from concurrent.futures import CancelledError
-from typing import Any, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional
 
 from httpx import Response as HttpCoreResponse
 
 from couchbase_analytics.common._core import ParsedResult, ParsedResultType
 from couchbase_analytics.common._core.query import build_query_metadata
+from couchbase_analytics.common._core.row_store import RowDecoder
 from couchbase_analytics.common.errors import AnalyticsError, InternalSDKError, TimeoutError
 from couchbase_analytics.common.logging import LogLevel
 from couchbase_analytics.common.query import QueryMetadata
+from couchbase_analytics.common.request import RequestState
+from couchbase_analytics.common.row import RowSchema
 from couchbase_analytics.protocol._core.request_context import RequestContext
 from couchbase_analytics.protocol._core.retries import RetryHandler
+from couchbase_analytics.protocol.errors import WrappedError
+
+
+def _pop_rows(rows: Deque[Any], max_rows: Optional[int] = None) -> List[Any]:
+    if max_rows is None or max_rows >= len(rows):
+        popped = list(rows)
+        rows.clear()
+        return popped
+    return [rows.popleft() for _ in range(max_rows)]
 
 
 class HttpStreamingResponse:
-    def __init__(self, request_context: RequestContext, lazy_execute: Optional[bool] = None) -> None:
+    def __init__(
+        self,
+        request_context: RequestContext,
+        lazy_execute: Optional[bool] = None,
+        buffer_entire_response: Optional[bool] = None,
+        return_on_headers: Optional[bool] = None,
+    ) -> None:
         self._request_context = request_context
         if lazy_execute is not None:
             self._lazy_execute = lazy_execute
         else:
             self._lazy_execute = False
+        self._buffer_entire_response = buffer_entire_response is True
+        self._return_on_headers = return_on_headers is True
+        # set when send_request() has returned w/o waiting on the first result, see _wait_for_first_result()
+        self._first_result_pending = False
+        # only set when the entire response has been buffered and decoded at once
+        self._buffered_rows: Optional[Deque[Any]] = None
+        # rows deserialized at once, but not yet returned from get_next_row()
+        self._decoded_rows: Deque[Any] = deque()
         self._metadata: Optional[QueryMetadata] = None
+        self._raw_metadata: Optional[bytes] = None
+        # only set when rows are handed to a row handler rather than returned via get_next_row()/get_next_rows()
+        self._row_handler: Optional[Callable[[List[Any]], Any]] = None
+        self._row_handler_error: Optional[BaseException] = None
+        self._rows_handled = False
         self._core_response: HttpCoreResponse
 
     @property
@@ -47,6 +80,41 @@ class HttpStreamingResponse:
         """
         return self._lazy_execute
 
+    @property
+    def buffer_entire_response(self) -> bool:
+        """
+        **INTERNAL**
+        """
+        return self._buffer_entire_response
+
+    @property
+    def rows_buffered(self) -> bool:
+        """
+        **INTERNAL**
+
+        True if the entire response has been read at once, i.e. all rows are in memory.  The rows are deserialized as
+        they are returned, see :meth:`get_next_rows`.
+        """
+        return self._buffered_rows is not None
+
+    def enable_buffer_entire_response(self) -> None:
+        """
+        **INTERNAL**
+
+        Switches the request to read and decode the entire response at once.  Only applies if the request has not yet
+        been sent.
+        """
+        if self._request_context.request_state == RequestState.NotStarted:
+            self._buffer_entire_response = True
+
+    def _get_buffered_rows(self, max_rows: Optional[int] = None, raw: Optional[bool] = False) -> List[Any]:
+        if not self._buffered_rows:
+            raise StopIteration
+        rows = _pop_rows(self._buffered_rows, max_rows=max_rows)
+        if raw is True:
+            return rows
+        return self._request_context.deserialize_buffered_rows(rows)
+
     def _handle_iteration_abort(self) -> None:
         self.close()
         if self._request_context.cancelled:
@@ -65,6 +133,22 @@ class HttpStreamingResponse:
             self._request_context.shutdown()
             raise StopIteration
 
+    def _process_entire_response(self, body: bytes, json_response: Optional[Dict[str, Any]] = None) -> None:
+        rows, json_response = self._request_context.process_entire_response(self.close, body, json_response)
+        self._buffered_rows = deque(rows)
+        self.set_metadata(json_data=json_response)
+
+    def _handle_rows(self, rows: List[Any]) -> None:
+        if self._row_handler is None:
+            raise RuntimeError('Row handler not set for this response.')
+        self._rows_handled = True
+        try:
+            self._row_handler(self._request_context.deserialize_results(rows))
+        except BaseException as ex:
+            # raised as-is once the request has been cleaned up, see send_request_to_row_handler()
+            self._row_handler_error = ex
+            raise
+
     def _process_response(
         self, raw_response: Optional[ParsedResult] = None, handle_context_shutdown: Optional[bool] = False
     ) -> None:
@@ -87,8 +171,39 @@ class HttpStreamingResponse:
         **INTERNAL**
         """
         self._request_context.log_message('HttpStreamingResponse cancelling request', LogLevel.DEBUG)
-        self.close()
         self._request_context.cancel_request()
+        # if possible, read the remainder of the response so that the connection can be reused
+        self._request_context.drain_http_stream()
+        self.close()
+        self._request_context.shutdown()
+
+    def stop_streaming(self) -> None:
+        """
+        **INTERNAL**
+
+        Stops streaming once the caller has all the rows it needs.  If the entire HTTP response has already been
+        received, the remaining (buffered) results are read w/o being deserialized so that the metadata is available
+        and the connection can be reused.  Otherwise the JSON stream is stopped, the remainder of the HTTP response is
+        drained (see :meth:`RequestContext.drain_http_stream`), the HTTP response is closed and the request context is
+        shutdown.
+        """
+        # rows deserialized via get_next_row() that have not been returned are not needed either
+        self._decoded_rows.clear()
+        if self._buffered_rows is not None or self._request_context.is_shutdown:
+            # the entire response has already been processed
+            return
+        if self._request_context.http_stream_exhausted:
+            try:
+                while True:
+                    self.get_next_rows(raw=True)
+            except StopIteration:
+                return
+        self._request_context.log_message(
+            'HttpStreamingResponse stopping stream, remaining rows not needed', LogLevel.DEBUG
+        )
+        self._request_context.stop_processing_stream()
+        self._request_context.drain_http_stream()
+        self.close()
         self._request_context.shutdown()
 
     def get_metadata(self) -> QueryMetadata:
@@ -96,9 +211,35 @@ class HttpStreamingResponse:
             raise RuntimeError('Query metadata is only available after all rows have been iterated.')
         return self._metadata
 
+    def get_raw_metadata(self) -> bytes:
+        """
+        **INTERNAL**
+
+        Returns the query metadata as the JSON object received from the server (i.e. the response w/o the rows).
+        """
+        if self._raw_metadata is None:
+            raise RuntimeError('Query metadata is only available after all rows have been iterated.')
+        return self._raw_metadata
+
+    def create_row_decoder(self) -> RowDecoder:
+        """
+        **INTERNAL**
+        """
+        return self._request_context.create_row_decoder()
+
+    def get_row_schema(self) -> Optional[RowSchema]:
+        return self._request_context.row_schema
+
     def set_metadata(self, json_data: Optional[Any] = None, raw_metadata: Optional[bytes] = None) -> None:
         try:
-            self._metadata = QueryMetadata(build_query_metadata(json_data=json_data, raw_metadata=raw_metadata))
+            metadata = build_query_metadata(json_data=json_data, raw_metadata=raw_metadata)
+            metadata['http_bytes_received'] = self._request_context.http_bytes_received
+            metadata['http_bytes_decoded'] = self._request_context.http_bytes_decoded
+            self._metadata = QueryMetadata(metadata)
+            if raw_metadata is not None:
+                self._raw_metadata = raw_metadata
+            else:
+                self._raw_metadata = json.dumps(json_data, separators=(',', ':')).encode('utf-8')
             self._request_context.shutdown()
         except (AnalyticsError, ValueError) as err:
             self._request_context.shutdown(err)
@@ -112,7 +253,41 @@ class HttpStreamingResponse:
     def get_next_row(self) -> Any:
         """
         **INTERNAL**
+
+        Returns the next row.  All rows that are ready are deserialized at once and then returned one at a time.
+        """
+        if self._buffered_rows is not None:
+            if not self._decoded_rows:
+                self._decoded_rows.extend(self._get_buffered_rows(max_rows=self._request_context.row_batch_size))
+            return self._decoded_rows.popleft()
+
+        self._wait_for_first_result()
+        self._check_okay_to_iterate()
+        if not self._decoded_rows:
+            self._decoded_rows.extend(self._get_next_rows_from_stream())
+        return self._decoded_rows.popleft()
+
+    def get_next_rows(self, max_rows: Optional[int] = None, raw: Optional[bool] = False) -> List[Any]:
+        """
+        **INTERNAL**
+
+        Returns the next batch of rows (at most ``max_rows`` rows), as handed off by the JSON stream.  If ``raw`` is
+        enabled, rows are returned as received (i.e. w/o being deserialized or formatted), whether from the JSON stream
+        or from a response that was read at once.
         """
+        if self._buffered_rows is not None:
+            if self._decoded_rows:
+                return _pop_rows(self._decoded_rows, max_rows=max_rows)
+            return self._get_buffered_rows(max_rows=max_rows, raw=raw)
+
+        self._wait_for_first_result()
+        self._check_okay_to_iterate()
+        if self._decoded_rows:
+            # rows deserialized via get_next_row() that have not been returned yet
+            return _pop_rows(self._decoded_rows, max_rows=max_rows)
+        return self._get_next_rows_from_stream(max_rows=max_rows, raw=raw)
+
+    def _check_okay_to_iterate(self) -> None:
         if not (
             hasattr(self, '_core_response')
             and self._core_response is not None
@@ -120,34 +295,78 @@ class HttpStreamingResponse:
         ):
             self._handle_iteration_abort()
 
+    def _get_next_rows_from_stream(self, max_rows: Optional[int] = None, raw: Optional[bool] = False) -> List[Any]:
         self._request_context.maybe_continue_to_process_stream()
-        check_state = False
         while True:
-            if check_state and not self._request_context.okay_to_iterate:
-                self._handle_iteration_abort()
-
-            raw_response = self._request_context.get_result_from_stream()
+            raw_response = self._request_context.get_results_from_stream(max_rows=max_rows)
             if raw_response is None:
-                check_state = True
+                # only returned once the request's deadline has passed, the request is cancelled or a stage has ended
+                if not self._request_context.okay_to_iterate:
+                    self._handle_iteration_abort()
+                self._request_context.maybe_continue_to_process_stream()
                 continue
-            if raw_response.result_type == ParsedResultType.ROW:
-                if raw_response.value is None:
+            if raw_response.result_type == ParsedResultType.ROWS:
+                if not raw_response.value:
                     err = AnalyticsError(
-                        message='Unexpected empty row response while streaming.',
+                        message='Unexpected empty rows response while streaming.',
                         context=str(self._request_context.error_context),
                     )
                     self._request_context.shutdown(err)
                     self.close()
                     raise err
-                return self._request_context.deserialize_result(raw_response.value)
+                if raw is True:
+                    rows: List[Any] = raw_response.value
+                    return rows
+                return self._request_context.deserialize_results(raw_response.value)
             elif raw_response.result_type in [ParsedResultType.ERROR, ParsedResultType.UNKNOWN]:
                 self._process_response(raw_response=raw_response, handle_context_shutdown=True)
             elif raw_response.result_type == ParsedResultType.END:
                 self.set_metadata(raw_metadata=raw_response.value)
                 raise StopIteration
 
+    def _wait_for_first_result(self) -> None:
+        """
+        **INTERNAL**
+
+        If ``return_on_headers`` is enabled, the first result is waited on once iteration begins.  Any error (which
+        might result in the request being retried) is raised from the first iteration.
+        """
+        while self._first_result_pending:
+            self.send_request()
+
     @RetryHandler.with_retries
     def send_request(self) -> None:
+        if self._first_result_pending:
+            self._first_result_pending = False
+        else:
+            if not self._request_context.okay_to_stream:
+                raise RuntimeError('Query has been canceled or previously executed.')
+
+            self._request_context.initialize()
+            self._core_response = self._request_context.send_request()
+            if self._request_context.cancelled:
+                raise CancelledError('Request was cancelled.')
+            if self._buffer_entire_response:
+                self._process_entire_response(self._core_response.read())
+                return
+            if self._return_on_headers and self._core_response.status_code == 200:
+                # the preamble and rows might take a while, parsing continues in the background in the meantime
+                self._request_context.start_stream(self._core_response)
+                self._first_result_pending = True
+                return
+            small_response = self._request_context.read_small_response(self._core_response)
+            if small_response is not None:
+                self._process_entire_response(*small_response)
+                return
+            self._request_context.start_stream(self._core_response)
+        # block until we either know we have rows or errors
+        self._request_context.wait_for_stage_notification()
+        if not self._request_context.okay_to_iterate:
+            self._request_context.finish_processing_stream()
+            self._process_response()
+
+    @RetryHandler.with_retries
+    def _send_request_to_row_handler(self) -> None:
         if not self._request_context.okay_to_stream:
             raise RuntimeError('Query has been canceled or previously executed.')
 
@@ -155,9 +374,48 @@ class HttpStreamingResponse:
         self._core_response = self._request_context.send_request()
         if self._request_context.cancelled:
             raise CancelledError('Request was cancelled.')
-        self._request_context.start_stream(self._core_response)
-        # block until we either know we have rows or errors
-        self._request_context.wait_for_stage_notification()
-        if not self._request_context.okay_to_iterate:
-            self._request_context.finish_processing_stream()
-            self._process_response()
+        if self._buffer_entire_response:
+            self._process_entire_response(self._core_response.read())
+            return
+        small_response = self._request_context.read_small_response(self._core_response)
+        if small_response is not None:
+            self._process_entire_response(*small_response)
+            return
+        final_result = self._request_context.stream_to_row_handler(self._core_response, self._handle_rows)
+        if final_result is not None and final_result.result_type == ParsedResultType.END:
+            self.set_metadata(raw_metadata=final_result.value)
+            return
+        try:
+            self._process_response(raw_response=final_result)
+        except WrappedError as ex:
+            if self._rows_handled:
+                # retrying the request would hand the same rows to the row handler again
+                ex.retriable = False
+            raise
+
+    def send_request_to_row_handler(self, row_handler: Callable[[List[Any]], Any]) -> QueryMetadata:
+        """
+        **INTERNAL**
+
+        Executes the query, handing each batch of rows to the row handler as the response is parsed rather than
+        making the rows available via :meth:`get_next_row`.
+
+        Returns:
+            The query metadata, available once all rows have been handed to the row handler.
+        """
+        self._row_handler = row_handler
+        try:
+            self._send_request_to_row_handler()
+        except Exception:
+            if self._row_handler_error is not None:
+                raise self._row_handler_error from None
+            raise
+
+        if self._buffered_rows:
+            # the entire response was read at once, so the rows are deserialized here rather than by the JSON stream
+            rows = list(self._buffered_rows)
+            self._buffered_rows.clear()
+            batch_size = self._request_context.row_batch_size
+            for idx in range(0, len(rows), batch_size):
+                row_handler(self._request_context.deserialize_buffered_rows(rows[idx : idx + batch_size]))
+        return self.get_metadata()
@@ -14,7 +14,14 @@
 #  limitations under the License.
 
 
+from couchbase_analytics.common.columns import Column as Column  # noqa: F401
+from couchbase_analytics.common.columns import ColumnarResult as ColumnarResult  # noqa: F401
 from couchbase_analytics.common.enums import QueryScanConsistency as QueryScanConsistency  # noqa: F401
+from couchbase_analytics.common.enums import RowFormat as RowFormat  # noqa: F401
 from couchbase_analytics.common.query import QueryMetadata as QueryMetadata  # noqa: F401
 from couchbase_analytics.common.query import QueryMetrics as QueryMetrics  # noqa: F401
 from couchbase_analytics.common.query import QueryWarning as QueryWarning  # noqa: F401
+from couchbase_analytics.common.row import LazyRow as LazyRow  # noqa: F401
+from couchbase_analytics.common.row import Record as Record  # noqa: F401
+from couchbase_analytics.common.row import RowSchema as RowSchema  # noqa: F401
+from couchbase_analytics.common.row_store import RowStore as RowStore  # noqa: F401
@@ -15,7 +15,7 @@
 
 import sys
 from concurrent.futures import Future
-from typing import overload
+from typing import Any, Callable, List, overload
 
 if sys.version_info < (3, 11):
     from typing_extensions import Unpack
@@ -25,6 +25,7 @@ else:
 from couchbase_analytics import JSONType
 from couchbase_analytics.options import QueryOptions, QueryOptionsKwargs
 from couchbase_analytics.protocol.database import Database as Database
+from couchbase_analytics.query import QueryMetadata
 from couchbase_analytics.result import BlockingQueryResult
 
 class Scope:
@@ -101,3 +102,33 @@ class Scope:
     def execute_query(
         self, statement: str, *args: JSONType, enable_cancel: bool, **kwargs: str
     ) -> Future[BlockingQueryResult]: ...
+    @overload
+    def execute_query(
+        self, statement: str, *args: JSONType, row_handler: Callable[[Any], Any], **kwargs: Unpack[QueryOptionsKwargs]
+    ) -> QueryMetadata: ...
+    @overload
+    def execute_query(
+        self,
+        statement: str,
+        options: QueryOptions,
+        *args: JSONType,
+        row_handler: Callable[[Any], Any],
+        **kwargs: Unpack[QueryOptionsKwargs],
+    ) -> QueryMetadata: ...
+    @overload
+    def execute_query(
+        self,
+        statement: str,
+        *args: JSONType,
+        batch_handler: Callable[[List[Any]], Any],
+        **kwargs: Unpack[QueryOptionsKwargs],
+    ) -> QueryMetadata: ...
+    @overload
+    def execute_query(
+        self,
+        statement: str,
+        options: QueryOptions,
+        *args: JSONType,
+        batch_handler: Callable[[List[Any]], Any],
+        **kwargs: Unpack[QueryOptionsKwargs],
+    ) -> QueryMetadata: ...
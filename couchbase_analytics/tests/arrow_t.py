@@ -0,0 +1,198 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+import pathlib
+import sys
+from typing import Any, Dict, List
+
+import pytest
+
+from couchbase_analytics.common._core.arrow import ArrowBatchBuilder, ArrowFileFormat, ArrowFileWriter
+from couchbase_analytics.query import LazyRow, Record, RowSchema
+
+
+class ArrowTestSuite:
+    TEST_MANIFEST = [
+        'test_arrow_batch_builder',
+        'test_arrow_batch_builder_inferred_schema_new_fields',
+        'test_arrow_batch_builder_invalid_schema',
+        'test_arrow_batch_builder_mapping_rows',
+        'test_arrow_batch_builder_non_object_rows',
+        'test_arrow_batch_builder_null_fields',
+        'test_arrow_batch_builder_schema',
+        'test_arrow_batch_builder_schema_mismatch',
+        'test_arrow_file_writer',
+        'test_arrow_file_writer_max_pending_rows',
+        'test_arrow_file_writer_no_rows',
+        'test_arrow_file_writer_null_fields',
+        'test_arrow_unavailable',
+    ]
+
+    def test_arrow_batch_builder(self) -> None:
+        pa = pytest.importorskip('pyarrow')
+        rows: List[Dict[str, Any]] = [{'id': i, 'name': f'name{i}', 'score': i / 2} for i in range(10)]
+        builder = ArrowBatchBuilder()
+        assert builder.schema is None
+        first = builder.to_record_batch(rows[:6])
+        second = builder.to_record_batch(rows[6:])
+        assert isinstance(first, pa.RecordBatch)
+        assert first.num_rows == 6 and second.num_rows == 4
+        assert builder.schema == first.schema == second.schema
+        assert first.schema.names == ['id', 'name', 'score']
+        assert first.schema.field('id').type == pa.int64()
+        assert pa.Table.from_batches([first, second]).to_pylist() == rows
+
+    def test_arrow_batch_builder_inferred_schema_new_fields(self) -> None:
+        pytest.importorskip('pyarrow')
+        builder = ArrowBatchBuilder()
+        builder.to_record_batch([{'a': 1}])
+        # missing fields are null, fields not in the inferred schema are an error rather than silently dropped
+        assert builder.to_record_batch([{}]).to_pylist() == [{'a': None}]
+        with pytest.raises(ValueError):
+            builder.to_record_batch([{'a': 2, 'b': 'x'}])
+
+    def test_arrow_batch_builder_invalid_schema(self) -> None:
+        pytest.importorskip('pyarrow')
+        with pytest.raises(ValueError):
+            ArrowBatchBuilder(schema={'a': 'int64'})
+
+    def test_arrow_batch_builder_mapping_rows(self) -> None:
+        pytest.importorskip('pyarrow')
+        rows = [Record(RowSchema(['a', 'b']), (1, 'x')), LazyRow(b'{"a":2,"b":"y"}'), {'a': 3, 'b': 'z'}]
+        batch = ArrowBatchBuilder().to_record_batch(rows)
+        assert batch.to_pylist() == [{'a': 1, 'b': 'x'}, {'a': 2, 'b': 'y'}, {'a': 3, 'b': 'z'}]
+
+    def test_arrow_batch_builder_non_object_rows(self) -> None:
+        pytest.importorskip('pyarrow')
+        with pytest.raises(ValueError):
+            ArrowBatchBuilder().to_record_batch([{'a': 1}, 1])
+
+    def test_arrow_batch_builder_null_fields(self) -> None:
+        pa = pytest.importorskip('pyarrow')
+        builder = ArrowBatchBuilder()
+        first = builder.to_record_batch([{'a': 1, 'b': None}])
+        assert first.schema.field('b').type == pa.null()
+        # the null typed field is resolved by the first non-null value, the other fields keep their inferred type
+        second = builder.to_record_batch([{'a': 2, 'b': None}, {'a': 3, 'b': 'x'}])
+        assert second.schema.field('b').type == pa.string()
+        assert builder.schema == second.schema
+        assert second.to_pylist() == [{'a': 2, 'b': None}, {'a': 3, 'b': 'x'}]
+        with pytest.raises(ValueError):
+            builder.to_record_batch([{'a': 4, 'b': 5}])
+
+    def test_arrow_batch_builder_schema(self) -> None:
+        pa = pytest.importorskip('pyarrow')
+        schema = pa.schema([('id', pa.int32()), ('name', pa.string())])
+        builder = ArrowBatchBuilder(schema=schema)
+        # fields not in a provided schema are ignored
+        batch = builder.to_record_batch([{'id': 1, 'name': 'a', 'extra': True}, {'id': 2}])
+        assert batch.schema == schema
+        assert batch.to_pylist() == [{'id': 1, 'name': 'a'}, {'id': 2, 'name': None}]
+
+    def test_arrow_batch_builder_schema_mismatch(self) -> None:
+        pa = pytest.importorskip('pyarrow')
+        builder = ArrowBatchBuilder(schema=pa.schema([('id', pa.int64())]))
+        with pytest.raises(ValueError):
+            builder.to_record_batch([{'id': 'a'}])
+
+    @pytest.mark.parametrize('file_format', [ArrowFileFormat.PARQUET, ArrowFileFormat.ARROW_IPC])
+    def test_arrow_file_writer(self, tmp_path: pathlib.Path, file_format: ArrowFileFormat) -> None:
+        pa = pytest.importorskip('pyarrow')
+        rows: List[Dict[str, Any]] = [{'id': i, 'name': f'name{i}'} for i in range(25)]
+        builder = ArrowBatchBuilder()
+        path = str(tmp_path / 'rows')
+        writer = ArrowFileWriter(path, file_format)
+        for idx in range(0, len(rows), 10):
+            writer.write_batch(builder.to_record_batch(rows[idx : idx + 10]))
+        assert writer.finish(builder.schema) == len(rows)
+        if file_format is ArrowFileFormat.PARQUET:
+            pq = pytest.importorskip('pyarrow.parquet')
+            assert pq.ParquetFile(path).metadata.num_row_groups == 3
+            table = pq.read_table(path)
+        else:
+            table = pa.ipc.open_file(path).read_all()
+        assert table.to_pylist() == rows
+
+    def test_arrow_file_writer_max_pending_rows(self, tmp_path: pathlib.Path) -> None:
+        pytest.importorskip('pyarrow')
+        builder = ArrowBatchBuilder()
+        writer = ArrowFileWriter(str(tmp_path / 'rows'), ArrowFileFormat.ARROW_IPC, max_pending_rows=5)
+        # too many rows to hold, so the file is opened w/ the null typed field
+        writer.write_batch(builder.to_record_batch([{'a': i, 'b': None} for i in range(10)]))
+        with pytest.raises(ValueError):
+            writer.write_batch(builder.to_record_batch([{'a': 10, 'b': 'x'}]))
+        writer.close()
+
+    @pytest.mark.parametrize('file_format', [ArrowFileFormat.PARQUET, ArrowFileFormat.ARROW_IPC])
+    def test_arrow_file_writer_no_rows(self, tmp_path: pathlib.Path, file_format: ArrowFileFormat) -> None:
+        pa = pytest.importorskip('pyarrow')
+        schema = pa.schema([('id', pa.int64())])
+        path = str(tmp_path / 'rows')
+        writer = ArrowFileWriter(path, file_format)
+        assert writer.finish(schema) == 0
+        if file_format is ArrowFileFormat.PARQUET:
+            pq = pytest.importorskip('pyarrow.parquet')
+            table = pq.read_table(path)
+        else:
+            table = pa.ipc.open_file(path).read_all()
+        assert table.num_rows == 0
+        assert table.schema == schema
+
+    @pytest.mark.parametrize('file_format', [ArrowFileFormat.PARQUET, ArrowFileFormat.ARROW_IPC])
+    @pytest.mark.parametrize('resolved', [True, False])
+    def test_arrow_file_writer_null_fields(
+        self, tmp_path: pathlib.Path, file_format: ArrowFileFormat, resolved: bool
+    ) -> None:
+        pa = pytest.importorskip('pyarrow')
+        rows: List[Dict[str, Any]] = [{'id': i, 'name': None} for i in range(25)]
+        if resolved:
+            rows[-1]['name'] = 'name24'
+        builder = ArrowBatchBuilder()
+        path = str(tmp_path / 'rows')
+        writer = ArrowFileWriter(path, file_format)
+        for idx in range(0, len(rows), 10):
+            writer.write_batch(builder.to_record_batch(rows[idx : idx + 10]))
+        assert writer.finish(builder.schema) == len(rows)
+        if file_format is ArrowFileFormat.PARQUET:
+            pq = pytest.importorskip('pyarrow.parquet')
+            table = pq.read_table(path)
+        else:
+            table = pa.ipc.open_file(path).read_all()
+        assert table.schema.field('name').type == (pa.string() if resolved else pa.null())
+        assert table.to_pylist() == rows
+
+    def test_arrow_unavailable(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # a None entry in sys.modules makes the import raise ImportError
+        monkeypatch.setitem(sys.modules, 'pyarrow', None)
+        with pytest.raises(ImportError):
+            ArrowBatchBuilder()
+        with pytest.raises(ImportError):
+            ArrowFileWriter('rows.parquet', ArrowFileFormat.PARQUET)
+
+
+class ArrowTests(ArrowTestSuite):
+    @pytest.fixture(scope='class', autouse=True)
+    def validate_test_manifest(self) -> None:
+        def valid_test_method(meth: str) -> bool:
+            attr = getattr(ArrowTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+
+        method_list = [meth for meth in dir(ArrowTests) if valid_test_method(meth)]
+        test_list = set(ArrowTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest invalid.  Missing/extra tests: {test_list}.')
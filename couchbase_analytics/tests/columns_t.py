@@ -0,0 +1,154 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+import sys
+from array import array
+from typing import Any, Dict, List
+
+import pytest
+
+from couchbase_analytics.common._core.column_builder import ColumnBuilder
+from couchbase_analytics.query import ColumnarResult, LazyRow, Record, RowSchema
+
+
+class ColumnsTestSuite:
+    TEST_MANIFEST = [
+        'test_columns',
+        'test_columns_dtype_widening',
+        'test_columns_empty',
+        'test_columns_mapping_rows',
+        'test_columns_missing_fields',
+        'test_columns_non_object_rows',
+        'test_columns_numpy',
+        'test_columns_numpy_unavailable',
+    ]
+
+    def test_columns(self) -> None:
+        rows: List[Dict[str, Any]] = [
+            {'id': i, 'score': i / 2, 'active': i % 2 == 0, 'name': f'name{i}', 'tags': [i]} for i in range(10)
+        ]
+        builder = ColumnBuilder()
+        builder.add_rows(rows[:4])
+        builder.add_rows(rows[4:])
+        result = builder.build()
+        assert isinstance(result, ColumnarResult)
+        assert result.row_count == 10
+        assert list(result) == ['id', 'score', 'active', 'name', 'tags']
+        assert result['id'].dtype == 'int64' and result['id'].values == array('q', range(10))
+        assert result['score'].dtype == 'float64' and isinstance(result['score'].values, array)
+        assert result['active'].dtype == 'bool' and isinstance(result['active'].values, array)
+        assert result['name'].dtype == 'object' and result['name'].values == [f'name{i}' for i in range(10)]
+        assert result['tags'].dtype == 'object'
+        for column in result.values():
+            assert len(column) == 10
+            assert column.null_count == 0
+        assert result.to_dict() == {field: [row[field] for row in rows] for field in rows[0]}
+
+    @pytest.mark.parametrize(
+        'values, dtype',
+        [
+            ([1, 2.5, 3], 'float64'),
+            ([1, 'a'], 'object'),
+            ([1, 2**63], 'object'),
+            ([True, 1], 'object'),
+            ([1, True], 'object'),
+            ([1.5, 'a'], 'object'),
+            ([None, None], 'object'),
+            ([None, 2.5, None, 1], 'float64'),
+            ([2**53, 2.5, -(2**53)], 'float64'),
+            ([2**62 + 1, 2.5], 'object'),
+            ([2.5, 10**30], 'object'),
+            ([2.5, -(2**53) - 1], 'object'),
+            ([1, 2.5, 'x'], 'object'),
+            ([None, 1, 2.5, None, 3, 'x'], 'object'),
+            ([1.5, 2, 'x'], 'object'),
+        ],
+    )
+    @pytest.mark.parametrize('batched', [True, False])
+    def test_columns_dtype_widening(self, values: List[Any], dtype: str, batched: bool) -> None:
+        builder = ColumnBuilder()
+        if batched:
+            builder.add_rows([{'value': value} for value in values])
+        else:
+            for value in values:
+                builder.add_rows([{'value': value}])
+        column = builder.build()['value']
+        assert column.dtype == dtype
+        assert column.to_list() == values
+        assert [type(value) for value in column.to_list()] == [
+            float if dtype == 'float64' and value is not None else type(value) for value in values
+        ]
+        assert list(column.null_mask) == [int(value is None) for value in values]
+
+    def test_columns_empty(self) -> None:
+        result = ColumnBuilder().build()
+        assert result.row_count == 0
+        assert len(result) == 0
+
+    def test_columns_mapping_rows(self) -> None:
+        rows = [Record(RowSchema(['a', 'b']), (1, 'x')), LazyRow(b'{"a":2,"b":"y"}')]
+        builder = ColumnBuilder()
+        builder.add_rows(rows)
+        assert builder.build().to_dict() == {'a': [1, 2], 'b': ['x', 'y']}
+
+    def test_columns_missing_fields(self) -> None:
+        builder = ColumnBuilder()
+        builder.add_rows([{'a': 1}, {'b': 'x'}, {'a': 3, 'c': 2.5}, {}])
+        result = builder.build()
+        assert result.row_count == 4
+        assert result.to_dict() == {'a': [1, None, 3, None], 'b': [None, 'x', None, None], 'c': [None, None, 2.5, None]}
+        assert result['a'].dtype == 'int64'
+        assert list(result['a'].null_mask) == [0, 1, 0, 1]
+        assert result['c'].null_count == 3
+
+    def test_columns_non_object_rows(self) -> None:
+        builder = ColumnBuilder()
+        with pytest.raises(ValueError):
+            builder.add_rows([{'a': 1}, 1])
+
+    def test_columns_numpy(self) -> None:
+        numpy = pytest.importorskip('numpy')
+        builder = ColumnBuilder(use_numpy=True)
+        builder.add_rows([{'a': 1, 'b': 1.5, 'c': True, 'd': 'x'}, {'a': None, 'b': 2, 'c': False, 'd': None}])
+        result = builder.build()
+        assert isinstance(result['a'].values, numpy.ndarray) and result['a'].values.dtype == numpy.int64
+        assert result['b'].values.dtype == numpy.float64
+        assert result['c'].values.dtype == numpy.bool_
+        assert result['d'].values == ['x', None]
+        assert result['a'].null_mask.dtype == numpy.bool_
+        assert result['a'].null_mask.tolist() == [False, True]
+        assert result.to_dict() == {'a': [1, None], 'b': [1.5, 2.0], 'c': [True, False], 'd': ['x', None]}
+
+    def test_columns_numpy_unavailable(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # a None entry in sys.modules makes the import raise ImportError
+        monkeypatch.setitem(sys.modules, 'numpy', None)
+        with pytest.raises(ImportError):
+            ColumnBuilder(use_numpy=True)
+
+
+class ColumnsTests(ColumnsTestSuite):
+    @pytest.fixture(scope='class', autouse=True)
+    def validate_test_manifest(self) -> None:
+        def valid_test_method(meth: str) -> bool:
+            attr = getattr(ColumnsTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+
+        method_list = [meth for meth in dir(ColumnsTests) if valid_test_method(meth)]
+        test_list = set(ColumnsTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest invalid.  Missing/extra tests: {test_list}.')
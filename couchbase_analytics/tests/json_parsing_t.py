@@ -17,11 +17,16 @@
 from __future__ import annotations
 
 import json
-from typing import TYPE_CHECKING
+from decimal import Decimal
+from threading import Thread
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 import pytest
 
-from couchbase_analytics.common._core import JsonStreamConfig, ParsedResult, ParsedResultType
+from couchbase_analytics.common._core import JsonParserBackend, JsonStreamConfig, ParsedResult, ParsedResultType
+from couchbase_analytics.common._core.buffered_bytes import ADAPTIVE_SHRINK_AFTER_PAUSES, BufferedBytes
+from couchbase_analytics.common._core.json_parser_backend import is_parser_backend_available, resolve_parser_backend
+from couchbase_analytics.common._core.json_parsing import decode_if_complete
 from couchbase_analytics.protocol._core.json_stream import JsonStream
 from tests.environments.simple_environment import JsonDataType
 from tests.utils import BytesIterator
@@ -42,6 +47,18 @@ class JsonParsingTestSuite:
         'test_array_empty',
         'test_array_mixed_types',
         'test_array_of_objects',
+        'test_buffered_bytes',
+        'test_buffered_bytes_adaptive',
+        'test_buffered_bytes_invalid_config',
+        'test_buffered_bytes_run_parsing',
+        'test_decode_if_complete',
+        'test_decode_rows',
+        'test_decode_rows_disabled',
+        'test_decode_rows_infer_row_shape',
+        'test_decode_rows_values',
+        'test_drain_http_stream',
+        'test_empty_http_chunks',
+        'test_get_results_batched',
         'test_invalid_empty',
         'test_invalid_garbage_between_objects',
         'test_invalid_leading_garbage',
@@ -53,6 +70,13 @@ class JsonParsingTestSuite:
         'test_object_simple_nested',
         'test_object_with_empty_key_and_value',
         'test_object_with_unicode',
+        'test_parser_backend',
+        'test_parser_backend_invalid',
+        'test_parser_backend_resolution',
+        'test_run_parsing',
+        'test_split_raw_rows',
+        'test_split_raw_rows_invalid',
+        'test_split_raw_rows_preserves_bytes',
         'test_value_bool',
         'test_value_null',
     ]
@@ -247,6 +271,315 @@ class JsonParsingTestSuite:
         assert result.value.decode('utf-8') == data
         assert parser.get_result(0.01) is None
 
+    @pytest.mark.parametrize(
+        'stream_config',
+        [
+            JsonStreamConfig(buffered_bytes_max=64, row_batch_size=2),
+            JsonStreamConfig(buffered_bytes_max=64, row_batch_size=2, decode_rows=True),
+            JsonStreamConfig(buffered_bytes_max=64, row_batch_size=2, split_raw_rows=True),
+            JsonStreamConfig(buffered_bytes_max=2**20, buffered_row_max=4, row_batch_size=2),
+        ],
+    )
+    def test_buffered_bytes(self, test_env: SimpleEnvironment, stream_config: JsonStreamConfig) -> None:
+        json_object, bytes_data = test_env.get_json_data(JsonDataType.MULTIPLE_RESULTS)
+        expected_rows = json_object.pop('results')
+        parser = JsonStream(BytesIterator(bytes_data, chunk_size=7), stream_config=stream_config)
+        buffered_bytes = parser._buffered_bytes
+        assert isinstance(buffered_bytes, BufferedBytes)
+        parser.start_parsing()
+        # the producer pauses once the size of the buffered rows (or number of buffered batches) reaches the threshold
+        assert parser.token_stream_exhausted is False
+        max_row_size = max(len(json.dumps(row)) for row in expected_rows)
+        rows: List[Any] = []
+        while True:
+            assert buffered_bytes.buffered <= buffered_bytes.buffer_size + stream_config.row_batch_size * max_row_size
+            assert len(parser._results_buffer) <= stream_config.buffered_row_max
+            result = parser.get_results(0.01)
+            if result is None and not parser.token_stream_exhausted:
+                parser.continue_parsing()
+                continue
+            assert isinstance(result, ParsedResult)
+            if result.result_type != ParsedResultType.ROWS:
+                break
+            rows.extend(row if parser.decode_rows else json.loads(row) for row in result.value)
+            parser.continue_parsing()
+
+        assert result.result_type == ParsedResultType.END
+        assert rows == expected_rows
+        assert json.loads(result.value) == json_object
+        assert buffered_bytes.buffered == pytest.approx(0)
+
+    def test_buffered_bytes_adaptive(self) -> None:
+        now = [0.0]
+        buffered_bytes = BufferedBytes(
+            JsonStreamConfig(buffered_bytes_min=1000, buffered_bytes_max=8000), clock=lambda: now[0]
+        )
+        assert buffered_bytes.adaptive is True
+        assert buffered_bytes.buffer_size == 1000
+
+        def fill_and_drain(consumer_wait_time: float) -> None:
+            # the producer fills the buffer in 0.1s, the consumer drains it in 1s
+            buffered_bytes.start_producing()
+            for _ in range(10):
+                buffered_bytes.add_row(b'x' * 100)
+            buffered_bytes.add_batch()
+            now[0] += 0.1
+            buffered_bytes.pause_producing()
+            buffered_bytes.receive_batch(10)
+            buffered_bytes.consume_rows(10)
+            buffered_bytes.add_consumer_wait_time(consumer_wait_time)
+            now[0] += 1 + consumer_wait_time
+
+        # each pause adapts the buffer to what happened since the previous pause
+        fill_and_drain(0)
+        # the consumer waits on the (faster) producer, the buffer grows (up to the max)
+        for _ in range(10):
+            fill_and_drain(0.5)
+        assert buffered_bytes.buffer_size == 8000
+        # the consumer no longer waits, the buffer shrinks (down to the min)
+        for _ in range(ADAPTIVE_SHRINK_AFTER_PAUSES + 1):
+            fill_and_drain(0)
+        assert buffered_bytes.buffer_size == 6000
+        for _ in range(ADAPTIVE_SHRINK_AFTER_PAUSES * 20):
+            fill_and_drain(0)
+        assert buffered_bytes.buffer_size == 1000
+
+        fixed = BufferedBytes(JsonStreamConfig(buffered_bytes_max=8000))
+        assert fixed.adaptive is False
+        assert fixed.buffer_size == 8000
+
+    @pytest.mark.parametrize(
+        'config_kwargs',
+        [
+            {'buffered_bytes_max': 0},
+            {'buffered_bytes_min': 10},
+            {'buffered_bytes_min': 0, 'buffered_bytes_max': 10},
+            {'buffered_bytes_min': 20, 'buffered_bytes_max': 10},
+        ],
+    )
+    def test_buffered_bytes_invalid_config(self, config_kwargs: Dict[str, int]) -> None:
+        with pytest.raises(ValueError):
+            JsonStreamConfig(**config_kwargs)  # type: ignore[arg-type]
+
+    @pytest.mark.parametrize('buffered_bytes_min', [None, 32])
+    def test_buffered_bytes_run_parsing(self, test_env: SimpleEnvironment, buffered_bytes_min: Optional[int]) -> None:
+        json_object, bytes_data = test_env.get_json_data(JsonDataType.MULTIPLE_RESULTS)
+        stream_config = JsonStreamConfig(
+            buffered_bytes_max=128, buffered_bytes_min=buffered_bytes_min, row_batch_size=2
+        )
+        parser = JsonStream(BytesIterator(bytes_data, chunk_size=7), stream_config=stream_config)
+        # a single, persistent producer that parks while the consumer catches up
+        producer = Thread(target=parser.run_parsing)
+        producer.start()
+        rows: List[Any] = []
+        while True:
+            result = parser.get_result(5)
+            assert isinstance(result, ParsedResult)
+            if result.result_type != ParsedResultType.ROW:
+                break
+            rows.append(json.loads(result.value))
+        producer.join(5)
+
+        assert producer.is_alive() is False
+        assert result.result_type == ParsedResultType.END
+        assert rows == json_object.pop('results')
+        assert json.loads(result.value) == json_object
+
+    @pytest.mark.parametrize('use_float', [True, False])
+    @pytest.mark.parametrize(
+        'json_type',
+        [
+            JsonDataType.SIMPLE_REQUEST,
+            JsonDataType.MULTIPLE_RESULTS,
+            JsonDataType.MULTIPLE_RESULTS_RAW,
+            JsonDataType.FAILED_REQUEST,
+            JsonDataType.FAILED_REQUEST_MID_STREAM,
+            JsonDataType.FAILED_REQUEST_MULTI_ERRORS,
+        ],
+    )
+    def test_decode_rows(self, test_env: SimpleEnvironment, json_type: JsonDataType, use_float: bool) -> None:
+        json_object, bytes_data = test_env.get_json_data(json_type)
+        stream_config = JsonStreamConfig(decode_rows=True, use_float=use_float)
+        parser = JsonStream(BytesIterator(bytes_data), stream_config=stream_config)
+        assert parser.decode_rows is True
+        parser.start_parsing()
+        rows = []
+        while True:
+            result = parser.get_result(0.01)
+            if result is None and not parser.token_stream_exhausted:
+                parser.continue_parsing()
+                continue
+            assert isinstance(result, ParsedResult)
+            if result.result_type != ParsedResultType.ROW:
+                break
+            rows.append(result.value)
+
+        expected_type = ParsedResultType.ERROR if 'errors' in json_object else ParsedResultType.END
+        assert result.result_type == expected_type
+        expected_rows = json_object.pop('results', [])
+        if use_float:
+            assert rows == expected_rows
+        else:
+            assert rows == json.loads(json.dumps(expected_rows), parse_float=Decimal)
+        assert isinstance(result.value, bytes)
+        assert json.loads(result.value) == json_object
+
+    @pytest.mark.parametrize(
+        'data, expected',
+        [
+            (b'{"results":[{"a":1}],"status":"success"}\n', {'results': [{'a': 1}], 'status': 'success'}),
+            (b'{"results":[{"a":1}', None),
+            (b'{"results":[{"a":1},{"b":2}', None),
+            (b'{"results":[{"a":1}],"status":"success"}{}', None),
+            (b'[{"a":1}]', None),
+            (b'', None),
+        ],
+    )
+    def test_decode_if_complete(self, data: bytes, expected: Optional[Any]) -> None:
+        assert decode_if_complete(data) == expected
+
+    def test_decode_rows_disabled(self) -> None:
+        data = b'{"results":[{"a":1}],"status":"success"}'
+        parser = JsonStream(
+            BytesIterator(data), stream_config=JsonStreamConfig(decode_rows=True, buffer_entire_result=True)
+        )
+        assert parser.decode_rows is False
+        parser = JsonStream(BytesIterator(data), stream_config=JsonStreamConfig(decode_rows=True, split_raw_rows=True))
+        assert parser.decode_rows is False
+        parser.start_parsing()
+        result = parser.get_result(0.01)
+        assert isinstance(result, ParsedResult)
+        assert result.result_type == ParsedResultType.ROW
+        assert result.value == b'{"a":1}'
+
+    @pytest.mark.parametrize(
+        'tail_rows',
+        [
+            [],
+            [{'a': 2, 'c': 'x'}],
+            [{'a': 2, 'b': {'nested': [1, 2]}, 'c': 'x'}],
+            [{'a': 2, 'b': [1, {'c': None}]}],
+            [{'a': 2}],
+            [{'a': 2, 'b': 'y', 'c': 'x', 'd': 4.5}],
+            [{'c': 'x', 'b': 'y', 'a': 2}],
+            [1, 'str', None, [1, 2], {}],
+        ],
+    )
+    def test_decode_rows_infer_row_shape(self, tail_rows: List[Any]) -> None:
+        sample_size = 3
+        rows: List[Any] = [{'a': i, 'b': f'b{i}', 'c': i % 2 == 0} for i in range(sample_size + 2)]
+        rows.extend(tail_rows)
+        rows.append({'a': 10, 'b': 'b10', 'c': None})
+        data = json.dumps({'requestID': '1', 'results': rows, 'metrics': {'resultCount': len(rows)}})
+        stream_config = JsonStreamConfig(decode_rows=True, infer_row_shape=True, row_shape_sample_size=sample_size)
+        parser = JsonStream(BytesIterator(data, chunk_size=7), stream_config=stream_config)
+        parser.start_parsing()
+        decoded = []
+        while True:
+            result = parser.get_result(0.01)
+            if result is None and not parser.token_stream_exhausted:
+                parser.continue_parsing()
+                continue
+            assert isinstance(result, ParsedResult)
+            if result.result_type != ParsedResultType.ROW:
+                break
+            decoded.append(result.value)
+
+        assert result.result_type == ParsedResultType.END
+        assert decoded == json.loads(json.dumps(rows), parse_float=Decimal)
+        assert isinstance(result.value, bytes)
+        assert json.loads(result.value) == {'requestID': '1', 'metrics': {'resultCount': len(rows)}}
+        # once the shape is learned, rows of that shape share the same key objects
+        shaped_rows = [
+            row
+            for row in decoded[sample_size:]
+            if isinstance(row, dict) and list(row) == ['a', 'b', 'c'] and not isinstance(row['b'], (dict, list))
+        ]
+        assert len(shaped_rows) >= 3
+        for row in shaped_rows[1:]:
+            assert all(key is shaped_key for key, shaped_key in zip(row, shaped_rows[0]))
+
+    def test_decode_rows_values(self) -> None:
+        rows = [1, -2.5, 1e100, 'str', True, False, None, [], {}, {'a': [1, {'b': None}], 'c': 'd'}, [[1], [2.25]]]
+        data = json.dumps({'requestID': '1', 'results': rows, 'metrics': {'resultCount': len(rows)}})
+        parser = JsonStream(BytesIterator(data, chunk_size=3), stream_config=JsonStreamConfig(decode_rows=True))
+        parser.start_parsing()
+        decoded = []
+        while True:
+            result = parser.get_result(0.01)
+            if result is None and not parser.token_stream_exhausted:
+                parser.continue_parsing()
+                continue
+            assert isinstance(result, ParsedResult)
+            if result.result_type != ParsedResultType.ROW:
+                break
+            decoded.append(result.value)
+
+        assert decoded == rows
+        assert result.result_type == ParsedResultType.END
+        assert json.loads(result.value) == {'requestID': '1', 'metrics': {'resultCount': len(rows)}}
+
+    def test_drain_http_stream(self, test_env: SimpleEnvironment) -> None:
+        _, bytes_data = test_env.get_json_data(JsonDataType.MULTIPLE_RESULTS)
+        parser = JsonStream(
+            BytesIterator(bytes_data, chunk_size=7),
+            stream_config=JsonStreamConfig(buffered_row_max=2, row_batch_size=1),
+        )
+        parser.start_parsing()
+        result = parser.get_result(0.01)
+        assert isinstance(result, ParsedResult)
+        assert result.result_type == ParsedResultType.ROW
+        assert parser.http_stream_exhausted is False
+        assert parser.drain_http_stream(len(bytes_data), 5) is True
+        assert parser.http_stream_exhausted is True
+
+        parser = JsonStream(BytesIterator(bytes_data, chunk_size=7))
+        assert parser.drain_http_stream(1, 5) is False
+        assert parser.http_stream_exhausted is False
+
+    @pytest.mark.parametrize('decode_rows', [True, False])
+    def test_empty_http_chunks(self, test_env: SimpleEnvironment, decode_rows: bool) -> None:
+        json_object, bytes_data = test_env.get_json_data(JsonDataType.MULTIPLE_RESULTS)
+        # an empty chunk must not be mistaken for the end of the HTTP response
+        chunks = [chunk for data in BytesIterator(bytes_data, chunk_size=7) for chunk in (b'', data)]
+        parser = JsonStream(iter(chunks), stream_config=JsonStreamConfig(decode_rows=decode_rows))
+        parser.start_parsing()
+        rows: List[Any] = []
+        while True:
+            result = parser.get_result(0.01)
+            if result is None and not parser.token_stream_exhausted:
+                parser.continue_parsing()
+                continue
+            assert isinstance(result, ParsedResult)
+            if result.result_type != ParsedResultType.ROW:
+                break
+            rows.append(result.value if decode_rows else json.loads(result.value))
+
+        assert result.result_type == ParsedResultType.END
+        assert rows == json_object.pop('results')
+        assert json.loads(result.value) == json_object
+
+    @pytest.mark.parametrize('max_rows', [None, 1, 4, 10, 100])
+    def test_get_results_batched(self, test_env: SimpleEnvironment, max_rows: Optional[int]) -> None:
+        json_object, bytes_data = test_env.get_json_data(JsonDataType.MULTIPLE_RESULTS)
+        parser = JsonStream(BytesIterator(bytes_data), stream_config=JsonStreamConfig(row_batch_size=10))
+        parser.start_parsing()
+        rows: List[Any] = []
+        while True:
+            result = parser.get_results(0.01, max_rows=max_rows)
+            if result is None and not parser.token_stream_exhausted:
+                parser.continue_parsing()
+                continue
+            assert isinstance(result, ParsedResult)
+            if result.result_type != ParsedResultType.ROWS:
+                break
+            assert 0 < len(result.value) <= (max_rows or 10)
+            rows.extend(json.loads(row) for row in result.value)
+
+        assert result.result_type == ParsedResultType.END
+        assert rows == json_object.pop('results')
+        assert json.loads(result.value) == json_object
+
     def test_invalid_empty(self) -> None:
         data = ''
         parser = JsonStream(
@@ -394,6 +727,198 @@ class JsonParsingTestSuite:
         assert result.value.decode('utf-8') == data
         assert parser.get_result(0.01) is None
 
+    @pytest.mark.parametrize('buffered_result', [True, False])
+    @pytest.mark.parametrize(
+        'backend', [JsonParserBackend.YAJL2_C, JsonParserBackend.PYTHON, JsonParserBackend.SIMDJSON]
+    )
+    @pytest.mark.parametrize(
+        'json_type',
+        [
+            JsonDataType.SIMPLE_REQUEST,
+            JsonDataType.MULTIPLE_RESULTS,
+            JsonDataType.FAILED_REQUEST,
+            JsonDataType.FAILED_REQUEST_MID_STREAM,
+        ],
+    )
+    def test_parser_backend(
+        self,
+        test_env: SimpleEnvironment,
+        json_type: JsonDataType,
+        backend: JsonParserBackend,
+        buffered_result: bool,
+    ) -> None:
+        if not is_parser_backend_available(backend):
+            pytest.skip(f'JSON parser backend {backend.value} is not available.')
+        json_object, bytes_data = test_env.get_json_data(json_type)
+        stream_config = JsonStreamConfig(parser_backend=backend, buffer_entire_result=buffered_result)
+        parser = JsonStream(BytesIterator(bytes_data), stream_config=stream_config)
+        assert parser.parser_backend == backend
+        parser.start_parsing()
+        rows = []
+        while True:
+            result = parser.get_result(0.01)
+            if result is None and not parser.token_stream_exhausted:
+                parser.continue_parsing()
+                continue
+            assert isinstance(result, ParsedResult)
+            assert isinstance(result.value, bytes)
+            if result.result_type != ParsedResultType.ROW:
+                break
+            rows.append(json.loads(result.value))
+
+        expected_type = ParsedResultType.ERROR if 'errors' in json_object else ParsedResultType.END
+        assert result.result_type == expected_type
+        if buffered_result:
+            assert rows == []
+        else:
+            assert rows == json_object.pop('results', [])
+        assert json.loads(result.value) == json_object
+
+    @pytest.mark.parametrize(
+        'backend', [JsonParserBackend.YAJL2_C, JsonParserBackend.PYTHON, JsonParserBackend.SIMDJSON]
+    )
+    @pytest.mark.parametrize('data', ['', '{"results":[1,2', '{"results":[1]}garbage'])
+    def test_parser_backend_invalid(self, backend: JsonParserBackend, data: str) -> None:
+        if not is_parser_backend_available(backend):
+            pytest.skip(f'JSON parser backend {backend.value} is not available.')
+        stream_config = JsonStreamConfig(parser_backend=backend, buffer_entire_result=True)
+        parser = JsonStream(BytesIterator(bytes(data, 'utf-8')), stream_config=stream_config)
+        parser.start_parsing()
+        result = parser.get_result(0.01)
+        assert isinstance(result, ParsedResult)
+        assert result.result_type == ParsedResultType.ERROR
+
+    def test_parser_backend_resolution(self) -> None:
+        expected = JsonParserBackend.YAJL2_C
+        if not is_parser_backend_available(JsonParserBackend.YAJL2_C):
+            expected = JsonParserBackend.PYTHON
+        assert resolve_parser_backend(JsonParserBackend.AUTO) == expected
+        assert JsonStream(BytesIterator(b'{}')).parser_backend == expected
+
+        assert resolve_parser_backend(JsonParserBackend.PYTHON) == JsonParserBackend.PYTHON
+        if not is_parser_backend_available(JsonParserBackend.SIMDJSON):
+            with pytest.raises(ValueError):
+                JsonStream(
+                    BytesIterator(b'{}'), stream_config=JsonStreamConfig(parser_backend=JsonParserBackend.SIMDJSON)
+                )
+        with pytest.raises(ValueError):
+            resolve_parser_backend('yajl2_c')  # type: ignore[arg-type]
+
+    @pytest.mark.parametrize('decode_rows', [True, False])
+    def test_run_parsing(self, test_env: SimpleEnvironment, decode_rows: bool) -> None:
+        json_object, bytes_data = test_env.get_json_data(JsonDataType.MULTIPLE_RESULTS)
+        stream_config = JsonStreamConfig(buffered_row_max=4, row_batch_size=2, decode_rows=decode_rows)
+        parser = JsonStream(BytesIterator(bytes_data, chunk_size=7), stream_config=stream_config)
+        # a single, persistent producer that parks while the consumer catches up
+        producer = Thread(target=parser.run_parsing)
+        producer.start()
+        rows: List[Any] = []
+        while True:
+            result = parser.get_result(5)
+            assert isinstance(result, ParsedResult)
+            if result.result_type != ParsedResultType.ROW:
+                break
+            rows.append(result.value if decode_rows else json.loads(result.value))
+        producer.join(5)
+
+        assert producer.is_alive() is False
+        assert parser.token_stream_exhausted is True
+        assert result.result_type == ParsedResultType.END
+        assert rows == json_object.pop('results')
+        assert json.loads(result.value) == json_object
+
+    @pytest.mark.parametrize('buffered_result', [True, False])
+    @pytest.mark.parametrize('chunk_size', [1, 7, 100])
+    @pytest.mark.parametrize(
+        'json_type',
+        [
+            JsonDataType.SIMPLE_REQUEST,
+            JsonDataType.MULTIPLE_RESULTS,
+            JsonDataType.MULTIPLE_RESULTS_RAW,
+            JsonDataType.FAILED_REQUEST,
+            JsonDataType.FAILED_REQUEST_MID_STREAM,
+            JsonDataType.FAILED_REQUEST_MULTI_ERRORS,
+        ],
+    )
+    def test_split_raw_rows(
+        self, test_env: SimpleEnvironment, json_type: JsonDataType, chunk_size: int, buffered_result: bool
+    ) -> None:
+        json_object, bytes_data = test_env.get_json_data(json_type)
+        stream_config = JsonStreamConfig(split_raw_rows=True, buffer_entire_result=buffered_result)
+        parser = JsonStream(BytesIterator(bytes_data, chunk_size=chunk_size), stream_config=stream_config)
+        parser.start_parsing()
+        rows = []
+        while True:
+            result = parser.get_result(0.01)
+            if result is None and not parser.token_stream_exhausted:
+                parser.continue_parsing()
+                continue
+            assert isinstance(result, ParsedResult)
+            assert isinstance(result.value, bytes)
+            if result.result_type != ParsedResultType.ROW:
+                break
+            rows.append(json.loads(result.value))
+
+        expected_type = ParsedResultType.ERROR if 'errors' in json_object else ParsedResultType.END
+        assert result.result_type == expected_type
+        if buffered_result:
+            assert rows == []
+        else:
+            assert rows == json_object.pop('results', [])
+        assert json.loads(result.value) == json_object
+        assert parser.get_result(0.01) is None
+
+    @pytest.mark.parametrize(
+        'data',
+        [
+            '',
+            '   \n\t  ',
+            'garbage{"results":[1]}',
+            '{"results":[1]}garbage',
+            '{"results":[1,2',
+            '{"results":[1,,2]}',
+            '{"results":[1,]}',
+            '{"results":[{"a":1]]}',
+        ],
+    )
+    def test_split_raw_rows_invalid(self, data: str) -> None:
+        parser = JsonStream(BytesIterator(bytes(data, 'utf-8')), stream_config=JsonStreamConfig(split_raw_rows=True))
+        parser.start_parsing()
+        result = None
+        while result is None or result.result_type == ParsedResultType.ROW:
+            result = parser.get_result(0.01)
+            if result is None and not parser.token_stream_exhausted:
+                parser.continue_parsing()
+        assert result.result_type == ParsedResultType.ERROR
+        assert result.value is not None
+        assert 'JsonTokenParsingError' in result.value.decode('utf-8')
+
+    def test_split_raw_rows_preserves_bytes(self) -> None:
+        rows = [
+            '{ "id" : 1.10, "name" : "Alice" }',
+            '"a \\"quoted\\" value, with [brackets]"',
+            '1E+2',
+            '{"nested":{"results":[1,2]},"unicode":"\\u00e9 你好"}',
+            '[ ]',
+        ]
+        data = f'{{"requestID": "1", "results": [ {" , ".join(rows)} ], "status": "success"}}'
+        parser = JsonStream(
+            BytesIterator(bytes(data, 'utf-8'), chunk_size=5), stream_config=JsonStreamConfig(split_raw_rows=True)
+        )
+        parser.start_parsing()
+        for row in rows:
+            result = parser.get_result(0.01)
+            assert isinstance(result, ParsedResult)
+            assert result.result_type == ParsedResultType.ROW
+            # rows are the exact bytes sent by the server
+            assert result.value == bytes(row, 'utf-8')
+
+        final_result = parser.get_result(0.01)
+        assert isinstance(final_result, ParsedResult)
+        assert final_result.result_type == ParsedResultType.END
+        assert isinstance(final_result.value, bytes)
+        assert json.loads(final_result.value) == {'requestID': '1', 'status': 'success'}
+
     def test_value_bool(self) -> None:
         data = 'true'
         parser = JsonStream(
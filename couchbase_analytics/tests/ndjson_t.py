@@ -0,0 +1,133 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import threading
+from decimal import Decimal
+from typing import Any, List
+
+import pytest
+
+from couchbase_analytics.common._core.ndjson import (
+    encode_ndjson_line,
+    encode_ndjson_metadata,
+    encode_ndjson_rows,
+    write_async,
+)
+from couchbase_analytics.query import LazyRow, Record, RowSchema
+
+
+class NdjsonTestSuite:
+    TEST_MANIFEST = [
+        'test_encode_decoded_rows',
+        'test_encode_metadata',
+        'test_encode_multiline_raw_row',
+        'test_encode_raw_rows',
+        'test_encode_unserializable_row',
+        'test_write_async',
+    ]
+
+    def test_encode_decoded_rows(self) -> None:
+        rows: List[Any] = [
+            {'a': 1, 'b': [1, 2]},
+            Record(RowSchema(['a', 'b']), (2, 'x')),
+            LazyRow(b'{"a": 3}'),
+            {'a': Decimal('4.5')},
+            'str',
+            None,
+        ]
+        lines = encode_ndjson_rows(rows).split(b'\n')
+        assert lines[-1] == b''
+        assert lines[:-1] == [b'{"a":1,"b":[1,2]}', b'{"a":2,"b":"x"}', b'{"a": 3}', b'{"a":4.5}', b'"str"', b'null']
+
+    def test_encode_metadata(self) -> None:
+        raw_metadata = b'{\n  "requestID": "abc",\n  "status": "success"\n}'
+        line = encode_ndjson_metadata(raw_metadata)
+        assert line.endswith(b'\n') and line.count(b'\n') == 1
+        assert json.loads(line) == json.loads(raw_metadata)
+
+    def test_encode_multiline_raw_row(self) -> None:
+        # newlines w/in a string are escaped, so only the whitespace newlines need to be removed
+        raw = b'{\r\n  "a": "line1\\nline2",\n  "b": 1\n}'
+        line = encode_ndjson_line(raw)
+        assert b'\n' not in line and b'\r' not in line
+        assert json.loads(bytes(line)) == {'a': 'line1\nline2', 'b': 1}
+
+    def test_encode_raw_rows(self) -> None:
+        buf = b'[{"a":1},{"a":2}]'
+        rows: List[Any] = [memoryview(buf)[1:8], b'{"a":2}', bytearray(b'{"a":3}')]
+        # raw rows are written as received
+        assert encode_ndjson_line(rows[0]) is rows[0]
+        assert encode_ndjson_line(rows[1]) is rows[1]
+        assert encode_ndjson_rows(rows) == b'{"a":1}\n{"a":2}\n{"a":3}\n'
+        assert encode_ndjson_rows(rows[:2]) == b'{"a":1}\n{"a":2}\n'
+        # a multi-line row within a batch of raw rows
+        assert encode_ndjson_rows([b'{"a":1}', b'{\n"a":2\n}']) == b'{"a":1}\n{ "a":2 }\n'
+        assert encode_ndjson_rows([]) == b''
+
+    def test_encode_unserializable_row(self) -> None:
+        with pytest.raises(TypeError):
+            encode_ndjson_rows([object()])
+
+    def test_write_async(self) -> None:
+        class AsyncWriter:
+            def __init__(self) -> None:
+                self.data = b''
+                self.drained = 0
+
+            async def write(self, data: bytes) -> None:
+                self.data += data
+
+            async def drain(self) -> None:
+                self.drained += 1
+
+        class BlockingSink(io.BytesIO):
+            def __init__(self) -> None:
+                super().__init__()
+                self.thread_ids: List[int] = []
+
+            def write(self, data: Any) -> int:
+                self.thread_ids.append(threading.get_ident())
+                return super().write(data)
+
+        async def run() -> None:
+            writer = AsyncWriter()
+            sink = BlockingSink()
+            await write_async(writer, b'a\n')
+            await write_async(sink, b'b\n')
+            assert writer.data == b'a\n' and writer.drained == 1
+            assert sink.getvalue() == b'b\n'
+            # a blocking write is not run on the event loop's thread
+            assert sink.thread_ids and threading.get_ident() not in sink.thread_ids
+
+        asyncio.run(run())
+
+
+class NdjsonTests(NdjsonTestSuite):
+    @pytest.fixture(scope='class', autouse=True)
+    def validate_test_manifest(self) -> None:
+        def valid_test_method(meth: str) -> bool:
+            attr = getattr(NdjsonTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+
+        method_list = [meth for meth in dir(NdjsonTests) if valid_test_method(meth)]
+        test_list = set(NdjsonTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest invalid.  Missing/extra tests: {test_list}.')
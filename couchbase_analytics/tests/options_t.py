@@ -17,7 +17,8 @@
 from __future__ import annotations
 
 from datetime import timedelta
-from typing import Dict, Optional, Type
+from importlib.util import find_spec
+from typing import Dict, Optional, Type, Union
 
 import pytest
 
@@ -25,6 +26,7 @@ from couchbase_analytics.credential import Credential
 from couchbase_analytics.deserializer import DefaultJsonDeserializer, Deserializer, PassthroughDeserializer
 from couchbase_analytics.options import (
     ClusterOptions,
+    HttpCompression,
     SecurityOptions,
     SecurityOptionsKwargs,
     TimeoutOptions,
@@ -40,6 +42,9 @@ TEST_CERT_STR = get_test_cert_str()
 
 class ClusterOptionsTestSuite:
     TEST_MANIFEST = [
+        'test_options_compression',
+        'test_options_compression_kwargs',
+        'test_options_compression_unavailable',
         'test_options_deserializer',
         'test_options_deserializer_kwargs',
         'test_options_max_retries',
@@ -55,6 +60,42 @@ class ClusterOptionsTestSuite:
         'test_timeout_options_must_be_positive_kwargs',
     ]
 
+    @pytest.mark.parametrize(
+        'compression, expected_headers',
+        [
+            (None, None),
+            (HttpCompression.GZIP, {'Accept-Encoding': 'gzip'}),
+            (HttpCompression.NONE, {'Accept-Encoding': 'identity'}),
+        ],
+    )
+    def test_options_compression(
+        self, compression: Optional[HttpCompression], expected_headers: Optional[Dict[str, str]]
+    ) -> None:
+        cred = Credential.from_username_and_password('Administrator', 'password')
+        client = _ClientAdapter('https://localhost', cred, ClusterOptions(compression=compression))
+        assert client.connection_details.cluster_options.get('compression') == (
+            compression.value if compression is not None else None
+        )
+        assert client.connection_details.get_http_headers() == expected_headers
+
+    @pytest.mark.parametrize('compression', [HttpCompression.AUTO, 'auto'])
+    def test_options_compression_kwargs(self, compression: Union[HttpCompression, str]) -> None:
+        cred = Credential.from_username_and_password('Administrator', 'password')
+        client = _ClientAdapter('https://localhost', cred, **{'compression': compression})
+        expected = ['gzip']
+        if find_spec('brotli') is not None or find_spec('brotlicffi') is not None:
+            expected.insert(0, 'br')
+        if find_spec('zstandard') is not None:
+            expected.insert(0, 'zstd')
+        assert client.connection_details.get_http_headers() == {'Accept-Encoding': ', '.join(expected)}
+
+    def test_options_compression_unavailable(self) -> None:
+        if find_spec('zstandard') is not None:
+            pytest.skip('zstandard is installed, zstd compression is available.')
+        cred = Credential.from_username_and_password('Administrator', 'password')
+        with pytest.raises(ValueError):
+            _ClientAdapter('https://localhost', cred, ClusterOptions(compression=HttpCompression.ZSTD))
+
     @pytest.mark.parametrize('deserializer_cls', [DefaultJsonDeserializer, PassthroughDeserializer])
     def test_options_deserializer(self, deserializer_cls: Type[Deserializer]) -> None:
         cred = Credential.from_username_and_password('Administrator', 'password')
@@ -16,6 +16,7 @@
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 from datetime import timedelta
 from typing import Any, Dict, List, Optional, Union
@@ -47,6 +48,7 @@ class QueryOptionsTestSuite:
     TEST_MANIFEST = [
         'test_options_deserializer',
         'test_options_deserializer_kwargs',
+        'test_options_deserializer_unavailable',
         'test_options_max_retries',
         'test_options_max_retries_kwargs',
         'test_options_named_parameters',
@@ -57,6 +59,8 @@ class QueryOptionsTestSuite:
         'test_options_raw_kwargs',
         'test_options_readonly',
         'test_options_readonly_kwargs',
+        'test_options_row_format',
+        'test_options_row_format_kwargs',
         'test_options_scan_consistency',
         'test_options_scan_consistency_kwargs',
         'test_options_timeout',
@@ -95,6 +99,19 @@ class QueryOptionsTestSuite:
         assert req.deserializer == deserializer
         query_ctx.validate_query_context(req.body)
 
+    @pytest.mark.parametrize(
+        'module_name, deserializer_name', [('orjson', 'OrjsonDeserializer'), ('msgspec', 'MsgspecDeserializer')]
+    )
+    def test_options_deserializer_unavailable(
+        self, monkeypatch: pytest.MonkeyPatch, module_name: str, deserializer_name: str
+    ) -> None:
+        from couchbase_analytics import deserializer
+
+        # a None entry in sys.modules makes the import raise ImportError
+        monkeypatch.setitem(sys.modules, module_name, None)
+        with pytest.raises(ImportError):
+            getattr(deserializer, deserializer_name)()
+
     @pytest.mark.parametrize('max_retries', [5, 10, None])
     def test_options_max_retries(
         self, query_statment: str, request_builder: _RequestBuilder, query_ctx: QueryContext, max_retries: Optional[int]
@@ -201,6 +218,32 @@ class QueryOptionsTestSuite:
         assert req.options == exp_opts
         query_ctx.validate_query_context(req.body)
 
+    def test_options_row_format(
+        self, query_statment: str, request_builder: _RequestBuilder, query_ctx: QueryContext
+    ) -> None:
+        from couchbase_analytics.query import RowFormat
+
+        q_opts = QueryOptions(row_format=RowFormat.RECORD)
+        req = request_builder.build_base_query_request(query_statment, q_opts)
+        exp_opts: QueryOptionsTransformedKwargs = {'row_format': RowFormat.RECORD.value}
+        assert req.options == exp_opts
+        assert 'row_format' not in req.body
+        query_ctx.validate_query_context(req.body)
+
+        with pytest.raises(ValueError):
+            request_builder.build_base_query_request(query_statment, QueryOptions(row_format='namedtuple'))
+
+    def test_options_row_format_kwargs(
+        self, query_statment: str, request_builder: _RequestBuilder, query_ctx: QueryContext
+    ) -> None:
+        from couchbase_analytics.query import RowFormat
+
+        kwargs: QueryOptionsKwargs = {'row_format': RowFormat.TUPLE}
+        req = request_builder.build_base_query_request(query_statment, **kwargs)
+        exp_opts: QueryOptionsTransformedKwargs = {'row_format': RowFormat.TUPLE.value}
+        assert req.options == exp_opts
+        query_ctx.validate_query_context(req.body)
+
     def test_options_scan_consistency(
         self, query_statment: str, request_builder: _RequestBuilder, query_ctx: QueryContext
     ) -> None:
@@ -0,0 +1,126 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+from threading import Thread, Timer
+from time import monotonic
+from typing import List
+
+import pytest
+
+from couchbase_analytics.protocol._core.ring_buffer import SpscRingBuffer
+
+
+class RingBufferTestSuite:
+    TEST_MANIFEST = [
+        'test_fifo_order_with_wraparound',
+        'test_get_empty_timeout',
+        'test_invalid_capacity',
+        'test_put_full_timeout',
+        'test_threaded_handoff',
+        'test_wake_consumer',
+        'test_wake_consumer_not_waiting',
+    ]
+
+    def test_fifo_order_with_wraparound(self) -> None:
+        buffer: SpscRingBuffer[int] = SpscRingBuffer(3)
+        received: List[int] = []
+        for i in range(10):
+            assert buffer.put(i, timeout=0) is True
+            if i % 2 == 1:
+                while not buffer.empty():
+                    item = buffer.get(timeout=0)
+                    assert item is not None
+                    received.append(item)
+        assert received == list(range(10))
+        assert len(buffer) == 0
+
+    def test_get_empty_timeout(self) -> None:
+        buffer: SpscRingBuffer[int] = SpscRingBuffer(2)
+        assert buffer.get(timeout=0.01) is None
+        buffer.put(1)
+        assert buffer.get(timeout=0.01) == 1
+        assert buffer.get(timeout=0.01) is None
+
+    @pytest.mark.parametrize('capacity', [0, -1])
+    def test_invalid_capacity(self, capacity: int) -> None:
+        with pytest.raises(ValueError):
+            SpscRingBuffer(capacity)
+
+    def test_put_full_timeout(self) -> None:
+        buffer: SpscRingBuffer[int] = SpscRingBuffer(2)
+        assert buffer.put(1, timeout=0.01) is True
+        assert buffer.put(2, timeout=0.01) is True
+        assert buffer.full() is True
+        assert buffer.put(3, timeout=0.01) is False
+        assert buffer.get() == 1
+        assert buffer.put(3, timeout=0.01) is True
+        assert [buffer.get(), buffer.get()] == [2, 3]
+
+    @pytest.mark.parametrize('capacity', [1, 4, 64])
+    def test_threaded_handoff(self, capacity: int) -> None:
+        buffer: SpscRingBuffer[int] = SpscRingBuffer(capacity)
+        item_count = 10000
+
+        def produce() -> None:
+            for i in range(item_count):
+                while not buffer.put(i, timeout=1):
+                    pass
+
+        producer = Thread(target=produce)
+        producer.start()
+        received: List[int] = []
+        while len(received) < item_count:
+            item = buffer.get(timeout=1)
+            if item is not None:
+                received.append(item)
+        producer.join()
+        assert received == list(range(item_count))
+        assert buffer.empty() is True
+
+    def test_wake_consumer(self) -> None:
+        buffer: SpscRingBuffer[int] = SpscRingBuffer(2)
+        waker = Timer(0.05, buffer.wake_consumer)
+        start = monotonic()
+        waker.start()
+        assert buffer.get(timeout=10) is None
+        assert monotonic() - start < 5
+        waker.join()
+        # the wake request is consumed, items are still handed off as normal
+        buffer.put(1)
+        assert buffer.get(timeout=0.01) == 1
+
+    def test_wake_consumer_not_waiting(self) -> None:
+        buffer: SpscRingBuffer[int] = SpscRingBuffer(2)
+        # a wake request made prior to the consumer waiting is not lost
+        buffer.wake_consumer()
+        start = monotonic()
+        assert buffer.get(timeout=10) is None
+        assert monotonic() - start < 5
+        assert buffer.get(timeout=0.01) is None
+
+
+class RingBufferTests(RingBufferTestSuite):
+    @pytest.fixture(scope='class', autouse=True)
+    def validate_test_manifest(self) -> None:
+        def valid_test_method(meth: str) -> bool:
+            attr = getattr(RingBufferTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+
+        method_list = [meth for meth in dir(RingBufferTests) if valid_test_method(meth)]
+        test_list = set(RingBufferTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest invalid.  Missing/extra tests: {test_list}.')
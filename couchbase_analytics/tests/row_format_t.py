@@ -0,0 +1,204 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+import json
+import pickle
+from typing import Any, Dict, List
+
+import pytest
+
+from couchbase_analytics.common._core.row_formatter import RowFormatter
+from couchbase_analytics.common.row import MAX_LAZY_INDEXED_FIELDS
+from couchbase_analytics.deserializer import LazyRowDeserializer
+from couchbase_analytics.query import LazyRow, Record, RowFormat, RowSchema
+
+
+class RowFormatTestSuite:
+    TEST_MANIFEST = [
+        'test_dict_rows_share_field_names',
+        'test_lazy_row',
+        'test_lazy_row_deserializer',
+        'test_lazy_row_duplicate_fields',
+        'test_lazy_row_invalid',
+        'test_lazy_row_wide',
+        'test_non_object_rows',
+        'test_record',
+        'test_record_rows_share_schema',
+        'test_row_schema',
+        'test_tuple_rows',
+        'test_tuple_rows_unknown_field',
+    ]
+
+    def test_dict_rows_share_field_names(self) -> None:
+        formatter = RowFormatter(RowFormat.DICT)
+        # build the field names at runtime so that each row has its own copy
+        batches = [[{''.join(['na', 'me']): f'n{i}', ''.join(['ci', 'ty']): f'c{i}'}] for i in range(3)]
+        rows = [row for batch in batches for row in formatter.format_rows(batch)]
+        assert rows == [{'name': f'n{i}', 'city': f'c{i}'} for i in range(3)]
+        for row in rows[1:]:
+            assert all(key is first_key for key, first_key in zip(row, rows[0]))
+        assert formatter.schema is None
+
+    def test_lazy_row(self) -> None:
+        row: Dict[str, Any] = {
+            'a': 1,
+            'b': 'x\\"y',
+            'c': {'d': [1, {'e': '}]"'}], 'f': None},
+            'g': [1, 2, [3]],
+            'h': -1.5e3,
+            'i': True,
+            'j\u00e9\n': '\u00fc',
+            'k': '',
+        }
+        for raw in [json.dumps(row).encode('utf-8'), json.dumps(row, indent=2, ensure_ascii=False).encode('utf-8')]:
+            lazy_row = LazyRow(raw)
+            assert lazy_row.raw is raw
+            assert lazy_row['g'] == [1, 2, [3]]
+            assert lazy_row['a'] == 1
+            assert lazy_row['j\u00e9\n'] == '\u00fc'
+            assert lazy_row.get('missing') is None
+            assert 'c' in lazy_row and 'missing' not in lazy_row
+            assert lazy_row == row
+            assert lazy_row.to_dict() == row
+            assert list(lazy_row) == list(row)
+            assert len(lazy_row) == len(row)
+            assert pickle.loads(pickle.dumps(lazy_row)) == row
+            with pytest.raises(KeyError):
+                lazy_row['missing']
+
+        empty_row = LazyRow(b' { } ')
+        assert empty_row.get('a') is None
+        assert empty_row.to_dict() == {}
+
+    def test_lazy_row_deserializer(self) -> None:
+        deserializer = LazyRowDeserializer()
+        values: List[Any] = [b'{"a":1}', memoryview(b'xx {"b":2}')[3:], b'1', b'"str"', b'[1,2]', b'null']
+        rows = deserializer.deserialize_many(values)
+        assert isinstance(rows[0], LazyRow) and rows[0] == {'a': 1}
+        assert isinstance(rows[1], LazyRow) and type(rows[1].raw) is bytes and rows[1] == {'b': 2}
+        assert rows[2:] == [1, 'str', [1, 2], None]
+
+    @pytest.mark.parametrize(
+        'raw',
+        [
+            b'{"a":1,"a":2}',
+            b'{"a":{"x":1},"b":0,"a":[2]}',
+            b'{"a":1,"b":{"a":0},"a":2}',
+            b'{"a":1,"\\u0061":2}',
+            b'{"a\\/b":1,"a/b":2}',
+        ],
+    )
+    def test_lazy_row_duplicate_fields(self, raw: bytes) -> None:
+        expected = json.loads(raw)
+        # json.loads keeps the last value of a duplicated field, each access must match regardless of the access order
+        for fields in [list(expected), list(reversed(expected)), ['b', *expected]]:
+            lazy_row = LazyRow(raw)
+            for field in fields:
+                assert lazy_row.get(field) == expected.get(field)
+            assert lazy_row.to_dict() == expected
+            assert dict(lazy_row) == expected
+
+    @pytest.mark.parametrize(
+        'raw',
+        [b'[1]', b'{"a":', b'{"a" 1}', b'{"a":1 "b":2}', b'{"a":"x', b'{"a":[1,2}', b'{"a":tru}', b'{a:1}'],
+    )
+    def test_lazy_row_invalid(self, raw: bytes) -> None:
+        # rows are only validated when accessed
+        lazy_row = LazyRow(raw)
+        with pytest.raises(ValueError):
+            lazy_row['a']
+
+    def test_lazy_row_wide(self) -> None:
+        row = {f'field{i}': {'nested': [i, str(i)]} if i % 2 else i for i in range(MAX_LAZY_INDEXED_FIELDS * 3)}
+        lazy_row = LazyRow(json.dumps(row).encode('utf-8'))
+        assert lazy_row['field1'] == {'nested': [1, '1']}
+        # fields past the indexed fields decode the entire row
+        assert lazy_row[f'field{MAX_LAZY_INDEXED_FIELDS * 2}'] == MAX_LAZY_INDEXED_FIELDS * 2
+        assert lazy_row['field1'] == {'nested': [1, '1']}
+        assert lazy_row == row
+
+    @pytest.mark.parametrize('row_format', [RowFormat.DICT, RowFormat.TUPLE, RowFormat.RECORD])
+    def test_non_object_rows(self, row_format: RowFormat) -> None:
+        rows: List[Any] = [1, 'str', None, [1, 2], b'{"a":1}']
+        assert RowFormatter(row_format).format_rows(rows) == rows
+
+    def test_record(self) -> None:
+        record = Record(RowSchema(['a', 'b']), (1, {'c': 2}))
+        assert record == {'a': 1, 'b': {'c': 2}}
+        assert record['b'] == {'c': 2}
+        assert record.get('c') is None
+        assert 'a' in record and 'c' not in record
+        assert list(record.items()) == [('a', 1), ('b', {'c': 2})]
+        assert record.as_dict() == {'a': 1, 'b': {'c': 2}}
+        assert record.as_tuple() == (1, {'c': 2})
+        assert len(record) == 2
+        assert pickle.loads(pickle.dumps(record)) == record
+        assert not hasattr(record, '__dict__')
+        with pytest.raises(KeyError):
+            record['c']
+        with pytest.raises(ValueError):
+            Record(RowSchema(['a', 'b']), (1,))
+
+    def test_record_rows_share_schema(self) -> None:
+        formatter = RowFormatter(RowFormat.RECORD)
+        rows = formatter.format_rows([{'a': 1, 'b': 2}, {'b': 3, 'a': 4}, {'a': 5, 'b': 6}, {'a': 7}])
+        assert rows == [{'a': 1, 'b': 2}, {'b': 3, 'a': 4}, {'a': 5, 'b': 6}, {'a': 7}]
+        assert all(isinstance(row, Record) for row in rows)
+        assert rows[0].schema is rows[2].schema
+        assert rows[1].schema.fields == ('b', 'a')
+        assert rows[3].schema.fields == ('a',)
+
+    def test_row_schema(self) -> None:
+        schema = RowSchema(['a', 'b'])
+        assert schema.fields == ('a', 'b')
+        assert schema.index('b') == 1
+        assert 'a' in schema and 'c' not in schema
+        assert list(schema) == ['a', 'b']
+        assert schema == RowSchema(('a', 'b'))
+        assert schema != RowSchema(('b', 'a'))
+        with pytest.raises(KeyError):
+            schema.index('c')
+        with pytest.raises(ValueError):
+            RowSchema(['a', 'a'])
+
+    def test_tuple_rows(self) -> None:
+        formatter = RowFormatter(RowFormat.TUPLE)
+        assert formatter.schema is None
+        rows = formatter.format_rows([{'a': 1, 'b': 2}, {'b': 3, 'a': 4}])
+        rows.extend(formatter.format_rows([{'a': 5}, {}]))
+        assert rows == [(1, 2), (4, 3), (5, None), (None, None)]
+        assert formatter.schema == RowSchema(['a', 'b'])
+
+    def test_tuple_rows_unknown_field(self) -> None:
+        formatter = RowFormatter(RowFormat.TUPLE)
+        formatter.format_rows([{'a': 1}])
+        with pytest.raises(ValueError):
+            formatter.format_rows([{'a': 1, 'b': 2}])
+
+
+class RowFormatTests(RowFormatTestSuite):
+    @pytest.fixture(scope='class', autouse=True)
+    def validate_test_manifest(self) -> None:
+        def valid_test_method(meth: str) -> bool:
+            attr = getattr(RowFormatTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+
+        method_list = [meth for meth in dir(RowFormatTests) if valid_test_method(meth)]
+        test_list = set(RowFormatTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest invalid.  Missing/extra tests: {test_list}.')
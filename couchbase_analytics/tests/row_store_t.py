@@ -0,0 +1,201 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import pickle
+from typing import Any, Dict, List
+
+import pytest
+
+from couchbase_analytics.common._core.row_formatter import RowFormatter
+from couchbase_analytics.common._core.row_store import RowDecoder
+from couchbase_analytics.common._core.row_store_builder import RowStoreBuilder, estimate_row_size
+from couchbase_analytics.deserializer import DefaultJsonDeserializer
+from couchbase_analytics.query import Record, RowFormat, RowSchema, RowStore
+
+
+def _raw_rows(start: int, stop: int) -> List[bytes]:
+    return [json.dumps({'id': i, 'name': f'name{i}'}).encode('utf-8') for i in range(start, stop)]
+
+
+def _build(rows: List[Any], memory_limit: int, tmp_path: pathlib.Path, **kwargs: Any) -> RowStore:
+    row_format = kwargs.pop('row_format', None)
+    decoder = RowDecoder(DefaultJsonDeserializer(), RowFormatter(row_format) if row_format is not None else None)
+    builder = RowStoreBuilder(decoder, memory_limit, directory=str(tmp_path))
+    for idx in range(0, len(rows), 7):
+        builder.add_rows(rows[idx : idx + 7], **kwargs)
+    return builder.build()
+
+
+class RowStoreTestSuite:
+    TEST_MANIFEST = [
+        'test_row_store_builder_close',
+        'test_row_store_buffered_rows',
+        'test_row_store_close',
+        'test_row_store_decoded_rows',
+        'test_row_store_in_memory',
+        'test_row_store_invalid_memory_limit',
+        'test_row_store_memory_limit',
+        'test_row_store_multiline_rows',
+        'test_row_store_pickle',
+        'test_row_store_row_format',
+        'test_row_store_spilled',
+    ]
+
+    def test_row_store_builder_close(self, tmp_path: pathlib.Path) -> None:
+        builder = RowStoreBuilder(RowDecoder(DefaultJsonDeserializer()), 0, directory=str(tmp_path))
+        builder.add_rows(_raw_rows(0, 10))
+        assert len(os.listdir(tmp_path)) == 1
+        builder.close()
+        assert os.listdir(tmp_path) == []
+
+    def test_row_store_buffered_rows(self, tmp_path: pathlib.Path) -> None:
+        # rows of a response that was read at once are already in memory, so they are never spilled
+        store = _build(_raw_rows(0, 50), 0, tmp_path, buffered=True, row_format=RowFormat.TUPLE)
+        assert store.spilled_row_count == 0
+        assert store.path is None
+        assert list(store) == [(i, f'name{i}') for i in range(50)]
+
+    def test_row_store_close(self, tmp_path: pathlib.Path) -> None:
+        with _build(_raw_rows(0, 50), 2**11, tmp_path) as store:
+            path = store.path
+            assert path is not None and os.path.exists(path)
+            assert store[-1] == {'id': 49, 'name': 'name49'}
+        assert not os.path.exists(path)
+        # rows kept in memory remain available
+        assert store[0] == {'id': 0, 'name': 'name0'}
+        with pytest.raises(ValueError):
+            store[-1]
+        store.close()
+
+    def test_row_store_decoded_rows(self, tmp_path: pathlib.Path) -> None:
+        # rows decoded by the JSON stream are re-encoded when spilled
+        rows: List[Dict[str, Any]] = [{'id': i, 'name': f'name{i}', 'tags': [i, None]} for i in range(50)]
+        with _build(rows, 2**11, tmp_path) as store:
+            assert 0 < store.spilled_row_count < 50
+            assert list(store) == rows
+            assert store[10:40] == rows[10:40]
+
+    def test_row_store_in_memory(self, tmp_path: pathlib.Path) -> None:
+        with _build(_raw_rows(0, 50), 2**20, tmp_path) as store:
+            assert len(store) == 50
+            assert store.spilled_row_count == 0
+            assert store.path is None
+            assert [row['id'] for row in store] == list(range(50))
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.parametrize('memory_limit', [-1, 1.5, True, None])
+    def test_row_store_invalid_memory_limit(self, memory_limit: Any) -> None:
+        with pytest.raises(ValueError):
+            RowStoreBuilder(RowDecoder(DefaultJsonDeserializer()), memory_limit)
+
+    def test_row_store_memory_limit(self, tmp_path: pathlib.Path) -> None:
+        rows = _raw_rows(0, 50)
+        # the memory limit applies to the (estimated) size of the deserialized rows, not to the size of the raw JSON
+        memory_limit = sum(len(row) for row in rows)
+        with _build(rows, memory_limit, tmp_path) as store:
+            memory_row_count = len(store) - store.spilled_row_count
+            assert 0 < memory_row_count < 50
+            assert sum(estimate_row_size(row) for row in store[:memory_row_count]) <= memory_limit
+            assert [row['id'] for row in store] == list(range(50))
+
+    def test_row_store_multiline_rows(self, tmp_path: pathlib.Path) -> None:
+        rows = [json.dumps({'id': i, 'text': f'a\nb{i}'}, indent=2).encode('utf-8') for i in range(20)]
+        with _build(rows, 0, tmp_path) as store:
+            assert store.spilled_row_count == 20
+            assert [row['id'] for row in store] == list(range(20))
+            assert store[3]['text'] == 'a\nb3'
+            assert store.path is not None
+            # the spilled rows are newline delimited JSON
+            lines = pathlib.Path(store.path).read_bytes().splitlines()
+            assert [json.loads(line) for line in lines] == list(store)
+
+    def test_row_store_pickle(self, tmp_path: pathlib.Path) -> None:
+        store = _build(_raw_rows(0, 50), 100, tmp_path, row_format=RowFormat.RECORD)
+        copy = pickle.loads(pickle.dumps(store))
+        assert isinstance(copy, RowStore)
+        assert copy.path == store.path
+        assert list(copy) == list(store)
+        assert isinstance(copy[-1], Record)
+        # only the row store that spilled the rows removes the file
+        copy.close()
+        assert store.path is not None and os.path.exists(store.path)
+        assert store[-1]['id'] == 49
+        store.close()
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.parametrize('row_format', [RowFormat.TUPLE, RowFormat.RECORD])
+    def test_row_store_row_format(self, tmp_path: pathlib.Path, row_format: RowFormat) -> None:
+        with _build(_raw_rows(0, 50), 2**11, tmp_path, row_format=row_format) as store:
+            assert 0 < store.spilled_row_count < 50
+            rows = list(store)
+            if row_format == RowFormat.TUPLE:
+                assert rows == [(i, f'name{i}') for i in range(50)]
+            else:
+                assert all(isinstance(row, Record) and row.schema == RowSchema(('id', 'name')) for row in rows)
+                assert [row['id'] for row in rows] == list(range(50))
+
+        # formatted tuple rows (e.g. rows that have already been iterated) are re-encoded as objects when spilled
+        formatter = RowFormatter(RowFormat.TUPLE)
+        decoder = RowDecoder(DefaultJsonDeserializer(), formatter)
+        tuple_rows = decoder.decode(list(_raw_rows(0, 20)))
+        builder = RowStoreBuilder(decoder, 0, directory=str(tmp_path))
+        builder.add_rows(tuple_rows)
+        with builder.build() as store:
+            assert store.spilled_row_count == 20
+            assert list(store) == tuple_rows
+
+    def test_row_store_spilled(self, tmp_path: pathlib.Path) -> None:
+        expected = [{'id': i, 'name': f'name{i}'} for i in range(100)]
+        with _build(_raw_rows(0, 100), 2**11, tmp_path) as store:
+            assert len(store) == 100
+            memory_row_count = len(store) - store.spilled_row_count
+            assert 0 < memory_row_count < 100
+            assert store.path is not None and pathlib.Path(store.path).parent == tmp_path
+            # re-iterable
+            assert list(store) == expected
+            assert list(store) == expected
+            assert store[0] == expected[0]
+            assert store[99] == store[-1] == expected[99]
+            assert store[memory_row_count] == expected[memory_row_count]
+            assert store[5:60] == expected[5:60]
+            assert store[::-3] == expected[::-3]
+            assert store[200:] == []
+            with pytest.raises(IndexError):
+                store[100]
+            with pytest.raises(IndexError):
+                store[-101]
+            assert store.index(expected[70]) == 70
+            assert expected[42] in store
+            assert repr(store) == f'RowStore(row_count=100, spilled_row_count={store.spilled_row_count})'
+        assert os.listdir(tmp_path) == []
+
+
+class RowStoreTests(RowStoreTestSuite):
+    @pytest.fixture(scope='class', autouse=True)
+    def validate_test_manifest(self) -> None:
+        def valid_test_method(meth: str) -> bool:
+            attr = getattr(RowStoreTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+
+        method_list = [meth for meth in dir(RowStoreTests) if valid_test_method(meth)]
+        test_list = set(RowStoreTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest invalid.  Missing/extra tests: {test_list}.')
@@ -0,0 +1,93 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""
+Microbenchmark of the available deserializers, decoding rows one at a time and in batches (deserialize_many).
+
+Usage:
+    python -m tests.benchmarks.deserializers [--rows N] [--batch-size N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import dataclass
+from importlib.util import find_spec
+from time import perf_counter
+from typing import List, Tuple
+
+from couchbase_analytics.deserializer import (
+    DefaultJsonDeserializer,
+    Deserializer,
+    MsgspecDeserializer,
+    OrjsonDeserializer,
+)
+
+
+@dataclass
+class Row:
+    id: int
+    name: str
+    city: str
+    score: float
+    tags: List[str]
+    active: bool
+
+
+def _build_rows(rows: int) -> List[bytes]:
+    return [
+        json.dumps(
+            {'id': i, 'name': f'name-{i}', 'city': 'Santa Clara', 'score': i * 1.5, 'tags': ['a', 'b'], 'active': True}
+        ).encode('utf-8')
+        for i in range(rows)
+    ]
+
+
+def bench_deserialize(deserializer: Deserializer, rows: List[bytes]) -> float:
+    start = perf_counter()
+    for row in rows:
+        deserializer.deserialize(row)
+    return len(rows) / (perf_counter() - start)
+
+
+def bench_deserialize_many(deserializer: Deserializer, rows: List[bytes], batch_size: int) -> float:
+    start = perf_counter()
+    for idx in range(0, len(rows), batch_size):
+        deserializer.deserialize_many(rows[idx : idx + batch_size])
+    return len(rows) / (perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--batch-size', type=int, default=50)
+    args = parser.parse_args()
+
+    rows = _build_rows(args.rows)
+    deserializers: List[Tuple[str, Deserializer]] = [('DefaultJsonDeserializer', DefaultJsonDeserializer())]
+    if find_spec('orjson') is not None:
+        deserializers.append(('OrjsonDeserializer', OrjsonDeserializer()))
+    if find_spec('msgspec') is not None:
+        deserializers.append(('MsgspecDeserializer', MsgspecDeserializer()))
+        deserializers.append(('MsgspecDeserializer(Row)', MsgspecDeserializer(row_type=Row)))
+
+    for name, deserializer in deserializers:
+        print(f'{name:>26} (per row): {bench_deserialize(deserializer, rows):>12,.0f} rows/sec')
+        many = bench_deserialize_many(deserializer, rows, args.batch_size)
+        print(f'{name:>26} (batched): {many:>12,.0f} rows/sec')
+
+
+if __name__ == '__main__':
+    main()
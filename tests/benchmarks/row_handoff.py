@@ -0,0 +1,107 @@
+#  Copyright 2016-2025. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Microbenchmark of the handoff between the JSON stream's parsing stage (producer) and the iterating thread (consumer).
+
+Usage:
+    python -m tests.benchmarks.row_handoff [--rows N] [--capacity N]
+"""
+
+from __future__ import annotations
+
+import argparse
+from queue import Queue
+from threading import Thread
+from time import perf_counter
+from typing import Callable, Optional, Tuple
+
+from couchbase_analytics.protocol._core.ring_buffer import SpscRingBuffer
+
+
+def _run(put: Callable[[int], object], get: Callable[[], Optional[int]], rows: int) -> float:
+    def produce() -> None:
+        for i in range(rows):
+            put(i)
+        put(-1)
+
+    producer = Thread(target=produce)
+    start = perf_counter()
+    producer.start()
+    while True:
+        item = get()
+        if item is not None and item < 0:
+            break
+    elapsed = perf_counter() - start
+    producer.join()
+    return rows / elapsed
+
+
+def _run_uncontended(put: Callable[[int], object], get: Callable[[], Optional[int]], rows: int, capacity: int) -> float:
+    # the cost of the handoff itself, i.e. when neither side has to wait on the other
+    start = perf_counter()
+    for _ in range(rows // capacity):
+        for i in range(capacity):
+            put(i)
+        for _ in range(capacity):
+            get()
+    return (rows // capacity) * capacity / (perf_counter() - start)
+
+
+def bench_queue_uncontended(rows: int, capacity: int) -> float:
+    queue: Queue[int] = Queue(maxsize=capacity)
+    return _run_uncontended(lambda item: queue.put(item, timeout=0.25), lambda: queue.get(timeout=0.25), rows, capacity)
+
+
+def bench_ring_buffer_uncontended(rows: int, capacity: int) -> float:
+    buffer: SpscRingBuffer[int] = SpscRingBuffer(capacity)
+    return _run_uncontended(
+        lambda item: buffer.put(item, timeout=0.25), lambda: buffer.get(timeout=0.25), rows, capacity
+    )
+
+
+def bench_queue(rows: int, capacity: int) -> float:
+    queue: Queue[int] = Queue(maxsize=capacity)
+    return _run(lambda item: queue.put(item, timeout=0.25), lambda: queue.get(timeout=0.25), rows)
+
+
+def bench_ring_buffer(rows: int, capacity: int) -> float:
+    buffer: SpscRingBuffer[int] = SpscRingBuffer(capacity)
+
+    def put(item: int) -> None:
+        while not buffer.put(item, timeout=0.25):
+            pass
+
+    return _run(put, lambda: buffer.get(timeout=0.25), rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--capacity', type=int, default=102)
+    args = parser.parse_args()
+
+    results: Tuple[Tuple[str, Callable[[int, int], float]], ...] = (
+        ('queue.Queue (uncontended)', bench_queue_uncontended),
+        ('SpscRingBuffer (uncontended)', bench_ring_buffer_uncontended),
+        ('queue.Queue (threaded)', bench_queue),
+        ('SpscRingBuffer (threaded)', bench_ring_buffer),
+    )
+    for name, bench in results:
+        print(f'{name:>30}: {bench(args.rows, args.capacity):>12,.0f} rows/sec')
+
+
+if __name__ == '__main__':
+    main()
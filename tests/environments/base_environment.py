@@ -35,8 +35,9 @@ from acouchbase_analytics.cluster import AsyncCluster
 from acouchbase_analytics.result import AsyncQueryResult
 from acouchbase_analytics.scope import AsyncScope
 from couchbase_analytics.cluster import Cluster
+from couchbase_analytics.common._core.http_compression import get_accept_encoding
 from couchbase_analytics.credential import Credential
-from couchbase_analytics.options import ClusterOptions, SecurityOptions
+from couchbase_analytics.options import ClusterOptions, HttpCompression, SecurityOptions
 from couchbase_analytics.result import BlockingQueryResult
 from couchbase_analytics.scope import Scope
 from tests import TEST_LOGGER_NAME, AnalyticsTestEnvironmentError
@@ -280,6 +281,15 @@ class BlockingTestEnvironment(TestEnvironment):
             except Exception as ex:
                 raise AnalyticsTestEnvironmentError(f'Unable to execute statement={statement}. Error: {ex}') from None
 
+    def update_http_compression(self, compression: Optional[HttpCompression]) -> None:
+        if self._server_handler is None:
+            raise AnalyticsTestEnvironmentError('No server handler provided, cannot update HTTP compression.')
+        if self._cluster is None or not hasattr(self._cluster, '_impl'):
+            raise AnalyticsTestEnvironmentError('No cluster available, cannot enable test server.')
+        # None restores the HTTP client's default
+        accept_encoding = get_accept_encoding(compression) or 'gzip, deflate'
+        self._cluster._impl._client_adapter.client.headers['Accept-Encoding'] = accept_encoding
+
     def update_request_extensions(self, extensions: Dict[str, object]) -> None:
         if self._server_handler is None:
             raise AnalyticsTestEnvironmentError('No server handler provided, cannot update request extensions.')
@@ -502,6 +512,15 @@ class AsyncTestEnvironment(TestEnvironment):
             except Exception as ex:
                 raise AnalyticsTestEnvironmentError(f'Unable to execute statement={statement}. Error: {ex}') from None
 
+    def update_http_compression(self, compression: Optional[HttpCompression]) -> None:
+        if self._server_handler is None:
+            raise AnalyticsTestEnvironmentError('No server handler provided, cannot update HTTP compression.')
+        if self._async_cluster is None or not hasattr(self._async_cluster, '_impl'):
+            raise AnalyticsTestEnvironmentError('No cluster available, cannot enable test server.')
+        # None restores the HTTP client's default
+        accept_encoding = get_accept_encoding(compression) or 'gzip, deflate'
+        self._async_cluster._impl._client_adapter.client.headers['Accept-Encoding'] = accept_encoding
+
     def update_request_extensions(self, extensions: Dict[str, object]) -> None:
         if self._server_handler is None:
             raise AnalyticsTestEnvironmentError('No server handler provided, cannot update request extensions.')
@@ -58,6 +58,8 @@ class ServerResultsRequest:
     chunk_size: Optional[int] = None
     stream: Optional[bool] = False
     until: Optional[float] = None
+    first_row_delay: Optional[float] = None
+    compress: Optional[bool] = False
 
     @classmethod
     def from_json(cls, json_data: Dict[str, Any]) -> ServerResultsRequest:
@@ -66,6 +68,11 @@ class ServerResultsRequest:
             raise ValueError(f'Invalid "until" value: {until_raw}. Must be a number.')
         until = float(until_raw) if until_raw is not None else None
 
+        delay_raw = json_data.get('first_row_delay', None)
+        if delay_raw is not None and not isinstance(delay_raw, (float, int)):
+            raise ValueError(f'Invalid "first_row_delay" value: {delay_raw}. Must be a number.')
+        first_row_delay = float(delay_raw) if delay_raw is not None else None
+
         row_count = json_data.get('row_count', None)
         if row_count is None and until is None:
             raise ValueError('Missing "row_count" in JSON data.')
@@ -86,6 +93,8 @@ class ServerResultsRequest:
             chunk_size=chunk_size,
             stream=json_data.get('stream', False),
             until=until,
+            first_row_delay=first_row_delay,
+            compress=json_data.get('compress', False),
         )
 
 
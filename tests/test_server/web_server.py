@@ -181,6 +181,9 @@ class AsyncWebServer:
                 'Connection': 'keep-alive',
             },
         )
+        if request.compress is True:
+            # the content encoding is negotiated via the request's Accept-Encoding header
+            response.enable_compression()
         await response.prepare(web_request)
         resp = ServerResponse.create()
         start = perf_counter()
@@ -190,10 +193,15 @@ class AsyncWebServer:
         resp.update_elapsed_time(elapsed)
 
         chunk_size = request.chunk_size or 100
+        first_row_delay = request.first_row_delay
         async_iterator = AsyncBytesIterator(bytes(json.dumps(resp.to_json_repr()), 'utf-8'), chunk_size=chunk_size)
         async for chunk in async_iterator:
             logger.info(f'Writing chunk of size {len(chunk)}; {chunk=}')
             await response.write(chunk)
+            if first_row_delay is not None:
+                # the first chunk (i.e. the preamble, if the chunk size is small enough) is sent prior to the delay
+                await asyncio.sleep(first_row_delay)
+                first_row_delay = None
         logger.info('Writing EOF')
         await response.write_eof()
         logger.info('returning response')
@@ -211,7 +219,11 @@ class AsyncWebServer:
         elapsed = end - start
         resp.update_elapsed_time(elapsed)
         res = resp.to_json_repr()
-        return web.json_response(res)
+        response = web.json_response(res)
+        if request.compress is True:
+            # the body is compressed as a whole, so the Content-Length header is the compressed size
+            response.enable_compression()
+        return response
 
     async def handle_error_request(self, request: web.Request) -> web.Response:
         try: